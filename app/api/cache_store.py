@@ -0,0 +1,274 @@
+"""Stockage clé-valeur sur disque, dans un seul fichier, pour le cache des réponses de l'API.
+
+Les caches de l'API écrivaient un fichier JSON indenté par requête (nommé par
+hachage MD5) : l'expiration demandait un ``stat`` ou un ``json.load`` par
+fichier, et un répertoire de dizaines de milliers de fichiers dégradait le
+système de fichiers. ``KVStore`` range toutes les entrées dans une base SQLite :
+
+- la valeur est du JSON (encodé avec orjson s'il est installé), compressé avec
+  zlib au-delà de quelques centaines d'octets ;
+- ``expires_at`` et ``accessed_at`` sont des colonnes indexées : la purge des
+  entrées expirées et l'éviction LRU sont de simples requêtes ;
+- la lecture d'une clé est une recherche par clé primaire ;
+- la taille totale des valeurs est bornée par ``max_bytes`` : au-delà, les
+  entrées les moins récemment lues sont évincées.
+
+Les entrées expirées restent lisibles avec ``get_entry`` (pour une
+revalidation HTTP) jusqu'à leur purge ou leur éviction.
+
+Exemple d'utilisation:
+    ```python
+    store = get_kv_store("data/cache/gw2api/responses.sqlite", max_bytes=64 * 1024 * 1024)
+    store.set("GET:/v2/build", {"id": 170000}, ttl=3600)
+    store.get("GET:/v2/build")  # {"id": 170000}
+    ```
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_entries_expires_at ON entries (expires_at);
+CREATE INDEX IF NOT EXISTS ix_entries_accessed_at ON entries (accessed_at);
+"""
+
+# Taille maximale par défaut des valeurs stockées (octets)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Nombre d'entrées évincées par requête lorsque la taille maximale est dépassée
+_EVICTION_BATCH = 64
+
+# Taille en dessous de laquelle une valeur n'est pas compressée (octets)
+_COMPRESS_MIN_BYTES = 256
+
+# Premier octet d'un flux zlib ; un document JSON ne commence jamais par "x"
+_ZLIB_HEADER = b'x'
+
+
+def encode_value(value: Any, compress: bool = True) -> bytes:
+    """Sérialise une valeur en JSON et la compresse si elle est assez grande.
+
+    Raises:
+        TypeError: Si la valeur n'est pas sérialisable en JSON
+    """
+    if ORJSON_AVAILABLE:
+        data = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if compress and len(data) >= _COMPRESS_MIN_BYTES:
+        return zlib.compress(data)
+    return data
+
+
+def decode_value(blob: bytes) -> Any:
+    """Désérialise une valeur, compressée ou non."""
+    if blob[:1] == _ZLIB_HEADER:
+        blob = zlib.decompress(blob)
+    return orjson.loads(blob) if ORJSON_AVAILABLE else json.loads(blob.decode('utf-8'))
+
+
+class KVStore:
+    """Stockage clé-valeur SQLite, compressé, avec expiration et éviction LRU.
+
+    Les méthodes sont synchrones et protégées par un verrou : une connexion est
+    partagée par les threads du processus.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time
+    ):
+        """Ouvre (ou crée) le fichier de stockage.
+
+        Args:
+            path: Chemin du fichier SQLite
+            max_bytes: Taille maximale des valeurs compressées stockées
+            clock: Horloge (remplaçable pour les tests)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        self._metrics = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def _read(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Lit une entrée et met à jour sa date d'accès (pour l'éviction LRU)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (self._clock(), key))
+        try:
+            return decode_value(row[0]), row[1]
+        except (zlib.error, ValueError) as e:
+            logger.warning(f"Entrée de cache corrompue {key}: {e}")
+            self.delete(key)
+            return None
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Lit une entrée, même expirée.
+
+        Returns:
+            Un tuple (valeur, expires_at), ou None si la clé est absente
+        """
+        entry = self._read(key)
+        self._metrics["hits" if entry is not None else "misses"] += 1
+        return entry
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retourne la valeur d'une clé, ou None si elle est absente ou expirée."""
+        entry = self._read(key)
+        if entry is None or entry[1] <= self._clock():
+            self._metrics["misses"] += 1
+            return None
+        self._metrics["hits"] += 1
+        return entry[0]
+
+    def set(self, key: str, value: Any, ttl: float, compress: bool = True) -> None:
+        """Enregistre une valeur (sérialisable en JSON) pour ``ttl`` secondes."""
+        blob = encode_value(value, compress)
+        now = self._clock()
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now + ttl, now)
+            )
+            self._size += len(blob) - (previous[0] if previous else 0)
+            self._metrics["writes"] += 1
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def touch(self, key: str, ttl: float) -> bool:
+        """Prolonge la durée de vie d'une entrée sans réécrire sa valeur.
+
+        Returns:
+            True si l'entrée existe
+        """
+        now = self._clock()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE entries SET expires_at = ?, accessed_at = ? WHERE key = ?", (now + ttl, now, key)
+            )
+        return cursor.rowcount > 0
+
+    def delete(self, key: str) -> bool:
+        """Supprime une entrée ; retourne True si elle existait."""
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return False
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._size -= row[0]
+        return True
+
+    def clear(self, prefix: str = "") -> int:
+        """Supprime toutes les entrées, ou celles dont la clé commence par ``prefix``.
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        with self._lock:
+            if prefix:
+                cursor = self._conn.execute(
+                    "DELETE FROM entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+                )
+            else:
+                cursor = self._conn.execute("DELETE FROM entries")
+            self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        return cursor.rowcount
+
+    def purge_expired(self, prefix: str = "") -> int:
+        """Supprime les entrées expirées (dont la clé commence par ``prefix``) ; retourne leur nombre."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM entries WHERE expires_at <= ? AND substr(key, 1, ?) = ?",
+                (self._clock(), len(prefix), prefix)
+            )
+            self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        return cursor.rowcount
+
+    def _evict(self) -> None:
+        """Évince les entrées les moins récemment lues jusqu'à respecter ``max_bytes``.
+
+        Doit être appelé avec le verrou.
+        """
+        while self._size > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT ?", (_EVICTION_BATCH,)
+            ).fetchall()
+            if not rows:
+                self._size = 0
+                return
+            evicted = []
+            for key, size in rows:
+                if self._size <= self.max_bytes:
+                    break
+                evicted.append(key)
+                self._size -= size
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in evicted])
+            self._metrics["evictions"] += len(evicted)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne le nombre d'entrées, la taille occupée et les compteurs d'accès."""
+        return {
+            **self._metrics,
+            "count": len(self),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "path": str(self.path),
+        }
+
+    def close(self) -> None:
+        """Ferme la connexion SQLite."""
+        with self._lock:
+            self._conn.close()
+
+
+_stores: Dict[str, KVStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_kv_store(path: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES) -> KVStore:
+    """Retourne le stockage partagé par le processus pour un fichier donné (ouvert à la demande)."""
+    key = str(Path(path).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = KVStore(path, max_bytes=max_bytes)
+        return store
@@ -0,0 +1,71 @@
+"""Endpoints de lecture du catalogue de jeu, servis depuis l'instantané en mémoire."""
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, HTTPException
+
+from app.services.catalog import CatalogSnapshot, get_catalog
+
+router = APIRouter(prefix="/catalog", tags=["catalog"])
+
+
+def _require_catalog() -> CatalogSnapshot:
+    catalog = get_catalog()
+    if catalog is None:
+        raise HTTPException(status_code=503, detail="Le catalogue de jeu n'est pas encore chargé")
+    return catalog
+
+
+@router.get("/", summary="Statistiques du catalogue")
+def catalog_stats() -> Dict[str, Any]:
+    """Retourne la version et le nombre d'entrées de l'instantané courant."""
+    catalog = _require_catalog()
+    return {"version": catalog.version, "loaded_at": catalog.loaded_at, "counts": catalog.stats()}
+
+
+@router.get("/professions", summary="Lister les professions")
+def list_professions() -> List[Dict[str, Any]]:
+    """Retourne toutes les professions."""
+    return [profession.to_dict() for profession in _require_catalog().professions.values()]
+
+
+@router.get("/professions/{profession_id}", summary="Détails d'une profession")
+def get_profession(profession_id: str) -> Dict[str, Any]:
+    """Retourne une profession avec ses spécialisations et ses types d'armes."""
+    catalog = _require_catalog()
+    profession = catalog.professions.get(profession_id)
+    if profession is None:
+        raise HTTPException(status_code=404, detail=f"Profession inconnue: {profession_id}")
+
+    data = profession.to_dict()
+    data["specializations"] = [s.to_dict() for s in catalog.specializations_for_profession(profession_id)]
+    data["weapon_types"] = [w.to_dict() for w in catalog.weapon_types_for_profession(profession_id)]
+    return data
+
+
+@router.get("/professions/{profession_id}/skills", summary="Compétences d'une profession")
+def list_profession_skills(profession_id: str) -> List[Dict[str, Any]]:
+    """Retourne les compétences d'une profession."""
+    catalog = _require_catalog()
+    if profession_id not in catalog.professions:
+        raise HTTPException(status_code=404, detail=f"Profession inconnue: {profession_id}")
+    return [skill.to_dict() for skill in catalog.skills_for_profession(profession_id)]
+
+
+@router.get("/skills/{skill_id}", summary="Détails d'une compétence")
+def get_skill(skill_id: int) -> Dict[str, Any]:
+    """Retourne une compétence."""
+    skill = _require_catalog().skills.get(skill_id)
+    if skill is None:
+        raise HTTPException(status_code=404, detail=f"Compétence inconnue: {skill_id}")
+    return skill.to_dict()
+
+
+@router.get("/traits/{trait_id}", summary="Détails d'un trait")
+def get_trait(trait_id: int) -> Dict[str, Any]:
+    """Retourne un trait."""
+    trait = _require_catalog().traits.get(trait_id)
+    if trait is None:
+        raise HTTPException(status_code=404, detail=f"Trait inconnu: {trait_id}")
+    return trait.to_dict()
@@ -6,23 +6,26 @@ en gérant la mise en cache, la limitation de débit et la gestion des erreurs.
 
 import asyncio
 import aiohttp
-import aiofiles
-import json
 import logging
 import time
-import hashlib
 import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, TypeVar, Type, Callable, Awaitable
+from typing import Any, Dict, List, Optional, Tuple, Union, TypeVar, Type, Callable, Awaitable
 from urllib.parse import urlencode, urljoin
 
 from .config import settings
+from .rate_limiter import get_rate_limiter
+from .tiered_cache import TieredCache, get_cache, make_key
 
 # Type générique pour les réponses de l'API
 T = TypeVar('T')
 
 logger = logging.getLogger(__name__)
 
+# Espace de noms des réponses de l'API dans le cache multi-niveaux
+CACHE_NAMESPACE = "api"
+
 class GW2APIError(Exception):
     """Exception de base pour les erreurs de l'API GW2."""
     pass
@@ -39,6 +42,17 @@ class NotFoundError(GW2APIError):
     """Exception levée lorsqu'une ressource n'est pas trouvée."""
     pass
 
+@dataclass
+class _Flight:
+    """Requête GET en cours, partagée par tous les appelants de la même clé.
+    
+    Attributes:
+        task: Tâche effectuant la requête
+        waiters: Nombre d'appelants qui attendent son résultat
+    """
+    task: asyncio.Task
+    waiters: int = 0
+
 class GW2APIClient:
     """Client pour interagir avec l'API Guild Wars 2."""
     
@@ -49,9 +63,15 @@ class GW2APIClient:
             session: Session HTTP à utiliser (optionnel)
         """
         self._session = session
-        self._last_request_time = 0
-        self._rate_limit_semaphore = asyncio.Semaphore(settings.requests_per_second)
-        self._cache: Dict[str, Dict] = {}
+        # Seau à jetons partagé par tous les clients du processus
+        self._rate_limiter = get_rate_limiter()
+        # Requêtes GET en cours, par clé de cache
+        self._in_flight: Dict[str, _Flight] = {}
+        # Issue des requêtes GET : cache frais, réponse complète, 304 Not Modified
+        # ou appel regroupé avec une requête identique déjà en cours
+        self._request_stats: Dict[str, int] = {
+            "cache_hits": 0, "responses_200": 0, "responses_304": 0, "coalesced": 0
+        }
         
         # Créer le répertoire de cache s'il n'existe pas
         if settings.cache_enabled and settings.cache_dir:
@@ -74,77 +94,80 @@ class GW2APIClient:
                 self._session._connector._close()
             self._session._connector = None
     
-    async def _get_cache_path(self, cache_key: str) -> Path:
-        """Génère un chemin de fichier de cache à partir d'une clé."""
-        # Créer un hachage de la clé pour le nom de fichier
-        cache_hash = hashlib.md5(cache_key.encode('utf-8')).hexdigest()
-        return Path(settings.cache_dir) / f"{cache_hash}.json"
-    
-    async def _load_from_cache(self, cache_key: str) -> Optional[Dict]:
-        """Charge des données depuis le cache disque."""
+    def _response_cache(self) -> Optional[TieredCache]:
+        """Retourne le cache des réponses (None si le cache est désactivé)."""
         if not settings.cache_enabled or not settings.cache_dir:
             return None
+        return get_cache(CACHE_NAMESPACE)
+    
+    async def _read_cache_entry(self, cache_key: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """Lit une entrée du cache, même expirée.
         
-        cache_path = await self._get_cache_path(cache_key)
+        Returns:
+            Un tuple (entrée, fraîche) où l'entrée contient les données et les
+            validateurs HTTP ``etag`` et ``last_modified``, ou None si absente
+        """
+        cache = self._response_cache()
+        if cache is None:
+            return None
         
-        # Vérifier si le fichier de cache existe et n'est pas expiré
-        if cache_path.exists():
-            file_stat = cache_path.stat()
-            if time.time() - file_stat.st_mtime < settings.cache_ttl:
-                try:
-                    async with aiofiles.open(cache_path, 'r', encoding='utf-8') as f:
-                        data = json.loads(await f.read())
-                        if settings.log_requests:
-                            logger.debug(f"Données chargées depuis le cache: {cache_key}")
-                        return data
-                except (json.JSONDecodeError, OSError) as e:
-                    logger.warning(f"Erreur lors de la lecture du cache {cache_path}: {e}")
-                    # Supprimer le fichier de cache corrompu
-                    try:
-                        cache_path.unlink()
-                    except OSError:
-                        pass
-        
-        return None
-    
-    async def _save_to_cache(self, cache_key: str, data: Any) -> None:
-        """Enregistre des données dans le cache disque."""
-        if not settings.cache_enabled or not settings.cache_dir:
-            return
+        cached = await cache.get_entry(cache_key)
+        if cached is None:
+            return None
+        entry, expires_at = cached
+        return entry, expires_at > time.time()
+    
+    async def _load_from_cache(self, cache_key: str) -> Optional[Dict]:
+        """Charge des données depuis le cache."""
+        cached = await self._read_cache_entry(cache_key)
+        if cached is None or not cached[1]:
+            return None
         
-        cache_path = await self._get_cache_path(cache_key)
+        if settings.log_requests:
+            logger.debug(f"Données chargées depuis le cache: {cache_key}")
+        return cached[0]["data"]
+    
+    async def _save_to_cache(
+        self,
+        cache_key: str,
+        data: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        page_total: Optional[int] = None
+    ) -> None:
+        """Enregistre des données dans le cache, avec leurs validateurs HTTP et le nombre de pages."""
+        cache = self._response_cache()
+        if cache is None:
+            return
         
-        try:
-            # Créer le répertoire parent si nécessaire
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Écrire les données dans le fichier de cache
-            async with aiofiles.open(cache_path, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(data, ensure_ascii=False, indent=2))
-            
-            if settings.log_requests:
-                logger.debug(f"Données enregistrées dans le cache: {cache_key}")
-                
-        except (OSError, TypeError) as e:
-            logger.error(f"Erreur lors de l'écriture dans le cache {cache_path}: {e}")
+        await cache.set(cache_key, {
+            "etag": etag, "last_modified": last_modified, "page_total": page_total, "data": data
+        })
+        if settings.log_requests:
+            logger.debug(f"Données enregistrées dans le cache: {cache_key}")
+    
+    async def _refresh_cache_entry(self, cache_key: str) -> None:
+        """Prolonge la durée de vie d'une entrée du cache sans réécrire ses données."""
+        cache = self._response_cache()
+        if cache is not None:
+            await cache.touch(cache_key)
+    
+    @staticmethod
+    def _conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        """En-têtes de requête conditionnelle pour revalider une entrée expirée."""
+        headers = {}
+        if entry.get("etag"):
+            headers['If-None-Match'] = entry["etag"]
+        if entry.get("last_modified"):
+            headers['If-Modified-Since'] = entry["last_modified"]
+        return headers
     
     async def _rate_limit(self) -> None:
         """Applique la limitation de débit (rate limiting)."""
         if not settings.rate_limit_enabled:
             return
         
-        async with self._rate_limit_semaphore:
-            now = time.time()
-            elapsed = now - self._last_request_time
-            
-            # Attendre si nécessaire pour respecter la limite de débit
-            if elapsed < 1.0 / settings.requests_per_second:
-                wait_time = (1.0 / settings.requests_per_second) - elapsed
-                if settings.log_requests:
-                    logger.debug(f"Attente de {wait_time:.3f}s pour respecter la limite de débit")
-                await asyncio.sleep(wait_time)
-            
-            self._last_request_time = time.time()
+        await self._rate_limiter.acquire()
     
     async def _make_request(
         self,
@@ -153,6 +176,7 @@ class GW2APIClient:
         params: Optional[Dict[str, Any]] = None,
         use_cache: bool = True,
         cache_key_extra: str = "",
+        with_page_total: bool = False,
         **kwargs
     ) -> Any:
         """Effectue une requête HTTP vers l'API GW2.
@@ -163,10 +187,12 @@ class GW2APIClient:
             params: Paramètres de requête
             use_cache: Si True, utilise le cache si disponible
             cache_key_extra: Chaîne supplémentaire pour la clé de cache
+            with_page_total: Si True, retourne aussi l'en-tête ``X-Page-Total``
             **kwargs: Arguments supplémentaires pour aiohttp.request
             
         Returns:
-            La réponse désérialisée de l'API
+            La réponse désérialisée de l'API, ou un tuple (réponse, nombre de
+            pages ou None) si ``with_page_total`` est vrai
             
         Raises:
             RateLimitExceeded: Si la limite de taux est dépassée
@@ -183,16 +209,90 @@ class GW2APIClient:
         params = params or {}
         
         # Créer une clé de cache unique pour cette requête
-        cache_key = f"{method}:{endpoint}:{urlencode(sorted(params.items()))}:{cache_key_extra}"
+        cache_key = make_key(f"{method.upper()}:{endpoint}", urlencode(sorted(params.items())), cache_key_extra)
+        
+        # Les GET identiques simultanés partagent une seule requête
+        if method.upper() == 'GET' and not kwargs:
+            return await self._single_flight(
+                f"{cache_key}:{use_cache}:{with_page_total}",
+                lambda: self._send_request(method, url, endpoint, params, use_cache, cache_key, with_page_total)
+            )
+        return await self._send_request(
+            method, url, endpoint, params, use_cache, cache_key, with_page_total, **kwargs
+        )
+    
+    async def _single_flight(self, key: str, request: Callable[[], Awaitable[Any]]) -> Any:
+        """Partage une requête entre tous les appelants simultanés de la même clé.
+        
+        Le premier appelant lance la requête dans une tâche ; les suivants
+        attendent cette même tâche et reçoivent le même résultat (ou la même
+        exception). La tâche est protégée par ``asyncio.shield`` : l'annulation
+        d'un appelant n'annule la requête que s'il était le dernier à l'attendre.
+        Elle est alors retirée des requêtes en cours avant d'être annulée, et un
+        nouvel appelant lance sa propre requête au lieu de rejoindre une requête
+        annulée.
+        
+        Note:
+            Les appelants regroupés reçoivent le même objet : il ne doit pas être
+            modifié en place.
+        """
+        flight = self._in_flight.get(key)
+        if flight is None or flight.task.cancelled():
+            flight = _Flight(asyncio.ensure_future(request()))
+            self._in_flight[key] = flight
+            flight.task.add_done_callback(lambda task: self._end_flight(key, task))
+        else:
+            self._request_stats["coalesced"] += 1
+            if settings.log_requests:
+                logger.debug(f"Requête regroupée avec une requête identique en cours: {key}")
         
-        # Essayer de charger depuis le cache si activé
-        if use_cache and method.upper() == 'GET':
-            cached_data = await self._load_from_cache(cache_key)
-            if cached_data is not None:
-                return cached_data
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                self._end_flight(key, flight.task)
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+    
+    def _end_flight(self, key: str, task: asyncio.Task) -> None:
+        """Retire une requête terminée des requêtes en cours."""
+        flight = self._in_flight.get(key)
+        if flight is not None and flight.task is task:
+            del self._in_flight[key]
+    
+    async def _send_request(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        use_cache: bool,
+        cache_key: str,
+        with_page_total: bool = False,
+        **kwargs
+    ) -> Any:
+        """Effectue la requête HTTP, en servant ou revalidant le cache si possible.
         
-        # Appliquer la limitation de débit
-        await self._rate_limit()
+        Voir ``_make_request`` pour les paramètres et les exceptions.
+        """
+        # Essayer de charger depuis le cache si activé ; une entrée expirée est
+        # revalidée par une requête conditionnelle
+        stale_entry = None
+        headers = dict(kwargs.pop('headers', None) or {})
+        if use_cache and method.upper() == 'GET':
+            cached = await self._read_cache_entry(cache_key)
+            if cached is not None:
+                entry, fresh = cached
+                if fresh:
+                    self._request_stats["cache_hits"] += 1
+                    if settings.log_requests:
+                        logger.debug(f"Données chargées depuis le cache: {cache_key}")
+                    return (entry["data"], entry.get("page_total")) if with_page_total else entry["data"]
+                stale_entry = entry
+                headers.update(self._conditional_headers(entry))
         
         # Journalisation de la requête
         if settings.log_requests:
@@ -202,11 +302,15 @@ class GW2APIClient:
         last_error = None
         
         for attempt in range(settings.max_retries + 1):
+            # Appliquer la limitation de débit (y compris avant chaque nouvel essai)
+            await self._rate_limit()
+            
             try:
                 async with self._session.request(
                     method=method,
                     url=url,
                     params=params,
+                    headers=headers or None,
                     timeout=settings.request_timeout,
                     **kwargs
                 ) as response:
@@ -222,7 +326,11 @@ class GW2APIClient:
                                 f"Limite de débit dépassée, nouvel essai dans {retry_after}s "
                                 f"(tentative {attempt + 1}/{settings.max_retries})"
                             )
-                            await asyncio.sleep(retry_after)
+                            # Le seau à jetons ralentit toutes les requêtes du processus
+                            if settings.rate_limit_enabled:
+                                self._rate_limiter.penalize(retry_after)
+                            else:
+                                await asyncio.sleep(retry_after)
                             continue
                         else:
                             raise RateLimitExceeded(
@@ -245,8 +353,21 @@ class GW2APIClient:
                                 f"Erreur serveur {response.status} après {settings.max_retries} tentatives"
                             )
                     
+                    # Données inchangées : prolonger l'entrée du cache sans
+                    # transférer ni parser la réponse
+                    if response.status == 304 and stale_entry is not None:
+                        self._request_stats["responses_304"] += 1
+                        self._rate_limiter.on_success()
+                        await self._refresh_cache_entry(cache_key)
+                        if settings.log_requests:
+                            logger.debug(f"Données inchangées (304), cache prolongé: {cache_key}")
+                        if with_page_total:
+                            return stale_entry["data"], stale_entry.get("page_total")
+                        return stale_entry["data"]
+                    
                     # Pour les autres erreurs, lever une exception
                     response.raise_for_status()
+                    self._rate_limiter.on_success()
                     
                     # Lire et parser la réponse
                     content_type = response.headers.get('Content-Type', '')
@@ -255,11 +376,22 @@ class GW2APIClient:
                     else:
                         data = await response.text()
                     
+                    if response.status == 200:
+                        self._request_stats["responses_200"] += 1
+                    
+                    page_total = response.headers.get('X-Page-Total')
+                    page_total = int(page_total) if page_total and page_total.isdigit() else None
+                    
                     # Mettre en cache la réponse si nécessaire
                     if use_cache and method.upper() == 'GET' and response.status == 200:
-                        await self._save_to_cache(cache_key, data)
+                        await self._save_to_cache(
+                            cache_key, data,
+                            etag=response.headers.get('ETag'),
+                            last_modified=response.headers.get('Last-Modified'),
+                            page_total=page_total
+                        )
                     
-                    return data
+                    return (data, page_total) if with_page_total else data
             
             except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 last_error = e
@@ -293,6 +425,33 @@ class GW2APIClient:
             cache_key_extra=cache_key_extra, **kwargs
         )
     
+    async def get_page(
+        self,
+        endpoint: str,
+        page: int,
+        page_size: int = 200,
+        params: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True
+    ) -> Tuple[List[Any], int]:
+        """Récupère une page d'un endpoint paginé de l'API GW2.
+        
+        Args:
+            endpoint: Point de terminaison de l'API (sans la base URL)
+            page: Numéro de la page (à partir de 0)
+            page_size: Nombre d'éléments par page (200 au maximum)
+            params: Paramètres de requête supplémentaires
+            use_cache: Si True, utilise le cache si disponible
+            
+        Returns:
+            Un tuple (éléments de la page, nombre total de pages selon
+            l'en-tête ``X-Page-Total``, 1 s'il est absent)
+        """
+        params = {**(params or {}), 'page': page, 'page_size': page_size}
+        data, page_total = await self._make_request(
+            'GET', endpoint, params=params, use_cache=use_cache, with_page_total=True
+        )
+        return data or [], page_total if page_total is not None else 1
+    
     async def post(
         self,
         endpoint: str,
@@ -408,22 +567,23 @@ class GW2APIClient:
     async def clear_cache(self, prefix: str = "") -> int:
         """Vide le cache, éventuellement filtré par préfixe.
         
+        Vider tout le cache supprime aussi les fichiers JSON de l'ancien cache
+        (un fichier par requête).
+        
         Args:
-            prefix: Préfixe des clés de cache à supprimer (vide pour tout supprimer)
+            prefix: Préfixe des clés de cache à supprimer, ex: "GET:/v2/skills"
+                (vide pour tout supprimer)
             
         Returns:
-            Nombre de fichiers de cache supprimés
+            Nombre d'entrées de cache supprimées
         """
-        if not settings.cache_enabled or not settings.cache_dir:
+        cache = self._response_cache()
+        if cache is None:
             return 0
         
-        cache_dir = Path(settings.cache_dir)
-        if not cache_dir.exists():
-            return 0
-        
-        deleted = 0
-        for cache_file in cache_dir.glob("*.json"):
-            if not prefix or cache_file.name.startswith(prefix):
+        deleted = await cache.clear(prefix)
+        if not prefix:
+            for cache_file in Path(settings.cache_dir).glob("*.json"):
                 try:
                     cache_file.unlink()
                     deleted += 1
@@ -431,26 +591,36 @@ class GW2APIClient:
                     logger.error(f"Erreur lors de la suppression du cache {cache_file}: {e}")
         
         if deleted > 0 and settings.log_requests:
-            logger.info(f"Cache vidé: {deleted} fichiers supprimés")
+            logger.info(f"Cache vidé: {deleted} entrées supprimées")
         
         return deleted
     
+    def get_request_stats(self) -> Dict[str, int]:
+        """Retourne le nombre de requêtes GET servies par le cache, par une
+        réponse complète (200) ou revalidées sans transfert (304)."""
+        return dict(self._request_stats)
+    
+    def get_rate_limit_stats(self) -> Dict[str, Any]:
+        """Retourne les métriques d'attente du limiteur de débit partagé."""
+        return self._rate_limiter.stats()
+    
     async def get_cache_info(self) -> Dict[str, Any]:
         """Retourne des informations sur l'état du cache."""
-        if not settings.cache_enabled or not settings.cache_dir:
-            return {"enabled": False}
-        
-        cache_dir = Path(settings.cache_dir)
-        if not cache_dir.exists():
-            return {"enabled": True, "cache_dir": str(cache_dir), "count": 0}
-        
-        cache_files = list(cache_dir.glob("*.json"))
-        total_size = sum(f.stat().st_size for f in cache_files if f.is_file())
+        cache = self._response_cache()
+        if cache is None:
+            return {"enabled": False, "requests": self.get_request_stats()}
         
+        cache_stats = cache.stats()
+        disk_stats = cache_stats.get("disk", {})
         return {
             "enabled": True,
-            "cache_dir": str(cache_dir),
-            "count": len(cache_files),
-            "total_size_bytes": total_size,
-            "total_size_mb": total_size / (1024 * 1024),
+            "cache_dir": settings.cache_dir,
+            "cache_file": disk_stats.get("path"),
+            "count": disk_stats.get("count", cache_stats["memory_entries"]),
+            "total_size_bytes": disk_stats.get("size_bytes", 0),
+            "total_size_mb": disk_stats.get("size_bytes", 0) / (1024 * 1024),
+            "max_size_bytes": disk_stats.get("max_bytes"),
+            "evictions": disk_stats.get("evictions", 0),
+            "tiers": cache_stats,
+            "requests": self.get_request_stats(),
         }
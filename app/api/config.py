@@ -28,6 +28,10 @@ class GW2APISettings(BaseSettings):
     cache_enabled: bool = True
     cache_ttl: int = 3600  # 1 heure en secondes
     cache_dir: str = "data/cache/gw2api"
+    cache_max_bytes: int = 256 * 1024 * 1024  # Taille maximale du cache (éviction LRU au-delà)
+    cache_memory_entries: int = 1024  # Entrées du niveau mémoire de chaque espace de noms
+    cache_ttls: Dict[str, int] = {}  # Durée de vie par espace de noms (ex: {"gw2_data": 86400})
+    redis_url: Optional[str] = None  # Niveau Redis du cache (ex: "redis://localhost:6379/0")
     
     # Paramètres de requête
     request_timeout: int = 30  # secondes
@@ -37,6 +41,12 @@ class GW2APISettings(BaseSettings):
     # Paramètres de taux d'appel (rate limiting)
     rate_limit_enabled: bool = True
     requests_per_second: int = 5
+    rate_limit_burst: int = 10  # Requêtes autorisées en rafale (taille du seau à jetons)
+    rate_limit_min_rate: float = 0.5  # Débit minimum après des réponses 429
+    
+    # Paramètres du pipeline de synchronisation
+    sync_fetch_concurrency: int = 4  # Récupérations simultanées (bornées par requests_per_second)
+    sync_queue_size: int = 4  # Lots en attente entre deux étages du pipeline
     
     # Paramètres de journalisation
     log_requests: bool = True
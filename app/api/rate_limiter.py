@@ -0,0 +1,183 @@
+"""Limitation de débit des requêtes vers l'API GW2 par seau à jetons.
+
+L'ancien mécanisme (sémaphore de ``requests_per_second`` places et attente
+depuis la dernière requête) ne garantissait pas un débit réel et ne permettait
+pas de rafale. ``TokenBucket`` :
+
+- se remplit de ``rate`` jetons par seconde, jusqu'à ``burst`` jetons ;
+- réserve un jeton par requête : les appelants attendent leur tour dans
+  l'ordre d'arrivée, sans verrou (les réservations se font sans ``await``) ;
+- réduit son débit après une réponse 429 (en respectant ``Retry-After``), une
+  seule fois par fenêtre de blocage, puis le rétablit progressivement à chaque
+  succès. À la fin d'un blocage, les appelants en attente repartent espacés au
+  débit courant, et non tous au même instant.
+
+Un seul seau est partagé par toutes les instances de ``GW2APIClient`` du
+processus (voir ``get_rate_limiter``).
+
+Exemple d'utilisation:
+    ```python
+    limiter = get_rate_limiter()
+    await limiter.acquire()
+    ...
+    limiter.on_success()          # ou limiter.penalize(retry_after) sur 429
+    print(limiter.stats())
+    ```
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Fenêtre (secondes) pendant laquelle les réponses 429 suivantes ne réduisent
+# plus le débit, quand l'API n'envoie pas de ``Retry-After``
+PENALTY_WINDOW = 1.0
+
+
+class TokenBucket:
+    """Seau à jetons avec réduction adaptative du débit."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        min_rate: float = 0.5,
+        backoff_factor: float = 0.5,
+        recovery_step: float = 0.1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialise le seau, plein.
+
+        Args:
+            rate: Débit nominal, en requêtes par seconde
+            burst: Nombre maximum de requêtes en rafale
+            min_rate: Débit minimum après des réponses 429
+            backoff_factor: Facteur appliqué au débit à chaque réponse 429
+            recovery_step: Fraction du débit nominal rétablie à chaque succès
+                (au plus une fois par seconde)
+            clock: Horloge monotone (remplaçable pour les tests)
+        """
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._last_adjustment = self._updated
+        self._metrics: Dict[str, float] = {
+            "acquired": 0, "waited": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0, "throttled": 0
+        }
+
+    def _refill(self, now: float) -> None:
+        """Ajoute les jetons accumulés depuis la dernière mise à jour.
+
+        Pendant un blocage ``Retry-After``, ``_updated`` est la fin du blocage :
+        aucun jeton ne s'accumule avant.
+        """
+        if now <= self._updated:
+            return
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Réserve un jeton et retourne le temps d'attente avant de l'utiliser.
+
+        Le solde peut devenir négatif : chaque réservation attend alors que les
+        jetons des réservations précédentes soient disponibles, comptés à partir
+        de la fin d'un éventuel blocage.
+        """
+        now = self._clock()
+        self._refill(now)
+        self._tokens -= 1
+        wait = max(0.0, self._updated - now) + max(0.0, -self._tokens / self.rate)
+
+        self._metrics["acquired"] += 1
+        if wait > 0:
+            self._metrics["waited"] += 1
+            self._metrics["wait_seconds"] += wait
+            self._metrics["max_wait_seconds"] = max(self._metrics["max_wait_seconds"], wait)
+        return wait
+
+    async def acquire(self) -> float:
+        """Attend qu'un jeton soit disponible ; retourne le temps attendu."""
+        wait = self.reserve()
+        if wait > 0:
+            if settings.log_requests:
+                logger.debug(f"Attente de {wait:.3f}s pour respecter la limite de débit")
+            await asyncio.sleep(wait)
+        return wait
+
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        """Réduit le débit après une réponse 429.
+
+        Les réponses 429 reçues avant la fin de la fenêtre de la précédente
+        (``Retry-After``, ou ``PENALTY_WINDOW``) sont comptées mais ne réduisent
+        pas à nouveau le débit : elles proviennent de requêtes déjà envoyées.
+
+        Args:
+            retry_after: Délai demandé par l'en-tête ``Retry-After``, en secondes
+        """
+        now = self._clock()
+        self._metrics["throttled"] += 1
+        if now < self._blocked_until:
+            return
+        self._refill(now)
+        self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+        if retry_after:
+            # Aucun jeton avant la fin du blocage ; une requête part dès sa fin
+            self._blocked_until = now + retry_after
+            self._updated = self._blocked_until
+            self._tokens = min(self._tokens, 1.0)
+        else:
+            self._blocked_until = now + PENALTY_WINDOW
+            self._tokens = min(self._tokens, 0.0)
+        self._last_adjustment = now
+        logger.warning(f"Limite de débit de l'API atteinte, débit réduit à {self.rate:.2f} requêtes/s")
+
+    def on_success(self) -> None:
+        """Rétablit progressivement le débit nominal après une réponse réussie."""
+        if self.rate >= self.max_rate:
+            return
+        now = self._clock()
+        if now - self._last_adjustment >= 1.0:
+            self._refill(now)
+            self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery_step)
+            self._last_adjustment = now
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les métriques d'attente et le débit courant."""
+        acquired = self._metrics["acquired"]
+        return {
+            **self._metrics,
+            "average_wait_seconds": self._metrics["wait_seconds"] / acquired if acquired else 0.0,
+            "rate": self.rate,
+            "max_rate": self.max_rate,
+            "burst": self.burst,
+        }
+
+
+_rate_limiter: Optional[TokenBucket] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucket:
+    """Retourne le seau à jetons partagé par le processus (créé à la demande)."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = TokenBucket(
+                rate=settings.requests_per_second,
+                burst=settings.rate_limit_burst,
+                min_rate=settings.rate_limit_min_rate
+            )
+        return _rate_limiter
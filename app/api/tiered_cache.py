@@ -0,0 +1,502 @@
+"""Cache multi-niveaux : mémoire → disque → Redis.
+
+L'application avait quatre caches sans lien entre eux (le cache disque du
+client API, le dictionnaire ``_api_cache`` jamais purgé de ``GW2DataService``,
+``GW2APICache`` et le décorateur ``redis_cache``). ``TieredCache`` les remplace
+par une seule abstraction, découpée en espaces de noms :
+
+- un niveau mémoire LRU borné (``cache_memory_entries`` entrées) ;
+- un niveau disque persistant (``KVStore``, un seul fichier SQLite) ;
+- un niveau Redis optionnel (si ``redis_url`` est configuré).
+
+La lecture descend les niveaux et recopie l'entrée trouvée dans les niveaux
+supérieurs ; l'écriture met à jour tous les niveaux. Chaque espace de noms a sa
+durée de vie par défaut (``cache_ttls``, sinon ``cache_ttl``). Le niveau
+mémoire sert de cache local : une clé souvent lue n'interroge pas Redis.
+
+``get_or_set`` protège contre l'effet de meute (« cache stampede ») : un seul
+calcul par clé dans le processus, un verrou Redis entre processus, et un
+rafraîchissement anticipé probabiliste (XFetch) avant l'expiration.
+
+Les clés sont construites par ``make_key`` : un groupe lisible (ex:
+"GET:/v2/skills"), qui permet de vider le cache par préfixe, suivi d'une
+empreinte stable des autres éléments.
+
+Exemple d'utilisation:
+    ```python
+    cache = get_cache("api")
+    key = make_key("GET:/v2/skills", {"ids": "1,2"})
+    await cache.set(key, data)
+    data = await cache.get(key)
+    ```
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from .cache_store import KVStore, decode_value, encode_value, get_kv_store
+from .config import settings
+
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Fichier du niveau disque, dans ``settings.cache_dir``
+CACHE_FILE_NAME = "cache.sqlite"
+
+# Intervalle d'attente de la valeur calculée par un autre processus (secondes)
+_LOCK_POLL_INTERVAL = 0.05
+
+
+def make_key(group: str, *parts: Any) -> str:
+    """Construit une clé de cache stable.
+
+    Args:
+        group: Préfixe lisible de la clé (ex: "GET:/v2/skills")
+        *parts: Autres éléments de la clé (sérialisables en JSON, dictionnaires
+            compris : l'ordre de leurs clés n'influe pas sur la clé)
+
+    Returns:
+        ``"<group>:<empreinte SHA-1 des éléments>"``
+    """
+    canonical = json.dumps(parts, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return f"{group}:{hashlib.sha1(canonical.encode('utf-8')).hexdigest()}"
+
+
+class MemoryTier:
+    """Niveau mémoire : dictionnaire LRU borné de (valeur, expires_at)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self, prefix: str = "") -> int:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def purge_expired(self, prefix: str, now: float) -> int:
+        with self._lock:
+            keys = [
+                key for key, (_, expires_at) in self._entries.items()
+                if key.startswith(prefix) and expires_at <= now
+            ]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TieredCache:
+    """Cache d'un espace de noms, sur les niveaux mémoire, disque et Redis.
+
+    Note:
+        Le niveau mémoire retourne l'objet mis en cache lui-même : les valeurs
+        lues ne doivent pas être modifiées en place.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float,
+        memory_entries: int = 1024,
+        store: Optional[KVStore] = None,
+        redis_client: Optional[Any] = None,
+        compress: bool = True,
+        clock: Callable[[], float] = time.time
+    ):
+        """Initialise le cache.
+
+        Args:
+            namespace: Espace de noms, préfixe de toutes les clés
+            ttl: Durée de vie par défaut des entrées, en secondes
+            memory_entries: Nombre maximum d'entrées du niveau mémoire
+            store: Niveau disque (None pour un cache sans persistance)
+            redis_client: Client ``redis.asyncio`` (None sans niveau Redis)
+            compress: Si True, compresse les grandes valeurs des niveaux disque et Redis
+            clock: Horloge (remplaçable pour les tests)
+        """
+        self.namespace = namespace
+        self.ttl = ttl
+        self.memory = MemoryTier(memory_entries)
+        self.store = store
+        self.redis = redis_client
+        self.compress = compress
+        self._clock = clock
+        self._flights: Dict[str, asyncio.Future] = {}
+        self._metrics = {
+            "memory_hits": 0, "disk_hits": 0, "redis_hits": 0, "misses": 0,
+            "computed": 0, "early_refreshes": 0, "lock_waits": 0
+        }
+
+    def _full_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Lit une entrée sur le premier niveau qui la contient.
+
+        Une entrée expirée n'est retournée que si aucun niveau n'en a de fraîche
+        (elle peut servir à une revalidation).
+
+        Returns:
+            Un tuple (valeur, expires_at), ou None si la clé est absente
+        """
+        full_key = self._full_key(key)
+        now = self._clock()
+
+        stale = self.memory.get(full_key)
+        if stale is not None and stale[1] > now:
+            self._metrics["memory_hits"] += 1
+            return stale
+
+        if self.store is not None:
+            entry = self.store.get_entry(full_key)
+            if entry is not None:
+                self.memory.set(full_key, *entry)
+                if entry[1] > now:
+                    self._metrics["disk_hits"] += 1
+                    return entry
+                stale = entry
+
+        if self.redis is not None:
+            entry = await self._redis_get(full_key)
+            if entry is not None and entry[1] > now:
+                self._metrics["redis_hits"] += 1
+                self.memory.set(full_key, *entry)
+                self._store_set(full_key, entry[0], entry[1] - now)
+                return entry
+
+        self._metrics["misses"] += 1
+        return stale
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Retourne la valeur d'une clé, ou None si elle est absente ou expirée."""
+        entry = await self.get_entry(key)
+        if entry is None or entry[1] <= self._clock():
+            return None
+        return entry[0]
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Enregistre une valeur sur tous les niveaux.
+
+        Une valeur non sérialisable en JSON n'est conservée qu'en mémoire.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        full_key = self._full_key(key)
+        self.memory.set(full_key, value, self._clock() + ttl)
+        self._store_set(full_key, value, ttl)
+        if self.redis is not None:
+            await self._redis_set(full_key, value, ttl)
+
+    async def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        beta: float = 1.0,
+        lock_timeout: float = 10.0
+    ) -> Any:
+        """Retourne la valeur en cache, ou la calcule en la protégeant de l'effet de meute.
+
+        - Dans le processus, les appels simultanés pour une même clé attendent
+          un seul calcul.
+        - Entre processus, un verrou Redis (``SET NX``) désigne le seul
+          processus qui recalcule ; les autres attendent sa valeur (au plus
+          ``lock_timeout`` secondes), ou servent l'ancienne si elle est encore
+          valide.
+        - Avant l'expiration, une entrée est recalculée par anticipation avec
+          une probabilité croissante (XFetch) : proportionnelle à la durée du
+          dernier calcul et à ``beta`` (0 pour désactiver).
+
+        Les entrées sont stockées avec la durée de leur calcul : une clé
+        utilisée par ``get_or_set`` ne doit pas être lue avec ``get``. Un
+        résultat None n'est pas mis en cache.
+
+        Args:
+            key: Clé de cache
+            compute: Coroutine calculant la valeur
+            ttl: Durée de vie de la valeur (par défaut : celle de l'espace de noms)
+            beta: Facteur du rafraîchissement anticipé
+            lock_timeout: Durée maximale du verrou Redis, en secondes
+        """
+        entry = await self.get_entry(key)
+        if entry is not None and not self._refresh_early(entry, beta):
+            return entry[0][0]
+
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(self._recompute(key, compute, ttl, entry, lock_timeout))
+            self._flights[key] = flight
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        return await asyncio.shield(flight)
+
+    def _refresh_early(self, entry: Tuple[Any, float], beta: float) -> bool:
+        """Indique si une entrée doit être recalculée (expirée, ou tirage XFetch)."""
+        (_, delta), expires_at = entry
+        now = self._clock()
+        if expires_at <= now:
+            return True
+        if beta <= 0 or delta <= 0:
+            return False
+        # 1 - random() est dans ]0, 1] : le logarithme est défini
+        if now - delta * beta * math.log(1.0 - random.random()) >= expires_at:
+            self._metrics["early_refreshes"] += 1
+            return True
+        return False
+
+    async def _recompute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[float],
+        previous: Optional[Tuple[Any, float]],
+        lock_timeout: float
+    ) -> Any:
+        """Calcule et enregistre une valeur, sous verrou Redis si disponible."""
+        lock_key = f"{self._full_key(key)}:lock"
+        token = None
+        if self.redis is not None:
+            token = await self._acquire_lock(lock_key, lock_timeout)
+            if token is None:
+                # Un autre processus recalcule : l'ancienne valeur reste servie
+                # tant qu'elle est valide, sinon on attend la nouvelle
+                if previous is not None and previous[1] > self._clock():
+                    return previous[0][0]
+                self._metrics["lock_waits"] += 1
+                deadline = self._clock() + lock_timeout
+                while self._clock() < deadline:
+                    await asyncio.sleep(_LOCK_POLL_INTERVAL)
+                    entry = await self._redis_get(self._full_key(key))
+                    if entry is not None and entry[1] > self._clock():
+                        self.memory.set(self._full_key(key), *entry)
+                        return entry[0][0]
+                logger.warning(f"Verrou de cache toujours détenu après {lock_timeout}s, calcul local: {key}")
+
+        try:
+            start = time.perf_counter()
+            value = await compute()
+            self._metrics["computed"] += 1
+            if value is not None:
+                await self.set(key, [value, time.perf_counter() - start], ttl)
+            return value
+        finally:
+            if token is not None:
+                await self._release_lock(lock_key, token)
+
+    async def _acquire_lock(self, lock_key: str, timeout: float) -> Optional[str]:
+        """Pose le verrou Redis ; retourne son jeton, ou None s'il est déjà détenu.
+
+        Si Redis est indisponible, le calcul se fait sans verrou.
+        """
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis.set(lock_key, token, nx=True, px=max(1, int(timeout * 1000)))
+        except Exception as e:
+            logger.warning(f"Erreur lors de la pose du verrou Redis: {e}")
+            return token
+        return token if acquired else None
+
+    async def _release_lock(self, lock_key: str, token: str) -> None:
+        """Libère le verrou Redis s'il est toujours détenu par ce jeton."""
+        try:
+            current = await self.redis.get(lock_key)
+            if current is not None and (current.decode() if isinstance(current, bytes) else current) == token:
+                await self.redis.delete(lock_key)
+        except Exception as e:
+            logger.warning(f"Erreur lors de la libération du verrou Redis: {e}")
+
+    async def touch(self, key: str, ttl: Optional[float] = None) -> None:
+        """Prolonge la durée de vie d'une entrée sans la relire depuis sa source."""
+        ttl = self.ttl if ttl is None else ttl
+        full_key = self._full_key(key)
+        entry = self.memory.get(full_key)
+        if entry is not None:
+            self.memory.set(full_key, entry[0], self._clock() + ttl)
+        if self.store is not None:
+            self.store.touch(full_key, ttl)
+        if self.redis is not None and entry is not None:
+            await self._redis_set(full_key, entry[0], ttl)
+
+    async def delete(self, key: str) -> None:
+        """Supprime une entrée de tous les niveaux."""
+        full_key = self._full_key(key)
+        self.memory.delete(full_key)
+        if self.store is not None:
+            self.store.delete(full_key)
+        if self.redis is not None:
+            try:
+                await self.redis.delete(full_key)
+            except Exception as e:
+                logger.warning(f"Erreur lors de la suppression dans le cache Redis: {e}")
+
+    async def clear(self, prefix: str = "") -> int:
+        """Vide l'espace de noms, ou les clés commençant par ``prefix``.
+
+        Returns:
+            Nombre d'entrées supprimées (niveau le plus complet)
+        """
+        full_prefix = self._full_key(prefix)
+        deleted = self.memory.clear(full_prefix)
+        if self.store is not None:
+            deleted = max(deleted, self.store.clear(full_prefix))
+        if self.redis is not None:
+            try:
+                keys = [key async for key in self.redis.scan_iter(match=f"{full_prefix}*")]
+                if keys:
+                    deleted = max(deleted, await self.redis.delete(*keys))
+            except Exception as e:
+                logger.warning(f"Erreur lors du vidage du cache Redis: {e}")
+        return deleted
+
+    def purge_expired(self) -> int:
+        """Supprime les entrées expirées des niveaux mémoire et disque.
+
+        Redis expire lui-même ses entrées.
+
+        Returns:
+            Nombre d'entrées supprimées (du disque, ou de la mémoire sans niveau disque)
+        """
+        purged = self.memory.purge_expired(self._full_key(""), self._clock())
+        if self.store is not None:
+            purged = self.store.purge_expired(self._full_key(""))
+        return purged
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les succès par niveau et l'occupation du niveau mémoire."""
+        stats: Dict[str, Any] = {
+            "namespace": self.namespace,
+            "ttl": self.ttl,
+            **self._metrics,
+            "memory_entries": len(self.memory),
+            "memory_max_entries": self.memory.max_entries,
+            "memory_evictions": self.memory.evictions,
+            "redis": self.redis is not None,
+        }
+        if self.store is not None:
+            stats["disk"] = self.store.stats()
+        return stats
+
+    def _store_set(self, full_key: str, value: Any, ttl: float) -> None:
+        if self.store is None:
+            return
+        try:
+            self.store.set(full_key, value, ttl, compress=self.compress)
+        except (TypeError, ValueError, sqlite3.Error) as e:
+            logger.debug(f"Valeur conservée en mémoire uniquement ({full_key}): {e}")
+
+    async def _redis_get(self, full_key: str) -> Optional[Tuple[Any, float]]:
+        try:
+            blob = await self.redis.get(full_key)
+            if blob is None:
+                return None
+            entry = decode_value(blob)
+            return entry["v"], entry["e"]
+        except Exception as e:
+            logger.warning(f"Erreur lors de la lecture du cache Redis: {e}")
+            return None
+
+    async def _redis_set(self, full_key: str, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        try:
+            blob = encode_value({"v": value, "e": self._clock() + ttl}, self.compress)
+            await self.redis.set(full_key, blob, ex=max(1, math.ceil(ttl)))
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Valeur non enregistrée dans Redis ({full_key}): {e}")
+        except Exception as e:
+            logger.warning(f"Erreur lors de l'écriture dans le cache Redis: {e}")
+
+
+_caches: Dict[Tuple[str, Optional[str]], TieredCache] = {}
+_caches_lock = threading.Lock()
+_redis_client: Optional[Any] = None
+
+
+def _get_redis_client() -> Optional[Any]:
+    """Retourne le client Redis partagé, si ``redis_url`` est configuré."""
+    global _redis_client
+    if not settings.redis_url:
+        return None
+    if not REDIS_AVAILABLE:
+        logger.warning("Le module redis n'est pas installé. Le cache distribué ne sera pas disponible.")
+        return None
+    if _redis_client is None:
+        _redis_client = redis.from_url(settings.redis_url)
+    return _redis_client
+
+
+def get_cache(
+    namespace: str,
+    ttl: Optional[float] = None,
+    path: Optional[Union[str, Path]] = None,
+    persistent: bool = True,
+    compress: bool = True
+) -> TieredCache:
+    """Retourne le cache partagé par le processus pour un espace de noms (créé à la demande).
+
+    Args:
+        namespace: Espace de noms (ex: "api")
+        ttl: Durée de vie par défaut (par défaut : ``cache_ttls[namespace]``, sinon ``cache_ttl``)
+        path: Fichier du niveau disque (par défaut : ``cache_dir/cache.sqlite``)
+        persistent: Si False, le cache n'a ni niveau disque ni niveau Redis
+        compress: Si True, compresse les grandes valeurs des niveaux disque et Redis
+
+    Les paramètres ne s'appliquent qu'à la création du cache de l'espace de noms.
+    """
+    store_path = None
+    if persistent and settings.cache_enabled and (path or settings.cache_dir):
+        store_path = str(Path(path) if path else Path(settings.cache_dir) / CACHE_FILE_NAME)
+
+    with _caches_lock:
+        cache = _caches.get((namespace, store_path))
+        if cache is None:
+            cache = TieredCache(
+                namespace,
+                ttl=ttl if ttl is not None else settings.cache_ttls.get(namespace, settings.cache_ttl),
+                memory_entries=settings.cache_memory_entries,
+                store=get_kv_store(store_path, max_bytes=settings.cache_max_bytes) if store_path else None,
+                redis_client=_get_redis_client() if persistent else None,
+                compress=compress
+            )
+            _caches[(namespace, store_path)] = cache
+        return cache
@@ -12,6 +12,9 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = "development"
     DEBUG: bool = False
     
+    # Fichier binaire du catalogue de jeu partagé par les workers (voir app.services.catalog_file)
+    CATALOG_FILE: Optional[str] = None
+    
     # Configuration CORS
     FRONTEND_URL: str = "http://localhost:3000"
     ALLOWED_ORIGINS: List[str] = Field(default=["http://localhost:3000", "http://localhost:8000"])
@@ -5,12 +5,14 @@ des timeouts et d'autres optimisations de performance.
 """
 import os
 import logging
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
 
 from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import Pool, QueuePool
 
 from .config import settings
 
@@ -41,16 +43,19 @@ if "sqlite" in settings.DATABASE_URL:
     
     # SQLite n'utilise pas de pool de connexions
     engine_config["connect_args"] = connect_args
+    pool_config = {}
 else:
     # Configuration du pool de connexions pour les autres bases de données (PostgreSQL, etc.)
-    engine_config.update({
+    # (partagée par les moteurs synchrone et asynchrone)
+    pool_config = {
         "pool_size": 5,  # Taille du pool de connexions
         "max_overflow": 10,  # Connexions supplémentaires autorisées
         "pool_timeout": 30,  # Délai d'attente pour obtenir une connexion (secondes)
         "pool_recycle": 3600,  # Recycle les connexions après 1 heure
         "pool_pre_ping": True,  # Vérifie que la connexion est toujours active
-        "connect_args": connect_args
-    })
+    }
+    engine_config.update(pool_config)
+    engine_config["connect_args"] = connect_args
 
 # Création du moteur avec la configuration appropriée
 engine = create_engine(**engine_config)
@@ -63,6 +68,114 @@ SessionLocal = sessionmaker(
     expire_on_commit=True,  # Les objets sont expirés après commit
 )
 
+# Pilotes asynchrones par pilote synchrone
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url(url: str = settings.DATABASE_URL) -> str:
+    """Convertit l'URL de la base vers le pilote asynchrone correspondant.
+    
+    Args:
+        url: URL SQLAlchemy synchrone (ex: 'postgresql://...')
+        
+    Returns:
+        L'URL avec le pilote asynchrone (ex: 'postgresql+asyncpg://...')
+    """
+    scheme, separator, rest = url.partition("://")
+    if not separator:
+        return url
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+_async_engine: Optional[AsyncEngine] = None
+_async_sessionmaker: Optional[async_sessionmaker] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Retourne le moteur asynchrone, créé à la première utilisation.
+    
+    Il utilise la même configuration de pool que le moteur synchrone ; le pilote
+    asynchrone (aiosqlite ou asyncpg) n'est importé qu'à ce moment.
+    """
+    global _async_engine
+    if _async_engine is None:
+        async_connect_args = {
+            key: value for key, value in connect_args.items() if key != "check_same_thread"
+        }
+        _async_engine = create_async_engine(
+            get_async_database_url(),
+            echo=settings.DEBUG,
+            connect_args=async_connect_args,
+            **pool_config
+        )
+        logger.info(f"Moteur asynchrone créé ({_async_engine.dialect.driver})")
+    return _async_engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    """Retourne la fabrique de sessions asynchrones.
+    
+    Les objets ne sont pas expirés après commit : un accès paresseux à un attribut
+    expiré déclencherait une requête implicite, interdite en asynchrone.
+    """
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        _async_sessionmaker = async_sessionmaker(
+            bind=get_async_engine(),
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_sessionmaker
+
+
+async def dispose_async_engine() -> None:
+    """Ferme les connexions du moteur asynchrone (à l'arrêt de l'application)."""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_sessionmaker = None
+
+
+def get_pool_status(pool: Pool) -> Dict[str, Any]:
+    """Retourne l'utilisation d'un pool de connexions.
+    
+    Args:
+        pool: Pool SQLAlchemy (``engine.pool`` ou ``async_engine.sync_engine.pool``)
+        
+    Returns:
+        Un dictionnaire avec la classe du pool et, pour les pools bornés, les
+        connexions ouvertes, disponibles, utilisées et le taux d'utilisation
+    """
+    status: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        capacity = pool.size() + pool._max_overflow
+        checked_out = pool.checkedout()
+        status.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_in": pool.checkedin(),
+            "checked_out": checked_out,
+            "overflow": max(pool.overflow(), 0),
+            "utilization": checked_out / capacity if capacity > 0 else 0.0,
+        })
+    return status
+
+
+def get_pools_status() -> Dict[str, Any]:
+    """Retourne l'utilisation des pools synchrone et asynchrone."""
+    return {
+        "sync": get_pool_status(engine.pool),
+        "async": get_pool_status(_async_engine.sync_engine.pool) if _async_engine is not None else None,
+    }
+
+
 # Importer Base depuis le module de base des modèles
 from app.models.base import Base
 
@@ -154,6 +267,18 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Fournit une session asynchrone pour les dépendances FastAPI.
+    
+    Utilisation:
+        @app.get("/skills/{skill_id}")
+        async def read_skill(skill_id: int, db: AsyncSession = Depends(get_async_db)):
+            return await repository.get_skill(db, skill_id)
+    """
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
 # Configuration spécifique pour SQLite pour améliorer les performances
 if "sqlite" in settings.DATABASE_URL:
     @event.listens_for(Engine, "connect")
@@ -165,3 +290,13 @@ if "sqlite" in settings.DATABASE_URL:
         cursor.execute("PRAGMA synchronous=NORMAL")  # Meilleur compromis perf/fiabilité
         cursor.execute("PRAGMA cache_size=-2000")  # Taille du cache en nombre de pages (env. 2MB)
         cursor.close()
+        # Le pilote ouvre sinon la transaction lui-même, seulement avant une écriture :
+        # un SAVEPOINT émis en premier ouvrirait alors la transaction, et son RELEASE
+        # la validerait. Les transactions sont ouvertes par ``sqlite_begin``.
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(Engine, "begin")
+    def sqlite_begin(connection):
+        """Ouvre explicitement la transaction SQLite (points de sauvegarde imbriqués)."""
+        if connection.dialect.name == "sqlite":
+            connection.exec_driver_sql("BEGIN")
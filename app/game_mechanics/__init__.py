@@ -8,7 +8,10 @@ from .constants import (
     BuffType, ConditionType, BoonType, RoleType, GameMode,
     AttributeType, DamageType, ComboFieldType, ComboFinisherType, SkillCategory
 )
-from .interactions import InteractionEffect, InteractionAnalyzer, ComboAnalyzer
+from .interactions import (
+    InteractionEffect, InteractionAnalyzer, ComboAnalyzer, EffectIndex, effects_from_facts, COMBO_TABLE
+)
+from .rotation import RotationSimulator, RotationResult, SkillProfile, compile_skill
 
 __all__ = [
     # Constantes
@@ -16,5 +19,9 @@ __all__ = [
     'AttributeType', 'DamageType', 'ComboFieldType', 'ComboFinisherType', 'SkillCategory',
     
     # Classes principales
-    'InteractionEffect', 'InteractionAnalyzer', 'ComboAnalyzer',
+    'InteractionEffect', 'InteractionAnalyzer', 'ComboAnalyzer', 'EffectIndex', 'effects_from_facts',
+    'COMBO_TABLE',
+    
+    # Simulation
+    'RotationSimulator', 'RotationResult', 'SkillProfile', 'compile_skill',
 ]
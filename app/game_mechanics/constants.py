@@ -58,6 +58,7 @@ class ConditionType(Enum):
     WEAKNESS = "Weakness"
     VULNERABILITY = "Vulnerability"
     STUN = "Stun"
+    DAZE = "Daze"
     DIZZY = "Dizzy"
     KNOCKDOWN = "Knockdown"
 
@@ -1,15 +1,30 @@
 """Gestion des interactions entre les compétences, traits et mécaniques de jeu GW2."""
 
-from typing import Dict, List, Optional, Set, Tuple, Union
+import copy
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 from enum import Enum
 import math
 
+import numpy as np
+
 from .constants import (
     BuffType, ConditionType, BoonType, RoleType, GameMode, 
     AttributeType, DamageType, ComboFieldType, ComboFinisherType, SkillCategory
 )
 from app.models import Skill, Trait, Weapon, Armor, Trinket, UpgradeComponent
 
+logger = logging.getLogger(__name__)
+
+# Faits purement descriptifs (portée, rayon, etc.) qui ne sont pas des effets
+DESCRIPTIVE_FACT_TYPES = frozenset({'Recharge', 'Range', 'Radius', 'Distance', 'Time', 'NoData'})
+
+_BOONS_BY_NAME = {boon.value: boon for boon in BoonType}
+_CONDITIONS_BY_NAME = {condition.value: condition for condition in ConditionType}
+_COMBO_FIELDS_BY_NAME = {field.value: field for field in ComboFieldType}
+_COMBO_FINISHERS_BY_NAME = {finisher.value: finisher for finisher in ComboFinisherType}
+
 class InteractionEffect:
     """Représente un effet d'interaction entre des compétences, traits ou équipements."""
     
@@ -76,11 +91,271 @@ class InteractionEffect:
             description=data.get('description')
         )
 
+def _snake_case(name: str) -> str:
+    return ''.join(f"_{c.lower()}" if c.isupper() and i else c.lower() for i, c in enumerate(name))
+
+def effects_from_facts(
+    source_type: str,
+    source_id: int,
+    facts: Optional[Iterable[dict]],
+    traited: bool = False
+) -> List[InteractionEffect]:
+    """Convertit des faits de l'API GW2 en effets d'interaction typés.
+    
+    Args:
+        source_type: Type de la source ('skill', 'trait', etc.)
+        source_id: Identifiant de la source
+        facts: Faits bruts (``facts`` ou ``traited_facts``)
+        traited: Indique s'il s'agit de faits conditionnés par un trait ; le trait
+            requis est alors reporté dans ``conditions``
+        
+    Returns:
+        La liste des effets, dans l'ordre des faits
+    """
+    effects: List[InteractionEffect] = []
+    for fact in facts or ():
+        fact_type = fact.get('type')
+        if not fact_type or fact_type in DESCRIPTIVE_FACT_TYPES:
+            continue
+        
+        conditions = []
+        if traited and fact.get('requires_trait') is not None:
+            conditions.append({'requires_trait': fact['requires_trait'], 'overrides': fact.get('overrides')})
+        
+        common = dict(
+            source_type=source_type,
+            source_id=source_id,
+            conditions=conditions,
+            description=fact.get('text'),
+        )
+        
+        if fact_type in ('Buff', 'PrefixedBuff'):
+            status = fact.get('status')
+            stacks = fact.get('apply_count', 1)
+            duration = fact.get('duration')
+            if status in _BOONS_BY_NAME:
+                effects.append(InteractionEffect(
+                    effect_type='apply_boon', effect_value=_BOONS_BY_NAME[status],
+                    target='ally', duration=duration, stacks=stacks, **common
+                ))
+            elif status in _CONDITIONS_BY_NAME:
+                effects.append(InteractionEffect(
+                    effect_type='apply_condition', effect_value=_CONDITIONS_BY_NAME[status],
+                    target='enemy', duration=duration, stacks=stacks, **common
+                ))
+            else:
+                effects.append(InteractionEffect(
+                    effect_type='apply_buff', effect_value=status or '',
+                    duration=duration, stacks=stacks, **common
+                ))
+        elif fact_type == 'ComboField':
+            field = _COMBO_FIELDS_BY_NAME.get(fact.get('field_type'))
+            if field is not None:
+                effects.append(InteractionEffect(
+                    effect_type='combo_field', effect_value=field.value,
+                    target='area', combo_field=field, **common
+                ))
+        elif fact_type == 'ComboFinisher':
+            finisher = _COMBO_FINISHERS_BY_NAME.get(fact.get('finisher_type'))
+            if finisher is not None:
+                effects.append(InteractionEffect(
+                    effect_type='combo_finisher', effect_value=fact.get('percent', 100),
+                    target='combo', combo_finisher=finisher, **common
+                ))
+        elif fact_type == 'Damage':
+            effects.append(InteractionEffect(
+                effect_type='damage', effect_value=fact.get('dmg_multiplier', 0),
+                target='enemy', stacks=fact.get('hit_count', 1), **common
+            ))
+        elif fact_type == 'AttributeAdjust':
+            effects.append(InteractionEffect(
+                effect_type='attribute_adjust',
+                effect_value={'target': fact.get('target'), 'value': fact.get('value')},
+                **common
+            ))
+        else:
+            effects.append(InteractionEffect(
+                effect_type=_snake_case(fact_type),
+                effect_value=fact.get('value', fact.get('percent', fact.get('duration', ''))),
+                duration=fact.get('duration'),
+                **common
+            ))
+    return effects
+
+class EffectIndex:
+    """Index précalculé des effets des compétences et des traits.
+    
+    Tous les faits (``facts`` et ``traited_facts``) sont analysés une seule fois au
+    chargement du catalogue. Des index inversés par type d'effet, buff, condition,
+    champ et finisseur de combo transforment les requêtes du type « quelles
+    compétences donnent de la stabilité ? » en simples accès à des dictionnaires.
+    
+    Exemple d'utilisation:
+        ```python
+        index = EffectIndex.from_session(session)
+        stability_skills = index.sources_with_boon(BoonType.STABILITY)
+        blast_skills = index.sources_with_combo_finisher(ComboFinisherType.BLAST)
+        ```
+    """
+    
+    def __init__(self):
+        self.by_source: Dict[Tuple[str, int], List[InteractionEffect]] = {}
+        self.by_effect_type: Dict[str, List[InteractionEffect]] = defaultdict(list)
+        self.by_boon: Dict[BoonType, List[InteractionEffect]] = defaultdict(list)
+        self.by_condition: Dict[ConditionType, List[InteractionEffect]] = defaultdict(list)
+        self.by_combo_field: Dict[ComboFieldType, List[InteractionEffect]] = defaultdict(list)
+        self.by_combo_finisher: Dict[ComboFinisherType, List[InteractionEffect]] = defaultdict(list)
+    
+    def __len__(self) -> int:
+        return sum(len(effects) for effects in self.by_source.values())
+    
+    def __contains__(self, key: Tuple[str, int]) -> bool:
+        return key in self.by_source
+    
+    @classmethod
+    def build(cls, skills: Iterable[Any] = (), traits: Iterable[Any] = ()) -> 'EffectIndex':
+        """Construit l'index à partir de compétences et de traits."""
+        index = cls()
+        for skill in skills:
+            index.add_skill(skill)
+        for trait in traits:
+            index.add_trait(trait)
+        return index
+    
+    @classmethod
+    def from_session(cls, session) -> 'EffectIndex':
+        """Construit l'index à partir de toutes les compétences et traits en base.
+        
+        Seules les colonnes utiles sont chargées, sans les relations.
+        """
+        from sqlalchemy.orm import load_only, noload
+        
+        skills = session.query(Skill).options(
+            load_only(Skill.id, Skill.facts, Skill.traited_facts, Skill.combo_field, Skill.combo_finisher),
+            noload('*')
+        ).all()
+        traits = session.query(Trait).options(
+            load_only(Trait.id, Trait.facts, Trait.traited_facts),
+            noload('*')
+        ).all()
+        index = cls.build(skills, traits)
+        logger.info(
+            f"Index des effets construit: {len(index)} effets pour "
+            f"{len(skills)} compétences et {len(traits)} traits"
+        )
+        return index
+    
+    def add_skill(self, skill: Any) -> List[InteractionEffect]:
+        """Indexe les effets d'une compétence (faits, faits conditionnés et combos)."""
+        effects = effects_from_facts('skill', skill.id, getattr(skill, 'facts', None))
+        effects.extend(effects_from_facts('skill', skill.id, getattr(skill, 'traited_facts', None), traited=True))
+        
+        # Les colonnes de combo complètent les faits lorsqu'ils ne les décrivent pas
+        field = _COMBO_FIELDS_BY_NAME.get(getattr(skill, 'combo_field', None))
+        if field is not None and not any(e.combo_field == field for e in effects):
+            effects.append(InteractionEffect(
+                'skill', skill.id, 'combo_field', field.value, target='area', combo_field=field
+            ))
+        finisher = _COMBO_FINISHERS_BY_NAME.get(getattr(skill, 'combo_finisher', None))
+        if finisher is not None and not any(e.combo_finisher == finisher for e in effects):
+            effects.append(InteractionEffect(
+                'skill', skill.id, 'combo_finisher', 100, target='combo', combo_finisher=finisher
+            ))
+        
+        self._add('skill', skill.id, effects)
+        return effects
+    
+    def add_trait(self, trait: Any) -> List[InteractionEffect]:
+        """Indexe les effets d'un trait."""
+        effects = effects_from_facts('trait', trait.id, getattr(trait, 'facts', None))
+        effects.extend(effects_from_facts('trait', trait.id, getattr(trait, 'traited_facts', None), traited=True))
+        self._add('trait', trait.id, effects)
+        return effects
+    
+    def add_effect(self, effect: InteractionEffect) -> None:
+        """Ajoute un effet isolé à l'index."""
+        self.by_source.setdefault((effect.source_type, effect.source_id), []).append(effect)
+        self._index(effect)
+    
+    def _add(self, source_type: str, source_id: int, effects: List[InteractionEffect]) -> None:
+        if (source_type, source_id) in self.by_source:
+            self.remove(source_type, source_id)
+        self.by_source[(source_type, source_id)] = effects
+        for effect in effects:
+            self._index(effect)
+    
+    def _index(self, effect: InteractionEffect) -> None:
+        self.by_effect_type[effect.effect_type].append(effect)
+        if effect.effect_type == 'apply_boon':
+            self.by_boon[effect.effect_value].append(effect)
+        elif effect.effect_type == 'apply_condition':
+            self.by_condition[effect.effect_value].append(effect)
+        if effect.combo_field is not None:
+            self.by_combo_field[effect.combo_field].append(effect)
+        if effect.combo_finisher is not None:
+            self.by_combo_finisher[effect.combo_finisher].append(effect)
+    
+    def remove(self, source_type: str, source_id: int) -> None:
+        """Retire tous les effets d'une source de l'index."""
+        effects = self.by_source.pop((source_type, source_id), None)
+        if not effects:
+            return
+        removed = {id(effect) for effect in effects}
+        for mapping in (self.by_effect_type, self.by_boon, self.by_condition,
+                        self.by_combo_field, self.by_combo_finisher):
+            for key in list(mapping):
+                mapping[key] = [e for e in mapping[key] if id(e) not in removed]
+                if not mapping[key]:
+                    del mapping[key]
+    
+    def effects_for(self, source_type: str, source_id: int) -> List[InteractionEffect]:
+        """Retourne les effets d'une source (liste vide si elle n'est pas indexée)."""
+        return self.by_source.get((source_type, source_id), [])
+    
+    @staticmethod
+    def _source_ids(effects: Iterable[InteractionEffect], source_type: Optional[str]) -> Set[int]:
+        return {e.source_id for e in effects if source_type is None or e.source_type == source_type}
+    
+    def sources_with_effect_type(self, effect_type: str, source_type: Optional[str] = 'skill') -> Set[int]:
+        """Identifiants des sources ayant un effet du type donné."""
+        return self._source_ids(self.by_effect_type.get(effect_type, ()), source_type)
+    
+    def sources_with_boon(self, boon: BoonType, source_type: Optional[str] = 'skill') -> Set[int]:
+        """Identifiants des sources qui appliquent un buff."""
+        return self._source_ids(self.by_boon.get(boon, ()), source_type)
+    
+    def sources_with_condition(self, condition: ConditionType, source_type: Optional[str] = 'skill') -> Set[int]:
+        """Identifiants des sources qui appliquent une condition."""
+        return self._source_ids(self.by_condition.get(condition, ()), source_type)
+    
+    def sources_with_combo_field(self, field: ComboFieldType, source_type: Optional[str] = 'skill') -> Set[int]:
+        """Identifiants des sources qui posent un champ de combo."""
+        return self._source_ids(self.by_combo_field.get(field, ()), source_type)
+    
+    def sources_with_combo_finisher(
+        self, finisher: ComboFinisherType, source_type: Optional[str] = 'skill'
+    ) -> Set[int]:
+        """Identifiants des sources qui déclenchent un finisseur de combo."""
+        return self._source_ids(self.by_combo_finisher.get(finisher, ()), source_type)
+
 class InteractionAnalyzer:
     """Analyse les interactions entre les compétences, traits et équipements."""
     
-    def __init__(self, game_mode: GameMode = GameMode.PVE):
+    def __init__(self, game_mode: GameMode = GameMode.PVE, effect_index: Optional[EffectIndex] = None):
+        """Initialise l'analyseur.
+        
+        Args:
+            game_mode: Mode de jeu pour lequel analyser les interactions
+            effect_index: Index précalculé des effets du catalogue. Par défaut,
+                celui de l'instantané courant du catalogue ; à défaut, il est
+                construit à la demande, compétence par compétence
+        """
         self.game_mode = game_mode
+        if effect_index is None:
+            from app.services.catalog import get_catalog
+            catalog = get_catalog()
+            effect_index = catalog.effect_index if catalog is not None else EffectIndex()
+        self.effect_index = effect_index
         self.effects_cache: Dict[Tuple[str, int], List[InteractionEffect]] = {}
     
     def add_effect(self, effect: InteractionEffect) -> None:
@@ -92,11 +367,11 @@ class InteractionAnalyzer:
     
     def get_effects_for_skill(self, skill_id: int) -> List[InteractionEffect]:
         """Récupère tous les effets liés à une compétence."""
-        return self.effects_cache.get(('skill', skill_id), [])
+        return self.effect_index.effects_for('skill', skill_id) + self.effects_cache.get(('skill', skill_id), [])
     
     def get_effects_for_trait(self, trait_id: int) -> List[InteractionEffect]:
         """Récupère tous les effets liés à un trait."""
-        return self.effects_cache.get(('trait', trait_id), [])
+        return self.effect_index.effects_for('trait', trait_id) + self.effects_cache.get(('trait', trait_id), [])
     
     def get_effects_for_item(self, item_type: str, item_id: int) -> List[InteractionEffect]:
         """Récupère tous les effets liés à un objet (arme, armure, etc.)."""
@@ -148,16 +423,22 @@ class InteractionAnalyzer:
         return effects
     
     def _extract_skill_effects(self, skill: Skill) -> List[InteractionEffect]:
-        """Extrait les effets d'une compétence."""
-        # TODO: Implémenter l'extraction des effets à partir des données de la compétence
-        # Cela nécessitera d'analyser les champs 'facts' et 'traited_facts' de l'API GW2
-        return []
+        """Extrait les effets de base d'une compétence (hors faits conditionnés par un trait)."""
+        if ('skill', skill.id) not in self.effect_index:
+            self.effect_index.add_skill(skill)
+        return [e for e in self.effect_index.effects_for('skill', skill.id) if not e.conditions]
     
     def _get_trait_effects_on_skill(self, trait: Trait, skill: Skill) -> List[InteractionEffect]:
-        """Récupère les effets d'un trait sur une compétence spécifique."""
-        # TODO: Implémenter la logique pour déterminer comment un trait affecte une compétence
-        # Cela nécessitera d'analyser les effets du trait et de les appliquer à la compétence
-        return []
+        """Récupère les effets d'un trait sur une compétence spécifique.
+        
+        Il s'agit des faits conditionnés de la compétence qui requièrent ce trait.
+        """
+        if ('skill', skill.id) not in self.effect_index:
+            self.effect_index.add_skill(skill)
+        return [
+            e for e in self.effect_index.effects_for('skill', skill.id)
+            if any(c.get('requires_trait') == trait.id for c in e.conditions)
+        ]
     
     def _get_weapon_effects_on_skill(self, weapon: Weapon, skill: Skill) -> List[InteractionEffect]:
         """Récupère les effets d'une arme sur une compétence spécifique."""
@@ -190,12 +471,14 @@ class InteractionAnalyzer:
                     if effect.effect_value in [
                         ConditionType.STUN, 
                         ConditionType.DAZE, 
+                        ConditionType.DIZZY, 
                         ConditionType.KNOCKDOWN,
                         ConditionType.FEAR,
                         ConditionType.TAUNT
                     ]:
-                        # Réduire la durée de 50% en PvP/WvW
-                        modified_effect = effect
+                        # Réduire la durée de 50% en PvP/WvW (sur une copie : les
+                        # effets proviennent de l'index partagé)
+                        modified_effect = copy.copy(effect)
                         modified_effect.duration = effect.duration * 0.5
                         modified_effects.append(modified_effect)
                         continue
@@ -206,18 +489,66 @@ class InteractionAnalyzer:
         
         return effects
 
+# Table complète des combos champ × finisseur. ``value`` est un poids relatif (0-1)
+# de l'intérêt du combo pour un groupe, utilisé pour le score de potentiel de combo.
+COMBO_TABLE: Dict[Tuple[ComboFieldType, ComboFinisherType], dict] = {
+    (ComboFieldType.FIRE, ComboFinisherType.BLAST): {'effect': 'Might (3x)', 'boon': BoonType.MIGHT, 'value': 1.0},
+    (ComboFieldType.FIRE, ComboFinisherType.LEAP): {'effect': 'Fire Aura', 'value': 0.4},
+    (ComboFieldType.FIRE, ComboFinisherType.PROJECTILE): {'effect': 'Burning', 'condition': ConditionType.BURNING, 'value': 0.5},
+    (ComboFieldType.FIRE, ComboFinisherType.WHIRL): {'effect': 'Burning Bolts', 'condition': ConditionType.BURNING, 'value': 0.4},
+    (ComboFieldType.ICE, ComboFinisherType.BLAST): {'effect': 'Frost Aura', 'value': 0.5},
+    (ComboFieldType.ICE, ComboFinisherType.LEAP): {'effect': 'Frost Aura', 'value': 0.3},
+    (ComboFieldType.ICE, ComboFinisherType.PROJECTILE): {'effect': 'Chilled', 'condition': ConditionType.CHILLED, 'value': 0.3},
+    (ComboFieldType.ICE, ComboFinisherType.WHIRL): {'effect': 'Chilling Bolts', 'condition': ConditionType.CHILLED, 'value': 0.3},
+    (ComboFieldType.LIGHTNING, ComboFinisherType.BLAST): {'effect': 'Swiftness', 'boon': BoonType.SWIFTNESS, 'value': 0.3},
+    (ComboFieldType.LIGHTNING, ComboFinisherType.LEAP): {'effect': 'Shocking Aura', 'value': 0.3},
+    (ComboFieldType.LIGHTNING, ComboFinisherType.PROJECTILE): {'effect': 'Vulnerability', 'condition': ConditionType.VULNERABILITY, 'value': 0.4},
+    (ComboFieldType.LIGHTNING, ComboFinisherType.WHIRL): {'effect': 'Electric Bolts', 'condition': ConditionType.VULNERABILITY, 'value': 0.3},
+    (ComboFieldType.POISON, ComboFinisherType.BLAST): {'effect': 'Weakness', 'condition': ConditionType.WEAKNESS, 'value': 0.4},
+    (ComboFieldType.POISON, ComboFinisherType.LEAP): {'effect': 'Weakness', 'condition': ConditionType.WEAKNESS, 'value': 0.3},
+    (ComboFieldType.POISON, ComboFinisherType.PROJECTILE): {'effect': 'Poison', 'condition': ConditionType.POISON, 'value': 0.3},
+    (ComboFieldType.POISON, ComboFinisherType.WHIRL): {'effect': 'Poison Bolts', 'condition': ConditionType.POISON, 'value': 0.3},
+    (ComboFieldType.LIGHT, ComboFinisherType.BLAST): {'effect': 'Resolution', 'boon': BoonType.RESOLUTION, 'value': 0.6},
+    (ComboFieldType.LIGHT, ComboFinisherType.LEAP): {'effect': 'Light Aura', 'value': 0.4},
+    (ComboFieldType.LIGHT, ComboFinisherType.PROJECTILE): {'effect': 'Condition Removal', 'value': 0.4},
+    (ComboFieldType.LIGHT, ComboFinisherType.WHIRL): {'effect': 'Cleansing Bolts', 'value': 0.4},
+    (ComboFieldType.DARK, ComboFinisherType.BLAST): {'effect': 'Blindness', 'condition': ConditionType.BLIND, 'value': 0.4},
+    (ComboFieldType.DARK, ComboFinisherType.LEAP): {'effect': 'Dark Aura', 'value': 0.3},
+    (ComboFieldType.DARK, ComboFinisherType.PROJECTILE): {'effect': 'Life Stealing', 'value': 0.3},
+    (ComboFieldType.DARK, ComboFinisherType.WHIRL): {'effect': 'Leeching Bolts', 'value': 0.3},
+    (ComboFieldType.ETHEREAL, ComboFinisherType.BLAST): {'effect': 'Chaos Armor', 'value': 0.3},
+    (ComboFieldType.ETHEREAL, ComboFinisherType.LEAP): {'effect': 'Chaos Aura', 'value': 0.3},
+    (ComboFieldType.ETHEREAL, ComboFinisherType.PROJECTILE): {'effect': 'Confusion', 'condition': ConditionType.CONFUSION, 'value': 0.3},
+    (ComboFieldType.ETHEREAL, ComboFinisherType.WHIRL): {'effect': 'Confounding Bolts', 'condition': ConditionType.CONFUSION, 'value': 0.3},
+    (ComboFieldType.SMOKE, ComboFinisherType.BLAST): {'effect': 'Stealth', 'value': 0.7},
+    (ComboFieldType.SMOKE, ComboFinisherType.LEAP): {'effect': 'Stealth', 'value': 0.4},
+    (ComboFieldType.SMOKE, ComboFinisherType.PROJECTILE): {'effect': 'Blindness', 'condition': ConditionType.BLIND, 'value': 0.3},
+    (ComboFieldType.SMOKE, ComboFinisherType.WHIRL): {'effect': 'Blinding Bolts', 'condition': ConditionType.BLIND, 'value': 0.3},
+    (ComboFieldType.WATER, ComboFinisherType.BLAST): {'effect': 'Area Heal', 'value': 0.9},
+    (ComboFieldType.WATER, ComboFinisherType.LEAP): {'effect': 'Healing', 'value': 0.5},
+    (ComboFieldType.WATER, ComboFinisherType.PROJECTILE): {'effect': 'Regeneration', 'boon': BoonType.REGENERATION, 'value': 0.4},
+    (ComboFieldType.WATER, ComboFinisherType.WHIRL): {'effect': 'Healing Bolts', 'value': 0.5},
+}
+
+# Ordre des axes de la matrice dense des combos
+COMBO_FIELDS: Tuple[ComboFieldType, ...] = tuple(ComboFieldType)
+COMBO_FINISHERS: Tuple[ComboFinisherType, ...] = tuple(ComboFinisherType)
+FIELD_INDEX: Dict[ComboFieldType, int] = {field: i for i, field in enumerate(COMBO_FIELDS)}
+FINISHER_INDEX: Dict[ComboFinisherType, int] = {finisher: i for i, finisher in enumerate(COMBO_FINISHERS)}
+
+# Matrice (champs × finisseurs) des poids des combos
+COMBO_VALUES = np.zeros((len(COMBO_FIELDS), len(COMBO_FINISHERS)))
+for (_field, _finisher), _combo in COMBO_TABLE.items():
+    COMBO_VALUES[FIELD_INDEX[_field], FINISHER_INDEX[_finisher]] = _combo['value']
+COMBO_VALUES.setflags(write=False)
+
 class ComboAnalyzer:
     """Analyse les interactions de combo dans GW2."""
     
     def __init__(self):
-        self.combo_fields: Dict[ComboFieldType, List[dict]] = {
-            ComboFieldType.FIRE: [
-                {'finisher': ComboFinisherType.BLAST, 'effect': 'Might (3x)'},
-                {'finisher': ComboFinisherType.LEAP, 'effect': 'Fire Aura'},
-                {'finisher': ComboFinisherType.PROJECTILE, 'effect': 'Burning'},
-            ],
-            # TODO: Ajouter d'autres types de champs de combo
-        }
+        self.combo_fields: Dict[ComboFieldType, List[dict]] = {field: [] for field in COMBO_FIELDS}
+        for (field, finisher), combo in COMBO_TABLE.items():
+            self.combo_fields[field].append({'finisher': finisher, **combo})
     
     def get_combo_effect(
         self, 
@@ -225,8 +556,7 @@ class ComboAnalyzer:
         finisher_type: ComboFinisherType
     ) -> Optional[dict]:
         """Récupère l'effet d'un combo champ-finisseur."""
-        field_effects = self.combo_fields.get(field_type, [])
-        for effect in field_effects:
-            if effect['finisher'] == finisher_type:
-                return effect
-        return None
+        combo = COMBO_TABLE.get((field_type, finisher_type))
+        if combo is None:
+            return None
+        return {'finisher': finisher_type, **combo}
@@ -0,0 +1,445 @@
+"""Simulation de rotation à événements discrets pour l'estimation des dégâts.
+
+Le simulateur rejoue les lancements de compétences d'un build à partir de leurs
+faits (``Skill.facts``) sur une fenêtre de combat fixe, en suivant les piles de
+conditions, de puissance (might) et la fureur (fury). Les événements (fin
+d'incantation, tic de conditions, expiration de piles) sont traités dans l'ordre
+chronologique via un tas binaire, ce qui permet de simuler plusieurs centaines
+de builds par seconde.
+
+Exemple d'utilisation:
+    ```python
+    simulator = RotationSimulator(fight_duration=60.0)
+    result = simulator.simulate(skills, attributes={AttributeType.POWER: 2500})
+    print(result.dps, result.condition_dps, result.might_average)
+    ```
+"""
+
+import heapq
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.models.skill_facts import SkillFactStore, get_skill_fact_store
+from .constants import AttributeType, BoonType, ConditionType
+
+# Temps d'incantation par défaut lorsqu'aucun fait ne le précise (secondes)
+DEFAULT_CAST_TIME = 0.75
+
+# Armure de la cible de référence (golem d'entraînement standard)
+DEFAULT_TARGET_ARMOR = 2597.0
+
+# Force d'arme moyenne utilisée pour les coups directs
+DEFAULT_WEAPON_STRENGTH = 1000.0
+
+# Bonus par pile de puissance (might)
+MIGHT_MAX_STACKS = 25
+MIGHT_POWER_PER_STACK = 30
+MIGHT_CONDITION_DAMAGE_PER_STACK = 30
+
+# Chance de coup critique conférée par la fureur (PvE)
+FURY_CRITICAL_CHANCE = 0.25
+
+# Dégâts par pile et par seconde au niveau 80 : (base, coefficient de Condition Damage)
+CONDITION_TICK_DAMAGE: Dict[ConditionType, Tuple[float, float]] = {
+    ConditionType.BLEEDING: (22.0, 0.06),
+    ConditionType.BURNING: (131.0, 0.155),
+    ConditionType.POISON: (33.5, 0.06),
+    ConditionType.TORMENT: (31.8, 0.09),
+    ConditionType.CONFUSION: (11.0, 0.03),
+}
+
+# Textes des faits de type 'Time' décrivant un temps d'incantation
+_CAST_TIME_TEXTS = {"activation", "casting time", "cast time"}
+
+# Types d'événements, triés par priorité à temps égal
+_CAST_END = 0
+_EXPIRE_CONDITION = 1
+_TICK = 2
+
+_CONDITIONS_BY_NAME = {condition.value: condition for condition in CONDITION_TICK_DAMAGE}
+
+
+@dataclass(frozen=True)
+class SkillProfile:
+    """Représentation compilée d'une compétence, prête pour la simulation."""
+    skill_id: Any
+    cast_time: float
+    recharge: float
+    damage_coefficient: float = 0.0
+    conditions: Tuple[Tuple[ConditionType, int, float], ...] = ()
+    might_stacks: int = 0
+    might_duration: float = 0.0
+    fury_duration: float = 0.0
+
+    @property
+    def has_effect(self) -> bool:
+        """Indique si la compétence a un intérêt pour la simulation."""
+        return bool(
+            self.damage_coefficient or self.conditions
+            or (self.might_stacks and self.might_duration) or self.fury_duration
+        )
+
+
+@dataclass
+class RotationResult:
+    """Résultat d'une simulation de rotation."""
+    duration: float
+    direct_damage: float = 0.0
+    condition_damage: Dict[ConditionType, float] = field(default_factory=dict)
+    average_condition_stacks: Dict[ConditionType, float] = field(default_factory=dict)
+    casts: Dict[Any, int] = field(default_factory=dict)
+    might_average: float = 0.0
+    fury_uptime: float = 0.0
+
+    @property
+    def total_condition_damage(self) -> float:
+        return sum(self.condition_damage.values())
+
+    @property
+    def total_damage(self) -> float:
+        return self.direct_damage + self.total_condition_damage
+
+    @property
+    def dps(self) -> float:
+        return self.total_damage / self.duration if self.duration else 0.0
+
+    @property
+    def direct_dps(self) -> float:
+        return self.direct_damage / self.duration if self.duration else 0.0
+
+    @property
+    def condition_dps(self) -> float:
+        return self.total_condition_damage / self.duration if self.duration else 0.0
+
+    @property
+    def condition_share(self) -> float:
+        """Part des dégâts totaux provenant des conditions (0-1)."""
+        total = self.total_damage
+        return self.total_condition_damage / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convertit le résultat en dictionnaire pour la sérialisation."""
+        return {
+            "duration": self.duration,
+            "dps": self.dps,
+            "direct_dps": self.direct_dps,
+            "condition_dps": self.condition_dps,
+            "condition_damage": {c.value: v for c, v in self.condition_damage.items()},
+            "average_condition_stacks": {c.value: v for c, v in self.average_condition_stacks.items()},
+            "casts": dict(self.casts),
+            "might_average": self.might_average,
+            "fury_uptime": self.fury_uptime,
+        }
+
+
+def compile_skill(skill: Any, fact_store: Optional[SkillFactStore] = None) -> SkillProfile:
+    """Compile les faits d'une compétence en ``SkillProfile``.
+
+    Args:
+        skill: Compétence (modèle ``Skill`` ou tout objet exposant ``id``,
+            ``facts`` et ``recharge``)
+        fact_store: Store des faits en colonnes ; s'il contient la compétence, les
+            faits y sont lus au lieu du JSON
+
+    Returns:
+        Le profil compilé de la compétence
+    """
+    skill_id = getattr(skill, 'id', None)
+    if fact_store is not None and skill_id is not None and skill_id in fact_store:
+        return _compile_from_store(skill_id, float(getattr(skill, 'recharge', None) or 0.0), fact_store)
+
+    cast_time = DEFAULT_CAST_TIME
+    recharge = float(getattr(skill, 'recharge', None) or 0.0)
+    damage_coefficient = 0.0
+    conditions: List[Tuple[ConditionType, int, float]] = []
+    might_stacks = 0
+    might_duration = 0.0
+    fury_duration = 0.0
+
+    for fact in getattr(skill, 'facts', None) or []:
+        fact_type = fact.get('type')
+        if fact_type == 'Damage':
+            damage_coefficient += float(fact.get('dmg_multiplier', 0) or 0) * int(fact.get('hit_count', 1) or 1)
+        elif fact_type == 'Recharge':
+            recharge = float(fact.get('value', recharge) or 0.0)
+        elif fact_type == 'Time' and str(fact.get('text', '')).lower() in _CAST_TIME_TEXTS:
+            cast_time = float(fact.get('duration', cast_time) or 0.0)
+        elif fact_type == 'Buff':
+            status = fact.get('status')
+            stacks = int(fact.get('apply_count', 1) or 1)
+            duration = float(fact.get('duration', 0) or 0.0)
+            if status in _CONDITIONS_BY_NAME:
+                conditions.append((_CONDITIONS_BY_NAME[status], stacks, duration))
+            elif status == BoonType.MIGHT.value:
+                might_stacks += stacks
+                might_duration = max(might_duration, duration)
+            elif status == BoonType.FURY.value:
+                fury_duration += duration
+
+    return SkillProfile(
+        skill_id=getattr(skill, 'id', None),
+        cast_time=max(cast_time, 0.0),
+        recharge=max(recharge, 0.0),
+        damage_coefficient=damage_coefficient,
+        conditions=tuple(conditions),
+        might_stacks=might_stacks,
+        might_duration=might_duration,
+        fury_duration=fury_duration,
+    )
+
+
+def _compile_from_store(skill_id: int, recharge: float, store: SkillFactStore) -> SkillProfile:
+    """Compile les faits de base d'une compétence lus dans le store en colonnes."""
+    cast_time = DEFAULT_CAST_TIME
+    damage_coefficient = 0.0
+    conditions: List[Tuple[ConditionType, int, float]] = []
+    might_stacks = 0
+    might_duration = 0.0
+    fury_duration = 0.0
+
+    damage = store.type_code_of('Damage')
+    recharge_code = store.type_code_of('Recharge')
+    time = store.type_code_of('Time')
+    buff = store.type_code_of('Buff')
+    type_code, value, duration, stacks = store.type_code, store.value, store.duration, store.stacks
+
+    rows = store.fact_rows(skill_id, include_traited=False)
+    for row in range(rows.start, rows.stop):
+        code = type_code[row]
+        if code == damage:
+            if not math.isnan(value[row]):
+                damage_coefficient += float(value[row]) * int(stacks[row])
+        elif code == recharge_code:
+            if not math.isnan(value[row]):
+                recharge = float(value[row])
+        elif code == time and str(store.attribute_name(row) or '').lower() in _CAST_TIME_TEXTS:
+            if not math.isnan(duration[row]):
+                cast_time = float(duration[row])
+        elif code == buff:
+            status = store.attribute_name(row)
+            fact_duration = 0.0 if math.isnan(duration[row]) else float(duration[row])
+            if status in _CONDITIONS_BY_NAME:
+                conditions.append((_CONDITIONS_BY_NAME[status], int(stacks[row]), fact_duration))
+            elif status == BoonType.MIGHT.value:
+                might_stacks += int(stacks[row])
+                might_duration = max(might_duration, fact_duration)
+            elif status == BoonType.FURY.value:
+                fury_duration += fact_duration
+
+    return SkillProfile(
+        skill_id=skill_id,
+        cast_time=max(cast_time, 0.0),
+        recharge=max(recharge, 0.0),
+        damage_coefficient=damage_coefficient,
+        conditions=tuple(conditions),
+        might_stacks=might_stacks,
+        might_duration=might_duration,
+        fury_duration=fury_duration,
+    )
+
+
+class RotationSimulator:
+    """Simulateur de rotation à événements discrets.
+
+    La rotation suit une priorité simple : à chaque fin d'incantation, la première
+    compétence disponible (dans l'ordre fourni) est lancée. Une compétence sans
+    temps de recharge sert donc d'attaque automatique.
+
+    Les profils compilés sont mémorisés par identifiant de compétence : une même
+    instance peut simuler de nombreux builds partageant des compétences.
+    """
+
+    def __init__(
+        self,
+        fight_duration: float = 60.0,
+        target_armor: float = DEFAULT_TARGET_ARMOR,
+        weapon_strength: float = DEFAULT_WEAPON_STRENGTH,
+        fact_store: Optional[SkillFactStore] = None
+    ):
+        """Initialise le simulateur.
+
+        Args:
+            fight_duration: Durée de la fenêtre de combat en secondes
+            target_armor: Armure de la cible
+            weapon_strength: Force d'arme moyenne pour les coups directs
+            fact_store: Store des faits en colonnes (celui de l'application, s'il
+                est chargé, par défaut)
+        """
+        if fight_duration <= 0:
+            raise ValueError("fight_duration doit être strictement positif")
+        self.fight_duration = float(fight_duration)
+        self.target_armor = float(target_armor)
+        self.weapon_strength = float(weapon_strength)
+        self.fact_store = fact_store
+        self._profiles: Dict[Any, SkillProfile] = {}
+
+    def profile(self, skill: Any) -> SkillProfile:
+        """Retourne le profil compilé d'une compétence (mis en cache par ID)."""
+        if isinstance(skill, SkillProfile):
+            return skill
+
+        skill_id = getattr(skill, 'id', None)
+        if skill_id is None:
+            return compile_skill(skill)
+
+        profile = self._profiles.get(skill_id)
+        if profile is None:
+            store = self.fact_store if self.fact_store is not None else get_skill_fact_store()
+            profile = self._profiles[skill_id] = compile_skill(skill, store)
+        return profile
+
+    def simulate(
+        self,
+        skills: Iterable[Any],
+        attributes: Optional[Mapping[AttributeType, float]] = None
+    ) -> RotationResult:
+        """Simule la rotation d'un ensemble de compétences.
+
+        Args:
+            skills: Compétences ou profils compilés, par ordre de priorité
+            attributes: Attributs du personnage (valeurs par défaut du niveau 80 sinon)
+
+        Returns:
+            Le résultat de la simulation
+        """
+        attributes = attributes or {}
+        power = float(attributes.get(AttributeType.POWER, 1000))
+        precision = float(attributes.get(AttributeType.PRECISION, 1000))
+        ferocity = float(attributes.get(AttributeType.FEROCITY, 0))
+        condition_damage = float(attributes.get(AttributeType.CONDITION_DAMAGE, 0))
+        expertise = float(attributes.get(AttributeType.EXPERTISE, 0))
+
+        base_crit_chance = (precision - 895.0) / 2100.0
+        crit_damage = 1.5 + ferocity / 1500.0
+        condition_duration = 1.0 + min(expertise / 1500.0, 1.0)
+        strike_factor = self.weapon_strength / self.target_armor
+
+        end = self.fight_duration
+        rotation = [profile for profile in map(self.profile, skills) if profile.has_effect]
+        result = RotationResult(duration=end)
+        if not rotation:
+            return result
+
+        ready_at = [0.0] * len(rotation)
+        casts: Dict[Any, int] = {}
+        direct_damage = 0.0
+        condition_totals = {condition: 0.0 for condition in CONDITION_TICK_DAMAGE}
+        stack_totals = {condition: 0.0 for condition in CONDITION_TICK_DAMAGE}
+        condition_stacks = {condition: 0 for condition in CONDITION_TICK_DAMAGE}
+
+        # Piles de might : tas (expiration, nombre de piles), purgé paresseusement
+        might_stacks: List[List[float]] = []
+        might = 0
+        might_integral = 0.0
+        last_might_change = 0.0
+        fury_until = 0.0
+        fury_time = 0.0
+
+        events: List[Tuple[float, int, int, Any]] = []
+        sequence = 0
+
+        def push(time: float, kind: int, payload: Any) -> None:
+            nonlocal sequence
+            sequence += 1
+            heapq.heappush(events, (time, kind, sequence, payload))
+
+        def advance_might(now: float) -> None:
+            """Fait expirer les piles de might jusqu'à ``now`` en intégrant leur nombre."""
+            nonlocal might, might_integral, last_might_change
+            while might_stacks and might_stacks[0][0] <= now:
+                expires, count = heapq.heappop(might_stacks)
+                might_integral += might * (expires - last_might_change)
+                last_might_change = expires
+                might -= int(count)
+            might_integral += might * (now - last_might_change)
+            last_might_change = now
+
+        def start_cast(now: float) -> None:
+            """Lance la première compétence disponible ou attend la prochaine."""
+            next_ready = None
+            for index, profile in enumerate(rotation):
+                available = ready_at[index]
+                if available <= now:
+                    push(now + profile.cast_time, _CAST_END, index)
+                    # Éviter une boucle infinie sur une compétence instantanée sans recharge
+                    ready_at[index] = now + max(profile.recharge, profile.cast_time, 0.001)
+                    return
+                if next_ready is None or available < next_ready:
+                    next_ready = available
+            if next_ready is not None and next_ready <= end:
+                push(next_ready, _CAST_END, None)
+
+        push(0.0, _CAST_END, None)
+        for second in range(1, int(end) + 1):
+            push(float(second), _TICK, None)
+
+        while events:
+            now, kind, _, payload = heapq.heappop(events)
+            if now > end:
+                break
+
+            if kind == _TICK:
+                advance_might(now)
+                effective_condition_damage = condition_damage + MIGHT_CONDITION_DAMAGE_PER_STACK * might
+                for condition, stacks in condition_stacks.items():
+                    if stacks:
+                        base, coefficient = CONDITION_TICK_DAMAGE[condition]
+                        condition_totals[condition] += stacks * (base + coefficient * effective_condition_damage)
+                        stack_totals[condition] += stacks
+
+            elif kind == _EXPIRE_CONDITION:
+                condition, stacks = payload
+                condition_stacks[condition] -= stacks
+
+            else:  # _CAST_END
+                if payload is not None:
+                    profile = rotation[payload]
+                    casts[profile.skill_id] = casts.get(profile.skill_id, 0) + 1
+                    advance_might(now)
+
+                    if profile.damage_coefficient:
+                        crit_chance = base_crit_chance + (FURY_CRITICAL_CHANCE if fury_until > now else 0.0)
+                        crit_chance = min(max(crit_chance, 0.0), 1.0)
+                        effective_power = power + MIGHT_POWER_PER_STACK * might
+                        direct_damage += (
+                            profile.damage_coefficient * effective_power * strike_factor
+                            * (1.0 + crit_chance * (crit_damage - 1.0))
+                        )
+
+                    for condition, stacks, duration in profile.conditions:
+                        if stacks and duration:
+                            condition_stacks[condition] += stacks
+                            push(now + duration * condition_duration, _EXPIRE_CONDITION, (condition, stacks))
+
+                    if profile.might_stacks and profile.might_duration:
+                        heapq.heappush(might_stacks, [now + profile.might_duration, profile.might_stacks])
+                        might += profile.might_stacks
+                        # Au-delà du plafond, les nouvelles piles remplacent les plus anciennes
+                        while might > MIGHT_MAX_STACKS:
+                            excess = might - MIGHT_MAX_STACKS
+                            oldest = might_stacks[0]
+                            removed = min(excess, int(oldest[1]))
+                            oldest[1] -= removed
+                            might -= removed
+                            if not oldest[1]:
+                                heapq.heappop(might_stacks)
+
+                    if profile.fury_duration:
+                        start = max(fury_until, now)
+                        new_until = start + profile.fury_duration
+                        fury_time += max(0.0, min(new_until, end) - start)
+                        fury_until = new_until
+
+                start_cast(now)
+
+        advance_might(end)
+        ticks = int(end) or 1
+
+        result.direct_damage = direct_damage
+        result.condition_damage = {c: v for c, v in condition_totals.items() if v}
+        result.average_condition_stacks = {c: v / ticks for c, v in stack_totals.items() if v}
+        result.casts = casts
+        result.might_average = might_integral / end
+        result.fury_uptime = min(fury_time / end, 1.0)
+        return result
@@ -44,23 +44,49 @@ async def on_startup() -> None:
     # Log de démarrage
     import logging
     logger = logging.getLogger(__name__)
+    
+    # Instantané du catalogue de jeu (avec l'index des effets et le store des faits),
+    # projeté depuis le fichier partagé s'il existe
+    from app.config import settings
+    from app.services.catalog_file import install_catalog
+    try:
+        install_catalog(settings.CATALOG_FILE)
+    except Exception as e:
+        logger.warning(f"Impossible de charger le catalogue de jeu: {e}")
+    
     logger.info("L'application GW2 Team Builder démarre...")
     logger.debug("Niveau de log: %s", log_level)
 
 
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    """Ferme les connexions du moteur asynchrone à l'arrêt de l'application."""
+    from app.database import dispose_async_engine
+    await dispose_async_engine()
+
+
 @app.get("/ping")
 def ping() -> dict[str, str]:
     """Health-check endpoint."""
     return {"status": "ok"}
 
 
+@app.get("/health/db")
+def database_health() -> dict:
+    """Utilisation des pools de connexions synchrone et asynchrone."""
+    from app.database import get_pools_status
+    return get_pools_status()
+
+
 # Routers
 from app.api.teams import router as teams_router
 from app.api.endpoints.builds import router as builds_router
+from app.api.catalog import router as catalog_router
 
 # Inclure les routeurs
 app.include_router(teams_router)
 app.include_router(builds_router)
+app.include_router(catalog_router)
 
 
 if __name__ == "__main__":
@@ -27,6 +27,7 @@ from .infusion import Infusion, InfusionType
 from .item_stats import ItemStats
 from .item_stat_mapping import ItemStat
 from .item import Item
+from .sync_state import SyncState, SyncHash, SyncCheckpoint
 
 # 4. Import des modèles de jointure (après que tous les modèles principaux soient définis)
 from .profession_weapon import ProfessionWeaponType, ProfessionWeaponSkill
@@ -87,6 +88,9 @@ __all__ = [
     'Item',
     'ItemStats',
     'ItemStat',
+    'SyncState',
+    'SyncHash',
+    'SyncCheckpoint',
     
     # Enums
     'WeaponType',
@@ -0,0 +1,258 @@
+"""Cache des résultats de requêtes calculés à partir d'une ligne de modèle.
+
+Les méthodes comme ``Skill.get_related_skills`` chargent d'autres lignes à partir
+d'identifiants stockés sur l'instance. Un ``lru_cache`` posé sur la méthode liée
+utilise l'instance ORM et la session comme clé : il ne touche presque jamais,
+retient sessions et objets en mémoire et n'est jamais invalidé par la
+synchronisation.
+
+``ModelCache`` range les résultats sous la clé
+``(modèle, id, méthode, arguments, version des données)`` :
+
+- la version des données est incrémentée après chaque synchronisation
+  (``bump_data_version``), ce qui invalide tout le cache ;
+- les événements SQLAlchemy ``after_update`` / ``after_delete`` des modèles
+  enregistrés (``register``) invalident les entrées de la ligne modifiée, ainsi
+  que celles dont le résultat contient cette ligne ;
+- le nombre d'entrées est borné (éviction LRU) et ``stats()`` expose les métriques.
+
+Seules les identités ``(modèle, id)`` des objets sont conservées, jamais les
+instances : elles restent liées à la session qui les a chargées, avec ses
+modifications non validées. Les objets sont relus dans la session de
+l'appelant, depuis sa carte d'identité, les absents en une requête par modèle.
+
+Exemple d'utilisation:
+    ```python
+    cache = get_model_cache()
+    skills = cache.get_or_load(session, Skill, skill.id, 'transform_skills', loader)
+    print(cache.stats())
+    ```
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+logger = logging.getLogger(__name__)
+
+# Clé d'une entrée : (modèle, id, méthode, arguments, version des données)
+ModelCacheKey = Tuple[str, Any, str, Tuple, int]
+
+# Identité d'un objet mis en cache : (modèle, id)
+ObjectRef = Tuple[type, Any]
+
+
+class ModelCache:
+    """Cache LRU borné d'identités d'objets ORM, invalidé par ligne et par synchronisation."""
+
+    def __init__(self, max_entries: int = 2048):
+        """Initialise le cache.
+
+        Args:
+            max_entries: Nombre maximum d'entrées conservées
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries doit être strictement positif")
+
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[ModelCacheKey, List[ObjectRef]]" = OrderedDict()
+        # (modèle, id) -> clés dont le résultat dépend de cette ligne
+        self._dependents: Dict[Tuple[str, Any], Set[ModelCacheKey]] = {}
+        self._dependencies: Dict[ModelCacheKey, Set[Tuple[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._registered: Set[type] = set()
+        self._data_version = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def data_version(self) -> int:
+        """Version courante des données (incrémentée à chaque synchronisation)."""
+        return self._data_version
+
+    def make_key(self, model: Type, obj_id: Any, name: str, args: Tuple = ()) -> ModelCacheKey:
+        """Construit la clé d'une entrée pour la version courante des données."""
+        return (model.__name__, obj_id, name, tuple(args), self._data_version)
+
+    def get(self, key: ModelCacheKey) -> Optional[List[ObjectRef]]:
+        """Retourne les identités des objets associés à une clé, ou None si elle est absente."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: ModelCacheKey, objects: List[Any], depends_on: Iterable[Any] = ()) -> None:
+        """Stocke les identités d'objets sous une clé.
+
+        Args:
+            key: Clé de l'entrée
+            objects: Objets dont les identités sont mises en cache
+            depends_on: Identifiants supplémentaires (du même modèle) dont dépend
+                l'entrée ; les identifiants des objets stockés sont ajoutés
+                automatiquement
+        """
+        model_name, obj_id = key[0], key[1]
+        with self._lock:
+            if key[4] != self._data_version:
+                # Résultat calculé avant une synchronisation : ne pas le stocker
+                return
+            self._forget(key)
+            self._entries[key] = [(type(obj), getattr(obj, 'id', None)) for obj in objects]
+            self._entries.move_to_end(key)
+
+            dependencies = {(model_name, obj_id)}
+            dependencies.update((model_name, dep) for dep in depends_on)
+            dependencies.update(
+                (type(obj).__name__, getattr(obj, 'id', None)) for obj in objects
+            )
+            self._dependencies[key] = dependencies
+            for dependency in dependencies:
+                self._dependents.setdefault(dependency, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._evictions += 1
+                self._forget(evicted)
+
+    def get_or_load(
+        self,
+        session: Session,
+        model: Type,
+        obj_id: Any,
+        name: str,
+        loader: Callable[[Session], List[Any]],
+        args: Tuple = (),
+        depends_on: Iterable[Any] = ()
+    ) -> List[Any]:
+        """Retourne des objets depuis le cache ou les charge avec ``loader``.
+
+        Args:
+            session: Session de l'appelant
+            model: Modèle de la ligne propriétaire
+            obj_id: Identifiant de la ligne propriétaire
+            name: Nom de la méthode ou du résultat mis en cache
+            loader: Fonction chargeant les objets depuis une session
+            args: Arguments faisant partie de la clé
+            depends_on: Identifiants dont dépend le résultat (voir ``put``)
+
+        Returns:
+            Les objets, chargés dans la session de l'appelant
+        """
+        key = self.make_key(model, obj_id, name, args)
+        cached = self.get(key)
+        if cached is None:
+            objects = loader(session)
+            self.put(key, objects, depends_on)
+            return objects
+        return self._resolve(session, cached)
+
+    @staticmethod
+    def _resolve(session: Session, refs: List[ObjectRef]) -> List[Any]:
+        """Relit des objets dans une session : carte d'identité, puis une requête par modèle.
+
+        Les lignes supprimées depuis la mise en cache sont ignorées.
+        """
+        objects: Dict[ObjectRef, Any] = {}
+        missing: Dict[type, List[Any]] = {}
+        for cls, ident in refs:
+            obj = session.identity_map.get(identity_key(cls, ident))
+            if obj is not None:
+                objects[(cls, ident)] = obj
+            else:
+                missing.setdefault(cls, []).append(ident)
+        for cls, idents in missing.items():
+            for obj in session.query(cls).filter(cls.id.in_(idents)):
+                objects[(cls, obj.id)] = obj
+        return [objects[ref] for ref in refs if ref in objects]
+
+    def _forget(self, key: ModelCacheKey) -> None:
+        for dependency in self._dependencies.pop(key, ()):
+            keys = self._dependents.get(dependency)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._dependents[dependency]
+
+    def invalidate(self, model: Type, obj_id: Any) -> int:
+        """Supprime les entrées d'une ligne et celles qui en dépendent.
+
+        Returns:
+            Le nombre d'entrées supprimées
+        """
+        with self._lock:
+            keys = self._dependents.pop((model.__name__, obj_id), set())
+            removed = 0
+            for key in list(keys):
+                if self._entries.pop(key, None) is not None:
+                    removed += 1
+                    self._forget(key)
+            self._invalidations += removed
+            return removed
+
+    def bump_data_version(self) -> int:
+        """Invalide tout le cache après une synchronisation des données.
+
+        Returns:
+            La nouvelle version des données
+        """
+        with self._lock:
+            self._data_version += 1
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+            self._dependents.clear()
+            self._dependencies.clear()
+            logger.debug(f"Cache des modèles invalidé (version des données {self._data_version})")
+            return self._data_version
+
+    def register(self, *models: type) -> None:
+        """Invalide automatiquement les entrées des lignes mises à jour ou supprimées.
+
+        Args:
+            models: Modèles SQLAlchemy à surveiller
+        """
+        for model in models:
+            if model in self._registered:
+                continue
+            event.listen(model, 'after_update', self._on_row_changed)
+            event.listen(model, 'after_delete', self._on_row_changed)
+            self._registered.add(model)
+
+    def _on_row_changed(self, mapper, connection, target) -> None:
+        self.invalidate(type(target), getattr(target, 'id', None))
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques d'utilisation du cache."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "data_version": self._data_version,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+
+_model_cache = ModelCache()
+
+
+def get_model_cache() -> ModelCache:
+    """Retourne le cache des modèles partagé par l'application."""
+    return _model_cache
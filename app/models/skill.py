@@ -1,6 +1,5 @@
 """Modèle SQLAlchemy pour les compétences GW2."""
 
-from functools import lru_cache
 from typing import List, Optional, Dict, Any, Union, TYPE_CHECKING
 
 from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum, JSON
@@ -10,6 +9,8 @@ from enum import Enum as PyEnum
 from .base import Base
 from .weapon import WeaponType
 from ..utils.db_utils import with_session
+from .skill_facts import get_skill_fact_store
+from .model_cache import get_model_cache
 
 if TYPE_CHECKING:
     from .profession import Profession
@@ -242,7 +243,6 @@ class Skill(Base):
         """
         return f"<Skill(id={self.id}, name='{self.name}', type='{self.type.value if self.type else None}')>"
     
-    @lru_cache(maxsize=128)
     def to_dict(self, include_related: bool = True, minimal: bool = False) -> dict:
         """Convertit l'objet en dictionnaire pour la sérialisation JSON.
         
@@ -253,10 +253,6 @@ class Skill(Base):
         Returns:
             dict: Représentation sérialisable de l'objet
             
-        Note:
-            Les résultats sont mis en cache avec LRU pour améliorer les performances.
-            Le cache est automatiquement invalidé lorsque l'objet est modifié.
-            
         Exemple:
             ```python
             # Sérialisation complète (par défaut)
@@ -267,9 +263,6 @@ class Skill(Base):
             
             # Sans les objets liés
             skill_no_related = skill.to_dict(include_related=False)
-            
-            # Vider le cache pour cette instance
-            skill.to_dict.cache_clear()
             ```
         """
         # Création du dictionnaire de base avec les champs essentiels
@@ -355,7 +348,6 @@ class Skill(Base):
         return chain
         
     @with_session
-    @lru_cache(maxsize=128)
     def get_related_skills(self, session: Session = None) -> dict[str, list['Skill']]:
         """Récupère toutes les compétences liées à cette compétence.
         
@@ -366,8 +358,9 @@ class Skill(Base):
             dict: Dictionnaire contenant les compétences liées par type
             
         Note:
-            Les résultats sont mis en cache avec LRU pour améliorer les performances.
-            Le cache est automatiquement invalidé lorsque l'objet est modifié.
+            Les compétences chargées par requête sont mises en cache dans le cache des
+            modèles (voir ``app.models.model_cache``), invalidé lorsque les compétences
+            concernées sont modifiées ou après une synchronisation.
             
         Exemple:
             ```python
@@ -380,9 +373,6 @@ class Skill(Base):
             
             print(f"Compétence flip: {related['flip_skill'][0].name if related['flip_skill'] else 'Aucune'}")
             print(f"Compétences dans la chaîne: {[s.name for s in related['chain_skills']]}")
-            
-            # Vider le cache pour cette instance si nécessaire
-            skill.get_related_skills.cache_clear()
             ```
         """
         # Récupération des compétences liées en une seule requête optimisée
@@ -399,10 +389,7 @@ class Skill(Base):
         if related_skill_ids:
             related_skills = {
                 skill.id: skill for skill in 
-                session.query(Skill)
-                .options(selectinload('*'))  # Chargement anticipé des relations
-                .filter(Skill.id.in_(related_skill_ids))
-                .all()
+                self._load_skills_cached(session, 'related_skills', related_skill_ids)
             }
         
         # Construction du résultat avec mise en cache des résultats intermédiaires
@@ -415,6 +402,19 @@ class Skill(Base):
         }
         
         return result
+    
+    def _load_skills_cached(self, session: Session, name: str, skill_ids) -> list['Skill']:
+        """Charge des compétences par ID en passant par le cache des modèles."""
+        skill_ids = tuple(sorted(set(skill_ids)))
+        return get_model_cache().get_or_load(
+            session, Skill, self.id, name,
+            lambda s: s.query(Skill)
+                .options(selectinload('*'))  # Chargement anticipé des relations
+                .filter(Skill.id.in_(skill_ids))
+                .all(),
+            args=skill_ids,
+            depends_on=skill_ids,
+        )
             
     def is_available_for_profession(self, profession_id: str) -> bool:
         """Vérifie si cette compétence est disponible pour une profession donnée.
@@ -462,7 +462,6 @@ class Skill(Base):
         return self.weapons
         
     @with_session
-    @lru_cache(maxsize=128)
     def get_transform_skills(self, session: Session = None) -> list['Skill']:
         """Récupère les compétences de transformation associées à cette compétence.
         
@@ -473,8 +472,8 @@ class Skill(Base):
             list[Skill]: Liste des compétences de transformation
             
         Note:
-            Les résultats sont mis en cache avec LRU pour améliorer les performances.
-            Le cache est automatiquement invalidé lorsque l'objet est modifié.
+            Les résultats sont mis en cache dans le cache des modèles, invalidé lorsque
+            les compétences concernées sont modifiées ou après une synchronisation.
             
         Exemple:
             ```python
@@ -484,21 +483,14 @@ class Skill(Base):
                 
             # Sans session (en crée une nouvelle)
             skills = skill.get_transform_skills()
-            
-            # Vider le cache pour cette instance si nécessaire
-            skill.get_transform_skills.cache_clear()
             ```
         """
         if not self.transform_skills:
             return []
             
-        return session.query(Skill)\
-            .options(selectinload('*'))\
-            .filter(Skill.id.in_(self.transform_skills))\
-            .all()
+        return self._load_skills_cached(session, 'transform_skills', self.transform_skills)
             
     @with_session
-    @lru_cache(maxsize=128)
     def get_bundle_skills(self, session: Session = None) -> list['Skill']:
         """Récupère les compétences de bundle associées à cette compétence.
         
@@ -509,8 +501,8 @@ class Skill(Base):
             list[Skill]: Liste des compétences de bundle
             
         Note:
-            Les résultats sont mis en cache avec LRU pour améliorer les performances.
-            Le cache est automatiquement invalidé lorsque l'objet est modifié.
+            Les résultats sont mis en cache dans le cache des modèles, invalidé lorsque
+            les compétences concernées sont modifiées ou après une synchronisation.
             
         Exemple:
             ```python
@@ -520,20 +512,13 @@ class Skill(Base):
                 
             # Sans session (en crée une nouvelle)
             skills = skill.get_bundle_skills()
-            
-            # Vider le cache pour cette instance si nécessaire
-            skill.get_bundle_skills.cache_clear()
             ```
         """
         if not self.bundle_skills:
             return []
             
-        return session.query(Skill)\
-            .options(selectinload('*'))\
-            .filter(Skill.id.in_(self.bundle_skills))\
-            .all()
+        return self._load_skills_cached(session, 'bundle_skills', self.bundle_skills)
             
-    @lru_cache(maxsize=128)
     def get_skill_facts(self, include_traited: bool = True) -> list[dict]:
         """Récupère les faits de compétence, avec option pour inclure les faits modifiés par les traits.
         
@@ -544,8 +529,8 @@ class Skill(Base):
             list[dict]: Liste des faits de compétence
             
         Notes:
-            Les résultats sont mis en cache avec LRU pour améliorer les performances.
-            Le cache est invalidé automatiquement lorsque l'objet est modifié.
+            Pour les accès répétés (métriques, simulation), préférer le store en colonnes
+            ``app.models.skill_facts.SkillFactStore``, chargé une fois pour toute la table.
             
         Exemple:
             ```python
@@ -554,23 +539,19 @@ class Skill(Base):
             
             # Obtenir uniquement les faits de base
             base_facts = skill.get_skill_facts(include_traited=False)
-            
-            # Vider le cache pour cette instance
-            skill.get_skill_facts.cache_clear()
             ```
         """
         facts = self.facts or []
         if include_traited and self.traited_facts:
-            # Créer une nouvelle liste pour éviter de modifier les données en cache
+            # Créer une nouvelle liste pour éviter de modifier les faits de l'instance
             facts = facts.copy()
             facts.extend(self.traited_facts)
         return facts
         
     def clear_cache(self):
-        """Vide le cache des méthodes de cette instance."""
-        self.get_skill_facts.cache_clear()
+        """Retire cette instance du cache des modèles."""
+        get_model_cache().invalidate(Skill, self.id)
         
-    @lru_cache(maxsize=512)
     def get_skill_facts_by_type(self, fact_type: str, include_traited: bool = True) -> list[dict]:
         """Récupère les faits de compétence d'un type spécifique.
         
@@ -581,10 +562,6 @@ class Skill(Base):
         Returns:
             list[dict]: Liste des faits correspondants
             
-        Notes:
-            Les résultats sont mis en cache avec LRU pour améliorer les performances.
-            Le cache est partagé avec `get_skill_facts()`.
-            
         Exemple:
             ```python
             # Obtenir tous les faits de dégâts
@@ -592,15 +569,11 @@ class Skill(Base):
             
             # Obtenir les buffs (y compris modifiés par les traits)
             buffs = skill.get_skill_facts_by_type('Buff')
-            
-            # Vider le cache pour cette instance
-            skill.get_skill_facts_by_type.cache_clear()
             ```
         """
         facts = self.get_skill_facts(include_traited=include_traited)
         return [f for f in facts if f.get('type') == fact_type]
         
-    @lru_cache(maxsize=1024)
     def get_skill_fact_value(self, fact_type: str, attribute: str = None, default=None):
         """Récupère la valeur d'un attribut spécifique d'un fait de compétence.
         
@@ -612,10 +585,6 @@ class Skill(Base):
         Returns:
             La valeur de l'attribut ou le fait complet si attribute est None
             
-        Notes:
-            Les résultats sont mis en cache avec LRU pour améliorer les performances.
-            Le cache est partagé avec `get_skill_facts_by_type()`.
-            
         Exemple:
             ```python
             # Obtenir les dégâts de base d'une compétence
@@ -623,24 +592,20 @@ class Skill(Base):
             
             # Obtenir le premier fait de type Buff
             buff_fact = skill.get_skill_fact_value('Buff')
-            
-            # Vider le cache pour cette instance
-            skill.get_skill_fact_value.cache_clear()
             ```
         """
-        facts = self.get_skill_facts_by_type(fact_type)
-        if not facts:
-            return default
-            
-        fact = facts[0]  # Prend le premier fait correspondant
-        if attribute is None:
-            return fact
-            
-        return fact.get(attribute, default)
+        for fact in self.get_skill_facts():
+            if fact.get('type') == fact_type:
+                # Prend le premier fait correspondant
+                return fact if attribute is None else fact.get(attribute, default)
+        return default
         
     def get_coefficients(self) -> dict:
         """Calcule les coefficients de dégâts et de soins de la compétence.
         
+        Si le store des faits en colonnes est chargé et contient la compétence, les
+        coefficients y sont lus directement, sans parcourir le JSON.
+        
         Returns:
             dict: Dictionnaire contenant les coefficients calculés
             
@@ -651,6 +616,10 @@ class Skill(Base):
             print(f"Dégâts: {coeffs.get('damage')}, Soins: {coeffs.get('healing')")
             ```
         """
+        store = get_skill_fact_store()
+        if store is not None and self.id in store:
+            return store.get_coefficients(self.id)
+        
         damage_fact = self.get_skill_fact_value('Damage')
         heal_fact = self.get_skill_fact_value('Heal')
         
@@ -664,6 +633,10 @@ class Skill(Base):
         }
 
 
+# Invalidation du cache des modèles lorsqu'une compétence est modifiée
+get_model_cache().register(Skill)
+
+
 # Configuration des relations pour éviter les imports circulaires
 # Cette configuration est maintenant gérée par SQLAlchemy via les modèles
 # en utilisant les chaînes pour les références aux modèles non encore chargés
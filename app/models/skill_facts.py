@@ -0,0 +1,272 @@
+"""Stockage en colonnes des faits de compétences.
+
+Les faits de l'API GW2 sont stockés en JSON (listes de dictionnaires) sur chaque
+``Skill``. Les parcourir à chaque appel alloue des dictionnaires et oblige à mettre
+les résultats en cache par instance. ``SkillFactStore`` charge une seule fois les
+faits de toute la table ``skills`` dans des tableaux NumPy typés (une ligne par
+fait) :
+
+- ``skill_id`` : identifiant de la compétence
+- ``type_code`` : code du type de fait (``fact_types[code]`` donne le nom)
+- ``attribute_code`` : code de l'attribut principal (buff, attribut ciblé, champ de
+  combo, texte...), ``-1`` s'il n'y en a pas
+- ``value`` : valeur numérique principale (multiplicateur de dégâts, valeur,
+  distance ou pourcentage), ``nan`` si absente
+- ``duration`` : durée en secondes, ``nan`` si absente
+- ``stacks`` : nombre d'applications ou de coups (1 par défaut)
+- ``requires_trait`` : trait requis pour les faits conditionnés, ``-1`` sinon
+
+Les faits d'une compétence sont contigus (faits de base puis faits conditionnés) ;
+``offsets`` et ``base_ends`` donnent leurs bornes, indexés par la position de la
+compétence dans ``skill_ids`` (trié).
+
+Exemple d'utilisation:
+    ```python
+    store = SkillFactStore.from_session(session)
+    set_skill_fact_store(store)
+
+    store.get_coefficients(5491)
+    store.get_value(5491, 'Recharge')
+    ```
+"""
+
+import logging
+import math
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Clés candidates (par ordre de priorité) pour les colonnes d'un fait
+VALUE_KEYS = ('dmg_multiplier', 'value', 'distance', 'percent')
+ATTRIBUTE_KEYS = ('status', 'target', 'field_type', 'finisher_type', 'text')
+STACK_KEYS = ('apply_count', 'hit_count')
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+class SkillFactStore:
+    """Faits de toutes les compétences, en colonnes typées."""
+
+    def __init__(
+        self,
+        skill_ids: np.ndarray,
+        offsets: np.ndarray,
+        base_ends: np.ndarray,
+        type_code: np.ndarray,
+        attribute_code: np.ndarray,
+        value: np.ndarray,
+        duration: np.ndarray,
+        stacks: np.ndarray,
+        requires_trait: np.ndarray,
+        fact_types: Sequence[str],
+        attributes: Sequence[str]
+    ):
+        self.skill_ids = skill_ids
+        self.offsets = offsets
+        self.base_ends = base_ends
+        self.type_code = type_code
+        self.attribute_code = attribute_code
+        self.value = value
+        self.duration = duration
+        self.stacks = stacks
+        self.requires_trait = requires_trait
+        self.fact_types = list(fact_types)
+        self.attributes = list(attributes)
+        self._type_codes = {name: code for code, name in enumerate(self.fact_types)}
+        self._attribute_codes = {name: code for code, name in enumerate(self.attributes)}
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[int, Optional[list], Optional[list]]]) -> 'SkillFactStore':
+        """Construit le store à partir de tuples (id, facts, traited_facts).
+
+        Args:
+            rows: Identifiant, faits de base et faits conditionnés de chaque compétence
+
+        Returns:
+            Le store construit
+        """
+        type_codes: Dict[str, int] = {}
+        attribute_codes: Dict[str, int] = {}
+        columns: Dict[str, list] = {
+            name: [] for name in ('type_code', 'attribute_code', 'value', 'duration', 'stacks', 'requires_trait')
+        }
+        skills: List[Tuple[int, list, list]] = sorted(
+            ((int(skill_id), facts or [], traited or []) for skill_id, facts, traited in rows),
+            key=lambda row: row[0]
+        )
+        offsets = [0]
+        base_ends = []
+
+        def append(fact: dict) -> None:
+            fact_type = str(fact.get('type') or '')
+            attribute = next((fact[k] for k in ATTRIBUTE_KEYS if isinstance(fact.get(k), str)), None)
+            value = next((v for v in (_number(fact.get(k)) for k in VALUE_KEYS) if v is not None), math.nan)
+            stacks = next((int(v) for v in (_number(fact.get(k)) for k in STACK_KEYS) if v is not None), 1)
+            duration = _number(fact.get('duration'))
+            requires_trait = _number(fact.get('requires_trait'))
+
+            columns['type_code'].append(type_codes.setdefault(fact_type, len(type_codes)))
+            columns['attribute_code'].append(
+                attribute_codes.setdefault(attribute, len(attribute_codes)) if attribute is not None else -1
+            )
+            columns['value'].append(value)
+            columns['duration'].append(math.nan if duration is None else duration)
+            columns['stacks'].append(stacks)
+            columns['requires_trait'].append(-1 if requires_trait is None else int(requires_trait))
+
+        count = 0
+        for _, facts, traited in skills:
+            for fact in facts:
+                if isinstance(fact, Mapping):
+                    append(fact)
+                    count += 1
+            base_ends.append(count)
+            for fact in traited:
+                if isinstance(fact, Mapping):
+                    append(fact)
+                    count += 1
+            offsets.append(count)
+
+        return cls(
+            skill_ids=np.array([row[0] for row in skills], dtype=np.int64),
+            offsets=np.array(offsets, dtype=np.int64),
+            base_ends=np.array(base_ends, dtype=np.int64),
+            type_code=np.array(columns['type_code'], dtype=np.int16),
+            attribute_code=np.array(columns['attribute_code'], dtype=np.int32),
+            value=np.array(columns['value'], dtype=np.float64),
+            duration=np.array(columns['duration'], dtype=np.float64),
+            stacks=np.array(columns['stacks'], dtype=np.int32),
+            requires_trait=np.array(columns['requires_trait'], dtype=np.int64),
+            fact_types=sorted(type_codes, key=type_codes.get),
+            attributes=sorted(attribute_codes, key=attribute_codes.get),
+        )
+
+    @classmethod
+    def from_skills(cls, skills: Iterable[Any]) -> 'SkillFactStore':
+        """Construit le store à partir d'objets exposant ``id``, ``facts`` et ``traited_facts``."""
+        return cls.build((s.id, getattr(s, 'facts', None), getattr(s, 'traited_facts', None)) for s in skills)
+
+    @classmethod
+    def from_session(cls, session) -> 'SkillFactStore':
+        """Charge les faits de toutes les compétences en une seule requête."""
+        from .skill import Skill
+
+        store = cls.build(session.query(Skill.id, Skill.facts, Skill.traited_facts))
+        logger.info(
+            f"Store des faits construit: {len(store)} faits pour {len(store.skill_ids)} compétences "
+            f"({store.nbytes / 1024:.1f} Ko)"
+        )
+        return store
+
+    def __len__(self) -> int:
+        return len(self.type_code)
+
+    def __contains__(self, skill_id: int) -> bool:
+        return self._position(skill_id) >= 0
+
+    @property
+    def nbytes(self) -> int:
+        """Taille mémoire des colonnes en octets."""
+        return sum(
+            array.nbytes for array in (
+                self.skill_ids, self.offsets, self.base_ends, self.type_code, self.attribute_code,
+                self.value, self.duration, self.stacks, self.requires_trait
+            )
+        )
+
+    def _position(self, skill_id: int) -> int:
+        position = int(np.searchsorted(self.skill_ids, skill_id))
+        if position < len(self.skill_ids) and self.skill_ids[position] == skill_id:
+            return position
+        return -1
+
+    def type_code_of(self, fact_type: str) -> int:
+        """Code d'un type de fait (``-1`` s'il n'apparaît dans aucune compétence)."""
+        return self._type_codes.get(fact_type, -1)
+
+    def attribute_name(self, row: int) -> Optional[str]:
+        """Nom de l'attribut principal d'un fait."""
+        code = self.attribute_code[row]
+        return self.attributes[code] if code >= 0 else None
+
+    def fact_rows(self, skill_id: int, include_traited: bool = True) -> slice:
+        """Lignes des faits d'une compétence (tranche vide si elle est inconnue)."""
+        position = self._position(skill_id)
+        if position < 0:
+            return slice(0, 0)
+        end = self.offsets[position + 1] if include_traited else self.base_ends[position]
+        return slice(int(self.offsets[position]), int(end))
+
+    def find(self, skill_id: int, fact_type: str, include_traited: bool = True) -> int:
+        """Ligne du premier fait d'un type donné pour une compétence, ``-1`` sinon."""
+        code = self.type_code_of(fact_type)
+        if code < 0:
+            return -1
+        rows = self.fact_rows(skill_id, include_traited)
+        for row in range(rows.start, rows.stop):
+            if self.type_code[row] == code:
+                return row
+        return -1
+
+    def get_value(self, skill_id: int, fact_type: str, column: str = 'value', default: Any = None) -> Any:
+        """Valeur d'une colonne pour le premier fait d'un type donné.
+
+        Args:
+            skill_id: Identifiant de la compétence
+            fact_type: Type de fait (ex: 'Damage', 'Recharge')
+            column: Colonne à lire ('value', 'duration', 'stacks'...)
+            default: Valeur retournée si le fait ou la valeur est absent
+
+        Returns:
+            La valeur trouvée ou ``default``
+        """
+        row = self.find(skill_id, fact_type)
+        if row < 0:
+            return default
+        value = getattr(self, column)[row].item()
+        if isinstance(value, float) and math.isnan(value):
+            return default
+        return value
+
+    def get_coefficients(self, skill_id: int) -> Dict[str, float]:
+        """Coefficients de dégâts et de soins d'une compétence (voir ``Skill.get_coefficients``)."""
+        damage = self.find(skill_id, 'Damage')
+        heal = self.find(skill_id, 'Heal')
+        return {
+            'damage': self._number_at(damage, self.value) if damage >= 0 else 0,
+            'healing': int(self.stacks[heal]) * self._number_at(heal, self.value) if heal >= 0 else 0,
+            'hits': int(self.stacks[damage]) if damage >= 0 else 0,
+            'duration': self.get_value(skill_id, 'Duration', 'duration', 0) or 0,
+            'radius': self.get_value(skill_id, 'Radius', 'value', 0) or 0,
+            'range': self.get_value(skill_id, 'Range', 'value', 0) or 0,
+        }
+
+    @staticmethod
+    def _number_at(row: int, column: np.ndarray) -> float:
+        value = column[row].item()
+        return 0 if math.isnan(value) else value
+
+
+_skill_fact_store: Optional[SkillFactStore] = None
+
+
+def get_skill_fact_store() -> Optional[SkillFactStore]:
+    """Retourne le store des faits chargé pour l'application (``None`` s'il n'est pas chargé)."""
+    return _skill_fact_store
+
+
+def set_skill_fact_store(store: Optional[SkillFactStore]) -> None:
+    """Installe le store des faits utilisé par ``Skill`` et les métriques."""
+    global _skill_fact_store
+    _skill_fact_store = store
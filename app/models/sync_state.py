@@ -0,0 +1,63 @@
+"""Modèles de suivi de la synchronisation incrémentale avec l'API GW2.
+
+``SyncState`` mémorise, pour chaque type d'entité, l'ID de build du jeu et la
+version de la conversion des données lors de la dernière synchronisation
+complète ; ``SyncHash`` mémorise l'empreinte du
+contenu brut renvoyé par l'API pour chaque entité synchronisée ;
+``SyncCheckpoint`` mémorise les lots déjà validés d'une synchronisation
+interrompue, pour la reprendre.
+"""
+from sqlalchemy import JSON, Column, DateTime, Integer, String
+
+from app.database import Base
+
+
+class SyncState(Base):
+    """État de la dernière synchronisation d'un type d'entité (ex: "skills")."""
+    __tablename__ = 'sync_states'
+
+    entity = Column(String(32), primary_key=True)
+    build_id = Column(Integer, nullable=True)  # ID de build (/v2/build) de la dernière synchronisation complète
+    mapping_version = Column(Integer, nullable=True)  # Version de la conversion (MAPPING_VERSION) utilisée
+    id_count = Column(Integer, default=0)  # Nombre d'IDs connus de l'API
+    synced_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<SyncState(entity='{self.entity}', build_id={self.build_id}, id_count={self.id_count})>"
+
+
+class SyncHash(Base):
+    """Empreinte du contenu brut d'une entité, telle que renvoyée par l'API."""
+    __tablename__ = 'sync_hashes'
+
+    entity = Column(String(32), primary_key=True)
+    entity_id = Column(String(64), primary_key=True)  # ID de l'API (chaîne pour les professions)
+    content_hash = Column(String(40), nullable=False)
+
+    def __repr__(self):
+        return f"<SyncHash(entity='{self.entity}', entity_id='{self.entity_id}')>"
+
+
+class SyncCheckpoint(Base):
+    """Point de reprise de la synchronisation d'un type d'entité.
+
+    Les lots d'IDs sont identifiés par leur position dans la liste à
+    synchroniser ; le point de reprise n'est valable que pour la même liste
+    (``ids_hash``), la même taille de lot et le même build du jeu.
+    """
+    __tablename__ = 'sync_checkpoints'
+
+    entity = Column(String(32), primary_key=True)
+    run_id = Column(String(36), nullable=False)  # Synchronisation qui a validé le dernier lot
+    build_id = Column(Integer, nullable=True)
+    ids_hash = Column(String(40), nullable=False)  # Empreinte de la liste d'IDs à synchroniser
+    chunk_size = Column(Integer, nullable=False)
+    chunk_count = Column(Integer, nullable=False)
+    done_chunks = Column(JSON, nullable=False, default=list)  # Positions des lots validés
+    updated_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return (
+            f"<SyncCheckpoint(entity='{self.entity}', run_id='{self.run_id}', "
+            f"done={len(self.done_chunks or [])}/{self.chunk_count})>"
+        )
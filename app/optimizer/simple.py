@@ -20,7 +20,7 @@ from __future__ import annotations
 
 import itertools
 import random
-from typing import List, Sequence, Tuple
+from typing import Iterable, List, Sequence, Tuple
 
 from sqlalchemy.orm import Session
 
@@ -33,6 +33,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 from app.models import Profession  # Import direct du modèle SQLAlchemy
 from app.scoring.engine import PlayerBuild, score_team
 from app.scoring.schema import ScoringConfig, TeamScoreResult
+from app.services.catalog import get_catalog
 
 #: Dictionnaire de correspondance entre les professions et leurs métadonnées (buffs et rôles par défaut).
 #: Format: {"NomProfession": (set(buffs), set(roles))}
@@ -95,25 +96,7 @@ def _default_candidates(db: Session) -> List[PlayerBuild]:
                 for prof_name, (buffs, roles) in _PROFESSION_METADATA.items()
             ]
         
-        # Créer les builds pour chaque profession
-        builds: List[PlayerBuild] = []
-        for prof in professions:
-            try:
-                buffs, roles = _PROFESSION_METADATA.get(prof.name, (set(), {"dps"}))
-                build = PlayerBuild(
-                    profession_id=prof.id,
-                    buffs=buffs,
-                    roles=roles,
-                    description=f"Build pour {prof.name}"
-                )
-                builds.append(build)
-                logger.debug(f"Build créé pour {prof.name} avec {len(buffs)} buffs et {len(roles)} rôles.")
-            except Exception as e:
-                logger.error(f"Erreur lors de la création du build pour {prof.name}: {str(e)}")
-                continue
-        
-        logger.info(f"{len(builds)} builds créés avec succès.")
-        return builds
+        return _candidates_from_professions(professions)
         
     except Exception as e:
         logger.error(f"Erreur critique dans _default_candidates: {str(e)}", exc_info=True)
@@ -129,6 +112,38 @@ def _default_candidates(db: Session) -> List[PlayerBuild]:
         ]
 
 
+def _candidates_from_professions(professions: Iterable) -> List[PlayerBuild]:
+    """Crée un build par défaut pour chaque profession.
+    
+    Args:
+        professions: Professions (modèles SQLAlchemy ou enregistrements du catalogue)
+        
+    Returns:
+        Une liste de PlayerBuild avec les buffs et rôles de _PROFESSION_METADATA.
+    """
+    import logging
+    logger = logging.getLogger(__name__)
+    
+    builds: List[PlayerBuild] = []
+    for prof in professions:
+        try:
+            buffs, roles = _PROFESSION_METADATA.get(prof.name, (set(), {"dps"}))
+            build = PlayerBuild(
+                profession_id=prof.id,
+                buffs=buffs,
+                roles=roles,
+                description=f"Build pour {prof.name}"
+            )
+            builds.append(build)
+            logger.debug(f"Build créé pour {prof.name} avec {len(buffs)} buffs et {len(roles)} rôles.")
+        except Exception as e:
+            logger.error(f"Erreur lors de la création du build pour {prof.name}: {str(e)}")
+            continue
+    
+    logger.info(f"{len(builds)} builds créés avec succès.")
+    return builds
+
+
 def optimize_team(
     team_size: int,
     samples: int,
@@ -184,9 +199,14 @@ def optimize(
     if random_seed is not None:
         random.seed(random_seed)
 
-    with SessionLocal() as db:
-        if candidates is None:
-            candidates = _default_candidates(db)
+    if candidates is None:
+        catalog = get_catalog()
+        if catalog is not None:
+            # Lecture depuis l'instantané du catalogue, sans accès à la base
+            candidates = _candidates_from_professions(catalog.professions.values())
+        else:
+            with SessionLocal() as db:
+                candidates = _default_candidates(db)
 
     if len(candidates) < team_size:
         raise ValueError("Not enough candidate builds to form a team.")
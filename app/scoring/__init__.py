@@ -5,11 +5,16 @@ en fonction de divers critères de performance et de synergie.
 """
 
 from .engine import PlayerBuild, score_team
+from .timeline import BoonSource, BoonTimeline, simulate_boon_timeline, score_team_timeline
+from .combos import ComboPotential, score_team_combos, score_teams_combos
 from .scorer import BuildScorer, BuildEvaluation
 from .schema import ScoringConfig, TeamScoreResult
+from .fingerprint import build_fingerprint
+from .cache import MetricResultCache, get_default_metric_cache
 from .metrics import (
     MetricType, MetricResult,
-    BaseMetric, AttributeScoreMetric, BoonUptimeMetric, ConditionDamageMetric
+    BaseMetric, AttributeScoreMetric, BoonUptimeMetric, ConditionDamageMetric,
+    DirectDamageMetric, RotationMetric
 )
 
 __all__ = [
@@ -18,6 +23,13 @@ __all__ = [
     'ScoringConfig',
     'TeamScoreResult',
     'score_team',
+    'BoonSource',
+    'BoonTimeline',
+    'simulate_boon_timeline',
+    'score_team_timeline',
+    'ComboPotential',
+    'score_team_combos',
+    'score_teams_combos',
     
     # Nouvelles exportations
     'BuildScorer',
@@ -28,4 +40,9 @@ __all__ = [
     'AttributeScoreMetric',
     'BoonUptimeMetric',
     'ConditionDamageMetric',
+    'DirectDamageMetric',
+    'RotationMetric',
+    'build_fingerprint',
+    'MetricResultCache',
+    'get_default_metric_cache',
 ]
@@ -0,0 +1,210 @@
+"""Cache des résultats de métriques pour le scoring des builds.
+
+Les mêmes builds sont évalués à plusieurs reprises (solveur, commande CLI
+``analyze-build``, API). Ce module mémorise les ``MetricResult`` par build et
+par métrique afin d'éviter de les recalculer.
+
+La clé d'un résultat est composée de :
+- l'empreinte canonique du build (voir ``app.scoring.fingerprint``)
+- le type de métrique et la classe qui l'implémente
+- le mode de jeu et le rôle ciblés
+- la version de la métrique (``BaseMetric.version``)
+- le poids de la métrique
+
+Incrémenter la version d'une métrique change donc toutes ses clés : les anciennes
+entrées ne sont plus jamais lues et finissent par être évincées.
+
+Les résultats dépendent aussi des données de jeu (faits des compétences) : le
+cache partagé est vidé après chaque synchronisation et à chaque remplacement de
+l'instantané du catalogue. Un cache persistant écrit avant une synchronisation
+doit être vidé (``invalidate()``) avant d'être réutilisé.
+
+Les résultats sont copiés à l'écriture et à la lecture : un appelant qui
+modifie un ``MetricResult`` (ou ses détails) n'altère pas le cache.
+"""
+
+import copy
+import logging
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+from app.game_mechanics import GameMode, RoleType
+from .metrics import BaseMetric, MetricResult, MetricType
+
+logger = logging.getLogger(__name__)
+
+# Clé d'un résultat en cache
+MetricCacheKey = Tuple[str, str, str, str, Optional[str], int, float]
+
+# Version du format du fichier de persistance
+_PERSISTENCE_FORMAT = 2
+
+
+class MetricResultCache:
+    """Cache LRU borné des résultats de métriques, avec persistance optionnelle.
+
+    Exemple d'utilisation:
+        ```python
+        cache = MetricResultCache(max_entries=10_000, path="data/cache/metrics.pkl")
+        scorer = BuildScorer(role=RoleType.DPS, result_cache=cache)
+        scorer.evaluate_builds(builds)
+        print(cache.stats())
+        cache.save()
+        ```
+    """
+
+    def __init__(self, max_entries: int = 10000, path: Optional[Union[str, Path]] = None):
+        """Initialise le cache.
+
+        Args:
+            max_entries: Nombre maximum de résultats conservés en mémoire
+            path: Fichier de persistance (None pour un cache purement en mémoire).
+                S'il existe, son contenu est chargé immédiatement.
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries doit être strictement positif")
+
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self._entries: "OrderedDict[MetricCacheKey, MetricResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        if self.path and self.path.exists():
+            self.load()
+
+    @staticmethod
+    def make_key(
+        fingerprint: str,
+        metric: BaseMetric,
+        game_mode: GameMode,
+        role: Optional[RoleType]
+    ) -> MetricCacheKey:
+        """Construit la clé d'un résultat pour une métrique et un build.
+
+        La classe de la métrique fait partie de la clé : deux métriques
+        personnalisées du même type ne partagent pas leurs résultats.
+        """
+        metric_class = type(metric)
+        return (
+            fingerprint,
+            metric.metric_type.value,
+            f"{metric_class.__module__}.{metric_class.__qualname__}",
+            game_mode.value,
+            role.value if role else None,
+            metric.version,
+            float(metric.weight),
+        )
+
+    def get(self, key: Hashable) -> Optional[MetricResult]:
+        """Retourne le résultat associé à une clé, ou None s'il est absent."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return copy.deepcopy(result)
+
+    def put(self, key: Hashable, result: MetricResult) -> None:
+        """Stocke un résultat, en évinçant les entrées les moins récemment utilisées."""
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, metric_type: Optional[MetricType] = None) -> int:
+        """Supprime les entrées d'une métrique (ou toutes les entrées).
+
+        Args:
+            metric_type: Type de métrique à invalider (None pour tout vider)
+
+        Returns:
+            Le nombre d'entrées supprimées
+        """
+        with self._lock:
+            if metric_type is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+
+            stale = [key for key in self._entries if key[1] == metric_type.value]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques d'utilisation du cache."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+    def save(self) -> None:
+        """Écrit le contenu du cache dans le fichier de persistance."""
+        if not self.path:
+            return
+
+        with self._lock:
+            payload = {"format": _PERSISTENCE_FORMAT, "entries": list(self._entries.items())}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(self.path)
+        logger.debug(f"Cache des métriques sauvegardé: {len(payload['entries'])} entrées dans {self.path}")
+
+    def load(self) -> None:
+        """Charge le contenu du fichier de persistance (les erreurs sont ignorées)."""
+        if not self.path:
+            return
+
+        try:
+            with open(self.path, "rb") as f:
+                payload = pickle.load(f)
+            if payload.get("format") != _PERSISTENCE_FORMAT:
+                logger.warning(f"Format de cache des métriques obsolète ignoré: {self.path}")
+                return
+            entries = payload["entries"]
+        except Exception as e:
+            logger.warning(f"Impossible de charger le cache des métriques {self.path}: {e}")
+            return
+
+        with self._lock:
+            for key, result in entries[-self.max_entries:]:
+                self._entries[key] = result
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        logger.debug(f"Cache des métriques chargé: {len(self._entries)} entrées depuis {self.path}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_default_cache: Optional[MetricResultCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_metric_cache() -> MetricResultCache:
+    """Retourne le cache de résultats partagé par le processus (créé à la demande)."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = MetricResultCache()
+        return _default_cache
@@ -0,0 +1,277 @@
+"""Évaluation du potentiel de combos (champ × finisseur) d'une équipe, par sous-groupe.
+
+Chaque build apporte des sources de champs de combo (ex: champ d'eau) et de
+finisseurs (ex: explosion). Ce module compte ces sources par sous-groupe dans des
+tableaux NumPy (sous-groupes × champs, sous-groupes × finisseurs), puis croise ces
+comptes avec la matrice dense ``COMBO_VALUES`` de la table des combos pour noter
+les combos réalisables, comme explosion dans l'eau (soin de zone) ou explosion dans
+la lumière (résolution de zone).
+
+Les sources d'un build sont lues dans ``PlayerBuild.metadata`` :
+``combo_fields`` / ``combo_finishers`` (noms, une entrée par compétence source), ou
+``skill_ids`` résolus via un ``EffectIndex``.
+
+Exemple d'utilisation:
+    ```python
+    from app.scoring.combos import score_team_combos, score_teams_combos
+
+    potential = score_team_combos(team, effect_index=index)
+    print(potential.score, potential.achievable(0))
+
+    scores = score_teams_combos(candidate_teams, effect_index=index)  # un score par équipe
+    ```
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.game_mechanics.constants import ComboFieldType, ComboFinisherType
+from app.game_mechanics.interactions import (
+    COMBO_FIELDS,
+    COMBO_FINISHERS,
+    COMBO_TABLE,
+    COMBO_VALUES,
+    FIELD_INDEX,
+    FINISHER_INDEX,
+    EffectIndex,
+)
+from app.scoring.engine import PlayerBuild
+
+logger = logging.getLogger(__name__)
+
+# Taille maximale d'un sous-groupe
+SUBGROUP_SIZE = 5
+
+# Nombre de paires champ × finisseur au-delà duquel un combo n'apporte plus rien
+COMBO_SATURATION = 3
+
+# Échelle de la saturation exponentielle du score d'un sous-groupe
+COMBO_SCORE_SCALE = 3.0
+
+
+@dataclass
+class ComboPotential:
+    """Potentiel de combos d'une équipe.
+
+    Attributes:
+        field_counts: Sources de champs par sous-groupe (sous-groupes × champs)
+        finisher_counts: Sources de finisseurs par sous-groupe (sous-groupes × finisseurs)
+        combo_scores: Valeur de chaque combo par sous-groupe (sous-groupes × champs × finisseurs)
+        group_scores: Score de chaque sous-groupe (0-1)
+        score: Score moyen de l'équipe (0-1)
+    """
+    field_counts: np.ndarray
+    finisher_counts: np.ndarray
+    combo_scores: np.ndarray
+    group_scores: np.ndarray
+    score: float
+
+    def achievable(self, group: int) -> List[Tuple[ComboFieldType, ComboFinisherType, str]]:
+        """Retourne les combos réalisables d'un sous-groupe, du plus au moins intéressant."""
+        fields, finishers = np.nonzero(self.combo_scores[group])
+        order = np.argsort(-self.combo_scores[group][fields, finishers], kind="stable")
+        return [
+            (COMBO_FIELDS[f], COMBO_FINISHERS[k], COMBO_TABLE[(COMBO_FIELDS[f], COMBO_FINISHERS[k])]["effect"])
+            for f, k in zip(fields[order], finishers[order])
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convertit le résultat en dictionnaire sérialisable."""
+        return {
+            "score": self.score,
+            "groups": [
+                {
+                    "score": float(self.group_scores[g]),
+                    "combos": [
+                        {"field": field.value, "finisher": finisher.value, "effect": effect}
+                        for field, finisher, effect in self.achievable(g)
+                    ],
+                }
+                for g in range(len(self.group_scores))
+            ],
+        }
+
+
+def _combo_enum(value, enum_type):
+    if isinstance(value, enum_type):
+        return value
+    try:
+        return enum_type(str(value).capitalize())
+    except ValueError:
+        return None
+
+
+def player_combo_vectors(
+    player: PlayerBuild,
+    effect_index: Optional[EffectIndex] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Compte les sources de champs et de finisseurs d'un build.
+
+    Args:
+        player: Build du joueur
+        effect_index: Index des effets utilisé pour résoudre ``metadata['skill_ids']``
+
+    Returns:
+        Un tuple (comptes par champ, comptes par finisseur)
+    """
+    fields = np.zeros(len(COMBO_FIELDS))
+    finishers = np.zeros(len(COMBO_FINISHERS))
+    metadata = player.metadata
+
+    for name in metadata.get("combo_fields", ()):
+        field = _combo_enum(name, ComboFieldType)
+        if field is not None:
+            fields[FIELD_INDEX[field]] += 1
+    for name in metadata.get("combo_finishers", ()):
+        finisher = _combo_enum(name, ComboFinisherType)
+        if finisher is not None:
+            finishers[FINISHER_INDEX[finisher]] += 1
+
+    if effect_index is not None:
+        for skill_id in metadata.get("skill_ids", ()):
+            skill_fields = set()
+            skill_finishers = set()
+            for effect in effect_index.effects_for("skill", skill_id):
+                if effect.combo_field is not None:
+                    skill_fields.add(effect.combo_field)
+                if effect.combo_finisher is not None:
+                    skill_finishers.add(effect.combo_finisher)
+            for field in skill_fields:
+                fields[FIELD_INDEX[field]] += 1
+            for finisher in skill_finishers:
+                finishers[FINISHER_INDEX[finisher]] += 1
+
+    return fields, finishers
+
+
+def count_combo_sources(
+    team: Sequence[PlayerBuild],
+    effect_index: Optional[EffectIndex] = None,
+    group_size: int = SUBGROUP_SIZE
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Compte les sources de champs et de finisseurs de chaque sous-groupe.
+
+    Args:
+        team: Builds de l'équipe, dans l'ordre des sous-groupes
+        effect_index: Index des effets pour résoudre les compétences des builds
+        group_size: Taille d'un sous-groupe
+
+    Returns:
+        Un tuple de tableaux (sous-groupes × champs, sous-groupes × finisseurs)
+    """
+    n_groups = -(-len(team) // group_size)
+    fields = np.zeros((n_groups, len(COMBO_FIELDS)))
+    finishers = np.zeros((n_groups, len(COMBO_FINISHERS)))
+    if not team:
+        return fields, finishers
+
+    vectors = [player_combo_vectors(player, effect_index) for player in team]
+    groups = np.arange(len(team)) // group_size
+    np.add.at(fields, groups, np.stack([v[0] for v in vectors]))
+    np.add.at(finishers, groups, np.stack([v[1] for v in vectors]))
+    return fields, finishers
+
+
+def combo_potential_scores(
+    field_counts: np.ndarray,
+    finisher_counts: np.ndarray,
+    saturation: int = COMBO_SATURATION
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Note les combos réalisables à partir des comptes de sources.
+
+    Les tableaux peuvent avoir n'importe quelles dimensions de tête (ex: équipes ×
+    sous-groupes) : le calcul est entièrement vectorisé.
+
+    Args:
+        field_counts: Comptes de champs (... × champs)
+        finisher_counts: Comptes de finisseurs (... × finisseurs)
+        saturation: Nombre de paires au-delà duquel un combo n'apporte plus rien
+
+    Returns:
+        Un tuple (valeur de chaque combo (... × champs × finisseurs), score de chaque sous-groupe (...))
+    """
+    pairs = field_counts[..., :, None] * finisher_counts[..., None, :]
+    combos = COMBO_VALUES * np.minimum(pairs, saturation) / saturation
+    group_scores = 1.0 - np.exp(-combos.sum(axis=(-2, -1)) / COMBO_SCORE_SCALE)
+    return combos, group_scores
+
+
+def score_team_combos(
+    team: Sequence[PlayerBuild],
+    effect_index: Optional[EffectIndex] = None,
+    group_size: int = SUBGROUP_SIZE
+) -> ComboPotential:
+    """Évalue le potentiel de combos d'une équipe.
+
+    Args:
+        team: Builds de l'équipe, dans l'ordre des sous-groupes
+        effect_index: Index des effets pour résoudre les compétences des builds
+        group_size: Taille d'un sous-groupe
+
+    Returns:
+        Le potentiel de combos de l'équipe
+    """
+    fields, finishers = count_combo_sources(team, effect_index, group_size)
+    combos, group_scores = combo_potential_scores(fields, finishers)
+    score = float(group_scores.mean()) if len(group_scores) else 0.0
+    return ComboPotential(fields, finishers, combos, group_scores, score)
+
+
+def score_teams_combos(
+    teams: Sequence[Sequence[PlayerBuild]],
+    effect_index: Optional[EffectIndex] = None,
+    group_size: int = SUBGROUP_SIZE
+) -> np.ndarray:
+    """Évalue le potentiel de combos de plusieurs équipes en une passe vectorisée.
+
+    Les vecteurs de chaque build distinct ne sont calculés qu'une fois, ce qui rend
+    la fonction adaptée à l'évaluation de nombreuses équipes candidates pendant
+    l'optimisation.
+
+    Args:
+        teams: Équipes candidates
+        effect_index: Index des effets pour résoudre les compétences des builds
+        group_size: Taille d'un sous-groupe
+
+    Returns:
+        Le score (0-1) de chaque équipe
+    """
+    if not teams:
+        return np.zeros(0)
+
+    player_rows: Dict[int, int] = {}
+    players: List[PlayerBuild] = []
+    for team in teams:
+        for player in team:
+            if id(player) not in player_rows:
+                player_rows[id(player)] = len(players)
+                players.append(player)
+
+    vectors = [player_combo_vectors(player, effect_index) for player in players]
+    player_fields = np.stack([v[0] for v in vectors]) if vectors else np.zeros((0, len(COMBO_FIELDS)))
+    player_finishers = np.stack([v[1] for v in vectors]) if vectors else np.zeros((0, len(COMBO_FINISHERS)))
+
+    max_groups = max(-(-len(team) // group_size) for team in teams) or 1
+    fields = np.zeros((len(teams), max_groups, len(COMBO_FIELDS)))
+    finishers = np.zeros((len(teams), max_groups, len(COMBO_FINISHERS)))
+    mask = np.zeros((len(teams), max_groups), dtype=bool)
+
+    team_idx, group_idx, rows = [], [], []
+    for t, team in enumerate(teams):
+        for position, player in enumerate(team):
+            team_idx.append(t)
+            group_idx.append(position // group_size)
+            rows.append(player_rows[id(player)])
+    if rows:
+        team_idx, group_idx, rows = np.array(team_idx), np.array(group_idx), np.array(rows)
+        np.add.at(fields, (team_idx, group_idx), player_fields[rows])
+        np.add.at(finishers, (team_idx, group_idx), player_finishers[rows])
+        mask[team_idx, group_idx] = True
+
+    _, group_scores = combo_potential_scores(fields, finishers)
+    n_groups = mask.sum(axis=1)
+    return np.where(n_groups > 0, (group_scores * mask).sum(axis=1) / np.maximum(n_groups, 1), 0.0)
@@ -472,6 +472,47 @@ def _calculate_duplicate_penalty(
         for count in profession_counts.values()
     )
 
+def _combine_scores(
+    buff_score: float,
+    max_buff_score: float,
+    role_score: float,
+    max_role_score: float,
+    duplicate_penalty: float
+) -> Tuple[float, float, float]:
+    """Combine les composantes brutes en un score total normalisé.
+    
+    Args:
+        buff_score: Score brut de couverture des buffs
+        max_buff_score: Score de buffs maximal possible
+        role_score: Score brut de couverture des rôles
+        max_role_score: Score de rôles maximal possible
+        duplicate_penalty: Pénalité brute pour les doublons
+        
+    Returns:
+        Un tuple (score total, score de buffs normalisé, score de rôles normalisé),
+        chacun dans l'intervalle [0.0, 1.0]
+    """
+    # Éviter la division par zéro
+    normalized_buff_score = buff_score / max_buff_score if max_buff_score > 0 else 0.0
+    normalized_role_score = role_score / max_role_score if max_role_score > 0 else 0.0
+    
+    # Calcul du score total normalisé (moyenne pondérée des scores normalisés)
+    # avec application des poids globaux pour chaque composante
+    total_score = (normalized_buff_score * BUFF_COVERAGE_WEIGHT +
+                  normalized_role_score * ROLE_COVERAGE_WEIGHT)
+    
+    # Appliquer la pénalité (en pourcentage du score total)
+    if duplicate_penalty > 0 and total_score > 0:
+        # La pénalité est une fraction du score total, mais ne peut pas le rendre négatif
+        penalty_ratio = min(1.0, duplicate_penalty / (buff_score + role_score)) if (buff_score + role_score) > 0 else 0.0
+        total_score *= (1.0 - penalty_ratio * DUPLICATE_PENALTY_WEIGHT)
+    
+    # S'assurer que le score final est dans l'intervalle [0.0, 1.0]
+    total_score = max(0.0, min(1.0, total_score))
+    
+    # S'assurer que les scores normalisés sont bien dans [0.0, 1.0]
+    return total_score, min(1.0, normalized_buff_score), min(1.0, normalized_role_score)
+
 def score_team(team: Iterable[PlayerBuild], config: ScoringConfig) -> TeamScoreResult:
     """Calcule le score d'une équipe en fonction de sa composition.
     
@@ -562,28 +603,9 @@ def score_team(team: Iterable[PlayerBuild], config: ScoringConfig) -> TeamScoreR
     max_buff_score = sum(weight for _, weight in buff_weights_fs) if buff_weights_fs else 1.0
     max_role_score = sum(weight for _, weight, _ in role_weights_fs) if role_weights_fs else 1.0
     
-    # Éviter la division par zéro
-    normalized_buff_score = buff_score / max_buff_score if max_buff_score > 0 else 0.0
-    normalized_role_score = role_score / max_role_score if max_role_score > 0 else 0.0
-    
-    # Calcul du score total normalisé (moyenne pondérée des scores normalisés)
-    # avec application des poids globaux pour chaque composante
-    total_score = (normalized_buff_score * BUFF_COVERAGE_WEIGHT +
-                  normalized_role_score * ROLE_COVERAGE_WEIGHT)
-    
-    # Appliquer la pénalité (en pourcentage du score total)
-    if duplicate_penalty > 0 and total_score > 0:
-        # La pénalité est une fraction du score total, mais ne peut pas le rendre négatif
-        penalty_ratio = min(1.0, duplicate_penalty / (buff_score + role_score)) if (buff_score + role_score) > 0 else 0.0
-        total_score *= (1.0 - penalty_ratio * DUPLICATE_PENALTY_WEIGHT)
-    
-    # S'assurer que le score final est dans l'intervalle [0.0, 1.0]
-    # En utilisant math.fsum pour une meilleure précision avec les flottants
-    total_score = max(0.0, min(1.0, total_score))
-    
-    # S'assurer que les scores normalisés sont bien dans [0.0, 1.0]
-    normalized_buff_score = min(1.0, normalized_buff_score)
-    normalized_role_score = min(1.0, normalized_role_score)
+    total_score, normalized_buff_score, normalized_role_score = _combine_scores(
+        buff_score, max_buff_score, role_score, max_role_score, duplicate_penalty
+    )
     
     # Log de débogage pour vérifier les valeurs
     logger.debug("Scores normalisés - buff_score: %f, role_score: %f", 
@@ -0,0 +1,80 @@
+"""Empreinte canonique des builds GW2.
+
+Deux builds composés des mêmes éléments (profession, spécialisations, compétences,
+armes, équipement) doivent produire la même empreinte, quel que soit l'ordre dans
+lequel ces éléments ont été sélectionnés. L'empreinte sert de clé de déduplication
+pour la génération parallèle et de clé de cache pour le scoring.
+"""
+
+import hashlib
+import json
+from typing import Any, Iterable, List, Optional
+
+# Taille du condensé en octets (32 caractères hexadécimaux)
+FINGERPRINT_DIGEST_SIZE = 16
+
+
+def _entity_key(entity: Any) -> Optional[str]:
+    """Retourne une clé stable pour une entité du build (ID, sinon nom)."""
+    if entity is None:
+        return None
+    if isinstance(entity, (str, int)):
+        return str(entity)
+
+    entity_id = getattr(entity, 'id', None)
+    if entity_id is not None:
+        return str(entity_id)
+
+    name = getattr(entity, 'name', None)
+    if name is not None:
+        return f"name:{name}"
+
+    return repr(entity)
+
+
+def _slot_keys(entities: Optional[Iterable[Any]]) -> List[str]:
+    """Retourne les clés triées d'un emplacement (l'ordre de sélection est ignoré)."""
+    return sorted(key for key in map(_entity_key, entities or ()) if key is not None)
+
+
+def build_fingerprint(
+    profession: Any,
+    specializations: Optional[Iterable[Any]] = None,
+    skills: Optional[Iterable[Any]] = None,
+    weapons: Optional[Iterable[Any]] = None,
+    armor: Optional[Iterable[Any]] = None,
+    trinkets: Optional[Iterable[Any]] = None,
+    upgrades: Optional[Iterable[Any]] = None,
+) -> str:
+    """Calcule l'empreinte canonique d'un build.
+
+    Les éléments peuvent être des modèles SQLAlchemy, des objets exposant un
+    attribut ``id`` ou directement des identifiants.
+
+    Args:
+        profession: Profession du build (modèle ou identifiant)
+        specializations: Spécialisations choisies
+        skills: Compétences sélectionnées
+        weapons: Armes équipées
+        armor: Pièces d'armure
+        trinkets: Bijoux
+        upgrades: Améliorations (runes, cachets, etc.)
+
+    Returns:
+        Une chaîne hexadécimale identifiant le build
+
+    Example:
+        >>> build_fingerprint("Guardian", [42, 16], [9083]) == build_fingerprint("Guardian", [16, 42], [9083])
+        True
+    """
+    payload = [
+        _entity_key(profession),
+        _slot_keys(specializations),
+        _slot_keys(skills),
+        _slot_keys(weapons),
+        _slot_keys(armor),
+        _slot_keys(trinkets),
+        _slot_keys(upgrades),
+    ]
+    encoded = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=FINGERPRINT_DIGEST_SIZE).hexdigest()
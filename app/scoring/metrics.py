@@ -1,14 +1,17 @@
 """Métriques de base pour l'évaluation des builds GW2."""
 
-from typing import Dict, List, Set, Tuple, Optional, Any, Union
+from typing import Dict, List, Set, Tuple, Optional, Any, Union, Sequence
 from dataclasses import dataclass
 from enum import Enum, auto
 import math
 
+import numpy as np
+
 from app.game_mechanics import (
     RoleType, GameMode, BuffType, ConditionType, BoonType, 
     AttributeType, DamageType, SkillCategory, ComboFieldType, ComboFinisherType
 )
+from app.game_mechanics.rotation import RotationResult, RotationSimulator
 from app.models import (
     Profession, Specialization, Skill, Trait, 
     Weapon, Armor, Trinket, UpgradeComponent
@@ -52,6 +55,10 @@ class MetricResult:
 class BaseMetric:
     """Classe de base pour les métriques d'évaluation."""
     
+    # Version de l'algorithme ; à incrémenter lorsque le calcul change pour
+    # invalider les résultats mis en cache (voir app.scoring.cache)
+    version: int = 1
+    
     def __init__(self, weight: float = 1.0, **kwargs):
         self.weight = weight
         self.metric_type = MetricType(kwargs.get('metric_type', 'attribute_score'))
@@ -71,10 +78,112 @@ class BaseMetric:
     ) -> MetricResult:
         """Évalue la métrique pour un build donné."""
         raise NotImplementedError("La méthode evaluate doit être implémentée par les sous-classes")
+    
+    def evaluate_batch(
+        self,
+        builds: Sequence[Dict[str, Any]],
+        game_mode: GameMode = GameMode.PVE,
+        role: Optional[RoleType] = None,
+        **kwargs
+    ) -> List[MetricResult]:
+        """Évalue la métrique pour plusieurs builds à la fois.
+        
+        L'implémentation par défaut appelle ``evaluate`` pour chaque build. Les
+        sous-classes peuvent la surcharger pour vectoriser le calcul.
+        
+        Args:
+            builds: Builds à évaluer, chacun sous forme de dictionnaire contenant
+                les arguments de ``evaluate`` (profession, specializations, etc.)
+            game_mode: Mode de jeu ciblé
+            role: Rôle ciblé
+            **kwargs: Contexte supplémentaire transmis à chaque évaluation
+            
+        Returns:
+            Un résultat par build, dans l'ordre de ``builds``
+        """
+        return [
+            self.evaluate(**build, game_mode=game_mode, role=role, **kwargs)
+            for build in builds
+        ]
+
+def calculate_build_attributes(profession, specializations, weapons, armor, trinkets, upgrades) -> Dict[AttributeType, int]:
+    """Calcule les attributs totaux du build."""
+    # TODO: Implémenter le calcul des attributs à partir de l'équipement, des runes, etc.
+    attributes = {
+        AttributeType.POWER: 1000,
+        AttributeType.PRECISION: 1000,
+        AttributeType.TOUGHNESS: 1000,
+        AttributeType.VITALITY: 1000,
+        AttributeType.CONCENTRATION: 0,
+        AttributeType.CONDITION_DAMAGE: 0,
+        AttributeType.EXPERTISE: 0,
+        AttributeType.FEROCITY: 0,
+        AttributeType.HEALING_POWER: 0,
+    }
+    
+    # Appliquer les bonus des spécialisations
+    for spec in specializations:
+        # TODO: Ajouter les bonus d'attributs des traits sélectionnés
+        pass
+    
+    # Appliquer les bonus de l'équipement
+    for item in [*armor, *trinkets, *upgrades]:
+        # TODO: Ajouter les attributs de l'équipement
+        pass
+    
+    return attributes
 
 class AttributeScoreMetric(BaseMetric):
     """Évalue le score d'attributs d'un build."""
     
+    # Poids des attributs par rôle
+    ROLE_WEIGHTS = {
+        RoleType.HEALER: {
+            AttributeType.HEALING_POWER: 2.0,
+            AttributeType.CONCENTRATION: 1.8,
+            AttributeType.VITALITY: 1.2,
+            AttributeType.TOUGHNESS: 1.0,
+            AttributeType.POWER: 0.5,
+            AttributeType.PRECISION: 0.3,
+            AttributeType.FEROCITY: 0.2,
+            AttributeType.CONDITION_DAMAGE: 0.1,
+            AttributeType.EXPERTISE: 0.1,
+        },
+        RoleType.DPS: {
+            AttributeType.POWER: 2.0,
+            AttributeType.PRECISION: 1.8,
+            AttributeType.FEROCITY: 1.6,
+            AttributeType.CONDITION_DAMAGE: 1.4,
+            AttributeType.EXPERTISE: 1.2,
+            AttributeType.VITALITY: 0.8,
+            AttributeType.TOUGHNESS: 0.5,
+            AttributeType.HEALING_POWER: 0.1,
+            AttributeType.CONCENTRATION: 0.1,
+        },
+        RoleType.SUPPORT: {
+            AttributeType.CONCENTRATION: 2.0,
+            AttributeType.HEALING_POWER: 1.8,
+            AttributeType.VITALITY: 1.2,
+            AttributeType.TOUGHNESS: 1.0,
+            AttributeType.POWER: 0.6,
+            AttributeType.PRECISION: 0.4,
+            AttributeType.FEROCITY: 0.3,
+            AttributeType.CONDITION_DAMAGE: 0.2,
+            AttributeType.EXPERTISE: 0.2,
+        },
+        RoleType.TANK: {
+            AttributeType.TOUGHNESS: 2.5,
+            AttributeType.VITALITY: 2.0,
+            AttributeType.HEALING_POWER: 1.0,
+            AttributeType.CONCENTRATION: 0.8,
+            AttributeType.POWER: 0.5,
+            AttributeType.PRECISION: 0.3,
+            AttributeType.FEROCITY: 0.2,
+            AttributeType.CONDITION_DAMAGE: 0.1,
+            AttributeType.EXPERTISE: 0.1,
+        },
+    }
+    
     def __init__(self, **kwargs):
         super().__init__(metric_type=MetricType.ATTRIBUTE_SCORE, **kwargs)
         
@@ -92,32 +201,50 @@ class AttributeScoreMetric(BaseMetric):
             details={"attributes": attributes}
         )
     
-    def _calculate_attributes(self, profession, specializations, weapons, armor, trinkets, upgrades) -> Dict[AttributeType, int]:
-        """Calcule les attributs totaux du build."""
-        # TODO: Implémenter le calcul des attributs à partir de l'équipement, des runes, etc.
-        attributes = {
-            AttributeType.POWER: 1000,
-            AttributeType.PRECISION: 1000,
-            AttributeType.TOUGHNESS: 1000,
-            AttributeType.VITALITY: 1000,
-            AttributeType.CONCENTRATION: 0,
-            AttributeType.CONDITION_DAMAGE: 0,
-            AttributeType.EXPERTISE: 0,
-            AttributeType.FEROCITY: 0,
-            AttributeType.HEALING_POWER: 0,
-        }
+    def evaluate_batch(self, builds, game_mode=GameMode.PVE, role=None, **kwargs):
+        """Évalue plusieurs builds en un seul produit matriciel.
         
-        # Appliquer les bonus des spécialisations
-        for spec in specializations:
-            # TODO: Ajouter les bonus d'attributs des traits sélectionnés
-            pass
+        Les attributs de chaque build forment une ligne d'une matrice
+        (builds × attributs) ; le score par rôle devient un produit avec le
+        vecteur des poids du rôle.
+        """
+        if not builds:
+            return []
         
-        # Appliquer les bonus de l'équipement
-        for item in [*armor, *trinkets, *upgrades]:
-            # TODO: Ajouter les attributs de l'équipement
-            pass
+        attributes_list = [
+            self._calculate_attributes(
+                build['profession'], build.get('specializations', []), build.get('weapons', []),
+                build.get('armor', []), build.get('trinkets', []), build.get('upgrades', [])
+            )
+            for build in builds
+        ]
+        attribute_order = list(attributes_list[0].keys())
+        matrix = np.array(
+            [[attributes.get(attr, 0) for attr in attribute_order] for attributes in attributes_list],
+            dtype=np.float64
+        )
+        
+        if role is None:
+            scores = matrix.mean(axis=1)
+        else:
+            weights = self.ROLE_WEIGHTS.get(role, self.ROLE_WEIGHTS[RoleType.DPS])
+            weight_vector = np.array([weights.get(attr, 0.0) for attr in attribute_order])
+            total_weight = weight_vector.sum()
+            scores = matrix @ weight_vector / total_weight if total_weight else np.zeros(len(builds))
         
-        return attributes
+        return [
+            MetricResult(
+                metric_type=self.metric_type,
+                value=float(score),
+                weight=self.weight,
+                details={"attributes": attributes}
+            )
+            for score, attributes in zip(scores, attributes_list)
+        ]
+    
+    def _calculate_attributes(self, profession, specializations, weapons, armor, trinkets, upgrades) -> Dict[AttributeType, int]:
+        """Calcule les attributs totaux du build."""
+        return calculate_build_attributes(profession, specializations, weapons, armor, trinkets, upgrades)
     
     def _calculate_role_based_score(self, attributes: Dict[AttributeType, int], role: Optional[RoleType]) -> float:
         """Calcule un score basé sur les attributs et le rôle."""
@@ -125,56 +252,8 @@ class AttributeScoreMetric(BaseMetric):
             # Si aucun rôle n'est spécifié, calculer un score équilibré
             return sum(attributes.values()) / len(attributes)
         
-        # Poids des attributs par rôle
-        role_weights = {
-            RoleType.HEALER: {
-                AttributeType.HEALING_POWER: 2.0,
-                AttributeType.CONCENTRATION: 1.8,
-                AttributeType.VITALITY: 1.2,
-                AttributeType.TOUGHNESS: 1.0,
-                AttributeType.POWER: 0.5,
-                AttributeType.PRECISION: 0.3,
-                AttributeType.FEROCITY: 0.2,
-                AttributeType.CONDITION_DAMAGE: 0.1,
-                AttributeType.EXPERTISE: 0.1,
-            },
-            RoleType.DPS: {
-                AttributeType.POWER: 2.0,
-                AttributeType.PRECISION: 1.8,
-                AttributeType.FEROCITY: 1.6,
-                AttributeType.CONDITION_DAMAGE: 1.4,
-                AttributeType.EXPERTISE: 1.2,
-                AttributeType.VITALITY: 0.8,
-                AttributeType.TOUGHNESS: 0.5,
-                AttributeType.HEALING_POWER: 0.1,
-                AttributeType.CONCENTRATION: 0.1,
-            },
-            RoleType.SUPPORT: {
-                AttributeType.CONCENTRATION: 2.0,
-                AttributeType.HEALING_POWER: 1.8,
-                AttributeType.VITALITY: 1.2,
-                AttributeType.TOUGHNESS: 1.0,
-                AttributeType.POWER: 0.6,
-                AttributeType.PRECISION: 0.4,
-                AttributeType.FEROCITY: 0.3,
-                AttributeType.CONDITION_DAMAGE: 0.2,
-                AttributeType.EXPERTISE: 0.2,
-            },
-            RoleType.TANK: {
-                AttributeType.TOUGHNESS: 2.5,
-                AttributeType.VITALITY: 2.0,
-                AttributeType.HEALING_POWER: 1.0,
-                AttributeType.CONCENTRATION: 0.8,
-                AttributeType.POWER: 0.5,
-                AttributeType.PRECISION: 0.3,
-                AttributeType.FEROCITY: 0.2,
-                AttributeType.CONDITION_DAMAGE: 0.1,
-                AttributeType.EXPERTISE: 0.1,
-            },
-        }
-        
         # Utiliser les poids du rôle spécifié (par défaut à DPS si non trouvé)
-        weights = role_weights.get(role, role_weights[RoleType.DPS])
+        weights = self.ROLE_WEIGHTS.get(role, self.ROLE_WEIGHTS[RoleType.DPS])
         
         # Calculer le score pondéré
         total_weight = sum(weights.values())
@@ -265,99 +344,96 @@ class BoonUptimeMetric(BaseMetric):
         
         return uptimes
 
-class ConditionDamageMetric(BaseMetric):
+class RotationMetric(BaseMetric):
+    """Base des métriques de dégâts s'appuyant sur la simulation de rotation.
+    
+    Les compétences du build (y compris celles des armes) sont rejouées par un
+    ``RotationSimulator`` partagé par toutes les évaluations de la métrique.
+    """
+    
+    def __init__(self, fight_duration: float = 60.0, simulator: Optional[RotationSimulator] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.simulator = simulator or RotationSimulator(fight_duration=fight_duration)
+    
+    def _simulate(self, profession, specializations, skills, weapons, armor, trinkets, upgrades) -> RotationResult:
+        """Simule la rotation du build avec ses attributs."""
+        attributes = calculate_build_attributes(profession, specializations, weapons, armor, trinkets, upgrades)
+        return self.simulator.simulate(self._rotation_skills(skills, weapons), attributes)
+    
+    def _rotation_skills(self, skills, weapons) -> List[Any]:
+        """Retourne les compétences du build par ordre de priorité.
+        
+        Les compétences au temps de recharge le plus long sont lancées en
+        priorité ; celles sans recharge servent d'attaque automatique.
+        """
+        seen = set()
+        rotation = []
+        for skill in [*skills, *(s for weapon in weapons for s in (getattr(weapon, 'skills', None) or []))]:
+            key = getattr(skill, 'id', None) or id(skill)
+            if key in seen:
+                continue
+            seen.add(key)
+            rotation.append(skill)
+        
+        return sorted(rotation, key=lambda skill: -self.simulator.profile(skill).recharge)
+
+class DirectDamageMetric(RotationMetric):
+    """Évalue les dégâts directs (strike) d'un build à partir de sa rotation simulée."""
+    
+    def __init__(self, **kwargs):
+        super().__init__(metric_type=MetricType.DIRECT_DAMAGE, **kwargs)
+    
+    def evaluate(self, profession, specializations, skills, weapons, armor, trinkets, upgrades, game_mode=GameMode.PVE, role=None, **kwargs):
+        simulation = self._simulate(profession, specializations, skills, weapons, armor, trinkets, upgrades)
+        
+        return MetricResult(
+            metric_type=self.metric_type,
+            value=simulation.direct_dps,
+            weight=self.weight,
+            details={
+                "estimated_dps": simulation.direct_dps,
+                "might_average": simulation.might_average,
+                "fury_uptime": simulation.fury_uptime,
+                "casts": simulation.casts,
+            }
+        )
+
+class ConditionDamageMetric(RotationMetric):
     """Évalue le potentiel de dégâts de conditions d'un build."""
     
+    # Le DPS est désormais issu de la simulation de rotation
+    version = 2
+    
+    # Part minimale des dégâts de conditions pour considérer un build « condition »
+    CONDITION_SHARE_THRESHOLD = 0.5
+    
     def __init__(self, **kwargs):
         super().__init__(metric_type=MetricType.CONDITION_DAMAGE, **kwargs)
     
     def evaluate(self, profession, specializations, skills, weapons, armor, trinkets, upgrades, game_mode=GameMode.PVE, role=None, **kwargs):
+        simulation = self._simulate(profession, specializations, skills, weapons, armor, trinkets, upgrades)
+        
         # Vérifier si le build est orienté dégâts de conditions
-        if not self._is_condition_build(specializations, skills, weapons):
+        if not self._is_condition_build(simulation):
             return MetricResult(
                 metric_type=self.metric_type,
                 value=0.0,
                 weight=0.0,  # Pas de pénalité pour les builds non-condition
-                details={"is_condition_build": False}
+                details={"is_condition_build": False, "condition_share": simulation.condition_share}
             )
         
-        # Analyser les types de conditions appliqués
-        condition_types = self._analyze_condition_types(skills, weapons, specializations)
-        
-        # Estimer le DPS des conditions
-        condition_dps = self._estimate_condition_dps(condition_types, specializations, trinkets, upgrades)
-        
         return MetricResult(
             metric_type=self.metric_type,
-            value=condition_dps,
+            value=simulation.condition_dps,
             weight=self.weight,
             details={
                 "is_condition_build": True,
-                "condition_types": {c.name: v for c, v in condition_types.items()},
-                "estimated_dps": condition_dps
+                "condition_types": {c.name: v for c, v in simulation.average_condition_stacks.items()},
+                "condition_share": simulation.condition_share,
+                "estimated_dps": simulation.condition_dps
             }
         )
     
-    def _is_condition_build(self, specializations, skills, weapons) -> bool:
+    def _is_condition_build(self, simulation: RotationResult) -> bool:
         """Détermine si le build est orienté dégâts de conditions."""
-        # Vérifier les spécialisations pour des traits améliorant les conditions
-        for spec in specializations:
-            # TODO: Vérifier si la spécialisation contient des traits de condition
-            pass
-        
-        # Vérifier les compétences pour des applications de conditions
-        for skill in skills:
-            # TODO: Vérifier si la compétence applique des conditions
-            pass
-        
-        # Vérifier les armes pour des compétences de condition
-        for weapon in weapons:
-            # TODO: Vérifier si l'arme est typiquement utilisée pour les builds condition
-            pass
-        
-        # Par défaut, supposer que ce n'est pas un build condition
-        return False
-    
-    def _analyze_condition_types(self, skills, weapons, specializations) -> Dict[ConditionType, float]:
-        """Analyse les types de conditions appliqués par le build."""
-        condition_stacks = {cond: 0.0 for cond in ConditionType}
-        
-        # Analyser les compétences
-        for skill in skills:
-            # TODO: Extraire les conditions appliquées par la compétence
-            # et estimer le nombre de stacks par seconde
-            pass
-        
-        # Analyser les armes
-        for weapon in weapons:
-            # TODO: Extraire les conditions appliquées par les compétences d'arme
-            pass
-        
-        # Analyser les traits de spécialisation
-        for spec in specializations:
-            # TODO: Ajouter les bonus de condition des traits
-            pass
-        
-        return {k: v for k, v in condition_stacks.items() if v > 0}
-    
-    def _estimate_condition_dps(self, condition_types: Dict[ConditionType, float], specializations, trinkets, upgrades) -> float:
-        """Estime le DPS des conditions appliquées."""
-        # Dégâts de base par type de condition (par stack par seconde)
-        base_damage = {
-            ConditionType.BLEEDING: 110,
-            ConditionType.BURNING: 400,
-            ConditionType.CONFUSION: 200,  # Varie selon l'activité de la cible
-            ConditionType.POISON: 100,
-            ConditionType.TORMENT: 220,  # Plus élevé si la cible bouge
-        }
-        
-        # Calculer le DPS total
-        total_dps = 0.0
-        for cond, stacks in condition_types.items():
-            if cond in base_damage:
-                # Ajuster les dégâts en fonction des attributs (Condition Damage, Expertise)
-                # TODO: Prendre en compte les attributs du personnage
-                damage_multiplier = 1.0
-                total_dps += base_damage[cond] * stacks * damage_multiplier
-        
-        return total_dps
+        return simulation.total_damage > 0 and simulation.condition_share >= self.CONDITION_SHARE_THRESHOLD
@@ -4,14 +4,18 @@ Ce module fournit une classe BuildScorer qui permet d'évaluer des builds de per
 en utilisant diverses métriques de performance et de synergie.
 """
 
-from typing import Dict, List, Optional, Any, Tuple, Set
+from typing import Dict, List, Optional, Any, Tuple, Set, Sequence
 from dataclasses import dataclass, field
+import copy
 import logging
 
+import numpy as np
+
 from app.game_mechanics import (
     RoleType, GameMode, BuffType, ConditionType, BoonType, 
     AttributeType, DamageType, SkillCategory
 )
+from app.game_mechanics.rotation import RotationSimulator
 from app.models import (
     Profession, Specialization, Skill, Trait, 
     Weapon, Armor, Trinket, UpgradeComponent
@@ -19,8 +23,10 @@ from app.models import (
 
 from .metrics import (
     BaseMetric, MetricType, MetricResult,
-    AttributeScoreMetric, BoonUptimeMetric, ConditionDamageMetric
+    AttributeScoreMetric, BoonUptimeMetric, ConditionDamageMetric, DirectDamageMetric
 )
+from .cache import MetricResultCache
+from .fingerprint import build_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -59,7 +65,8 @@ d'un build de personnage selon différents critères (dégâts, survie, soutien,
         game_mode: GameMode = GameMode.PVE,
         role: Optional[RoleType] = None,
         custom_metrics: Optional[List[BaseMetric]] = None,
-        default_metric_weights: Optional[Dict[MetricType, float]] = None
+        default_metric_weights: Optional[Dict[MetricType, float]] = None,
+        result_cache: Optional[MetricResultCache] = None
     ):
         """Initialise le système de scoring.
         
@@ -68,9 +75,11 @@ d'un build de personnage selon différents critères (dégâts, survie, soutien,
             role: Rôle cible pour l'évaluation (influence le poids des métriques)
             custom_metrics: Liste personnalisée de métriques à utiliser
             default_metric_weights: Poids personnalisés pour les métriques par défaut
+            result_cache: Cache des résultats de métriques (None pour le désactiver)
         """
         self.game_mode = game_mode
         self.role = role
+        self.result_cache = result_cache
         
         # Définir les poids par défaut des métriques selon le rôle
         self.default_metric_weights = self._get_default_weights(role)
@@ -146,11 +155,19 @@ d'un build de personnage selon différents critères (dégâts, survie, soutien,
         if custom_metrics:
             return custom_metrics
         
+        # Les métriques de dégâts partagent le même simulateur (et ses profils compilés)
+        simulator = RotationSimulator()
+        
         # Utiliser les métriques par défaut avec les poids appropriés
         metrics = [
             AttributeScoreMetric(weight=self.default_metric_weights[MetricType.ATTRIBUTE_SCORE]),
             BoonUptimeMetric(weight=self.default_metric_weights[MetricType.BOON_UPTIME]),
-            ConditionDamageMetric(weight=self.default_metric_weights[MetricType.CONDITION_DAMAGE]),
+            DirectDamageMetric(
+                weight=self.default_metric_weights[MetricType.DIRECT_DAMAGE], simulator=simulator
+            ),
+            ConditionDamageMetric(
+                weight=self.default_metric_weights[MetricType.CONDITION_DAMAGE], simulator=simulator
+            ),
             # TODO: Ajouter d'autres métriques par défaut
         ]
         
@@ -182,47 +199,161 @@ d'un build de personnage selon différents critères (dégâts, survie, soutien,
         Returns:
             Un objet BuildEvaluation contenant le score et les détails
         """
-        evaluation = BuildEvaluation()
+        build = {
+            "profession": profession,
+            "specializations": specializations,
+            "skills": skills,
+            "weapons": weapons,
+            "armor": armor,
+            "trinkets": trinkets,
+            "upgrades": upgrades,
+        }
+        return self.evaluate_builds([build], context=context)[0]
+    
+    def evaluate_builds(
+        self,
+        builds: Sequence[Dict[str, Any]],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[BuildEvaluation]:
+        """Évalue plusieurs builds en appelant chaque métrique une seule fois par lot.
+        
+        Chaque métrique reçoit l'ensemble des builds via ``evaluate_batch``. Si
+        l'évaluation par lot échoue, la métrique est réévaluée build par build
+        afin qu'une erreur sur un build n'affecte pas les autres.
+        
+        Si un cache de résultats est configuré et qu'aucun contexte n'est fourni,
+        seuls les builds absents du cache sont évalués.
+        
+        Args:
+            builds: Builds à évaluer (mêmes clés que les arguments de evaluate_build)
+            context: Contexte supplémentaire pour l'évaluation
+            
+        Returns:
+            Une évaluation par build, dans l'ordre de ``builds``
+        """
         context = context or {}
+        evaluations = [BuildEvaluation() for _ in builds]
+        if not builds:
+            return evaluations
+        
+        # Le contexte est libre et peut influencer les métriques : on ne met
+        # en cache que les évaluations sans contexte
+        fingerprints = None
+        if self.result_cache is not None and not context:
+            fingerprints = [build_fingerprint(**build) for build in builds]
         
-        # Évaluer le build avec chaque métrique
+        # Évaluer tous les builds avec chaque métrique
         for metric in self.metrics:
+            if fingerprints is not None:
+                results = self._evaluate_metric_cached(metric, builds, fingerprints)
+            else:
+                results = self._evaluate_metric(metric, builds, context)
+            
+            for evaluation, result in zip(evaluations, results):
+                if result is None:
+                    continue
+                # Stocker le résultat
+                evaluation.metric_results[metric.metric_type] = result
+                evaluation.total_score += result.weighted_value
+        
+        for build, evaluation in zip(builds, evaluations):
+            # Normaliser le score total (optionnel)
+            evaluation.total_score = self._normalize_score(evaluation.total_score)
+            
+            # Ajouter des détails supplémentaires
+            evaluation.details.update({
+                "profession": build["profession"].name,
+                "specializations": [s.name for s in build.get("specializations", [])],
+                "role": self.role.value if self.role else "Aucun rôle spécifique",
+                "game_mode": self.game_mode.value,
+            })
+        
+        return evaluations
+    
+    def _evaluate_metric_cached(
+        self,
+        metric: BaseMetric,
+        builds: Sequence[Dict[str, Any]],
+        fingerprints: Sequence[str]
+    ) -> List[Optional[MetricResult]]:
+        """Évalue une métrique en ne calculant que les builds absents du cache.
+        
+        Les builds identiques d'un même lot ne sont calculés qu'une fois.
+        """
+        keys = [
+            self.result_cache.make_key(fingerprint, metric, self.game_mode, self.role)
+            for fingerprint in fingerprints
+        ]
+        results: List[Optional[MetricResult]] = [self.result_cache.get(key) for key in keys]
+        
+        # Premier build de chaque clé absente du cache
+        missing: Dict[Any, int] = {}
+        for i, result in enumerate(results):
+            if result is None:
+                missing.setdefault(keys[i], i)
+        if missing:
+            computed = self._evaluate_metric(metric, [builds[i] for i in missing.values()], {})
+            by_key = dict(zip(missing, computed))
+            for key, result in by_key.items():
+                if result is not None:
+                    self.result_cache.put(key, result)
+            for i, key in enumerate(keys):
+                if results[i] is None and by_key.get(key) is not None:
+                    # Chaque build reçoit son propre résultat, comme depuis le cache
+                    result = by_key[key]
+                    results[i] = result if i == missing[key] else copy.deepcopy(result)
+        
+        return results
+    
+    def _evaluate_metric(
+        self,
+        metric: BaseMetric,
+        builds: Sequence[Dict[str, Any]],
+        context: Dict[str, Any]
+    ) -> List[Optional[MetricResult]]:
+        """Évalue une métrique sur un lot de builds, avec repli build par build.
+        
+        Une métrique sans évaluation vectorisée est directement évaluée build
+        par build : l'implémentation par défaut de ``evaluate_batch`` ferait la
+        même chose sans isoler les erreurs, et un échec réévaluerait les builds
+        déjà traités.
+        
+        Returns:
+            Un résultat par build, ou None pour les builds dont l'évaluation a échoué
+        """
+        if type(metric).evaluate_batch is not BaseMetric.evaluate_batch:
             try:
-                result = metric.evaluate(
-                    profession=profession,
-                    specializations=specializations,
-                    skills=skills,
-                    weapons=weapons,
-                    armor=armor,
-                    trinkets=trinkets,
-                    upgrades=upgrades,
+                results = metric.evaluate_batch(
+                    builds, game_mode=self.game_mode, role=self.role, **context
+                )
+                if len(results) == len(builds):
+                    return list(results)
+                logger.warning(
+                    f"La métrique {metric.__class__.__name__} a retourné {len(results)} résultats "
+                    f"pour {len(builds)} builds, repli sur l'évaluation individuelle"
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Échec de l'évaluation par lot avec la métrique {metric.__class__.__name__}, "
+                    f"repli sur l'évaluation individuelle: {e}"
+                )
+        
+        results: List[Optional[MetricResult]] = []
+        for build in builds:
+            try:
+                results.append(metric.evaluate(
+                    **build,
                     game_mode=self.game_mode,
                     role=self.role,
                     **context
-                )
-                
-                # Stocker le résultat
-                evaluation.metric_results[metric.metric_type] = result
-                evaluation.total_score += result.weighted_value
-                
+                ))
             except Exception as e:
                 logger.error(
                     f"Erreur lors de l'évaluation avec la métrique {metric.__class__.__name__}: {e}",
                     exc_info=True
                 )
-        
-        # Normaliser le score total (optionnel)
-        evaluation.total_score = self._normalize_score(evaluation.total_score)
-        
-        # Ajouter des détails supplémentaires
-        evaluation.details.update({
-            "profession": profession.name,
-            "specializations": [s.name for s in specializations],
-            "role": self.role.value if self.role else "Aucun rôle spécifique",
-            "game_mode": self.game_mode.value,
-        })
-        
-        return evaluation
+                results.append(None)
+        return results
     
     def _normalize_score(self, raw_score: float) -> float:
         """Normalise le score brut dans une plage plus standard (0-1000)."""
@@ -246,10 +377,12 @@ d'un build de personnage selon différents critères (dégâts, survie, soutien,
         Returns:
             Un dictionnaire contenant les scores et une comparaison détaillée
         """
-        # Évaluer les deux builds
-        eval1 = self.evaluate_build(**build1, context=context)
-        eval2 = self.evaluate_build(**build2, context=context)
-        
+        # Évaluer les deux builds en un seul lot
+        eval1, eval2 = self.evaluate_builds([build1, build2], context=context)
+        return self._compare_evaluations(eval1, eval2)
+    
+    def _compare_evaluations(self, eval1: BuildEvaluation, eval2: BuildEvaluation) -> Dict[str, Any]:
+        """Construit la comparaison détaillée de deux évaluations existantes."""
         # Préparer la comparaison
         comparison = {
             "build1": {
@@ -286,3 +419,53 @@ d'un build de personnage selon différents critères (dégâts, survie, soutien,
             comparison["winner_margin"] = abs(eval1.total_score - eval2.total_score)
         
         return comparison
+    
+    def compare_builds_matrix(
+        self,
+        builds: Sequence[Dict[str, Any]],
+        context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Compare tous les builds deux à deux à partir d'une seule évaluation par build.
+        
+        Contrairement à des appels répétés à ``compare_builds``, chaque build n'est
+        évalué qu'une fois ; les matrices de différences sont ensuite obtenues par
+        diffusion (broadcasting) NumPy.
+        
+        Args:
+            builds: Builds à comparer (mêmes clés que les arguments de evaluate_build)
+            context: Contexte supplémentaire pour l'évaluation
+            
+        Returns:
+            Un dictionnaire contenant :
+            - "evaluations": l'évaluation de chaque build
+            - "scores": le vecteur des scores totaux (N)
+            - "score_matrix": matrice N×N où [i, j] = score(i) - score(j)
+            - "metric_matrices": matrices N×N des différences de valeur pondérée par métrique
+            - "winners": matrice N×N (1 si i l'emporte sur j, -1 si j l'emporte, 0 en cas d'égalité)
+            - "ranking": indices des builds triés par score décroissant
+        """
+        evaluations = self.evaluate_builds(builds, context=context)
+        scores = np.array([evaluation.total_score for evaluation in evaluations], dtype=np.float64)
+        score_matrix = scores[:, None] - scores[None, :]
+        
+        # Même seuil que compare_builds pour éviter les égalités trop proches
+        winners = np.where(score_matrix > 10, 1, np.where(score_matrix < -10, -1, 0))
+        
+        metric_matrices: Dict[str, np.ndarray] = {}
+        metric_types = {metric_type for evaluation in evaluations for metric_type in evaluation.metric_results}
+        for metric_type in metric_types:
+            values = np.array([
+                evaluation.metric_results[metric_type].weighted_value
+                if metric_type in evaluation.metric_results else np.nan
+                for evaluation in evaluations
+            ], dtype=np.float64)
+            metric_matrices[metric_type.value] = values[:, None] - values[None, :]
+        
+        return {
+            "evaluations": evaluations,
+            "scores": scores,
+            "score_matrix": score_matrix,
+            "metric_matrices": metric_matrices,
+            "winners": winners,
+            "ranking": [int(i) for i in np.argsort(-scores, kind="stable")],
+        }
@@ -0,0 +1,351 @@
+"""Simulation de la couverture des buffs (boons) dans le temps, par sous-groupe.
+
+``score_team`` considère un buff comme couvert dès qu'un membre du groupe le liste.
+Ce module discrétise un combat en intervalles de temps et accumule, pour chaque
+sous-groupe de 5 joueurs, les applications de buffs de toutes les sources de ses
+membres sous forme de tableaux NumPy (intervalles × buffs). On obtient ainsi de
+vrais pourcentages de couverture et des nombres de piles moyens.
+
+Chaque source est périodique : ``stacks`` piles appliquées toutes les ``interval``
+secondes à partir de ``offset``, pendant ``duration`` secondes, sur ``targets``
+membres du sous-groupe. Les sources peuvent être fournies explicitement via
+``PlayerBuild.metadata['boon_sources']`` ; sinon, chaque buff listé par un build
+reçoit une source par défaut (voir ``DEFAULT_BOON_SOURCES``).
+
+Exemple d'utilisation:
+    ```python
+    from app.scoring.timeline import score_team_timeline, simulate_boon_timeline
+
+    timeline = simulate_boon_timeline(team, fight_duration=120.0)
+    print(timeline.uptime_for("quickness"))  # couverture par sous-groupe
+
+    result, timeline = score_team_timeline(team, config)
+    ```
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.scoring.engine import (
+    PlayerBuild,
+    _calculate_duplicate_penalty,
+    _combine_scores,
+    score_team,
+    split_into_groups,
+)
+from app.scoring.schema import BuffCoverage, ScoringConfig, TeamScoreResult
+
+logger = logging.getLogger(__name__)
+
+# Taille maximale d'un sous-groupe
+SUBGROUP_SIZE = 5
+
+# Buffs cumulables en intensité et leur nombre maximal de piles
+INTENSITY_STACK_CAPS: Dict[str, int] = {
+    "might": 25,
+    "stability": 25,
+}
+
+
+@dataclass(frozen=True)
+class BoonSource:
+    """Source périodique d'un buff fournie par un joueur à son sous-groupe.
+
+    Attributes:
+        boon: Nom du buff (ex: 'quickness', 'might')
+        duration: Durée de chaque application en secondes
+        interval: Temps entre deux applications (0 pour une source permanente)
+        stacks: Nombre de piles par application
+        offset: Instant de la première application
+        targets: Nombre de membres du sous-groupe touchés (le joueur inclus)
+    """
+    boon: str
+    duration: float
+    interval: float
+    stacks: int = 1
+    offset: float = 0.0
+    targets: int = SUBGROUP_SIZE
+
+
+# Sources par défaut d'un build qui liste un buff sans préciser ses sources
+DEFAULT_BOON_SOURCES: Dict[str, BoonSource] = {
+    "might": BoonSource("might", duration=10.0, interval=8.0, stacks=10),
+    "stability": BoonSource("stability", duration=4.0, interval=10.0, stacks=2),
+    "quickness": BoonSource("quickness", duration=4.0, interval=5.0),
+    "alacrity": BoonSource("alacrity", duration=4.0, interval=5.0),
+    "fury": BoonSource("fury", duration=6.0, interval=8.0),
+    "protection": BoonSource("protection", duration=3.0, interval=8.0),
+    "regeneration": BoonSource("regeneration", duration=5.0, interval=8.0),
+    "aegis": BoonSource("aegis", duration=3.0, interval=12.0),
+    "resistance": BoonSource("resistance", duration=3.0, interval=10.0),
+    "resolution": BoonSource("resolution", duration=3.0, interval=8.0),
+    "swiftness": BoonSource("swiftness", duration=8.0, interval=10.0),
+    "vigor": BoonSource("vigor", duration=5.0, interval=10.0),
+    "superspeed": BoonSource("superspeed", duration=2.0, interval=12.0),
+}
+
+# Source utilisée pour un buff absent de DEFAULT_BOON_SOURCES
+_GENERIC_SOURCE = BoonSource("", duration=5.0, interval=8.0)
+
+
+@dataclass(frozen=True)
+class BoonTimeline:
+    """Chronologie des buffs d'une escouade, par sous-groupe.
+
+    Attributes:
+        bin_size: Durée d'un intervalle de temps en secondes
+        fight_duration: Durée du combat simulé
+        boons: Noms des buffs, dans l'ordre de la dernière dimension des tableaux
+        groups: Professions des membres de chaque sous-groupe
+        stacks: Piles moyennes par membre, forme (sous-groupes, intervalles, buffs)
+        uptime: Couverture moyenne (0-1), forme (sous-groupes, buffs)
+        average_stacks: Piles moyennes sur le combat, forme (sous-groupes, buffs)
+        providers: Professions fournissant chaque buff, par sous-groupe
+    """
+    bin_size: float
+    fight_duration: float
+    boons: Tuple[str, ...]
+    groups: Tuple[Tuple[str, ...], ...]
+    stacks: np.ndarray
+    uptime: np.ndarray
+    average_stacks: np.ndarray
+    providers: Tuple[Dict[str, List[str]], ...]
+
+    def boon_index(self, boon: str) -> int:
+        return self.boons.index(str(boon))
+
+    def uptime_for(self, boon: str) -> np.ndarray:
+        """Retourne la couverture d'un buff pour chaque sous-groupe."""
+        return self.uptime[:, self.boon_index(boon)]
+
+    def stacks_for(self, boon: str) -> np.ndarray:
+        """Retourne les piles d'un buff, forme (sous-groupes, intervalles)."""
+        return self.stacks[:, :, self.boon_index(boon)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convertit la chronologie en dictionnaire (sans la série temporelle complète)."""
+        return {
+            "bin_size": self.bin_size,
+            "fight_duration": self.fight_duration,
+            "groups": [
+                {
+                    "players": list(players),
+                    "uptime": {boon: float(self.uptime[g, i]) for i, boon in enumerate(self.boons)},
+                    "average_stacks": {
+                        boon: float(self.average_stacks[g, i]) for i, boon in enumerate(self.boons)
+                    },
+                }
+                for g, players in enumerate(self.groups)
+            ],
+        }
+
+
+def _coerce_source(source: Union[BoonSource, Mapping[str, Any]]) -> BoonSource:
+    if isinstance(source, BoonSource):
+        return source
+    return BoonSource(**source)
+
+
+def get_boon_sources(player: PlayerBuild) -> List[BoonSource]:
+    """Retourne les sources de buffs d'un build.
+
+    Les sources explicites de ``metadata['boon_sources']`` sont prioritaires ;
+    les buffs listés sans source explicite reçoivent une source par défaut.
+    """
+    explicit = [_coerce_source(source) for source in player.metadata.get("boon_sources", ())]
+    covered = {source.boon for source in explicit}
+
+    sources = list(explicit)
+    for buff in sorted(player.buffs):
+        buff = str(getattr(buff, "value", buff))
+        if buff in covered:
+            continue
+        default = DEFAULT_BOON_SOURCES.get(buff)
+        if default is None:
+            default = BoonSource(buff, _GENERIC_SOURCE.duration, _GENERIC_SOURCE.interval)
+        sources.append(default)
+    return sources
+
+
+def simulate_boon_timeline(
+    team: Sequence[PlayerBuild],
+    fight_duration: float = 60.0,
+    bin_size: float = 0.5,
+    boons: Optional[Iterable[str]] = None,
+    group_size: int = SUBGROUP_SIZE
+) -> BoonTimeline:
+    """Simule la couverture des buffs de chaque sous-groupe au cours d'un combat.
+
+    Toutes les sources de l'escouade sont traitées en une seule passe vectorisée :
+    pour chaque source et chaque intervalle, le nombre d'applications actives est
+    ``N(t) - N(t - duration)`` où ``N(x)`` compte les applications avant ``x``.
+
+    Args:
+        team: Builds de l'escouade, dans l'ordre des sous-groupes
+        fight_duration: Durée du combat en secondes
+        bin_size: Durée d'un intervalle de temps en secondes
+        boons: Buffs à suivre (par défaut, tous ceux fournis par l'escouade)
+        group_size: Taille des sous-groupes
+
+    Returns:
+        La chronologie des buffs par sous-groupe
+    """
+    if fight_duration <= 0 or bin_size <= 0:
+        raise ValueError("fight_duration et bin_size doivent être strictement positifs")
+
+    groups = split_into_groups(list(team), group_size=group_size)
+    group_sources = [
+        [(player, source) for player in group for source in get_boon_sources(player)]
+        for group in groups
+    ]
+
+    tracked = [str(getattr(boon, "value", boon)) for boon in boons] if boons is not None else []
+    for sources in group_sources:
+        for _, source in sources:
+            if boons is None and source.boon not in tracked:
+                tracked.append(source.boon)
+    boon_index = {boon: i for i, boon in enumerate(tracked)}
+
+    n_groups, n_boons = len(groups), len(tracked)
+    n_bins = max(1, int(np.ceil(fight_duration / bin_size)))
+
+    # Tableaux plats de toutes les sources retenues
+    rows: List[int] = []
+    params: List[Tuple[float, float, float, float]] = []
+    providers: List[Dict[str, List[str]]] = []
+    for g, (group, sources) in enumerate(zip(groups, group_sources)):
+        group_providers: Dict[str, List[str]] = {}
+        for player, source in sources:
+            index = boon_index.get(source.boon)
+            if index is None or source.duration <= 0:
+                continue
+            # Part moyenne des membres touchés par la source
+            coverage = min(1.0, source.targets / len(group))
+            rows.append(g * n_boons + index)
+            params.append((source.offset, source.interval, source.duration, source.stacks * coverage))
+            group_providers.setdefault(source.boon, []).append(player.profession_id)
+        providers.append(group_providers)
+
+    stacks = np.zeros((n_groups * n_boons, n_bins), dtype=np.float64)
+    if params:
+        offset, interval, duration, weight = (np.array(column)[:, None] for column in zip(*params))
+        times = (np.arange(n_bins) + 0.5) * bin_size
+
+        periodic = interval > 0
+        safe_interval = np.where(periodic, interval, 1.0)
+        applications = np.where(
+            periodic, np.floor((fight_duration - offset) / safe_interval) + 1, 1.0
+        ).clip(min=0)
+
+        def applied_before(x: np.ndarray) -> np.ndarray:
+            """Nombre d'applications ayant eu lieu avant ``x`` (inclus)."""
+            counts = np.floor((x - offset) / safe_interval) + 1
+            return np.clip(counts, 0, applications)
+
+        active = applied_before(times) - applied_before(times - duration)
+        # Une source permanente est active en continu à partir de son offset
+        active = np.where(periodic, active, (times >= offset).astype(np.float64))
+        np.add.at(stacks, np.array(rows), active * weight)
+
+    stacks = stacks.reshape(n_groups, n_boons, n_bins).transpose(0, 2, 1)
+    for boon, cap in INTENSITY_STACK_CAPS.items():
+        if boon in boon_index:
+            np.minimum(stacks[:, :, boon_index[boon]], cap, out=stacks[:, :, boon_index[boon]])
+
+    uptime = np.minimum(stacks, 1.0).mean(axis=1) if n_groups else np.zeros((0, n_boons))
+    average_stacks = stacks.mean(axis=1) if n_groups else np.zeros((0, n_boons))
+
+    return BoonTimeline(
+        bin_size=float(bin_size),
+        fight_duration=float(fight_duration),
+        boons=tuple(tracked),
+        groups=tuple(tuple(player.profession_id for player in group) for group in groups),
+        stacks=stacks,
+        uptime=uptime,
+        average_stacks=average_stacks,
+        providers=tuple(providers),
+    )
+
+
+def score_team_timeline(
+    team: Iterable[PlayerBuild],
+    config: ScoringConfig,
+    fight_duration: float = 60.0,
+    bin_size: float = 0.5,
+    uptime_threshold: float = 0.9
+) -> Tuple[TeamScoreResult, Optional[BoonTimeline]]:
+    """Variante de ``score_team`` fondée sur la couverture réelle des buffs.
+
+    Les rôles et les pénalités sont calculés comme dans ``score_team`` ; le score
+    de chaque buff devient ``poids × couverture moyenne des sous-groupes`` au lieu
+    d'un simple test de présence. Ce mode est plus coûteux et donc optionnel.
+
+    Args:
+        team: Builds de l'équipe
+        config: Configuration du calcul des scores
+        fight_duration: Durée du combat simulé en secondes
+        bin_size: Durée d'un intervalle de temps en secondes
+        uptime_threshold: Couverture minimale (dans chaque sous-groupe) pour
+            considérer un buff comme couvert
+
+    Returns:
+        Un tuple (résultat du scoring, chronologie des buffs). La chronologie
+        vaut None pour une équipe vide.
+    """
+    team_list = list(team)
+    base = score_team(team_list, config)
+    if not team_list:
+        return base, None
+
+    buffs = [str(getattr(buff, "value", buff)) for buff in config.buff_weights]
+    timeline = simulate_boon_timeline(team_list, fight_duration=fight_duration, bin_size=bin_size, boons=buffs)
+
+    buff_score = 0.0
+    buff_breakdown: Dict[str, float] = {}
+    buff_coverage: List[BuffCoverage] = []
+    for buff_type, buff_weight in config.buff_weights.items():
+        uptimes = timeline.uptime_for(buff_type.value)
+        score = buff_weight.weight * float(uptimes.mean())
+        buff_score += score
+        buff_breakdown[buff_type] = score
+        buff_coverage.append(BuffCoverage(
+            buff=buff_type,
+            covered=bool((uptimes >= uptime_threshold).all()),
+            provided_by=[
+                provider
+                for group_providers in timeline.providers
+                for provider in group_providers.get(buff_type.value, [])
+            ],
+            weight=buff_weight.weight,
+        ))
+
+    max_buff_score = sum(w.weight for w in config.buff_weights.values()) if config.buff_weights else 1.0
+    max_role_score = sum(w.weight for w in config.role_weights.values()) if config.role_weights else 1.0
+    role_score = sum(base.role_breakdown.values())
+
+    duplicate_penalty = 0.0
+    if config.duplicate_penalty:
+        duplicate_penalty = _calculate_duplicate_penalty(
+            tuple(team_list),
+            config.duplicate_penalty.threshold,
+            config.duplicate_penalty.penalty_per_extra
+        )
+
+    total_score, normalized_buff_score, normalized_role_score = _combine_scores(
+        buff_score, max_buff_score, role_score, max_role_score, duplicate_penalty
+    )
+    raw_total = buff_score + role_score
+
+    result = base.model_copy(update={
+        "total_score": total_score,
+        "buff_score": normalized_buff_score,
+        "role_score": normalized_role_score,
+        "duplicate_penalty": min(1.0, duplicate_penalty / raw_total if raw_total > 0 else 0.0),
+        "buff_breakdown": buff_breakdown,
+        "buff_coverage": buff_coverage,
+    })
+    return result, timeline
@@ -0,0 +1,322 @@
+"""Écriture par lots des données synchronisées depuis l'API GW2.
+
+La synchronisation validait chaque entité dans sa propre transaction (environ
+70 000 transactions pour les objets). ``BulkUpsertWriter`` écrit un lot de
+lignes (un appel de 200 éléments à l'API) avec une seule instruction
+``INSERT ... ON CONFLICT DO UPDATE`` multi-lignes par table, puis valide le lot.
+
+Le lot est écrit dans un point de sauvegarde. Si l'instruction échoue, seul ce
+point de sauvegarde est annulé (les lots déjà écrits dans la transaction sont
+conservés, même sans validation par lot) puis le lot est réécrit ligne par
+ligne, chaque ligne dans son propre point de sauvegarde : seules les lignes
+invalides sont rejetées.
+
+Une ligne ne met à jour que les colonnes qu'elle contient : les lignes d'un lot
+sont regroupées par ensemble de colonnes, une instruction par groupe.
+
+Exemple d'utilisation:
+    ```python
+    writer = BulkUpsertWriter(session)
+    result = writer.upsert(Skill, rows)
+    print(result.written, result.failed, writer.stats())
+    ```
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximum de paramètres liés par instruction (SQLite >= 3.32 : 32766, PostgreSQL : 65535)
+MAX_PARAMETERS = 32000
+
+# Dialectes supportant INSERT ... ON CONFLICT DO UPDATE
+_INSERT_FACTORIES = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+
+
+def _python_default(default: Any) -> Any:
+    """Évalue une valeur par défaut Python (``default``/``onupdate``) d'une colonne."""
+    if default is None:
+        return None
+    if getattr(default, 'is_callable', False):
+        return default.arg(None)
+    if getattr(default, 'is_scalar', False):
+        return default.arg
+    return None
+
+
+@dataclass
+class UpsertResult:
+    """Résultat de l'écriture d'un lot.
+
+    Attributes:
+        table: Nom de la table
+        written: Nombre de lignes insérées ou mises à jour
+        failed: Clés des lignes rejetées, avec le message d'erreur
+        statements: Nombre d'instructions exécutées
+        seconds: Durée de l'écriture
+    """
+    table: str
+    written: int = 0
+    failed: Dict[Any, str] = field(default_factory=dict)
+    statements: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Débit d'écriture du lot."""
+        return self.written / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class _TableStats:
+    rows: int = 0
+    failed: int = 0
+    chunks: int = 0
+    statements: int = 0
+    fallbacks: int = 0
+    seconds: float = 0.0
+
+
+class BulkUpsertWriter:
+    """Écrit des lignes par lots avec ``INSERT ... ON CONFLICT DO UPDATE``."""
+
+    def __init__(
+        self,
+        session: Session,
+        commit: bool = True,
+        on_rollback: Optional[Callable[[], None]] = None
+    ):
+        """Initialise l'écrivain.
+
+        Args:
+            session: Session SQLAlchemy
+            commit: Si True, valide la transaction après chaque lot
+            on_rollback: Appelée après l'annulation d'un lot (ex: pour vider un
+                cache d'instances chargées par la session)
+        """
+        self.session = session
+        self.commit = commit
+        self.on_rollback = on_rollback
+        self._stats: Dict[str, _TableStats] = {}
+
+    @property
+    def dialect(self) -> str:
+        """Nom du dialecte de la base."""
+        return self.session.get_bind().dialect.name
+
+    def upsert(
+        self,
+        model: Any,
+        rows: Sequence[Dict[str, Any]],
+        index_elements: Sequence[str] = ('id',)
+    ) -> UpsertResult:
+        """Insère ou met à jour un lot de lignes.
+
+        Args:
+            model: Modèle SQLAlchemy (ou ``Table``) cible
+            rows: Lignes à écrire (les clés qui ne sont pas des colonnes sont ignorées)
+            index_elements: Colonnes de la contrainte d'unicité utilisée pour le conflit
+
+        Returns:
+            Le résultat de l'écriture du lot
+        """
+        table: Table = model if isinstance(model, Table) else model.__table__
+        return self._write(table, self._normalize(table, rows), index_elements)
+
+    def replace(
+        self,
+        model: Any,
+        key_column: str,
+        keys: Iterable[Any],
+        rows: Sequence[Dict[str, Any]],
+        index_elements: Sequence[str]
+    ) -> UpsertResult:
+        """Remplace toutes les lignes de certaines clés (ex: liaisons d'une table d'association).
+
+        Les lignes existantes dont ``key_column`` fait partie de ``keys`` sont
+        supprimées, puis ``rows`` sont écrites, dans le même point de sauvegarde.
+
+        Args:
+            model: Modèle SQLAlchemy (ou ``Table``) cible
+            key_column: Colonne désignant le propriétaire des lignes (ex: ``trait_id``)
+            keys: Propriétaires dont les lignes sont remplacées
+            rows: Nouvelles lignes
+            index_elements: Colonnes de la contrainte d'unicité utilisée pour le conflit
+
+        Returns:
+            Le résultat de l'écriture du lot
+        """
+        table: Table = model if isinstance(model, Table) else model.__table__
+        keys = list(keys)
+        delete = table.delete().where(table.c[key_column].in_(keys)) if keys else None
+        return self._write(table, self._normalize(table, rows), index_elements, delete)
+
+    def _write(
+        self,
+        table: Table,
+        rows: List[Dict[str, Any]],
+        index_elements: Sequence[str],
+        delete: Any = None
+    ) -> UpsertResult:
+        """Écrit un lot dans un point de sauvegarde, ligne par ligne en cas d'échec."""
+        result = UpsertResult(table=table.name)
+        if not rows and delete is None:
+            return result
+
+        start = time.perf_counter()
+        stats = self._stats.setdefault(table.name, _TableStats())
+        stats.chunks += 1
+        try:
+            with self.session.begin_nested():
+                if delete is not None:
+                    self.session.execute(delete)
+                    result.statements += 1
+                if rows:
+                    result.statements += self._execute(table, rows, index_elements)
+        except Exception as e:
+            # Seul le point de sauvegarde du lot est annulé
+            stats.fallbacks += 1
+            if self.on_rollback is not None:
+                self.on_rollback()
+            logger.warning(
+                f"Échec de l'écriture groupée de {len(rows)} lignes dans {table.name} ({e}), "
+                f"réécriture ligne par ligne"
+            )
+            result.statements = 0
+            if delete is not None:
+                with self.session.begin_nested():
+                    self.session.execute(delete)
+                result.statements += 1
+            self._upsert_rows(table, rows, index_elements, result)
+        else:
+            if self.commit:
+                self.session.commit()
+            result.written = len(rows)
+
+        result.seconds = time.perf_counter() - start
+        stats.rows += result.written
+        stats.failed += len(result.failed)
+        stats.statements += result.statements
+        stats.seconds += result.seconds
+        logger.debug(
+            f"{table.name}: {result.written} lignes écrites en {result.seconds:.3f}s "
+            f"({result.rows_per_second:.0f} lignes/s, {len(result.failed)} rejetées)"
+        )
+        return result
+
+    def _upsert_rows(
+        self,
+        table: Table,
+        rows: List[Dict[str, Any]],
+        index_elements: Sequence[str],
+        result: UpsertResult
+    ) -> None:
+        """Écrit chaque ligne dans son propre point de sauvegarde."""
+        for row in rows:
+            key = tuple(row.get(column) for column in index_elements)
+            key = key[0] if len(key) == 1 else key
+            try:
+                with self.session.begin_nested():
+                    result.statements += self._execute(table, [row], index_elements)
+                result.written += 1
+            except Exception as e:
+                result.failed[key] = str(e)
+                logger.error(f"Ligne rejetée dans {table.name} ({key}): {e}")
+        if self.commit:
+            self.session.commit()
+
+    def _execute(self, table: Table, rows: List[Dict[str, Any]], index_elements: Sequence[str]) -> int:
+        """Exécute l'écriture, découpée selon la limite de paramètres ; retourne le nombre d'instructions."""
+        insert = _INSERT_FACTORIES.get(self.dialect)
+        if insert is None:
+            # Dialecte sans ON CONFLICT : suppression puis insertion, ligne par ligne
+            for row in rows:
+                self.session.execute(table.delete().where(
+                    *[table.c[column] == row[column] for column in index_elements]
+                ))
+                self.session.execute(table.insert().values(row))
+            return 2 * len(rows)
+
+        # Une instruction multi-lignes exige les mêmes colonnes pour chaque ligne
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(tuple(row), []).append(row)
+
+        statements = 0
+        for columns, group in groups.items():
+            per_statement = max(1, MAX_PARAMETERS // len(columns))
+            update_values = self._update_values(table, columns, index_elements)
+            for start in range(0, len(group), per_statement):
+                statement = insert(table).values(group[start:start + per_statement])
+                if update_values:
+                    statement = statement.on_conflict_do_update(
+                        index_elements=list(index_elements),
+                        set_={
+                            name: (statement.excluded[name] if value is None else value)
+                            for name, value in update_values.items()
+                        }
+                    )
+                else:
+                    # Toutes les colonnes font partie de la clé (ex: table d'association)
+                    statement = statement.on_conflict_do_nothing(index_elements=list(index_elements))
+                self.session.execute(statement)
+                statements += 1
+        return statements
+
+    @staticmethod
+    def _update_values(table: Table, columns: Iterable[str], index_elements: Sequence[str]) -> Dict[str, Any]:
+        """Colonnes mises à jour en cas de conflit (``None`` : valeur de la ligne proposée)."""
+        values: Dict[str, Any] = {
+            name: None for name in columns
+            if name not in index_elements and not table.c[name].primary_key
+        }
+        # Les valeurs ``onupdate`` (ex: date de mise à jour) ne sont pas appliquées par ON CONFLICT
+        for column in table.c:
+            if column.name not in values and column.onupdate is not None:
+                value = _python_default(column.onupdate)
+                if value is not None:
+                    values[column.name] = value
+        return values
+
+    @staticmethod
+    def _normalize(table: Table, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Garde les colonnes de la table, dans l'ordre des colonnes.
+
+        Les colonnes absentes d'une ligne ne sont pas ajoutées : elles prennent
+        leur valeur par défaut à l'insertion et restent inchangées à la mise à jour.
+        """
+        return [
+            {column.name: row[column.name] for column in table.c if column.name in row}
+            for row in rows
+        ]
+
+    def rows_per_second(self) -> float:
+        """Débit d'écriture global, toutes tables confondues."""
+        rows = sum(stats.rows for stats in self._stats.values())
+        seconds = sum(stats.seconds for stats in self._stats.values())
+        return round(rows / seconds, 1) if seconds > 0 else 0.0
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Statistiques d'écriture par table (lignes, rejets, débit)."""
+        return {
+            name: {
+                'rows': stats.rows,
+                'failed': stats.failed,
+                'chunks': stats.chunks,
+                'statements': stats.statements,
+                'fallbacks': stats.fallbacks,
+                'seconds': round(stats.seconds, 3),
+                'rows_per_second': round(stats.rows / stats.seconds, 1) if stats.seconds > 0 else 0.0,
+            }
+            for name, stats in self._stats.items()
+        }
@@ -0,0 +1,388 @@
+"""Instantané immuable du catalogue de jeu, servi en mémoire sans accès à la base.
+
+Les données de jeu (professions, spécialisations, compétences, traits, armes,
+statistiques d'objets, types d'armes par profession) ne changent qu'à la
+synchronisation. ``CatalogSnapshot`` les charge une fois dans des structures
+immuables et indexées : enregistrements figés (``CatalogRecord``), dictionnaires
+en lecture seule et tuples. L'index des effets et le store des faits des
+compétences sont construits à partir des mêmes lignes.
+
+L'instantané courant est remplacé d'un bloc (``set_catalog`` /
+``refresh_catalog``) au démarrage et après chaque synchronisation : les lecteurs
+qui tiennent une référence sur l'ancien instantané continuent de le lire de
+manière cohérente. Un instantané projeté depuis un fichier est rouvert par
+``get_catalog`` lorsque le fichier a été réécrit (par la synchronisation d'un
+autre worker).
+
+Exemple d'utilisation:
+    ```python
+    catalog = refresh_catalog()  # au démarrage ou après une synchronisation
+
+    catalog = get_catalog()
+    guardian = catalog.professions['Guardian']
+    skills = catalog.skills_for_profession('Guardian')
+    ```
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+from app.game_mechanics.interactions import EffectIndex
+from app.models import ItemStats, Profession, Skill, Specialization, Trait, Weapon
+from app.models.profession_weapon import ProfessionWeaponType
+from app.models.skill_facts import SkillFactStore, set_skill_fact_store
+
+logger = logging.getLogger(__name__)
+
+
+def _freeze(value: Any) -> Any:
+    """Rend une valeur JSON immuable (listes en tuples, dictionnaires en lecture seule)."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Inverse de ``_freeze`` : retourne des structures JSON modifiables."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class CatalogRecord(Mapping):
+    """Ligne figée du catalogue, accessible par attribut ou par clé.
+
+    Les valeurs JSON (listes, dictionnaires) sont elles aussi figées.
+    """
+
+    __slots__ = ('_model', '_values')
+
+    def __init__(self, model: str, values: Dict[str, Any]):
+        object.__setattr__(self, '_model', model)
+        object.__setattr__(self, '_values', {key: _freeze(value) for key, value in values.items()})
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(f"{self._model} n'a pas d'attribut '{name}'") from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self._model} est en lecture seule")
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __hash__(self) -> int:
+        return hash((self._model, self._values.get('id')))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, CatalogRecord):
+            return NotImplemented
+        return self._model == other._model and self._values == other._values
+
+    def __repr__(self) -> str:
+        return f"<{self._model}Record(id={self._values.get('id')!r}, name={self._values.get('name')!r})>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Retourne une copie modifiable et sérialisable de la ligne."""
+        return {key: _thaw(value) for key, value in self._values.items()}
+
+
+def _load_records(session: Session, model: type) -> Tuple[CatalogRecord, ...]:
+    """Charge toutes les lignes d'un modèle (colonnes uniquement, sans hydratation ORM)."""
+    keys = [attr.key for attr in sa_inspect(model).column_attrs]
+    query = session.query(*[getattr(model, key) for key in keys])
+    return tuple(CatalogRecord(model.__name__, dict(zip(keys, row))) for row in query)
+
+
+def _index(records: Iterable[CatalogRecord], key: str = 'id') -> Mapping:
+    return MappingProxyType({record[key]: record for record in records})
+
+
+def _group(records: Iterable[CatalogRecord], key: Callable[[CatalogRecord], Iterable[Any]]) -> Mapping:
+    groups: Dict[Any, List[CatalogRecord]] = {}
+    for record in records:
+        for group in key(record):
+            if group is not None:
+                groups.setdefault(group, []).append(record)
+    return MappingProxyType({group: tuple(items) for group, items in groups.items()})
+
+
+# Tables du catalogue : (attribut de l'instantané, modèle SQLAlchemy)
+CATALOG_TABLES: Tuple[Tuple[str, type], ...] = (
+    ('professions', Profession),
+    ('specializations', Specialization),
+    ('skills', Skill),
+    ('traits', Trait),
+    ('weapons', Weapon),
+    ('item_stats', ItemStats),
+    ('profession_weapon_types', ProfessionWeaponType),
+)
+
+# Regroupements : attribut -> (table source, clés de regroupement d'une ligne)
+CATALOG_GROUPS: Dict[str, Tuple[str, Callable[[CatalogRecord], Iterable[Any]]]] = {
+    'profession_weapon_types': ('profession_weapon_types', lambda r: (r.profession_id,)),
+    '_specializations_by_profession': ('specializations', lambda r: (r.profession_id,)),
+    '_skills_by_profession': ('skills', lambda r: {r.profession_id, *(r.professions or ())}),
+    '_traits_by_specialization': ('traits', lambda r: (r.specialization_id,)),
+}
+
+
+class CatalogSnapshot:
+    """Catalogue de jeu immuable et indexé.
+
+    Attributes:
+        version: Numéro de l'instantané (incrémenté à chaque chargement)
+        loaded_at: Horodatage du chargement
+        source: Origine des données ('database', 'memory' ou chemin du fichier)
+        professions: Professions par ID
+        specializations: Spécialisations par ID
+        skills: Compétences par ID
+        traits: Traits par ID
+        weapons: Armes par ID
+        item_stats: Statistiques d'objets par ID
+        profession_weapon_types: Types d'armes utilisables par ID de profession
+        effect_index: Index des effets des compétences et traits
+        fact_store: Store des faits des compétences en colonnes
+    """
+
+    _version_counter = 0
+    _version_lock = threading.Lock()
+
+    def __init__(
+        self,
+        professions: Iterable[CatalogRecord] = (),
+        specializations: Iterable[CatalogRecord] = (),
+        skills: Iterable[CatalogRecord] = (),
+        traits: Iterable[CatalogRecord] = (),
+        weapons: Iterable[CatalogRecord] = (),
+        item_stats: Iterable[CatalogRecord] = (),
+        profession_weapon_types: Iterable[CatalogRecord] = (),
+        source: str = 'memory'
+    ):
+        rows = {
+            'professions': tuple(professions),
+            'specializations': tuple(specializations),
+            'skills': tuple(skills),
+            'traits': tuple(traits),
+            'weapons': tuple(weapons),
+            'item_stats': tuple(item_stats),
+            'profession_weapon_types': tuple(profession_weapon_types),
+        }
+        self._populate(
+            tables={name: _index(rows[name]) for name, _ in CATALOG_TABLES if name != 'profession_weapon_types'},
+            groups={name: _group(rows[table], key) for name, (table, key) in CATALOG_GROUPS.items()},
+            fact_store=SkillFactStore.from_skills(rows['skills']),
+            effect_index=EffectIndex.build(rows['skills'], rows['traits']),
+            source=source,
+        )
+
+    @classmethod
+    def assemble(
+        cls,
+        tables: Mapping,
+        groups: Mapping,
+        fact_store: SkillFactStore,
+        effect_index: Callable[[], EffectIndex],
+        source: str,
+        is_stale: Optional[Callable[[], bool]] = None,
+        reload: Optional[Callable[[], 'CatalogSnapshot']] = None
+    ) -> 'CatalogSnapshot':
+        """Construit un instantané à partir d'index déjà prêts (ex: fichier mappé en mémoire).
+
+        Args:
+            tables: Enregistrements par ID pour chaque table (voir ``CATALOG_TABLES``)
+            groups: Regroupements (voir ``CATALOG_GROUPS``)
+            fact_store: Store des faits des compétences
+            effect_index: Fonction construisant l'index des effets à la première utilisation
+            source: Origine des données
+            is_stale: Indique si la source a changé depuis le chargement
+            reload: Recharge l'instantané depuis sa source
+
+        Returns:
+            L'instantané
+        """
+        snapshot = cls.__new__(cls)
+        snapshot._populate(tables, groups, fact_store, effect_index, source)
+        snapshot.__dict__.update(_is_stale=is_stale, _reload=reload)
+        return snapshot
+
+    def _populate(
+        self,
+        tables: Mapping,
+        groups: Mapping,
+        fact_store: SkillFactStore,
+        effect_index: Union[EffectIndex, Callable[[], EffectIndex]],
+        source: str
+    ) -> None:
+        with CatalogSnapshot._version_lock:
+            CatalogSnapshot._version_counter += 1
+            version = CatalogSnapshot._version_counter
+
+        self.__dict__.update(
+            version=version,
+            loaded_at=time.time(),
+            source=source,
+            fact_store=fact_store,
+            _effect_index_lock=threading.Lock(),
+            **tables,
+            **groups,
+        )
+        if isinstance(effect_index, EffectIndex):
+            self.__dict__['effect_index'] = effect_index
+        else:
+            self.__dict__['_effect_index_factory'] = effect_index
+
+    def __getattr__(self, name: str) -> Any:
+        # Index des effets construit à la première utilisation (instantanés issus d'un fichier)
+        if name != 'effect_index' or '_effect_index_factory' not in self.__dict__:
+            raise AttributeError(f"CatalogSnapshot n'a pas d'attribut '{name}'")
+        with self._effect_index_lock:
+            if 'effect_index' not in self.__dict__:
+                self.__dict__['effect_index'] = self._effect_index_factory()
+        return self.__dict__['effect_index']
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("CatalogSnapshot est immuable")
+
+    def is_stale(self) -> bool:
+        """Indique si la source de l'instantané a changé (et s'il peut être rechargé)."""
+        is_stale = self.__dict__.get('_is_stale')
+        return is_stale is not None and self.__dict__.get('_reload') is not None and is_stale()
+
+    def reload(self) -> 'CatalogSnapshot':
+        """Recharge l'instantané depuis sa source (sans l'installer)."""
+        reload = self.__dict__.get('_reload')
+        if reload is None:
+            raise ValueError(f"L'instantané v{self.version} ({self.source}) ne peut pas être rechargé")
+        return reload()
+
+    @classmethod
+    def load(cls, session: Session) -> 'CatalogSnapshot':
+        """Charge le catalogue complet depuis la base de données.
+
+        Args:
+            session: Session SQLAlchemy
+
+        Returns:
+            Le nouvel instantané
+        """
+        start = time.perf_counter()
+        snapshot = cls(
+            source='database',
+            **{name: _load_records(session, model) for name, model in CATALOG_TABLES}
+        )
+        logger.info(
+            f"Catalogue v{snapshot.version} chargé en {time.perf_counter() - start:.2f}s: "
+            f"{snapshot.stats()}"
+        )
+        return snapshot
+
+    def specializations_for_profession(self, profession_id: str) -> Tuple[CatalogRecord, ...]:
+        """Spécialisations d'une profession."""
+        return self._specializations_by_profession.get(profession_id, ())
+
+    def skills_for_profession(self, profession_id: str) -> Tuple[CatalogRecord, ...]:
+        """Compétences d'une profession (par ``profession_id`` ou liste ``professions``)."""
+        return self._skills_by_profession.get(profession_id, ())
+
+    def traits_for_specialization(self, specialization_id: int) -> Tuple[CatalogRecord, ...]:
+        """Traits d'une spécialisation."""
+        return self._traits_by_specialization.get(specialization_id, ())
+
+    def weapon_types_for_profession(self, profession_id: str) -> Tuple[CatalogRecord, ...]:
+        """Types d'armes utilisables par une profession."""
+        return self.profession_weapon_types.get(profession_id, ())
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        """Nombre d'entrées par catégorie."""
+        return {
+            'professions': len(self.professions),
+            'specializations': len(self.specializations),
+            'skills': len(self.skills),
+            'traits': len(self.traits),
+            'weapons': len(self.weapons),
+            'item_stats': len(self.item_stats),
+            'profession_weapon_types': sum(len(v) for v in self.profession_weapon_types.values()),
+            # L'index des effets n'est pas construit pour produire les statistiques
+            'effects': len(self.__dict__['effect_index']) if 'effect_index' in self.__dict__ else None,
+            'facts': len(self.fact_store),
+        }
+
+
+_catalog: Optional[CatalogSnapshot] = None
+_refresh_lock = threading.Lock()
+_reload_lock = threading.Lock()
+
+
+def get_catalog() -> Optional[CatalogSnapshot]:
+    """Retourne l'instantané courant du catalogue (``None`` s'il n'est pas chargé).
+
+    Si la source de l'instantané a changé (fichier réécrit), il est rechargé et
+    installé ; en cas d'échec, l'instantané courant reste servi.
+    """
+    snapshot = _catalog
+    if snapshot is None or not snapshot.is_stale():
+        return snapshot
+    with _reload_lock:
+        if _catalog is snapshot:
+            try:
+                set_catalog(snapshot.reload())
+                logger.info(f"Catalogue rechargé depuis {snapshot.source}")
+            except (ValueError, OSError) as e:
+                logger.warning(f"Impossible de recharger le catalogue depuis {snapshot.source}: {e}")
+        return _catalog
+
+
+def set_catalog(snapshot: Optional[CatalogSnapshot]) -> None:
+    """Remplace atomiquement l'instantané courant.
+
+    Le store des faits des compétences utilisé par ``Skill`` et le simulateur de
+    rotation est remplacé en même temps, et les résultats de métriques calculés
+    avec l'ancien store sont retirés du cache partagé.
+    """
+    from app.scoring.cache import get_default_metric_cache
+
+    global _catalog
+    _catalog = snapshot
+    set_skill_fact_store(snapshot.fact_store if snapshot is not None else None)
+    get_default_metric_cache().invalidate()
+
+
+def refresh_catalog(session: Optional[Session] = None) -> CatalogSnapshot:
+    """Recharge le catalogue depuis la base et l'installe comme instantané courant.
+
+    Args:
+        session: Session SQLAlchemy (une session dédiée est ouverte si absente)
+
+    Returns:
+        Le nouvel instantané
+    """
+    with _refresh_lock:
+        if session is not None:
+            snapshot = CatalogSnapshot.load(session)
+        else:
+            from app.database import SessionLocal
+
+            with SessionLocal() as own_session:
+                snapshot = CatalogSnapshot.load(own_session)
+        set_catalog(snapshot)
+        return snapshot
@@ -0,0 +1,545 @@
+"""Fichier binaire du catalogue de jeu, lu par ``mmap`` sans hydratation ORM.
+
+Chaque worker uvicorn et chaque démarrage à froid de la fonction Netlify
+reconstruit sinon son propre ``CatalogSnapshot`` depuis la base. L'export écrit
+le catalogue dans un fichier versionné ; la lecture le projette en mémoire avec
+``mmap`` et expose des vues NumPy sans copie. Les workers partagent ainsi le cache
+de pages du système et le démarrage se limite à l'ouverture du fichier.
+
+Format (little-endian) :
+
+- en-tête fixe : ``MAGIC`` (8 octets), version du format (u32), taille de
+  l'en-tête JSON (u32), début de la zone de données (u64) ;
+- en-tête JSON : tables (modèle, nombre de lignes, type de chaque colonne),
+  regroupements et sections (type NumPy, position, nombre d'éléments) ;
+- sections alignées sur ``ALIGNMENT`` octets :
+
+  - ``strings.offsets`` / ``strings.data`` : table des chaînes UTF-8
+    dédupliquées (les colonnes texte, JSON, énumération et date y font référence
+    par indice, ``-1`` pour ``None``) ;
+  - ``<table>.<colonne>`` : tableau à largeur fixe par colonne (``int64``,
+    ``float64``, ``int8`` pour les booléens, ``int32`` pour les chaînes), et
+    ``<table>.<colonne>.null`` pour les entiers nullables ; les lignes sont
+    triées par ID, la colonne ``id`` sert d'index de recherche dichotomique ;
+  - ``<groupe>.keys`` / ``.offsets`` / ``.rows`` : regroupements au format CSR ;
+  - ``facts.*`` : colonnes du ``SkillFactStore``.
+
+Exemple d'utilisation:
+    ```python
+    export_catalog(refresh_catalog(), 'data/catalog.bin')
+
+    catalog_file = CatalogFile('data/catalog.bin')
+    set_catalog(catalog_file.snapshot())
+    ```
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+from collections.abc import Mapping
+from datetime import datetime
+from enum import Enum as PyEnum
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from sqlalchemy import JSON, Boolean, Date, DateTime, Enum, Float, Integer, Numeric
+from sqlalchemy import inspect as sa_inspect
+
+from app.game_mechanics.interactions import EffectIndex
+from app.models.skill_facts import SkillFactStore
+from app.services.catalog import (
+    CATALOG_GROUPS, CATALOG_TABLES, CatalogRecord, CatalogSnapshot, refresh_catalog, set_catalog
+)
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'GW2CATLG'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# En-tête fixe : magic, version du format, taille de l'en-tête JSON, début des données
+_PREFIX = struct.Struct('<8sIIQ')
+
+# Colonnes du SkillFactStore stockées telles quelles
+_FACT_COLUMNS = (
+    'skill_ids', 'offsets', 'base_ends', 'type_code', 'attribute_code',
+    'value', 'duration', 'stacks', 'requires_trait'
+)
+
+_MODELS = dict(CATALOG_TABLES)
+
+
+class CatalogFileError(ValueError):
+    """Fichier de catalogue absent, tronqué ou d'une version de format inconnue."""
+
+
+def _column_kind(column_type: Any) -> str:
+    """Type de stockage d'une colonne SQLAlchemy."""
+    if isinstance(column_type, Boolean):
+        return 'bool'
+    if isinstance(column_type, Enum):
+        return 'enum'
+    if isinstance(column_type, Integer):
+        return 'int'
+    if isinstance(column_type, (Float, Numeric)):
+        return 'float'
+    if isinstance(column_type, (DateTime, Date)):
+        return 'datetime'
+    if isinstance(column_type, JSON):
+        return 'json'
+    return 'str'
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class _StringTableBuilder:
+    """Table des chaînes dédupliquées en cours d'écriture."""
+
+    def __init__(self):
+        self._codes: Dict[str, int] = {}
+        self._chunks: List[bytes] = []
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._chunks)
+            self._chunks.append(value.encode('utf-8'))
+        return code
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        offsets = np.zeros(len(self._chunks) + 1, dtype=np.int64)
+        np.cumsum([len(chunk) for chunk in self._chunks], out=offsets[1:])
+        return offsets, np.frombuffer(b''.join(self._chunks), dtype=np.uint8)
+
+
+def _encode_value(kind: str, value: Any) -> Optional[str]:
+    """Représentation texte d'une valeur stockée dans la table des chaînes."""
+    if value is None:
+        return None
+    if kind == 'enum':
+        return value.name if isinstance(value, PyEnum) else str(value)
+    if kind == 'datetime':
+        return value.isoformat()
+    if kind == 'json':
+        return json.dumps(_thaw_json(value), separators=(',', ':'), ensure_ascii=False)
+    return str(value)
+
+
+def _thaw_json(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _thaw_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw_json(item) for item in value]
+    return value
+
+
+def export_catalog(snapshot: CatalogSnapshot, path: Union[str, Path]) -> Path:
+    """Écrit un instantané du catalogue dans un fichier binaire.
+
+    Le fichier est écrit à côté de la destination puis renommé : les processus
+    qui ont déjà projeté l'ancien fichier continuent de le lire.
+
+    Args:
+        snapshot: Instantané à exporter
+        path: Chemin du fichier
+
+    Returns:
+        Le chemin du fichier écrit
+    """
+    start = time.perf_counter()
+    path = Path(path)
+    strings = _StringTableBuilder()
+    sections: Dict[str, np.ndarray] = {}
+    tables: Dict[str, Any] = {}
+    positions: Dict[str, Dict[Any, int]] = {}
+
+    for name, model in CATALOG_TABLES:
+        if name == 'profession_weapon_types':
+            records = [record for group in snapshot.profession_weapon_types.values() for record in group]
+        else:
+            records = list(getattr(snapshot, name).values())
+        records.sort(key=lambda record: record['id'])
+        positions[name] = {record['id']: row for row, record in enumerate(records)}
+
+        columns = {attr.key: _column_kind(attr.columns[0].type) for attr in sa_inspect(model).column_attrs}
+        for column, kind in columns.items():
+            values = [record.get(column) for record in records]
+            prefix = f'{name}.{column}'
+            if kind == 'int':
+                sections[f'{prefix}.null'] = np.array([v is None for v in values], dtype=np.uint8)
+                sections[prefix] = np.array([0 if v is None else int(v) for v in values], dtype=np.int64)
+            elif kind == 'float':
+                sections[prefix] = np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+            elif kind == 'bool':
+                sections[prefix] = np.array([-1 if v is None else int(bool(v)) for v in values], dtype=np.int8)
+            else:
+                sections[prefix] = np.array(
+                    [strings.add(_encode_value(kind, v)) for v in values], dtype=np.int32
+                )
+        tables[name] = {'model': model.__name__, 'rows': len(records), 'columns': columns}
+
+    groups: Dict[str, Any] = {}
+    for name, (table, _) in CATALOG_GROUPS.items():
+        group = getattr(snapshot, name)
+        keys = sorted(group, key=lambda key: (isinstance(key, str), key))
+        key_kind = 'str' if any(isinstance(key, str) for key in keys) else 'int'
+        rows = [positions[table][record['id']] for key in keys for record in group[key]]
+        offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum([len(group[key]) for key in keys], out=offsets[1:])
+        sections[f'{name}.keys'] = (
+            np.array([strings.add(str(key)) for key in keys], dtype=np.int32) if key_kind == 'str'
+            else np.array(keys, dtype=np.int64)
+        )
+        sections[f'{name}.offsets'] = offsets
+        sections[f'{name}.rows'] = np.array(rows, dtype=np.int64)
+        groups[name] = {'table': table, 'key_kind': key_kind}
+
+    store = snapshot.fact_store
+    for column in _FACT_COLUMNS:
+        sections[f'facts.{column}'] = getattr(store, column)
+    sections['facts.fact_types'] = np.array([strings.add(v) for v in store.fact_types], dtype=np.int32)
+    sections['facts.attributes'] = np.array([strings.add(v) for v in store.attributes], dtype=np.int32)
+
+    sections['strings.offsets'], sections['strings.data'] = strings.arrays()
+
+    # Positions relatives au début de la zone de données
+    layout: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    for name, array in sections.items():
+        array = np.ascontiguousarray(array)
+        sections[name] = array
+        layout[name] = {'dtype': array.dtype.str, 'offset': offset, 'count': int(array.size)}
+        offset = _align(offset + array.nbytes)
+
+    header = json.dumps({
+        'catalog_version': snapshot.version,
+        'created_at': time.time(),
+        'tables': tables,
+        'groups': groups,
+        'sections': layout,
+    }, separators=(',', ':')).encode('utf-8')
+    data_start = _align(_PREFIX.size + len(header))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        os.chmod(tmp_path, 0o644)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header), data_start))
+            f.write(header)
+            for name, array in sections.items():
+                f.seek(data_start + layout[name]['offset'])
+                f.write(array.tobytes())
+            f.truncate(data_start + offset)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    logger.info(
+        f"Catalogue v{snapshot.version} exporté vers {path} en {time.perf_counter() - start:.2f}s "
+        f"({(data_start + offset) / 1024:.1f} Ko)"
+    )
+    return path
+
+
+class CatalogTable(Mapping):
+    """Table du fichier, accessible par ID ; les lignes sont décodées à la première lecture."""
+
+    def __init__(self, catalog_file: 'CatalogFile', name: str):
+        spec = catalog_file.header['tables'][name]
+        self.name = name
+        self.model = spec['model']
+        self.columns: Dict[str, str] = spec['columns']
+        self._file = catalog_file
+        self._rows = spec['rows']
+        # Lignes déjà décodées, par position : le JSON n'est décodé qu'une fois par instantané
+        self._records: Dict[int, CatalogRecord] = {}
+        self._arrays = {column: catalog_file.array(f'{name}.{column}') for column in self.columns}
+        self._nulls = {
+            column: catalog_file.array(f'{name}.{column}.null')
+            for column, kind in self.columns.items() if kind == 'int'
+        }
+        self._enums = {
+            column: sa_inspect(_MODELS[name]).columns[column].type.enum_class
+            for column, kind in self.columns.items() if kind == 'enum'
+        }
+        ids = self._arrays['id']
+        # Les lignes sont écrites triées par ID : recherche dichotomique pour les IDs entiers
+        self._string_ids: Optional[Dict[str, int]] = (
+            {catalog_file.string(code): row for row, code in enumerate(ids)}
+            if self.columns['id'] == 'str' else None
+        )
+
+    def column(self, column: str) -> np.ndarray:
+        """Vue NumPy (sans copie) d'une colonne."""
+        return self._arrays[column]
+
+    def position(self, record_id: Any) -> int:
+        """Ligne d'un ID, ``-1`` s'il est absent."""
+        if self._string_ids is not None:
+            return self._string_ids.get(record_id, -1) if isinstance(record_id, str) else -1
+        if isinstance(record_id, bool) or not isinstance(record_id, (int, np.integer)):
+            return -1
+        ids = self._arrays['id']
+        row = int(np.searchsorted(ids, record_id))
+        return row if row < self._rows and ids[row] == record_id else -1
+
+    def record(self, row: int) -> CatalogRecord:
+        """Retourne une ligne, décodée à sa première lecture."""
+        record = self._records.get(row)
+        if record is None:
+            record = self._records[row] = self._decode(row)
+        return record
+
+    def _decode(self, row: int) -> CatalogRecord:
+        """Décode une ligne."""
+        values: Dict[str, Any] = {}
+        for column, kind in self.columns.items():
+            raw = self._arrays[column][row]
+            if kind == 'int':
+                values[column] = None if self._nulls[column][row] else int(raw)
+            elif kind == 'float':
+                values[column] = None if np.isnan(raw) else float(raw)
+            elif kind == 'bool':
+                values[column] = None if raw < 0 else bool(raw)
+            else:
+                text = self._file.string(int(raw))
+                if text is None or kind == 'str':
+                    values[column] = text
+                elif kind == 'json':
+                    values[column] = json.loads(text)
+                elif kind == 'enum':
+                    enum_class = self._enums[column]
+                    values[column] = enum_class[text] if enum_class is not None else text
+                else:
+                    values[column] = datetime.fromisoformat(text)
+        return CatalogRecord(self.model, values)
+
+    def __getitem__(self, record_id: Any) -> CatalogRecord:
+        row = self.position(record_id)
+        if row < 0:
+            raise KeyError(record_id)
+        return self.record(row)
+
+    def __contains__(self, record_id: Any) -> bool:
+        return self.position(record_id) >= 0
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._string_ids is not None:
+            return iter(self._string_ids)
+        return (int(record_id) for record_id in self._arrays['id'])
+
+    def __len__(self) -> int:
+        return self._rows
+
+
+class CatalogGroup(Mapping):
+    """Regroupement du fichier (CSR) : clé -> lignes d'une table."""
+
+    def __init__(self, catalog_file: 'CatalogFile', name: str, table: CatalogTable):
+        spec = catalog_file.header['groups'][name]
+        self._table = table
+        self._offsets = catalog_file.array(f'{name}.offsets')
+        self._rows = catalog_file.array(f'{name}.rows')
+        keys = catalog_file.array(f'{name}.keys')
+        self._keys: Dict[Any, int] = {
+            (catalog_file.string(int(key)) if spec['key_kind'] == 'str' else int(key)): index
+            for index, key in enumerate(keys)
+        }
+
+    def __getitem__(self, key: Any) -> Tuple[CatalogRecord, ...]:
+        index = self._keys[key]
+        rows = self._rows[self._offsets[index]:self._offsets[index + 1]]
+        return tuple(self._table.record(int(row)) for row in rows)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class CatalogFile:
+    """Fichier de catalogue projeté en mémoire en lecture seule.
+
+    L'export remplace le fichier par renommage : un worker qui le projette garde
+    l'ancienne version. ``is_stale`` compare l'identité du fichier sur le disque à
+    celle du fichier projeté, au plus une fois toutes les ``check_interval``
+    secondes.
+    """
+
+    check_interval = 1.0
+
+    def __init__(self, path: Union[str, Path]):
+        """Ouvre et valide le fichier.
+
+        Args:
+            path: Chemin du fichier
+
+        Raises:
+            CatalogFileError: Si le fichier est invalide ou d'une autre version de format
+        """
+        self.path = Path(path)
+        self._checked_at = time.monotonic()
+        with open(self.path, 'rb') as f:
+            self._identity = self._file_identity(os.fstat(f.fileno()))
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise CatalogFileError(f"Fichier de catalogue vide: {self.path}") from e
+
+        if len(self._mmap) < _PREFIX.size:
+            raise CatalogFileError(f"Fichier de catalogue tronqué: {self.path}")
+        magic, format_version, header_size, data_start = _PREFIX.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise CatalogFileError(f"Ce fichier n'est pas un catalogue GW2: {self.path}")
+        if format_version != FORMAT_VERSION:
+            raise CatalogFileError(
+                f"Version de format {format_version} non supportée (attendue: {FORMAT_VERSION})"
+            )
+        if _PREFIX.size + header_size > len(self._mmap):
+            raise CatalogFileError(f"Fichier de catalogue tronqué: {self.path}")
+        try:
+            self.header: Dict[str, Any] = json.loads(self._mmap[_PREFIX.size:_PREFIX.size + header_size])
+        except ValueError as e:
+            raise CatalogFileError(f"En-tête du catalogue illisible: {self.path}") from e
+        self._data_start = data_start
+
+        end = max(
+            (data_start + s['offset'] + s['count'] * np.dtype(s['dtype']).itemsize
+             for s in self.header['sections'].values()),
+            default=data_start
+        )
+        if end > len(self._mmap):
+            raise CatalogFileError(f"Fichier de catalogue tronqué: {self.path}")
+
+        self._string_offsets = self.array('strings.offsets')
+        self._string_data = self.array('strings.data')
+
+    @staticmethod
+    def _file_identity(stat: os.stat_result) -> Tuple[int, int, int]:
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def is_stale(self) -> bool:
+        """Indique si le fichier a été réécrit depuis son ouverture."""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = now
+        try:
+            return self._file_identity(os.stat(self.path)) != self._identity
+        except OSError:
+            # Fichier supprimé : l'instantané projeté reste utilisable
+            return False
+
+    @property
+    def catalog_version(self) -> int:
+        """Version de l'instantané exporté."""
+        return self.header['catalog_version']
+
+    @property
+    def nbytes(self) -> int:
+        """Taille du fichier projeté."""
+        return len(self._mmap)
+
+    def array(self, name: str) -> np.ndarray:
+        """Vue NumPy en lecture seule (sans copie) d'une section."""
+        spec = self.header['sections'][name]
+        return np.frombuffer(
+            self._mmap, dtype=np.dtype(spec['dtype']), count=spec['count'],
+            offset=self._data_start + spec['offset']
+        )
+
+    def string(self, code: int) -> Optional[str]:
+        """Chaîne de la table des chaînes (``None`` pour ``-1``)."""
+        if code < 0:
+            return None
+        start, end = self._string_offsets[code], self._string_offsets[code + 1]
+        return self._string_data[start:end].tobytes().decode('utf-8')
+
+    def table(self, name: str) -> CatalogTable:
+        """Table du catalogue (voir ``CATALOG_TABLES``)."""
+        return CatalogTable(self, name)
+
+    def fact_store(self) -> SkillFactStore:
+        """Store des faits des compétences adossé aux vues du fichier."""
+        return SkillFactStore(
+            **{column: self.array(f'facts.{column}') for column in _FACT_COLUMNS},
+            fact_types=[self.string(int(code)) for code in self.array('facts.fact_types')],
+            attributes=[self.string(int(code)) for code in self.array('facts.attributes')],
+        )
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Instantané du catalogue lisant directement le fichier.
+
+        Les lignes sont décodées à leur première lecture ; l'index des effets est
+        construit à sa première utilisation. ``get_catalog`` rouvre le fichier
+        lorsqu'il a été réécrit.
+        """
+        start = time.perf_counter()
+        tables = {name: self.table(name) for name, _ in CATALOG_TABLES}
+        groups = {
+            name: CatalogGroup(self, name, tables[table])
+            for name, (table, _) in CATALOG_GROUPS.items()
+        }
+        skills, traits = tables['skills'], tables['traits']
+        snapshot = CatalogSnapshot.assemble(
+            tables={name: table for name, table in tables.items() if name not in groups},
+            groups=groups,
+            fact_store=self.fact_store(),
+            effect_index=lambda: EffectIndex.build(skills.values(), traits.values()),
+            source=str(self.path),
+            is_stale=self.is_stale,
+            reload=lambda: load_catalog_file(self.path),
+        )
+        logger.info(
+            f"Catalogue v{snapshot.version} projeté depuis {self.path} en "
+            f"{(time.perf_counter() - start) * 1000:.1f}ms ({self.nbytes / 1024:.1f} Ko)"
+        )
+        return snapshot
+
+
+def load_catalog_file(path: Union[str, Path]) -> CatalogSnapshot:
+    """Ouvre un fichier de catalogue et retourne son instantané."""
+    return CatalogFile(path).snapshot()
+
+
+def install_catalog(path: Optional[Union[str, Path]] = None) -> CatalogSnapshot:
+    """Installe l'instantané courant depuis le fichier, ou depuis la base à défaut.
+
+    Si le fichier est absent ou invalide, le catalogue est chargé depuis la base
+    puis exporté vers ``path`` pour les workers suivants (sans échec si le
+    répertoire est en lecture seule).
+
+    Args:
+        path: Chemin du fichier de catalogue (``None`` pour toujours lire la base)
+
+    Returns:
+        L'instantané installé
+    """
+    if path is not None and Path(path).exists():
+        try:
+            snapshot = load_catalog_file(path)
+            set_catalog(snapshot)
+            return snapshot
+        except (ValueError, OSError) as e:
+            logger.warning(f"Fichier de catalogue {path} ignoré: {e}")
+
+    snapshot = refresh_catalog()
+    if path is not None:
+        try:
+            export_catalog(snapshot, path)
+        except OSError as e:
+            logger.warning(f"Impossible d'écrire le fichier de catalogue {path}: {e}")
+    return snapshot
@@ -7,39 +7,46 @@ les données de Guild Wars 2, en utilisant le cache local et l'API officielle.
 import asyncio
 import json
 import logging
+import time
 import uuid
-import pickle
 import traceback
 from datetime import datetime, timedelta
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Callable, Tuple, Union, TypeVar, Type
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Callable, Tuple, Union, TypeVar, Type
 from functools import wraps
 
-# Pour la gestion du cache distribué
-try:
-    import redis.asyncio as redis
-    REDIS_AVAILABLE = True
-except ImportError:
-    REDIS_AVAILABLE = False
-    import warnings
-    warnings.warn("Le module redis n'est pas installé. Le cache distribué ne sera pas disponible.")
+from app.api.tiered_cache import get_cache, make_key
 
 # Type générique pour les méthodes de cache
 T = TypeVar('T')
 
+# Espace de noms des appels API mis en cache par le service
+CACHE_NAMESPACE = "gw2_data"
+
 def redis_cache(
-    key_func: Optional[Callable[..., str]] = None,
+    key_func: Optional[Callable[..., Any]] = None,
     ttl: int = 86400,  # 24h par défaut
     prefix: str = "gw2tb:",
-    compress: bool = True
+    compress: bool = True,
+    beta: float = 1.0
 ) -> Callable:
-    """Décorateur pour mettre en cache le résultat d'une méthode avec Redis.
+    """Décorateur pour mettre en cache le résultat d'une méthode.
+    
+    Le résultat est stocké dans le cache multi-niveaux (mémoire, disque, puis
+    Redis si ``redis_url`` est configuré), dans l'espace de noms ``prefix``.
+    La clé est un hachage stable des arguments, et le calcul est protégé de
+    l'effet de meute : un seul appel recalcule une clé expirée, et une clé
+    très demandée est rafraîchie peu avant son expiration.
     
     Args:
-        key_func: Fonction pour générer la clé de cache à partir des arguments
+        key_func: Fonction retournant, à partir des arguments, les éléments
+            (sérialisables en JSON) de la clé de cache
         ttl: Durée de vie du cache en secondes
-        prefix: Préfixe pour les clés de cache
-        compress: Si True, compresse les données avec pickle
+        prefix: Préfixe pour les clés de cache (espace de noms du cache)
+        compress: Si True, compresse les grandes valeurs sur disque et dans Redis
+        beta: Facteur du rafraîchissement anticipé (0 pour le désactiver)
         
     Returns:
         Le décorateur à appliquer à la méthode
@@ -47,43 +54,18 @@ def redis_cache(
     def decorator(method: Callable[..., T]) -> Callable[..., T]:
         @wraps(method)
         async def wrapper(self, *args, **kwargs) -> T:
-            # Si Redis n'est pas disponible, on exécute simplement la méthode
-            if not hasattr(self, 'redis_client') or self.redis_client is None:
-                return await method(self, *args, **kwargs)
-                
+            cache = get_cache(prefix.rstrip(':'), ttl=ttl, compress=compress)
+            
             # Générer la clé de cache
             if key_func is not None:
-                cache_key = f"{prefix}{key_func(*args, **kwargs)}"
+                cache_key = make_key(method.__qualname__, key_func(*args, **kwargs))
             else:
                 # Par défaut, on utilise le nom de la méthode et les arguments
-                cache_key = f"{prefix}{method.__name__}:{str(args)}:{str(kwargs)}"
+                cache_key = make_key(method.__qualname__, args, kwargs)
             
-            try:
-                # Essayer de récupérer depuis le cache
-                cached_data = await self.redis_client.get(cache_key)
-                if cached_data is not None:
-                    if compress:
-                        cached_data = pickle.loads(cached_data)
-                    logger.debug(f"Cache hit pour la clé: {cache_key}")
-                    return cached_data
-                    
-            except Exception as e:
-                logger.warning(f"Erreur lors de la lecture du cache Redis: {e}")
-            
-            # Si le cache est vide ou en cas d'erreur, exécuter la méthode
-            result = await method(self, *args, **kwargs)
-            
-            try:
-                # Mettre en cache le résultat
-                if result is not None:
-                    value = pickle.dumps(result) if compress else str(result)
-                    await self.redis_client.setex(cache_key, ttl, value)
-                    logger.debug(f"Résultat mis en cache avec la clé: {cache_key} (TTL: {ttl}s)")
-                    
-            except Exception as e:
-                logger.warning(f"Erreur lors de l'écriture dans le cache Redis: {e}")
-            
-            return result
+            return await cache.get_or_set(
+                cache_key, lambda: method(self, *args, **kwargs), ttl=ttl, beta=beta
+            )
             
         return wrapper
     return decorator
@@ -104,9 +86,63 @@ from app.game_mechanics import (
     GameMode, RoleType, AttributeType, DamageType, 
     BuffType, BoonType, ConditionType, SkillCategory
 )
+from app.models.model_cache import get_model_cache
+from app.scoring.cache import get_default_metric_cache
+from app.models.trait import trait_skills
+from app.services.bulk_writer import BulkUpsertWriter
+from app.services.incremental_sync import ChunkCheckpoint, EntitySync, IncrementalSync
+from app.services.mapping.gw2_api_mapper import GW2APIMapper
+from app.services.sync_graph import SyncGraph, SyncStep
+from app.services.sync_pipeline import SyncPipeline, default_fetchers
 
 logger = logging.getLogger(__name__)
 
+# Catégories d'objets (clés des statistiques de sync_items) selon le type de l'API
+_ITEM_CATEGORIES = {
+    'weapon': 'weapons',
+    'armor': 'armor',
+    'trinket': 'trinkets',
+    'back': 'trinkets',
+    'accessory': 'trinkets',
+    'amulet': 'trinkets',
+    'ring': 'trinkets',
+    'upgradecomponent': 'upgrades',
+    'rune': 'upgrades',
+    'sigil': 'upgrades',
+    'consumable': 'consumables',
+    'food': 'consumables',
+    'gizmo': 'gizmos',
+    'tool': 'tools',
+    'gathering': 'tools',
+    'mini': 'minis',
+    'minipet': 'minis',
+}
+
+# Catégories d'objets enregistrées en base (avec la table de leurs détails)
+_STORED_ITEM_CATEGORIES = {'weapons', 'armor', 'trinkets', 'upgrades'}
+
+
+def _item_category(item_type: str) -> str:
+    """Retourne la catégorie d'un type d'objet de l'API (ex: "Weapon" -> "weapons")."""
+    return _ITEM_CATEGORIES.get(str(item_type).lower(), 'other')
+
+
+@dataclass
+class _ItemBatch:
+    """Lot d'objets converti, en attente d'écriture.
+    
+    Attributes:
+        rows: Lignes de la table ``items``
+        details: Lignes de détails par modèle (armes, armures, bijoux, améliorations)
+        categories: Catégorie de chaque objet enregistré, par ID
+        other_ids: IDs des objets traités qui ne sont pas enregistrés en base
+    """
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    details: Dict[Any, List[Dict[str, Any]]] = field(default_factory=dict)
+    categories: Dict[int, str] = field(default_factory=dict)
+    other_ids: List[Any] = field(default_factory=list)
+
+
 class GW2DataService:
     """Service pour la gestion des données GW2."""
     
@@ -119,6 +155,11 @@ class GW2DataService:
         """
         self._db = db_session
         self._api = api_client or GW2APIClient()
+        self._mapper: Optional[GW2APIMapper] = None
+        self._incremental_sync: Optional[IncrementalSync] = None
+        self._incremental_lock = asyncio.Lock()
+        self._db_lock = asyncio.Lock()
+        self._force_sync = False
         self._initialized = False
     
     @property
@@ -128,6 +169,72 @@ class GW2DataService:
             self._db = next(get_db())
         return self._db
     
+    @property
+    def mapper(self) -> GW2APIMapper:
+        """Retourne le mappeur partagé par toute une synchronisation.
+        
+        Sa carte d'identité est vidée au début de chaque étape (``sync_*``) et
+        après l'annulation d'un lot par l'écrivain : elle ne retient pas
+        d'instances d'une transaction annulée.
+        """
+        if self._mapper is None:
+            self._mapper = GW2APIMapper(self.db)
+        return self._mapper
+    
+    def _reset_mapper(self) -> None:
+        """Vide la carte d'identité du mappeur."""
+        if self._mapper is not None:
+            self._mapper.clear_cache()
+    
+    def _writer(self) -> BulkUpsertWriter:
+        """Retourne un écrivain par lots qui vide la carte d'identité du mappeur en cas d'annulation."""
+        return BulkUpsertWriter(self.db, on_rollback=self._reset_mapper)
+    
+    @asynccontextmanager
+    async def _db_section(self) -> AsyncIterator[Session]:
+        """Section d'écriture en base, exclusive entre les étapes d'une synchronisation.
+        
+        Les étapes exécutées simultanément (``_sync_graph``) partagent la
+        session : une seule étape à la fois peut y écrire. La transaction est
+        terminée en sortie de section (validée, ou annulée si une exception est
+        levée), de sorte qu'une étape ne valide ni n'annule jamais les
+        écritures d'une autre.
+        """
+        async with self._db_lock:
+            try:
+                yield self.db
+            except BaseException:
+                self.db.rollback()
+                self._reset_mapper()
+                raise
+            self.db.commit()
+    
+    async def _track(self, entity: str, ids: List[Any]) -> EntitySync:
+        """Démarre le suivi incrémental d'une entité (dans une section d'écriture)."""
+        async with self._db_section():
+            return (await self._incremental()).track(entity, ids)
+    
+    async def _checkpoint(self, tracker: EntitySync) -> ChunkCheckpoint:
+        """Retourne le point de reprise des lots d'une entité (dans une section d'écriture)."""
+        async with self._db_section():
+            return tracker.checkpoint()
+    
+    async def _incremental(self) -> IncrementalSync:
+        """Retourne le suivi de synchronisation incrémentale de la synchronisation en cours.
+        
+        Sans ID de build (API indisponible), toutes les entités sont récupérées.
+        Les étapes exécutées simultanément partagent le même suivi.
+        """
+        async with self._incremental_lock:
+            if self._incremental_sync is None:
+                try:
+                    build_id = (await self._api.get_build()).get('id')
+                except Exception as e:
+                    logger.warning(f"ID de build indisponible, synchronisation complète: {e}")
+                    build_id = None
+                self._incremental_sync = IncrementalSync(self.db, build_id, force=self._force_sync)
+        return self._incremental_sync
+    
     async def initialize(self) -> None:
         """Initialise le service (vérifie la connexion à l'API, etc.)."""
         if self._initialized:
@@ -160,16 +267,40 @@ class GW2DataService:
     
     # Méthodes pour la synchronisation des données
     
+    def _sync_graph(self) -> SyncGraph:
+        """Retourne le graphe des étapes d'une synchronisation complète.
+        
+        Les dépendances suivent les clés étrangères entre les tables : les
+        étapes indépendantes (par exemple les compétences et les statistiques
+        d'objets) s'exécutent simultanément. Les étapes partagent la session :
+        leurs écritures sont sérialisées par ``_db_section``.
+        """
+        return SyncGraph([
+            SyncStep("professions", self.sync_professions),
+            SyncStep("specializations", self.sync_specializations, depends_on=("professions",)),
+            SyncStep("skills", self.sync_skills, depends_on=("professions", "specializations")),
+            SyncStep("traits", self.sync_traits, depends_on=("specializations", "skills")),
+            SyncStep("itemstats", self.sync_itemstats),
+            SyncStep("items", self.sync_items, depends_on=("professions", "itemstats")),
+        ])
+    
     async def sync_all_data(self, force: bool = False) -> Dict[str, Any]:
         """Synchronise toutes les données depuis l'API GW2.
         
+        Seules les entités nouvelles ou modifiées depuis la dernière
+        synchronisation sont converties et écrites (voir ``IncrementalSync``).
+        Les étapes indépendantes s'exécutent simultanément (voir ``_sync_graph``).
+        
         Args:
             force: Si True, force la synchronisation même si les données sont à jour
+                et réécrit toutes les entités
             
         Returns:
-            Un dictionnaire avec les résultats de la synchronisation
+            Un dictionnaire avec le résultat de chaque étape et, sous ``timings``,
+            la durée des étapes et le chemin critique
         """
         results = {}
+        self._force_sync = force
         
         try:
             # Vérifier si la synchronisation est nécessaire
@@ -178,12 +309,9 @@ class GW2DataService:
                 return {"status": "up_to_date", "message": "Les données sont déjà à jour"}
             
             # Synchroniser les données de base dans l'ordre de dépendance
-            results["professions"] = await self.sync_professions()
-            results["specializations"] = await self.sync_specializations()
-            results["skills"] = await self.sync_skills()
-            results["traits"] = await self.sync_traits()
-            results["items"] = await self.sync_items()
-            results["item_stats"] = await self.sync_itemstats()
+            graph_result = await self._sync_graph().run()
+            results.update(graph_result.results)
+            results["timings"] = graph_result.report()
             
             # Mettre à jour la date de dernière synchronisation
             await self._update_last_sync_time()
@@ -197,8 +325,42 @@ class GW2DataService:
             results["error"] = str(e)
             raise
         
+        finally:
+            self._after_sync()
+        
         return results
     
+    def _after_sync(self) -> None:
+        """Invalide les caches dérivés des données après une synchronisation.
+        
+        Appelé même si la synchronisation échoue : des lignes ont pu être écrites.
+        """
+        # La carte d'identité du mappeur et le suivi incrémental ne vivent que le
+        # temps d'une synchronisation
+        self._mapper = None
+        self._incremental_sync = None
+        self._force_sync = False
+        
+        data_version = get_model_cache().bump_data_version()
+        logger.debug(f"Caches des modèles invalidés après synchronisation (version {data_version})")
+        
+        # Les scores des métriques dépendent des faits des compétences synchronisés
+        get_default_metric_cache().invalidate()
+        
+        # Remplacer l'instantané du catalogue s'il est utilisé par l'application
+        # et réécrire le fichier partagé par les workers
+        from app.config import settings
+        from app.services.catalog import CatalogSnapshot, get_catalog, refresh_catalog
+        from app.services.catalog_file import export_catalog
+        if get_catalog() is None and not settings.CATALOG_FILE:
+            return
+        try:
+            snapshot = refresh_catalog(self.db) if get_catalog() is not None else CatalogSnapshot.load(self.db)
+            if settings.CATALOG_FILE:
+                export_catalog(snapshot, settings.CATALOG_FILE)
+        except Exception as e:
+            logger.error(f"Impossible de recharger le catalogue après synchronisation: {e}")
+    
     async def _needs_sync(self) -> bool:
         """Vérifie si une synchronisation est nécessaire."""
         # TODO: Implémenter la logique pour vérifier si une synchronisation est nécessaire
@@ -215,34 +377,49 @@ class GW2DataService:
     async def sync_professions(self) -> Dict[str, Any]:
         """Synchronise les données des professions depuis l'API GW2."""
         logger.info("Début de la synchronisation des professions...")
+        self._reset_mapper()
         
         try:
             # Récupérer la liste des professions depuis l'API
             profession_ids = await self._api.get_professions()
+            tracker = await self._track('professions', profession_ids)
             
             # Récupérer les détails de chaque profession
             professions_data = []
-            for prof_id in profession_ids:
+            errors = 0
+            for prof_id in tracker.ids:
                 try:
                     prof_data = await self._api.get_profession(prof_id)
                     professions_data.append(prof_data)
                 except Exception as e:
+                    errors += 1
                     logger.error(f"Erreur lors de la récupération de la profession {prof_id}: {e}")
             
-            # Traiter les données des professions
-            processed = 0
-            for prof_data in professions_data:
-                try:
-                    await self._process_profession_data(prof_data)
-                    processed += 1
-                except Exception as e:
-                    logger.error(f"Erreur lors du traitement de la profession {prof_data.get('id')}: {e}")
+            async with self._db_section():
+                # Traiter les professions modifiées (lignes existantes chargées en une requête)
+                professions_data = tracker.changed(professions_data)
+                self.mapper.prefetch(Profession, [prof_data.get('id') for prof_data in professions_data])
+                processed = 0
+                for prof_data in professions_data:
+                    try:
+                        await self._process_profession_data(prof_data)
+                        tracker.record([prof_data['id']])
+                        processed += 1
+                    except Exception as e:
+                        errors += 1
+                        logger.error(f"Erreur lors du traitement de la profession {prof_data.get('id')}: {e}")
             
-            logger.info(f"Synchronisation des professions terminée: {processed}/{len(professions_data)} traitées")
+                tracker.complete(success=errors == 0)
+            logger.info(
+                f"Synchronisation des professions terminée: {processed}/{len(professions_data)} traitées, "
+                f"{tracker.unchanged} inchangées"
+            )
             return {
-                "total": len(professions_data),
+                "total": len(profession_ids),
                 "processed": processed,
-                "status": "success" if processed > 0 else "error"
+                "errors": errors,
+                **tracker.summary(),
+                "status": "success" if errors == 0 else "partial" if processed > 0 else "error"
             }
             
         except Exception as e:
@@ -257,13 +434,7 @@ class GW2DataService:
     async def _process_profession_data(self, prof_data: Dict[str, Any]) -> Profession:
         """Traite les données d'une profession et les enregistre en base."""
         db = self.db
-        
-        # Vérifier si la profession existe déjà
-        profession = db.query(Profession).filter_by(id=prof_data['id']).first()
-        
-        if not profession:
-            profession = Profession(id=prof_data['id'])
-            db.add(profession)
+        profession = self.mapper.get_or_create(Profession, prof_data['id'])
         
         # Mettre à jour les propriétés de base
         profession.name = prof_data.get('name', '')
@@ -289,28 +460,42 @@ class GW2DataService:
     async def sync_specializations(self) -> Dict[str, Any]:
         """Synchronise les données des spécialisations depuis l'API GW2."""
         logger.info("Début de la synchronisation des spécialisations...")
+        self._reset_mapper()
         
         try:
             # Récupérer les IDs de toutes les spécialisations
             spec_ids = await self._get_all_specialization_ids()
+            tracker = await self._track('specializations', spec_ids)
+            
+            # Récupérer les détails des spécialisations à synchroniser
+            specs_data = await self._api.get_specializations(tracker.ids)
+            
+            async with self._db_section():
+                # Traiter les spécialisations modifiées (lignes existantes chargées en une requête)
+                specs_data = tracker.changed(specs_data)
+                self.mapper.prefetch(Specialization, [spec_data.get('id') for spec_data in specs_data])
+                processed = 0
+                errors = 0
+                for spec_data in specs_data:
+                    try:
+                        await self._process_specialization_data(spec_data)
+                        tracker.record([spec_data['id']])
+                        processed += 1
+                    except Exception as e:
+                        errors += 1
+                        logger.error(f"Erreur lors du traitement de la spécialisation {spec_data.get('id')}: {e}")
             
-            # Récupérer les détails de chaque spécialisation
-            specs_data = await self._api.get_specializations(spec_ids)
-            
-            # Traiter les données des spécialisations
-            processed = 0
-            for spec_data in specs_data:
-                try:
-                    await self._process_specialization_data(spec_data)
-                    processed += 1
-                except Exception as e:
-                    logger.error(f"Erreur lors du traitement de la spécialisation {spec_data.get('id')}: {e}")
-            
-            logger.info(f"Synchronisation des spécialisations terminée: {processed}/{len(specs_data)} traitées")
+                tracker.complete(success=errors == 0)
+            logger.info(
+                f"Synchronisation des spécialisations terminée: {processed}/{len(specs_data)} traitées, "
+                f"{tracker.unchanged} inchangées"
+            )
             return {
-                "total": len(specs_data),
+                "total": len(spec_ids),
                 "processed": processed,
-                "status": "success" if processed > 0 else "error"
+                "errors": errors,
+                **tracker.summary(),
+                "status": "success" if errors == 0 else "partial" if processed > 0 else "error"
             }
             
         except Exception as e:
@@ -323,34 +508,13 @@ class GW2DataService:
             }
     
     async def _get_all_specialization_ids(self) -> List[int]:
-        """Récupère les IDs de toutes les spécialisations via les professions."""
-        # Récupérer d'abord toutes les professions
-        profession_ids = await self._api.get_professions()
-        all_spec_ids = set()
-        
-        # Pour chaque profession, récupérer les IDs de spécialisation
-        for prof_id in profession_ids:
-            try:
-                prof_data = await self._api.get_profession(prof_id)
-                for spec_type in ["specializations", "training"]:
-                    for item in prof_data.get(spec_type, []):
-                        if "id" in item:
-                            all_spec_ids.add(item["id"])
-            except Exception as e:
-                logger.error(f"Erreur lors de la récupération des spécialisations pour {prof_id}: {e}")
-        
-        return list(all_spec_ids)
+        """Récupère les IDs de toutes les spécialisations (une seule requête, sans passer par les professions)."""
+        return await self._api.get('/v2/specializations')
     
     async def _process_specialization_data(self, spec_data: Dict[str, Any]) -> Specialization:
         """Traite les données d'une spécialisation et les enregistre en base."""
         db = self.db
-        
-        # Vérifier si la spécialisation existe déjà
-        spec = db.query(Specialization).filter_by(id=spec_data['id']).first()
-        
-        if not spec:
-            spec = Specialization(id=spec_data['id'])
-            db.add(spec)
+        spec = self.mapper.get_or_create(Specialization, spec_data['id'])
         
         # Mettre à jour les propriétés de base
         spec.name = spec_data.get('name', '')
@@ -370,10 +534,14 @@ class GW2DataService:
     async def sync_skills(self) -> Dict[str, Any]:
         """Synchronise les données des compétences depuis l'API GW2.
         
+        Les lots de l'API sont récupérés en parallèle (``SyncPipeline``) et
+        chacun est écrit avec une seule instruction d'upsert.
+        
         Returns:
             Un dictionnaire contenant les résultats de la synchronisation
         """
         logger.info("Début de la synchronisation des compétences...")
+        self._reset_mapper()
         
         try:
             # Récupérer tous les IDs de compétences depuis l'API
@@ -385,43 +553,35 @@ class GW2DataService:
             
             logger.info(f"Récupération des détails pour {len(skill_ids)} compétences...")
             
-            # Récupérer les détails des compétences par lots
-            chunk_size = 200  # Limite de l'API GW2
-            processed = 0
-            errors = 0
-            
-            for i in range(0, len(skill_ids), chunk_size):
-                chunk = skill_ids[i:i + chunk_size]
-                
-                try:
-                    # Récupérer les détails du lot actuel
-                    skills_data = await self._api.get_skills(chunk)
-                    
-                    # Traiter chaque compétence du lot
-                    for skill_data in skills_data:
-                        try:
-                            await self._process_skill_data(skill_data)
-                            processed += 1
-                            
-                            # Journaliser la progression tous les 50 éléments
-                            if processed % 50 == 0:
-                                logger.info(f"Traitement en cours: {processed}/{len(skill_ids)} compétences")
-                                
-                        except Exception as e:
-                            errors += 1
-                            logger.error(f"Erreur lors du traitement de la compétence {skill_data.get('id')}: {e}")
-                            
-                except Exception as e:
-                    errors += 1
-                    logger.error(f"Erreur lors de la récupération du lot de compétences: {e}")
+            # Récupérer, convertir et écrire les compétences par lots
+            mapper = self.mapper
+            writer = self._writer()
+            tracker = await self._track('skills', skill_ids)
+            pipeline = SyncPipeline(
+                fetch=self._api.get_skills,
+                transform=lambda data: self._map_rows(tracker.changed(data), mapper.skill_row, "la compétence"),
+                write=lambda rows: self._upsert(writer, Skill, rows, tracker),
+                section=self._db_section,
+                label="compétences"
+            )
+            result = await pipeline.run(tracker.ids, checkpoint=await self._checkpoint(tracker))
+            processed, errors = result.processed, result.errors
+            async with self._db_section():
+                tracker.complete(success=errors == 0)
             
             # Journaliser les résultats
-            logger.info(f"Synchronisation des compétences terminée: {processed} traitées, {errors} erreurs")
+            rows_per_second = writer.rows_per_second()
+            logger.info(
+                f"Synchronisation des compétences terminée: {processed} traitées, {errors} erreurs "
+                f"({rows_per_second:.0f} lignes/s)"
+            )
             
             return {
                 "total": len(skill_ids),
                 "processed": processed,
                 "errors": errors,
+                "rows_per_second": rows_per_second,
+                **tracker.summary(),
                 "status": "success" if errors == 0 else "partial" if processed > 0 else "error"
             }
             
@@ -435,6 +595,26 @@ class GW2DataService:
                 "error": str(e)
             }
     
+    def _write_skills(
+        self,
+        skills_data: List[Dict[str, Any]],
+        mapper: 'GW2APIMapper',
+        writer: BulkUpsertWriter
+    ) -> Tuple[int, int]:
+        """Écrit un lot de compétences.
+        
+        Args:
+            skills_data: Données brutes des compétences depuis l'API
+            mapper: Mappeur utilisé pour convertir les données en lignes
+            writer: Écrivain par lots
+            
+        Returns:
+            Le nombre de compétences écrites et le nombre d'erreurs
+        """
+        rows, errors = self._map_rows(skills_data, mapper.skill_row, "la compétence")
+        written, failed = self._upsert(writer, Skill, rows)
+        return written, errors + failed
+    
     async def _process_skill_data(self, skill_data: Dict[str, Any]) -> Skill:
         """Traite les données d'une compétence et les enregistre en base.
         
@@ -443,41 +623,26 @@ class GW2DataService:
             
         Returns:
             L'objet Skill créé ou mis à jour
-        """
-        from app.services.mapping.gw2_api_mapper import GW2APIMapper
-        
-        db = self.db
-        mapper = GW2APIMapper(db)
-        
-        try:
-            # Convertir les données de l'API en modèle interne
-            skill = mapper.map_skill(skill_data)
-            
-            # Valider que les champs obligatoires sont présents
-            if not skill.name or not skill.type:
-                raise ValueError(f"Données de compétence invalides: champs obligatoires manquants dans {skill_data}")
             
-            # Sauvegarder les modifications
-            db.commit()
-            
-            # Journaliser la création/mise à jour
-            logger.debug(f"Compétence {'mise à jour' if skill.id else 'créée'}: {skill.name} (ID: {skill.id})")
-            
-            return skill
-            
-        except Exception as e:
-            # En cas d'erreur, annuler les modifications et relancer l'exception
-            db.rollback()
-            logger.error(f"Erreur lors du traitement de la compétence {skill_data.get('id')}: {e}")
-            raise
+        Raises:
+            ValueError: Si la compétence n'a pas pu être enregistrée
+        """
+        written, _ = self._write_skills([skill_data], self.mapper, self._writer())
+        if not written:
+            raise ValueError(f"Compétence {skill_data.get('id')} non enregistrée")
+        return self.db.get(Skill, skill_data['id'], populate_existing=True)
     
     async def sync_traits(self) -> Dict[str, Any]:
         """Synchronise les données des traits depuis l'API GW2.
         
+        Les lots de l'API sont récupérés en parallèle (``SyncPipeline``) et
+        chacun est écrit avec une seule instruction d'upsert.
+        
         Returns:
             Un dictionnaire contenant les résultats de la synchronisation
         """
         logger.info("Début de la synchronisation des traits...")
+        self._reset_mapper()
         
         try:
             # Récupérer tous les IDs de traits depuis l'API
@@ -489,43 +654,36 @@ class GW2DataService:
             
             logger.info(f"Récupération des détails pour {len(trait_ids)} traits...")
             
-            # Récupérer les détails des traits par lots
-            chunk_size = 200  # Limite de l'API GW2
-            processed = 0
-            errors = 0
-            
-            for i in range(0, len(trait_ids), chunk_size):
-                chunk = trait_ids[i:i + chunk_size]
-                
-                try:
-                    # Récupérer les détails du lot actuel
-                    traits_data = await self._api.get_traits(chunk)
-                    
-                    # Traiter chaque trait du lot
-                    for trait_data in traits_data:
-                        try:
-                            await self._process_trait_data(trait_data)
-                            processed += 1
-                            
-                            # Journaliser la progression tous les 50 éléments
-                            if processed % 50 == 0:
-                                logger.info(f"Traitement en cours: {processed}/{len(trait_ids)} traits")
-                                
-                        except Exception as e:
-                            errors += 1
-                            logger.error(f"Erreur lors du traitement du trait {trait_data.get('id')}: {e}")
-                            
-                except Exception as e:
-                    errors += 1
-                    logger.error(f"Erreur lors de la récupération du lot de traits: {e}")
+            # Récupérer, convertir et écrire les traits par lots
+            mapper = self.mapper
+            writer = self._writer()
+            elite_specializations = self._elite_specialization_ids()
+            tracker = await self._track('traits', trait_ids)
+            pipeline = SyncPipeline(
+                fetch=self._api.get_traits,
+                transform=lambda data: self._map_traits(tracker.changed(data), mapper, elite_specializations),
+                write=lambda rows: self._upsert_traits(writer, rows, tracker),
+                section=self._db_section,
+                label="traits"
+            )
+            result = await pipeline.run(tracker.ids, checkpoint=await self._checkpoint(tracker))
+            processed, errors = result.processed, result.errors
+            async with self._db_section():
+                tracker.complete(success=errors == 0)
             
             # Journaliser les résultats
-            logger.info(f"Synchronisation des traits terminée: {processed} traités, {errors} erreurs")
+            rows_per_second = writer.rows_per_second()
+            logger.info(
+                f"Synchronisation des traits terminée: {processed} traités, {errors} erreurs "
+                f"({rows_per_second:.0f} lignes/s)"
+            )
             
             return {
                 "total": len(trait_ids),
                 "processed": processed,
                 "errors": errors,
+                "rows_per_second": rows_per_second,
+                **tracker.summary(),
                 "status": "success" if errors == 0 else "partial" if processed > 0 else "error"
             }
             
@@ -539,6 +697,72 @@ class GW2DataService:
                 "error": str(e)
             }
     
+    def _elite_specialization_ids(self) -> set:
+        """Retourne les IDs des spécialisations d'élite (type des traits)."""
+        return {spec_id for (spec_id,) in self.db.query(Specialization.id).filter(Specialization.elite.is_(True))}
+    
+    def _write_traits(
+        self,
+        traits_data: List[Dict[str, Any]],
+        mapper: 'GW2APIMapper',
+        writer: BulkUpsertWriter,
+        elite_specializations: set
+    ) -> Tuple[int, int]:
+        """Écrit un lot de traits.
+        
+        Args:
+            traits_data: Données brutes des traits depuis l'API
+            mapper: Mappeur utilisé pour convertir les données en lignes
+            writer: Écrivain par lots
+            elite_specializations: IDs des spécialisations d'élite
+            
+        Returns:
+            Le nombre de traits écrits et le nombre d'erreurs
+        """
+        rows, errors = self._map_traits(traits_data, mapper, elite_specializations)
+        written, failed = self._upsert_traits(writer, rows)
+        return written, errors + failed
+    
+    @staticmethod
+    def _upsert_traits(
+        writer: BulkUpsertWriter,
+        rows: List[Dict[str, Any]],
+        tracker: Optional[EntitySync] = None
+    ) -> Tuple[int, int]:
+        """Écrit un lot de traits et leurs liaisons aux compétences (``trait_skills``).
+        
+        Returns:
+            Le nombre de traits écrits et rejetés
+        """
+        result = writer.upsert(Trait, rows)
+        written = [row for row in rows if row['id'] not in result.failed]
+        if tracker is not None:
+            tracker.record(row['id'] for row in written)
+        links = writer.replace(
+            trait_skills, 'trait_id', [row['id'] for row in written],
+            [
+                {'trait_id': row['id'], 'skill_id': skill_id}
+                for row in written for skill_id in dict.fromkeys(row.get('skills', ()))
+            ],
+            index_elements=('trait_id', 'skill_id')
+        )
+        if links.failed:
+            logger.warning(f"{len(links.failed)} liaisons trait-compétence rejetées (compétences inconnues ?)")
+        return result.written, len(result.failed)
+    
+    def _map_traits(
+        self,
+        traits_data: List[Dict[str, Any]],
+        mapper: 'GW2APIMapper',
+        elite_specializations: set
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Convertit un lot de traits en lignes ; retourne les lignes et le nombre d'erreurs."""
+        return self._map_rows(
+            traits_data,
+            lambda data: mapper.trait_row(data, elite=data.get('specialization') in elite_specializations),
+            "du trait"
+        )
+    
     async def _process_trait_data(self, trait_data: Dict[str, Any]) -> 'Trait':
         """Traite les données d'un trait et les enregistre en base.
         
@@ -547,44 +771,73 @@ class GW2DataService:
             
         Returns:
             L'objet Trait créé ou mis à jour
+            
+        Raises:
+            ValueError: Si le trait n'a pas pu être enregistré
         """
-        from app.services.mapping.gw2_api_mapper import GW2APIMapper
-        from app.models.trait import Trait
-        
-        db = self.db
-        mapper = GW2APIMapper(db)
+        written, _ = self._write_traits(
+            [trait_data], self.mapper, self._writer(), self._elite_specialization_ids()
+        )
+        if not written:
+            raise ValueError(f"Trait {trait_data.get('id')} non enregistré")
+        return self.db.get(Trait, trait_data['id'], populate_existing=True)
+    
+    @staticmethod
+    def _map_rows(
+        items: List[Dict[str, Any]],
+        row_builder: Callable[[Dict[str, Any]], Dict[str, Any]],
+        label: str
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Convertit un lot de données de l'API en lignes, en isolant les données invalides.
         
-        try:
-            # Convertir les données de l'API en modèle interne
-            trait = mapper.map_trait(trait_data)
-            
-            # Valider que les champs obligatoires sont présents
-            if not trait.name or not trait.type or not trait.tier:
-                raise ValueError(f"Données de trait invalides: champs obligatoires manquants dans {trait_data}")
-            
-            # Sauvegarder les modifications
-            db.commit()
-            
-            # Journaliser la création/mise à jour
-            logger.debug(f"Trait {'mis à jour' if trait.id else 'créé'}: {trait.name} (ID: {trait.id})")
-            
-            return trait
+        Args:
+            items: Données brutes depuis l'API
+            row_builder: Fonction de conversion d'un élément en ligne
+            label: Désignation de l'élément pour la journalisation (ex: "du trait")
             
-        except Exception as e:
-            # En cas d'erreur, annuler les modifications et relancer l'exception
-            db.rollback()
-            logger.error(f"Erreur lors du traitement du trait {trait_data.get('id')}: {e}")
-            raise
+        Returns:
+            Les lignes valides et le nombre d'éléments rejetés
+        """
+        rows = []
+        errors = 0
+        for data in items:
+            try:
+                rows.append(row_builder(data))
+            except Exception as e:
+                errors += 1
+                logger.error(f"Erreur lors du traitement de {label} {data.get('id') if isinstance(data, dict) else data}: {e}")
+        return rows, errors
+    
+    @staticmethod
+    def _upsert(
+        writer: BulkUpsertWriter,
+        model: Any,
+        rows: List[Dict[str, Any]],
+        tracker: Optional[EntitySync] = None
+    ) -> Tuple[int, int]:
+        """Écrit un lot de lignes ; retourne le nombre de lignes écrites et rejetées.
+        
+        Si ``tracker`` est fourni, l'empreinte des lignes écrites y est enregistrée.
+        """
+        result = writer.upsert(model, rows)
+        if tracker is not None:
+            tracker.record(row['id'] for row in rows if row['id'] not in result.failed)
+        return result.written, len(result.failed)
     
     # Méthodes pour la synchronisation des objets et statistiques
     
     async def sync_items(self) -> Dict[str, Any]:
         """Synchronise les données des objets depuis l'API GW2.
         
+        Les lots de l'API sont récupérés en parallèle (``SyncPipeline``) et
+        chacun est écrit avec une instruction d'upsert par table
+        (objets, puis armes, armures, bijoux et composants d'amélioration).
+        
         Returns:
             Un dictionnaire contenant les résultats de la synchronisation
         """
         logger.info("Début de la synchronisation des objets...")
+        self._reset_mapper()
         
         try:
             # Récupérer tous les IDs d'objets depuis l'API
@@ -596,10 +849,7 @@ class GW2DataService:
             
             logger.info(f"Récupération des détails pour {len(item_ids)} objets...")
             
-            # Récupérer les détails des objets par lots
-            chunk_size = 200  # Limite de l'API GW2
-            processed = 0
-            errors = 0
+            # Récupérer, convertir et écrire les objets par lots
             stats = {
                 'weapons': 0,
                 'armor': 0,
@@ -611,65 +861,27 @@ class GW2DataService:
                 'minis': 0,
                 'other': 0
             }
-            
-            for i in range(0, len(item_ids), chunk_size):
-                chunk = item_ids[i:i + chunk_size]
-                
-                try:
-                    # Récupérer les détails du lot actuel
-                    items_data = await self._api.get_items(chunk)
-                    
-                    # Traiter chaque objet du lot
-                    for item_data in items_data:
-                        try:
-                            item_type = item_data.get('type', '').lower()
-                            
-                            # Dispatcher vers le bon gestionnaire selon le type d'objet
-                            if item_type == 'weapon':
-                                await self._process_weapon_data(item_data)
-                                stats['weapons'] += 1
-                            elif item_type == 'armor':
-                                await self._process_armor_data(item_data)
-                                stats['armor'] += 1
-                            elif item_type in ['accessory', 'amulet', 'ring', 'back']:
-                                await self._process_trinket_data(item_data)
-                                stats['trinkets'] += 1
-                            elif item_type in ['upgradecomponent', 'rune', 'sigil']:
-                                await self._process_upgrade_component_data(item_data)
-                                stats['upgrades'] += 1
-                            elif item_type in ['consumable', 'food']:
-                                await self._process_consumable_data(item_data)
-                                stats['consumables'] += 1
-                            elif item_type == 'gizmo':
-                                await self._process_gizmo_data(item_data)
-                                stats['gizmos'] += 1
-                            elif item_type in ['tool', 'gathering']:
-                                await self._process_tool_data(item_data)
-                                stats['tools'] += 1
-                            elif item_type == 'mini':
-                                await self._process_mini_data(item_data)
-                                stats['minis'] += 1
-                            else:
-                                # Pour les autres types d'objets, on les enregistre simplement
-                                await self._process_generic_item_data(item_data)
-                                stats['other'] += 1
-                            
-                            processed += 1
-                            
-                            # Journaliser la progression tous les 50 éléments
-                            if processed % 50 == 0:
-                                logger.info(f"Traitement en cours: {processed}/{len(item_ids)} objets")
-                                
-                        except Exception as e:
-                            errors += 1
-                            logger.error(f"Erreur lors du traitement de l'objet {item_data.get('id')} ({item_data.get('type', 'inconnu')}): {e}")
-                            
-                except Exception as e:
-                    errors += 1
-                    logger.error(f"Erreur lors de la récupération du lot d'objets: {e}")
+            mapper = self.mapper
+            writer = self._writer()
+            tracker = await self._track('items', item_ids)
+            pipeline = SyncPipeline(
+                fetch=self._api.get_items,
+                transform=lambda data: self._map_items(tracker.changed(data), mapper, stats),
+                write=lambda batch: self._write_item_batch(batch, writer, stats, tracker),
+                section=self._db_section,
+                label="objets"
+            )
+            result = await pipeline.run(tracker.ids, checkpoint=await self._checkpoint(tracker))
+            processed, errors = result.processed, result.errors
+            async with self._db_section():
+                tracker.complete(success=errors == 0)
             
             # Journaliser les résultats
-            logger.info(f"Synchronisation des objets terminée: {processed} traités, {errors} erreurs")
+            rows_per_second = writer.rows_per_second()
+            logger.info(
+                f"Synchronisation des objets terminée: {processed} traités, {errors} erreurs "
+                f"({rows_per_second:.0f} lignes/s)"
+            )
             logger.info(f"Détail par type: {stats}")
             
             return {
@@ -677,6 +889,8 @@ class GW2DataService:
                 "processed": processed,
                 "errors": errors,
                 "stats": stats,
+                "rows_per_second": rows_per_second,
+                **tracker.summary(),
                 "status": "success" if errors == 0 else "partial" if processed > 0 else "error"
             }
             
@@ -690,200 +904,144 @@ class GW2DataService:
                 "error": str(e)
             }
     
-    async def _process_weapon_data(self, weapon_data: Dict[str, Any]) -> 'Item':
-        """Traite les données d'une arme et les enregistre en base.
+    async def _write_items(
+        self,
+        items_data: List[Dict[str, Any]],
+        mapper: 'GW2APIMapper',
+        writer: BulkUpsertWriter,
+        stats: Optional[Dict[str, int]] = None
+    ) -> Tuple[int, int]:
+        """Écrit un lot d'objets et les détails de leur type.
+        
+        Les armes, armures, bijoux et composants d'amélioration sont enregistrés
+        (une ligne dans ``items`` et une dans la table de leurs détails) ; les
+        autres types d'objets sont seulement comptés.
         
         Args:
-            weapon_data: Données brutes de l'arme depuis l'API
+            items_data: Données brutes des objets depuis l'API
+            mapper: Mappeur utilisé pour convertir les données en lignes
+            writer: Écrivain par lots
+            stats: Compteurs par catégorie d'objet, mis à jour sur place
             
         Returns:
-            L'objet Item contenant les données de l'arme créé ou mis à jour
-            
-        Raises:
-            ValueError: Si les données de l'arme sont invalides ou incomplètes
-            Exception: Pour toute autre erreur survenue lors du traitement
+            Le nombre d'objets traités et le nombre d'erreurs
         """
-        from app.services.mapping.gw2_api_mapper import GW2APIMapper
-        
-        if not hasattr(self, 'db') or self.db is None:
-            raise RuntimeError("La base de données n'est pas initialisée")
-            
-        db = self.db
-        mapper = GW2APIMapper(db)
-        
-        # Journaliser les données brutes pour le débogage
-        item_id = weapon_data.get('id', 'inconnu')
-        logger.debug(f"Traitement de l'arme ID: {item_id}, données: {json.dumps(weapon_data, default=str, ensure_ascii=False)[:500]}...")
-        
-        try:
-            # Vérifier si weapon_data est un dictionnaire
-            if not isinstance(weapon_data, dict):
-                error_msg = f"Données d'arme invalides: attendu un dictionnaire, reçu {type(weapon_data).__name__}"
-                logger.error(error_msg)
-                raise ValueError(error_msg)
-            
-            # Vérifier les champs obligatoires dans les données brutes
-            required_fields = ['id', 'name', 'type', 'rarity']
-            missing_fields = [field for field in required_fields if field not in weapon_data]
-            if missing_fields:
-                error_msg = f"Champs obligatoires manquants dans les données de l'arme {item_id}: {', '.join(missing_fields)}"
-                logger.error(error_msg)
-                raise ValueError(error_msg)
-                
-            # Convertir les données de l'API en modèle interne
-            try:
-                item = mapper.map_item(weapon_data)
-            except Exception as map_error:
-                error_msg = f"Échec du mappage de l'arme {item_id}: {str(map_error)}"
-                logger.error(error_msg, exc_info=True)
-                raise ValueError(error_msg) from map_error
-            
-            # Valider que les champs obligatoires sont présents après le mappage
-            if not item.name or not item.type or not item.rarity:
-                error_msg = f"Données d'arme invalides après mappage pour l'arme {item_id}: champs obligatoires manquants"
-                logger.error(error_msg)
-                raise ValueError(error_msg)
-                
-            # Vérifier que l'arme a bien des détails d'arme
-            if not hasattr(item, 'weapon') or not item.weapon:
-                error_msg = f"Détails d'arme manquants pour l'arme {item_id} (type: {item.type})"
-                logger.warning(error_msg)
-                # Créer des détails vides plutôt que d'échouer
-                item.weapon = mapper._map_weapon_details({})
-            
-            # Sauvegarder les modifications
-            try:
-                db.commit()
-                logger.debug(f"Arme {'mise à jour' if item.id else 'créée'}: {item.name} (ID: {item.id})")
-            except Exception as commit_error:
-                error_msg = f"Échec de la sauvegarde de l'arme {item_id}: {str(commit_error)}"
-                logger.error(error_msg, exc_info=True)
-                db.rollback()
-                raise RuntimeError(error_msg) from commit_error
-            
-            return item
-            
-        except Exception as e:
-            # En cas d'erreur, annuler les modifications et relancer l'exception
-            try:
-                db.rollback()
-            except Exception as rollback_error:
-                logger.error(f"Erreur lors du rollback pour l'arme {item_id}: {str(rollback_error)}", exc_info=True)
-                
-            # Si ce n'est pas déjà une ValueError, envelopper dans une exception plus descriptive
-            if not isinstance(e, (ValueError, RuntimeError)):
-                error_msg = f"Erreur inattendue lors du traitement de l'arme {item_id}: {str(e)}"
-                logger.error(error_msg, exc_info=True)
-                raise RuntimeError(error_msg) from e
-            raise  # Relancer l'exception originale si c'est déjà une ValueError ou RuntimeError
+        stats = stats if stats is not None else {}
+        batch, errors = await self._map_items(items_data, mapper, stats)
+        processed, failed = self._write_item_batch(batch, writer, stats)
+        return processed, errors + failed
     
-    async def _process_armor_data(self, armor_data: Dict[str, Any]) -> 'Armor':
-        """Traite les données d'une armure et les enregistre en base.
+    async def _map_items(
+        self,
+        items_data: List[Dict[str, Any]],
+        mapper: 'GW2APIMapper',
+        stats: Dict[str, int]
+    ) -> Tuple['_ItemBatch', int]:
+        """Convertit un lot d'objets en lignes de ``items`` et de leurs tables de détails.
+        
+        Les objets qui ne sont pas enregistrés en base sont traités et comptés ici.
         
-        Args:
-            armor_data: Données brutes de l'armure depuis l'API
-            
         Returns:
-            L'objet Armor créé ou mis à jour
+            Le lot converti et le nombre d'objets invalides
         """
-        from app.services.mapping.gw2_api_mapper import GW2APIMapper
-        
-        db = self.db
-        mapper = GW2APIMapper(db)
-        
-        try:
-            # Convertir les données de l'API en modèle interne
-            armor = mapper.map_armor(armor_data)
-            
-            # Valider que les champs obligatoires sont présents
-            if not armor.name or not armor.type or not armor.rarity:
-                raise ValueError(f"Données d'armure invalides: champs obligatoires manquants dans {armor_data}")
-            
-            # Sauvegarder les modifications
-            db.commit()
-            
-            # Journaliser la création/mise à jour
-            logger.debug(f"Armure {'mise à jour' if armor.id else 'créée'}: {armor.name} (ID: {armor.id})")
-            
-            return armor
-            
-        except Exception as e:
-            # En cas d'erreur, annuler les modifications et relancer l'exception
-            db.rollback()
-            logger.error(f"Erreur lors du traitement de l'armure {armor_data.get('id')}: {e}")
-            raise
+        batch = _ItemBatch()
+        stored = []
+        
+        # Dispatcher selon le type d'objet
+        for item_data in items_data:
+            category = _item_category(item_data.get('type', '') if isinstance(item_data, dict) else '')
+            if category in _STORED_ITEM_CATEGORIES:
+                stored.append(item_data)
+            else:
+                await self._process_other_item_data(category, item_data)
+                stats[category] = stats.get(category, 0) + 1
+                batch.other_ids.append(item_data.get('id') if isinstance(item_data, dict) else None)
+        
+        batch.rows, errors = self._map_rows(stored, mapper.item_row, "l'objet")
+        valid_ids = {row['id'] for row in batch.rows}
+        for item_data in stored:
+            if item_data.get('id') not in valid_ids:
+                continue
+            batch.categories[item_data['id']] = _item_category(item_data.get('type', ''))
+            detail = mapper.item_detail_row(item_data)
+            if detail is not None:
+                batch.details.setdefault(detail[0], []).append(detail[1])
+        return batch, errors
     
-    async def _process_trinket_data(self, trinket_data: Dict[str, Any]) -> 'Trinket':
-        """Traite les données d'un bijou et les enregistre en base.
+    def _write_item_batch(
+        self,
+        batch: '_ItemBatch',
+        writer: BulkUpsertWriter,
+        stats: Dict[str, int],
+        tracker: Optional[EntitySync] = None
+    ) -> Tuple[int, int]:
+        """Écrit un lot d'objets converti, puis les détails des objets écrits.
+        
+        Si ``tracker`` est fourni, l'empreinte des objets traités y est enregistrée.
         
-        Args:
-            trinket_data: Données brutes du bijou depuis l'API
-            
         Returns:
-            L'objet Trinket créé ou mis à jour
+            Le nombre d'objets traités et le nombre d'erreurs
         """
-        from app.services.mapping.gw2_api_mapper import GW2APIMapper
-        
-        db = self.db
-        mapper = GW2APIMapper(db)
-        
-        try:
-            # Convertir les données de l'API en modèle interne
-            trinket = mapper.map_trinket(trinket_data)
-            
-            # Valider que les champs obligatoires sont présents
-            if not trinket.name or not trinket.type or not trinket.rarity:
-                raise ValueError(f"Données de bijou invalides: champs obligatoires manquants dans {trinket_data}")
-            
-            # Sauvegarder les modifications
-            db.commit()
-            
-            # Journaliser la création/mise à jour
-            logger.debug(f"Bijou {'mis à jour' if trinket.id else 'créé'}: {trinket.name} (ID: {trinket.id})")
-            
-            return trinket
-            
-        except Exception as e:
-            # En cas d'erreur, annuler les modifications et relancer l'exception
-            db.rollback()
-            logger.error(f"Erreur lors du traitement du bijou {trinket_data.get('id')}: {e}")
-            raise
+        result = writer.upsert(Item, batch.rows)
+        errors = len(result.failed)
+        written_ids = {row['id'] for row in batch.rows if row['id'] not in result.failed}
+        
+        # Écrire les détails des objets enregistrés, une instruction par table
+        for model, detail_rows in batch.details.items():
+            detail_rows = [row for row in detail_rows if row['item_id'] in written_ids]
+            detail_result = writer.upsert(model, detail_rows, index_elements=('item_id',))
+            errors += len(detail_result.failed)
+            written_ids.difference_update(detail_result.failed)
+        
+        for item_id in written_ids:
+            category = batch.categories[item_id]
+            stats[category] = stats.get(category, 0) + 1
+        if tracker is not None:
+            tracker.record([*written_ids, *batch.other_ids])
+        return len(batch.other_ids) + len(written_ids), errors
     
-    async def _process_upgrade_component_data(self, upgrade_data: Dict[str, Any]) -> 'UpgradeComponent':
-        """Traite les données d'un composant d'amélioration et les enregistre en base.
+    async def _process_item_data(self, item_data: Dict[str, Any]) -> 'Item':
+        """Traite les données d'un objet et les enregistre en base.
         
         Args:
-            upgrade_data: Données brutes du composant depuis l'API
+            item_data: Données brutes de l'objet depuis l'API
             
         Returns:
-            L'objet UpgradeComponent créé ou mis à jour
-        """
-        from app.services.mapping.gw2_api_mapper import GW2APIMapper
-        
-        db = self.db
-        mapper = GW2APIMapper(db)
-        
-        try:
-            # Convertir les données de l'API en modèle interne
-            upgrade = mapper.map_upgrade_component(upgrade_data)
-            
-            # Valider que les champs obligatoires sont présents
-            if not upgrade.name or not upgrade.type or not upgrade.rarity:
-                raise ValueError(f"Données de composant d'amélioration invalides: champs obligatoires manquants dans {upgrade_data}")
-            
-            # Sauvegarder les modifications
-            db.commit()
-            
-            # Journaliser la création/mise à jour
-            logger.debug(f"Composant d'amélioration {'mis à jour' if upgrade.id else 'créé'}: {upgrade.name} (ID: {upgrade.id})")
-            
-            return upgrade
+            L'objet Item créé ou mis à jour
             
-        except Exception as e:
-            # En cas d'erreur, annuler les modifications et relancer l'exception
-            db.rollback()
-            logger.error(f"Erreur lors du traitement du composant d'amélioration {upgrade_data.get('id')}: {e}")
-            raise
+        Raises:
+            ValueError: Si l'objet n'a pas pu être enregistré
+        """
+        processed, errors = await self._write_items([item_data], self.mapper, self._writer())
+        if errors or not processed:
+            raise ValueError(f"Objet {item_data.get('id')} non enregistré")
+        return self.db.get(Item, item_data['id'], populate_existing=True)
+    
+    async def _process_weapon_data(self, weapon_data: Dict[str, Any]) -> 'Item':
+        """Traite les données d'une arme et les enregistre en base."""
+        return await self._process_item_data(weapon_data)
+    
+    async def _process_armor_data(self, armor_data: Dict[str, Any]) -> 'Item':
+        """Traite les données d'une armure et les enregistre en base."""
+        return await self._process_item_data(armor_data)
+    
+    async def _process_trinket_data(self, trinket_data: Dict[str, Any]) -> 'Item':
+        """Traite les données d'un bijou et les enregistre en base."""
+        return await self._process_item_data(trinket_data)
+    
+    async def _process_upgrade_component_data(self, upgrade_data: Dict[str, Any]) -> 'Item':
+        """Traite les données d'un composant d'amélioration et les enregistre en base."""
+        return await self._process_item_data(upgrade_data)
+    
+    async def _process_other_item_data(self, category: str, item_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Traite un objet qui n'est pas enregistré en base selon sa catégorie."""
+        handlers = {
+            'consumables': self._process_consumable_data,
+            'gizmos': self._process_gizmo_data,
+            'tools': self._process_tool_data,
+            'minis': self._process_mini_data,
+        }
+        return await handlers.get(category, self._process_generic_item_data)(item_data)
     
     async def _process_consumable_data(self, consumable_data: Dict[str, Any]) -> Dict[str, Any]:
         """Traite les données d'un consommable.
@@ -953,10 +1111,14 @@ class GW2DataService:
     async def sync_itemstats(self) -> Dict[str, Any]:
         """Synchronise les données des statistiques d'objets depuis l'API GW2.
         
+        Les lots de l'API sont récupérés en parallèle (``SyncPipeline``) et
+        chacun est écrit avec une seule instruction d'upsert.
+        
         Returns:
             Un dictionnaire contenant les résultats de la synchronisation
         """
         logger.info("Début de la synchronisation des statistiques d'objets...")
+        self._reset_mapper()
         
         try:
             # Récupérer tous les IDs de statistiques d'objets depuis l'API
@@ -968,43 +1130,35 @@ class GW2DataService:
             
             logger.info(f"Récupération des détails pour {len(itemstat_ids)} statistiques d'objets...")
             
-            # Récupérer les détails des statistiques par lots
-            chunk_size = 200  # Limite de l'API GW2
-            processed = 0
-            errors = 0
-            
-            for i in range(0, len(itemstat_ids), chunk_size):
-                chunk = itemstat_ids[i:i + chunk_size]
-                
-                try:
-                    # Récupérer les détails du lot actuel
-                    itemstats_data = await self._api.get_itemstats(chunk)
-                    
-                    # Traiter chaque statistique du lot
-                    for itemstat_data in itemstats_data:
-                        try:
-                            await self._process_itemstat_data(itemstat_data)
-                            processed += 1
-                            
-                            # Journaliser la progression tous les 20 éléments
-                            if processed % 20 == 0:
-                                logger.info(f"Traitement en cours: {processed}/{len(itemstat_ids)} statistiques d'objets")
-                                
-                        except Exception as e:
-                            errors += 1
-                            logger.error(f"Erreur lors du traitement de la statistique d'objet {itemstat_data.get('id')}: {e}")
-                            
-                except Exception as e:
-                    errors += 1
-                    logger.error(f"Erreur lors de la récupération du lot de statistiques d'objets: {e}")
+            # Récupérer, convertir et écrire les statistiques d'objets par lots
+            mapper = self.mapper
+            writer = self._writer()
+            tracker = await self._track('itemstats', itemstat_ids)
+            pipeline = SyncPipeline(
+                fetch=self._api.get_itemstats,
+                transform=lambda data: self._map_rows(tracker.changed(data), mapper.itemstat_row, "la statistique d'objet"),
+                write=lambda rows: self._upsert(writer, ItemStats, rows, tracker),
+                section=self._db_section,
+                label="statistiques d'objets"
+            )
+            result = await pipeline.run(tracker.ids, checkpoint=await self._checkpoint(tracker))
+            processed, errors = result.processed, result.errors
+            async with self._db_section():
+                tracker.complete(success=errors == 0)
             
             # Journaliser les résultats
-            logger.info(f"Synchronisation des statistiques d'objets terminée: {processed} traitées, {errors} erreurs")
+            rows_per_second = writer.rows_per_second()
+            logger.info(
+                f"Synchronisation des statistiques d'objets terminée: {processed} traitées, {errors} erreurs "
+                f"({rows_per_second:.0f} lignes/s)"
+            )
             
             return {
                 "total": len(itemstat_ids),
                 "processed": processed,
                 "errors": errors,
+                "rows_per_second": rows_per_second,
+                **tracker.summary(),
                 "status": "success" if errors == 0 else "partial" if processed > 0 else "error"
             }
             
@@ -1018,6 +1172,26 @@ class GW2DataService:
                 "error": str(e)
             }
     
+    def _write_itemstats(
+        self,
+        itemstats_data: List[Dict[str, Any]],
+        mapper: 'GW2APIMapper',
+        writer: BulkUpsertWriter
+    ) -> Tuple[int, int]:
+        """Écrit un lot de statistiques d'objets.
+        
+        Args:
+            itemstats_data: Données brutes des statistiques depuis l'API
+            mapper: Mappeur utilisé pour convertir les données en lignes
+            writer: Écrivain par lots
+            
+        Returns:
+            Le nombre de statistiques écrites et le nombre d'erreurs
+        """
+        rows, errors = self._map_rows(itemstats_data, mapper.itemstat_row, "la statistique d'objet")
+        written, failed = self._upsert(writer, ItemStats, rows)
+        return written, errors + failed
+    
     async def _process_itemstat_data(self, itemstat_data: Dict[str, Any]) -> 'ItemStats':
         """Traite les données d'une statistique d'objet et les enregistre en base.
         
@@ -1026,145 +1200,24 @@ class GW2DataService:
             
         Returns:
             L'objet ItemStats créé ou mis à jour
-        """
-        from app.services.mapping.gw2_api_mapper import GW2APIMapper
-        from app.models.item_stats import ItemStats  # Import explicite pour éviter les problèmes de référence circulaire
-        
-        db = self.db
-        mapper = GW2APIMapper(db)
-        
-        try:
-            item_id = itemstat_data.get('id')
-            item_name = itemstat_data.get('name', 'Sans nom')
-            logger.debug(f"[DEBUG] Début du traitement de la statistique d'objet: ID={item_id}, Nom='{item_name}'")
-            logger.debug(f"[DEBUG] Données brutes reçues: {itemstat_data}")
-            
-            # Vérifier si les données nécessaires sont présentes
-            if not item_id:
-                error_msg = "ID manquant dans les données de la statistique d'objet"
-                logger.error(f"[ERREUR] {error_msg}")
-                raise ValueError(error_msg)
-                
-            # Vérifier si la statistique existe déjà en base
-            existing_stat = db.query(ItemStats).get(item_id)
-            if existing_stat:
-                logger.debug(f"[DEBUG] Statistique existante trouvée: ID={existing_stat.id}, Nom='{existing_stat.name}'")
-                # Afficher les attributs actuels pour le débogage
-                attrs = {attr: getattr(existing_stat, attr, None) 
-                        for attr in ['power', 'precision', 'toughness', 'vitality', 'condition_damage', 
-                                   'ferocity', 'healing_power', 'concentration', 'expertise']}
-                logger.debug(f"[DEBUG] Attributs actuels: {attrs}")
-            
-            # Convertir les données de l'API en modèle interne
-            logger.debug("[DEBUG] Appel de mapper.map_itemstat...")
-            try:
-                itemstat = mapper.map_itemstat(itemstat_data)
-                logger.debug(f"[DEBUG] Données après mappage: {itemstat.to_dict() if hasattr(itemstat, 'to_dict') else itemstat}")
-            except Exception as map_err:
-                logger.error(f"[ERREUR] Échec du mappage de la statistique ID={item_id}: {str(map_err)}")
-                logger.debug(f"[DEBUG] Traceback du mappage: {traceback.format_exc()}")
-                raise
-            
-            # Gérer le cas où le nom est vide
-            if not itemstat.name:
-                # Utiliser un nom par défaut basé sur l'ID
-                itemstat.name = f"Statistiques-{item_id}"
-                logger.warning(f"[ATTENTION] Statistique d'objet sans nom, utilisation du nom par défaut: {itemstat.name} (ID: {item_id})")
-                
-                # Si la description est vide également, on peut en créer une basique
-                if not itemstat.description:
-                    itemstat.description = f"Statistiques d'objet personnalisées (ID: {item_id})"
-                    if not itemstat.description_fr:
-                        itemstat.description_fr = itemstat.description
-            
-            # Afficher des informations de débogage sur l'objet avant la sauvegarde
-            logger.debug(f"[DEBUG] Statistique d'objet avant sauvegarde - ID: {itemstat.id}, Nom: {itemstat.name}")
-            
-            # Afficher les attributs de la statistique
-            attributes = {}
-            for attr in ['power', 'precision', 'toughness', 'vitality', 'concentration', 
-                        'condition_damage', 'expertise', 'ferocity', 'healing_power', 'armor',
-                        'boon_duration', 'critical_chance', 'critical_damage', 'condition_duration']:
-                if hasattr(itemstat, attr):
-                    val = getattr(itemstat, attr, 0)
-                    if val:  # N'afficher que les attributs non nuls
-                        attributes[attr] = val
-            
-            logger.debug(f"[DEBUG] Attributs non nuls de la statistique: {attributes}")
-            
-            # Vérifier la cohérence des données
-            if not any(attributes.values()):
-                logger.warning(f"[ATTENTION] Aucun attribut non nul trouvé pour la statistique ID={item_id}")
-                logger.debug(f"[DEBUG] Données complètes: {itemstat.__dict__ if hasattr(itemstat, '__dict__') else 'Pas de __dict__'}")
-            
-            # Sauvegarder les modifications
-            logger.debug("[DEBUG] Tentative de sauvegarde en base de données...")
-            try:
-                db.add(itemstat)
-                logger.debug("[DEBUG] Objet ajouté à la session, commit en cours...")
-                db.commit()
-                logger.debug("[DEBUG] Commit réussi")
-            except Exception as save_error:
-                logger.error(f"[ERREUR] Échec de la sauvegarde de la statistique: {save_error}", exc_info=True)
-                logger.error(f"[ERREUR] Type d'erreur: {type(save_error).__name__}")
-                logger.error(f"[ERREUR] Arguments: {getattr(save_error, 'args', 'Pas d\'arguments')}")
-                logger.error(f"[ERREUR] Données problématiques: {itemstat_data}")
-                try:
-                    db.rollback()
-                    logger.debug("[DEBUG] Rollback effectué après erreur")
-                except Exception as rollback_err:
-                    logger.error(f"[ERREUR] Échec du rollback: {rollback_err}")
-                raise
             
-            # Récupérer l'objet fraîchement sauvegardé pour vérification
-            try:
-                saved_stat = db.query(ItemStats).get(itemstat.id)
-                if saved_stat:
-                    logger.debug(f"[DEBUG] Statistique d'objet après sauvegarde - ID: {saved_stat.id}, Nom: {saved_stat.name}")
-                    # Vérifier les attributs après sauvegarde
-                    saved_attrs = {attr: getattr(saved_stat, attr, None) 
-                                 for attr in ['power', 'precision', 'toughness', 'vitality', 'condition_damage', 
-                                            'ferocity', 'healing_power', 'concentration', 'expertise']
-                                 if getattr(saved_stat, attr, 0) != 0}
-                    logger.debug(f"[DEBUG] Attributs après sauvegarde: {saved_attrs}")
-                else:
-                    logger.warning(f"[ATTENTION] Impossible de récupérer la statistique ID={itemstat.id} après sauvegarde")
-            except Exception as verify_error:
-                logger.error(f"[ERREUR] Échec de la vérification de la sauvegarde: {verify_error}", exc_info=True)
-                logger.error(f"[ERREUR] Type: {type(verify_error).__name__}, Args: {getattr(verify_error, 'args', 'Pas d\'arguments')}")
-            
-            # Journaliser la création/mise à jour
-            action = "mise à jour" if existing_stat else "créée"
-            logger.info(f"[SUCCÈS] Statistique d'objet {action}: {itemstat.name} (ID: {itemstat.id})")
-            
-            return itemstat
-            
-        except Exception as e:
-            # En cas d'erreur, annuler les modifications et relancer l'exception
-            logger.error(f"[ERREUR CRITIQUE] Échec du traitement de la statistique ID={item_id}, Nom='{item_name}': {e}", exc_info=True)
-            logger.error(f"[DEBUG] Données en échec: {itemstat_data}")
-            
-            # Annuler les modifications non validées
-            try:
-                if db:
-                    db.rollback()
-                    logger.debug("[DEBUG] Rollback effectué")
-            except Exception as rollback_error:
-                logger.error(f"[ERREUR] Échec du rollback: {rollback_error}")
-            
-            # Relancer l'exception avec plus de contexte
-            error_msg = f"Erreur lors du traitement de la statistique ID={item_id}: {str(e)}"
-            logger.error(error_msg)
-            raise ValueError(error_msg) from e
+        Raises:
+            ValueError: Si la statistique n'a pas pu être enregistrée
+        """
+        written, _ = self._write_itemstats([itemstat_data], self.mapper, self._writer())
+        if not written:
+            raise ValueError(f"Erreur lors du traitement de la statistique ID={itemstat_data.get('id')}")
+        return self.db.get(ItemStats, itemstat_data['id'], populate_existing=True)
     
     async def sync_all(self) -> Dict[str, Any]:
-        """Synchronise toutes les données depuis l'API GW2 de manière séquentielle.
+        """Synchronise toutes les données depuis l'API GW2.
         
-        Cette méthode exécute les synchronisations dans un ordre logique pour respecter
-        les dépendances entre les différentes entités.
+        Les étapes s'exécutent selon leurs dépendances (voir ``_sync_graph``) :
+        une étape démarre dès que les étapes dont elle dépend sont terminées.
         
         Returns:
-            Un dictionnaire contenant les résultats de chaque étape de synchronisation
+            Un dictionnaire contenant le statut global, les résultats de chaque
+            étape et, sous ``timings``, la durée des étapes et le chemin critique
         """
         logger.info("Début de la synchronisation complète des données GW2...")
         
@@ -1172,29 +1225,8 @@ class GW2DataService:
         results = {}
         
         try:
-            # 1. Synchroniser les données de base du jeu (règles, mécaniques, etc.)
-            logger.info("Étape 1/6: Synchronisation des données de base du jeu...")
-            results["game_mechanics"] = await self.sync_game_mechanics()
-            
-            # 2. Synchroniser les professions et spécialisations
-            logger.info("Étape 2/6: Synchronisation des professions et spécialisations...")
-            results["professions"] = await self.sync_professions()
-            
-            # 3. Synchroniser les compétences
-            logger.info("Étape 3/6: Synchronisation des compétences...")
-            results["skills"] = await self.sync_skills()
-            
-            # 4. Synchroniser les traits
-            logger.info("Étape 4/6: Synchronisation des traits...")
-            results["traits"] = await self.sync_traits()
-            
-            # 5. Synchroniser les statistiques d'objets
-            logger.info("Étape 5/6: Synchronisation des statistiques d'objets...")
-            results["itemstats"] = await self.sync_itemstats()
-            
-            # 6. Synchroniser les objets (armes, armures, bijoux, etc.)
-            logger.info("Étape 6/6: Synchronisation des objets...")
-            results["items"] = await self.sync_items()
+            graph_result = await self._sync_graph().run()
+            results = graph_result.results
             
             # Vérifier s'il y a eu des erreurs
             has_errors = any(
@@ -1208,7 +1240,8 @@ class GW2DataService:
             
             return {
                 "status": status,
-                "results": results
+                "results": results,
+                "timings": graph_result.report()
             }
             
         except Exception as e:
@@ -1219,68 +1252,69 @@ class GW2DataService:
                 "error": error_msg,
                 "results": results  # Inclure les résultats partiels
             }
+        
+        finally:
+            self._after_sync()
     
     # Méthodes utilitaires
     
-    async def _paginated_api_call(self, endpoint: str, page_size: int = 200) -> List[Any]:
-        """Effectue un appel API avec pagination.
+    async def _paginated_api_call(self, endpoint: str, page_size: int = 200) -> AsyncIterator[Any]:
+        """Parcourt tous les éléments d'un endpoint paginé.
+        
+        La première page donne le nombre de pages (en-tête ``X-Page-Total``) ;
+        les suivantes sont récupérées simultanément (au plus
+        ``default_fetchers()`` à la fois), sous la limitation de débit du
+        client. Les éléments sont produits dès qu'une page arrive, dans l'ordre
+        d'arrivée des pages.
         
         Args:
             endpoint: L'endpoint de l'API à appeler (sans le /v2/ initial)
             page_size: Nombre d'éléments par page (max 200)
             
-        Returns:
-            Une liste contenant tous les éléments récupérés
+        Yields:
+            Les éléments de chaque page
         """
-        all_items = []
-        page = 0
-        total_items = None
-        
         # S'assurer que la taille de page ne dépasse pas la limite de l'API
         page_size = min(200, max(1, page_size))
+        path = f'/v2/{endpoint}'
         
         logger.debug(f"Début de la récupération paginée pour {endpoint} (page_size={page_size})")
         
         try:
-            while True:
-                # Construire les paramètres de pagination
-                params = {
-                    'page': page,
-                    'page_size': page_size
-                }
-                
-                # Effectuer l'appel API
-                response = await self._api.get(f'/v2/{endpoint}', params=params)
-                
-                # Pour la première page, récupérer le nombre total d'éléments
-                if page == 0:
-                    total_items = int(response.headers.get('X-Result-Total', '0'))
-                    logger.debug(f"Total d'éléments à récupérer: {total_items}")
-                
-                # Ajouter les éléments de la page courante
-                items = response.json()
-                if not items:
-                    break
-                    
-                all_items.extend(items)
-                logger.debug(f"Page {page + 1} récupérée: {len(items)} éléments")
-                
-                # Vérifier si on a tout récupéré
-                if len(all_items) >= total_items or len(items) < page_size:
-                    break
-                    
-                # Préparer la page suivante
-                page += 1
-                
-                # Petite pause pour éviter de surcharger l'API
-                await asyncio.sleep(0.1)
-                
+            items, page_total = await self._api.get_page(path, 0, page_size)
         except Exception as e:
             logger.error(f"Erreur lors de la récupération paginée de {endpoint}: {e}")
             raise
-            
-        logger.debug(f"Récupération paginée terminée: {len(all_items)} éléments au total")
-        return all_items
+        logger.debug(f"Page 1/{page_total} récupérée: {len(items)} éléments")
+        count = len(items)
+        for item in items:
+            yield item
+        
+        semaphore = asyncio.Semaphore(default_fetchers())
+        
+        async def fetch(page: int) -> List[Any]:
+            async with semaphore:
+                page_items, _ = await self._api.get_page(path, page, page_size)
+                return page_items
+        
+        tasks = [asyncio.ensure_future(fetch(page)) for page in range(1, page_total)]
+        try:
+            for done in asyncio.as_completed(tasks):
+                items = await done
+                count += len(items)
+                logger.debug(f"Page récupérée: {len(items)} éléments ({count} au total)")
+                for item in items:
+                    yield item
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération paginée de {endpoint}: {e}")
+            raise
+        finally:
+            # Arrêt anticipé du consommateur ou erreur : annuler les pages restantes
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        logger.debug(f"Récupération paginée terminée: {count} éléments au total")
     
     async def _get_or_create(self, model, **kwargs):
         """Récupère un objet ou le crée s'il n'existe pas."""
@@ -1346,6 +1380,7 @@ class GW2DataService:
             except Exception as e:
                 # En cas d'erreur, annuler les modifications du lot courant
                 self.db.rollback()
+                self._reset_mapper()
                 logger.error(f"Erreur lors du traitement du lot {batch_num}/{batch_count}: {e}", exc_info=True)
                 errors += len(batch)  # Compter toutes les erreurs du lot
         
@@ -1355,6 +1390,7 @@ class GW2DataService:
                 self.db.commit()
             except Exception as e:
                 self.db.rollback()
+                self._reset_mapper()
                 logger.error(f"Erreur lors de la validation finale: {e}", exc_info=True)
                 return {
                     "total": total,
@@ -1489,37 +1525,30 @@ class GW2DataService:
             params = {}
             
         # Générer une clé de cache unique basée sur l'endpoint et les paramètres
-        cache_key = f"{endpoint}:{str(sorted(params.items()))}"
+        cache = get_cache(CACHE_NAMESPACE)
+        cache_key = make_key(endpoint, params)
         
         # Vérifier si la réponse est en cache et toujours valide
-        if not force_refresh and hasattr(self, '_api_cache'):
-            cached_data = self._api_cache.get(cache_key)
-            if cached_data and (time.time() - cached_data['timestamp']) < cache_ttl:
-                logger.debug(f"Récupération depuis le cache: {cache_key}")
-                return cached_data['data']
+        cached = None if force_refresh else await cache.get_entry(cache_key)
+        if cached is not None and cached[1] > time.time():
+            logger.debug(f"Récupération depuis le cache: {cache_key}")
+            return cached[0]
         
         try:
-            # Effectuer l'appel API
+            # Effectuer l'appel API (le client retourne la réponse déjà décodée)
             logger.debug(f"Appel API vers {endpoint} avec les paramètres: {params}")
-            response = await self._api.get(endpoint, params=params)
-            data = response.json()
+            data = await self._api.get(endpoint, params=params)
             
             # Mettre en cache le résultat
-            if not hasattr(self, '_api_cache'):
-                self._api_cache = {}
-                
-            self._api_cache[cache_key] = {
-                'data': data,
-                'timestamp': time.time()
-            }
+            await cache.set(cache_key, data, cache_ttl)
             
             return data
             
         except Exception as e:
-            # En cas d'erreur, essayer de renvoyer les données en cache si disponibles
-            if not force_refresh and hasattr(self, '_api_cache') and cache_key in self._api_cache:
+            # En cas d'erreur, essayer de renvoyer les données en cache (même expirées)
+            if cached is not None:
                 logger.warning(f"Erreur API, utilisation des données en cache pour {cache_key}: {e}")
-                return self._api_cache[cache_key]['data']
+                return cached[0]
             raise
     
     async def clear_cache(self) -> Dict[str, Any]:
@@ -1529,11 +1558,7 @@ class GW2DataService:
             api_cache_info = await self._api.clear_cache()
             
             # Vider le cache interne
-            internal_cache_entries = 0
-            if hasattr(self, '_api_cache'):
-                internal_cache_entries = len(self._api_cache)
-                del self._api_cache
-                self._api_cache = {}
+            internal_cache_entries = await get_cache(CACHE_NAMESPACE).clear()
             
             return {
                 "status": "success",
@@ -1611,14 +1636,8 @@ class GW2DataService:
             # Récupérer les informations du cache de l'API
             api_cache_info = await self._api.get_cache_info()
             
-            # Calculer les informations du cache interne
-            internal_cache_info = {
-                'entries': len(self._api_cache) if hasattr(self, '_api_cache') else 0,
-                'size_bytes': sum(
-                    len(str(k)) + len(str(v)) 
-                    for k, v in getattr(self, '_api_cache', {}).items()
-                )
-            }
+            # Informations du cache interne (par niveau)
+            internal_cache_info = get_cache(CACHE_NAMESPACE).stats()
             
             return {
                 "status": "success",
@@ -190,20 +190,24 @@ class GW2ImportService(Generic[T]):
                 batch = ids[i:i + batch_size]
                 logger.debug(f"Traitement du lot {i//batch_size + 1}/{(len(ids)-1)//batch_size + 1}")
                 
+                # Charger en une requête les éléments du lot déjà en base
+                mapper.prefetch(self.model_class, batch)
+                
                 for id in batch:
                     try:
                         # Récupérer les données depuis l'API
                         data = self.get_by_id(id)
                         
+                        # Vérifier si l'élément existe déjà (via la carte d'identité du mapper)
+                        existing = mapper.get_existing(self.model_class, id)
+                        
                         # Utiliser le mapper pour convertir les données en modèle
                         instance = self._map_with_mapper(mapper, data)
                         
-                        # Vérifier si l'élément existe déjà
-                        existing = db.query(self.model_class).get(id)
-                        
                         if existing:
                             # Mettre à jour l'instance existante
-                            self._update_existing(existing, instance)
+                            if existing is not instance:
+                                self._update_existing(existing, instance)
                             stats['updated'] += 1
                         else:
                             # Ajouter la nouvelle instance
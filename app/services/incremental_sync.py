@@ -0,0 +1,317 @@
+"""Synchronisation incrémentale des données de l'API GW2.
+
+Chaque synchronisation récupérait et réécrivait tout le catalogue, même si rien
+n'avait changé. ``IncrementalSync`` s'appuie sur deux informations :
+
+- l'ID de build du jeu (``/v2/build``) de la dernière synchronisation complète
+  de chaque type d'entité : tant qu'il ne change pas, seuls les IDs apparus
+  depuis sont récupérés ;
+- une empreinte du contenu brut de chaque entité : après un changement de build,
+  tout est récupéré, mais les entités dont le contenu n'a pas changé ne sont ni
+  converties ni écrites.
+
+La version de la conversion (``MAPPING_VERSION``) entre dans l'empreinte et est
+enregistrée avec le build : l'incrémenter déclenche une synchronisation
+complète qui réécrit toutes les entités.
+
+Les IDs disparus de l'API sont retirés du suivi, journalisés et listés dans le
+résumé (``removed_ids``). Leurs lignes ne sont pas supprimées : des builds et
+des équipes enregistrés peuvent y faire référence, et une liste d'IDs tronquée
+par l'API viderait le catalogue. Leur suppression reste une opération manuelle.
+
+Une synchronisation interrompue (plantage, API indisponible) est reprise au
+dernier lot validé : ``ChunkCheckpoint`` enregistre en base chaque lot écrit,
+et la synchronisation suivante saute ces lots si la liste d'IDs et le build
+n'ont pas changé. Une interruption coûte au plus un lot.
+
+Exemple d'utilisation:
+    ```python
+    sync = IncrementalSync(session, build_id=170000)
+    tracker = sync.track('skills', skill_ids)
+    payloads = await api.get_skills(tracker.ids)
+    changed = tracker.changed(payloads)   # entités à convertir et écrire
+    tracker.record(written_ids)           # après l'écriture
+    tracker.complete(success=True)
+    ```
+"""
+
+import hashlib
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.models.sync_state import SyncCheckpoint, SyncHash, SyncState
+from app.services.bulk_writer import BulkUpsertWriter
+from app.services.mapping.gw2_api_mapper import MAPPING_VERSION
+from app.services.sync_pipeline import CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximum d'IDs par requête de suppression
+_DELETE_CHUNK_SIZE = 500
+
+
+def content_hash(payload: Any) -> str:
+    """Calcule l'empreinte SHA-1 du contenu brut d'une entité.
+
+    Le JSON est sérialisé avec des clés triées : l'ordre des clés renvoyé par
+    l'API n'influe pas sur l'empreinte.
+    """
+    data = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class ChunkCheckpoint:
+    """Lots validés de la synchronisation d'un type d'entité.
+
+    Un lot est identifié par sa position (``offset``) dans la liste d'IDs. Le
+    point de reprise enregistré n'est repris que pour la même liste d'IDs, la
+    même taille de lot et le même build connu ; sinon il est remplacé.
+
+    Attributes:
+        entity: Type d'entité (ex: "items")
+        resumed_from: ID de la synchronisation reprise (None sans reprise)
+        resumed: Nombre d'IDs des lots déjà validés lors de la reprise
+    """
+
+    def __init__(self, sync: 'IncrementalSync', entity: str, ids: Sequence[Any], chunk_size: int):
+        self._sync = sync
+        self.entity = entity
+        self.chunk_size = chunk_size
+        self._total = len(ids)
+        self._ids_hash = content_hash([str(entity_id) for entity_id in ids])
+        self._done: set = set()
+        self.resumed_from: Optional[str] = None
+        self.resumed = 0
+
+        row = sync.session.get(SyncCheckpoint, entity)
+        if (
+            row is not None
+            and sync.build_id is not None
+            and row.build_id == sync.build_id
+            and row.ids_hash == self._ids_hash
+            and row.chunk_size == chunk_size
+        ):
+            self._done = set(row.done_chunks or [])
+            self.resumed_from = row.run_id
+            self.resumed = sum(min(chunk_size, self._total - offset) for offset in self._done)
+            logger.info(
+                f"Reprise de la synchronisation des {entity} ({row.run_id}): "
+                f"{len(self._done)}/{row.chunk_count} lots déjà validés"
+            )
+        elif row is not None:
+            sync.session.delete(row)
+            sync.session.commit()
+
+    def is_done(self, offset: int) -> bool:
+        """Indique si le lot commençant à ``offset`` a déjà été validé."""
+        return offset in self._done
+
+    def commit(self, offset: int) -> None:
+        """Enregistre la validation d'un lot (après l'écriture de ses lignes)."""
+        self._done.add(offset)
+        session = self._sync.session
+        row = session.get(SyncCheckpoint, self.entity)
+        if row is None:
+            row = SyncCheckpoint(
+                entity=self.entity,
+                build_id=self._sync.build_id,
+                ids_hash=self._ids_hash,
+                chunk_size=self.chunk_size,
+                chunk_count=-(-self._total // self.chunk_size)
+            )
+            session.add(row)
+        row.run_id = self._sync.run_id
+        # Nouvelle liste : la colonne JSON n'est pas suivie en cas de modification sur place
+        row.done_chunks = sorted(self._done)
+        row.updated_at = datetime.utcnow()
+        session.commit()
+
+    def clear(self) -> None:
+        """Supprime le point de reprise (synchronisation terminée sans erreur)."""
+        self._done.clear()
+        row = self._sync.session.get(SyncCheckpoint, self.entity)
+        if row is not None:
+            self._sync.session.delete(row)
+            self._sync.session.commit()
+
+
+class EntitySync:
+    """Suivi incrémental de la synchronisation d'un type d'entité.
+
+    Attributes:
+        entity: Type d'entité (ex: "skills")
+        ids: IDs à récupérer en entier depuis l'API
+        new: IDs apparus depuis la dernière synchronisation
+        removed: IDs disparus de l'API
+        full: Si True, tous les IDs sont récupérés (build ou version de la conversion
+            changés, ou synchronisation forcée)
+    """
+
+    def __init__(self, sync: 'IncrementalSync', entity: str, api_ids: Sequence[Any]):
+        self._sync = sync
+        self.entity = entity
+        self.api_ids = list(api_ids)
+        self._hashes = sync._load_hashes(entity)
+        self._pending: Dict[str, str] = {}
+        self._checkpoint: Optional[ChunkCheckpoint] = None
+        self.unchanged = 0
+
+        api_keys = {str(entity_id) for entity_id in self.api_ids}
+        self.new = [entity_id for entity_id in self.api_ids if str(entity_id) not in self._hashes]
+        self.removed = [key for key in self._hashes if key not in api_keys]
+
+        state = sync.session.get(SyncState, entity)
+        self.full = (
+            sync.force
+            or sync.build_id is None
+            or state is None
+            or state.build_id != sync.build_id
+            or state.mapping_version != sync.mapping_version
+        )
+        self.ids = self.api_ids if self.full else self.new
+
+        if self.removed:
+            sync._forget(entity, self.removed)
+            for key in self.removed:
+                del self._hashes[key]
+            logger.warning(
+                f"{len(self.removed)} {entity} ont disparu de l'API (lignes conservées): "
+                f"{', '.join(self.removed[:20])}{'...' if len(self.removed) > 20 else ''}"
+            )
+
+        logger.info(
+            f"Synchronisation incrémentale des {entity}: {len(self.ids)}/{len(self.api_ids)} à récupérer "
+            f"({'complète' if self.full else 'nouveaux IDs'}), {len(self.new)} nouveaux, {len(self.removed)} supprimés"
+        )
+
+    def checkpoint(self, chunk_size: int = CHUNK_SIZE) -> ChunkCheckpoint:
+        """Retourne le point de reprise des lots de ``ids`` (repris s'il est valable)."""
+        if self._checkpoint is None or self._checkpoint.chunk_size != chunk_size:
+            self._checkpoint = ChunkCheckpoint(self._sync, self.entity, self.ids, chunk_size)
+        return self._checkpoint
+
+    def changed(self, payloads: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Filtre les entités dont le contenu a changé depuis leur dernière écriture.
+
+        Les empreintes des entités retenues sont mémorisées jusqu'à ``record``.
+
+        Args:
+            payloads: Données brutes des entités depuis l'API
+
+        Returns:
+            Les entités nouvelles ou modifiées
+        """
+        changed = []
+        for payload in payloads:
+            if not isinstance(payload, dict) or payload.get('id') is None:
+                changed.append(payload)
+                continue
+            key = str(payload['id'])
+            digest = content_hash([self._sync.mapping_version, payload])
+            if not self._sync.force and self._hashes.get(key) == digest:
+                self.unchanged += 1
+                continue
+            self._pending[key] = digest
+            changed.append(payload)
+        return changed
+
+    def record(self, entity_ids: Iterable[Any]) -> None:
+        """Enregistre l'empreinte des entités écrites avec succès."""
+        rows = []
+        for entity_id in entity_ids:
+            key = str(entity_id)
+            digest = self._pending.pop(key, None)
+            if digest is not None:
+                self._hashes[key] = digest
+                rows.append({'entity': self.entity, 'entity_id': key, 'content_hash': digest})
+        if rows:
+            self._sync.writer.upsert(SyncHash, rows, index_elements=('entity', 'entity_id'))
+
+    def complete(self, success: bool) -> None:
+        """Termine la synchronisation de l'entité.
+
+        L'ID de build n'est enregistré que si toutes les entités ont été écrites :
+        sinon la prochaine synchronisation récupère à nouveau tous les IDs, en
+        sautant les lots déjà validés. Le point de reprise est supprimé en cas
+        de succès.
+        """
+        if success and self._checkpoint is not None:
+            self._checkpoint.clear()
+        state = self._sync.session.get(SyncState, self.entity)
+        if state is None:
+            state = SyncState(entity=self.entity)
+            self._sync.session.add(state)
+        if success:
+            state.build_id = self._sync.build_id
+            state.mapping_version = self._sync.mapping_version
+        state.id_count = len(self.api_ids)
+        state.synced_at = datetime.utcnow()
+        self._sync.session.commit()
+
+    def summary(self) -> Dict[str, Any]:
+        """Résumé de la synchronisation incrémentale, à joindre aux résultats."""
+        summary = {
+            "fetched": len(self.ids),
+            "unchanged": self.unchanged,
+            "new": len(self.new),
+            "removed": len(self.removed),
+            "removed_ids": list(self.removed),
+            "full": self.full,
+        }
+        if self._checkpoint is not None and self._checkpoint.resumed_from is not None:
+            summary["resumed_from"] = self._checkpoint.resumed_from
+            summary["resumed"] = self._checkpoint.resumed
+        return summary
+
+
+class IncrementalSync:
+    """Suivi de la synchronisation incrémentale, pour une synchronisation complète."""
+
+    def __init__(
+        self,
+        session: Session,
+        build_id: Optional[int],
+        force: bool = False,
+        run_id: Optional[str] = None,
+        mapping_version: Optional[int] = None
+    ):
+        """Initialise le suivi.
+
+        Args:
+            session: Session SQLAlchemy
+            build_id: ID de build actuel du jeu (None si inconnu : tout est
+                récupéré, et les points de reprise sont ignorés)
+            force: Si True, récupère et réécrit toutes les entités
+            run_id: Identifiant de la synchronisation (généré par défaut)
+            mapping_version: Version de la conversion des données de l'API
+                (``MAPPING_VERSION`` par défaut)
+        """
+        self.session = session
+        self.build_id = build_id
+        self.force = force
+        self.run_id = run_id or uuid.uuid4().hex
+        self.mapping_version = mapping_version if mapping_version is not None else MAPPING_VERSION
+        self.writer = BulkUpsertWriter(session)
+
+    def track(self, entity: str, api_ids: Sequence[Any]) -> EntitySync:
+        """Prépare la synchronisation d'un type d'entité à partir de la liste d'IDs de l'API."""
+        return EntitySync(self, entity, api_ids)
+
+    def _load_hashes(self, entity: str) -> Dict[str, str]:
+        """Charge les empreintes enregistrées d'un type d'entité."""
+        query = self.session.query(SyncHash.entity_id, SyncHash.content_hash).filter(SyncHash.entity == entity)
+        return {entity_id: digest for entity_id, digest in query}
+
+    def _forget(self, entity: str, keys: Sequence[str]) -> None:
+        """Supprime les empreintes des IDs disparus de l'API."""
+        for start in range(0, len(keys), _DELETE_CHUNK_SIZE):
+            self.session.query(SyncHash).filter(
+                SyncHash.entity == entity,
+                SyncHash.entity_id.in_(keys[start:start + _DELETE_CHUNK_SIZE])
+            ).delete(synchronize_session=False)
+        self.session.commit()
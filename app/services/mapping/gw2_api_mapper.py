@@ -5,16 +5,24 @@ en objets de notre modèle de données interne.
 """
 
 import logging
-from typing import Dict, List, Any, Optional, Union, Set, Tuple
+from typing import Dict, List, Any, Iterable, Optional, Union, Set, Tuple
 from datetime import datetime
 
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, lazyload
 
 from app.models import (
     Profession, Specialization, Skill, Trait, 
     Weapon, Armor, Trinket, UpgradeComponent,
     ItemStats, ItemStat, Item, ItemType
 )
+from app.models.armor import ArmorType, WeightClass
+from app.models.item import Rarity
+from app.models.skill import SkillType
+from app.models.trait import TraitSlot, TraitTier, TraitType
+from app.models.trinket import TrinketType
+from app.models.upgrade_component import UpgradeComponentType
+from app.models.weapon import DamageType as WeaponDamageType, WeaponType
 from app.game_mechanics import (
     GameMode, RoleType, AttributeType, DamageType, 
     BuffType, BoonType, ConditionType, SkillCategory
@@ -22,6 +30,69 @@ from app.game_mechanics import (
 
 logger = logging.getLogger(__name__)
 
+# Nombre maximum d'IDs par requête IN de préchargement
+PREFETCH_CHUNK_SIZE = 500
+
+# Version de la conversion des données de l'API en lignes. À incrémenter à
+# chaque changement de conversion : la synchronisation incrémentale réécrit
+# alors toutes les entités, même si leur contenu dans l'API n'a pas changé.
+MAPPING_VERSION = 1
+
+# Noms d'attributs de l'API (en minuscules) vers les colonnes de ItemStats
+_ITEMSTAT_ATTRIBUTES = {
+    'power': 'power',
+    'precision': 'precision',
+    'toughness': 'toughness',
+    'vitality': 'vitality',
+    'concentration': 'concentration',
+    'conditiondamage': 'condition_damage',
+    'expertise': 'expertise',
+    'ferocity': 'ferocity',
+    'healing': 'healing_power',
+    'armor': 'armor',
+    'boonduration': 'boon_duration',
+    'criticalchance': 'critical_chance',
+    'criticaldamage': 'critical_damage',
+    'conditionduration': 'condition_duration'
+}
+
+# Ligne (tier) d'un trait majeur dans l'API vers son emplacement
+_TRAIT_SLOTS_BY_TIER = {1: TraitSlot.ADEPT, 2: TraitSlot.MASTER, 3: TraitSlot.GRANDMASTER}
+
+# Type d'objet de l'API vers la table de ses détails
+_DETAIL_MODELS = {
+    'Weapon': Weapon,
+    'Armor': Armor,
+    'Trinket': Trinket,
+    'Back': Trinket,
+    'Accessory': Trinket,
+    'Amulet': Trinket,
+    'Ring': Trinket,
+    'UpgradeComponent': UpgradeComponent,
+}
+
+_ENUM_LOOKUPS: Dict[type, Dict[str, Any]] = {}
+
+
+def _to_enum(enum_class: type, value: Any) -> Any:
+    """Convertit une valeur de l'API (ex: "Weapon", "LongBow") en membre d'énumération.
+    
+    Les énumérations sont persistées par nom : une chaîne brute de l'API serait
+    écrite telle quelle puis illisible au chargement. La recherche ignore la casse
+    et porte sur la valeur puis sur le nom du membre.
+    
+    Returns:
+        Le membre correspondant, ou None si la valeur est absente ou inconnue
+    """
+    if value is None or isinstance(value, enum_class):
+        return value
+    lookup = _ENUM_LOOKUPS.get(enum_class)
+    if lookup is None:
+        lookup = {member.name.lower(): member for member in enum_class}
+        lookup.update((str(member.value).lower(), member) for member in enum_class)
+        _ENUM_LOOKUPS[enum_class] = lookup
+    return lookup.get(str(value).lower())
+
 class GW2APIMapper:
     """Classe utilitaire pour mapper les données de l'API GW2 vers les modèles internes."""
     
@@ -29,12 +100,57 @@ class GW2APIMapper:
         """Initialise le mappeur avec une session de base de données."""
         self.db = db_session
         
-        # Cache pour les entités fréquemment utilisées
-        self._profession_cache: Dict[str, Profession] = {}
-        self._specialization_cache: Dict[int, Specialization] = {}
-        self._skill_cache: Dict[int, Skill] = {}
-        self._trait_cache: Dict[int, Trait] = {}
-        self._item_cache: Dict[int, Item] = {}
+        # Carte d'identité partagée par tous les modèles : {modèle: {id: instance}}.
+        # Une entrée à None signifie que la ligne n'existe pas en base.
+        self._identity: Dict[type, Dict[Any, Any]] = {}
+    
+    # Carte d'identité
+    
+    def prefetch(self, model: type, ids: Iterable[Any]) -> int:
+        """Charge en une requête ``IN`` les lignes existantes d'un lot d'IDs.
+        
+        Les IDs absents de la base sont aussi mémorisés, de sorte que le mappage
+        du lot ne fait plus aucun SELECT par élément. Les relations chargées
+        habituellement en avance ne le sont pas : le mappage n'écrit que des colonnes.
+        
+        Args:
+            model: Modèle SQLAlchemy à charger
+            ids: IDs (clé primaire) des éléments du lot
+            
+        Returns:
+            Le nombre de lignes chargées depuis la base
+        """
+        known = self._identity.setdefault(model, {})
+        missing = [key for key in dict.fromkeys(ids) if key is not None and key not in known]
+        if not missing:
+            return 0
+        
+        primary_key = inspect(model).primary_key[0]
+        loaded = 0
+        for start in range(0, len(missing), PREFETCH_CHUNK_SIZE):
+            keys = missing[start:start + PREFETCH_CHUNK_SIZE]
+            for instance in self.db.query(model).options(lazyload('*')).filter(primary_key.in_(keys)):
+                known[getattr(instance, primary_key.key)] = instance
+                loaded += 1
+            for key in keys:
+                known.setdefault(key, None)
+        return loaded
+    
+    def get_existing(self, model: type, key: Any) -> Any:
+        """Retourne l'instance existante d'un modèle (ou None), via la carte d'identité."""
+        known = self._identity.setdefault(model, {})
+        if key not in known:
+            known[key] = self.db.get(model, key)
+        return known[key]
+    
+    def get_or_create(self, model: type, key: Any) -> Any:
+        """Retourne l'instance existante d'un modèle ou en ajoute une nouvelle à la session."""
+        instance = self.get_existing(model, key)
+        if instance is None:
+            instance = model(id=key)
+            self.db.add(instance)
+            self._identity[model][key] = instance
+        return instance
     
     # Méthodes pour les professions
     
@@ -44,16 +160,7 @@ class GW2APIMapper:
         if not prof_id:
             raise ValueError("Données de profession invalides: ID manquant")
         
-        # Vérifier si la profession existe déjà en cache
-        if prof_id in self._profession_cache:
-            return self._profession_cache[prof_id]
-        
-        # Vérifier si la profession existe en base de données
-        profession = self.db.query(Profession).filter_by(id=prof_id).first()
-        
-        if not profession:
-            profession = Profession(id=prof_id)
-            self.db.add(profession)
+        profession = self.get_or_create(Profession, prof_id)
         
         # Mettre à jour les propriétés de base
         profession.name = api_data.get('name', '')
@@ -72,85 +179,8 @@ class GW2APIMapper:
         # Ne pas assigner directement skills, c'est une relation
         # Les compétences seront gérées via la relation skills
         
-        # Mettre en cache la profession
-        self._profession_cache[prof_id] = profession
-        
         return profession
     
-    # Méthodes pour les statistiques d'objets
-    
-    def map_itemstat(self, api_data: Dict[str, Any]) -> 'ItemStats':
-        """Mappe les données d'une statistique d'objet de l'API vers notre modèle.
-        
-        Args:
-            api_data: Données brutes de la statistique d'objet depuis l'API
-            
-        Returns:
-            L'objet ItemStats créé ou mis à jour
-            
-        Raises:
-            ValueError: Si les données de la statistique sont invalides ou incomplètes
-        """
-        if not api_data.get('id'):
-            raise ValueError("Données de statistique d'objet invalides: ID manquant")
-            
-        # Vérifier si la statistique existe déjà en base de données
-        itemstat = self.db.query(ItemStats).get(api_data['id'])
-        
-        if not itemstat:
-            itemstat = ItemStats(id=api_data['id'])
-            self.db.add(itemstat)
-        
-        # Mettre à jour les propriétés de base
-        itemstat.name = api_data.get('name', '')
-        itemstat.name_fr = api_data.get('name_fr', '')
-        itemstat.description = api_data.get('description', '')
-        itemstat.description_fr = api_data.get('description_fr', '')
-        
-        # Réinitialiser tous les attributs à 0
-        for attr in ['power', 'precision', 'toughness', 'vitality', 'concentration',
-                    'condition_damage', 'expertise', 'ferocity', 'healing_power',
-                    'armor', 'boon_duration', 'critical_chance', 'critical_damage',
-                    'condition_duration']:
-            setattr(itemstat, attr, 0)
-        
-        # Mettre à jour les attributs spécifiés dans les données
-        if 'attributes' in api_data and isinstance(api_data['attributes'], list):
-            for attr_obj in api_data['attributes']:
-                if not isinstance(attr_obj, dict):
-                    logger.warning(f"Format d'attribut inattendu: {attr_obj}")
-                    continue
-                    
-                attr_name = attr_obj.get('attribute')
-                value = attr_obj.get('value', 0)
-                
-                # Convertir les noms d'attributs de l'API vers nos noms de colonnes
-                attr_map = {
-                    'Power': 'power',
-                    'Precision': 'precision',
-                    'Toughness': 'toughness',
-                    'Vitality': 'vitality',
-                    'Concentration': 'concentration',
-                    'ConditionDamage': 'condition_damage',
-                    'Expertise': 'expertise',
-                    'Ferocity': 'ferocity',
-                    'Healing': 'healing_power',
-                    'Armor': 'armor',
-                    'BoonDuration': 'boon_duration',
-                    'CriticalChance': 'critical_chance',
-                    'CriticalDamage': 'critical_damage',
-                    'ConditionDuration': 'condition_duration'
-                }
-                
-                if attr_name in attr_map:
-                    setattr(itemstat, attr_map[attr_name], value)
-                    logger.debug(f"Attribut mappé: {attr_name} = {value} -> {attr_map[attr_name]}")
-        
-        # Journaliser la création/mise à jour
-        logger.debug(f"Statistique d'objet {'mise à jour' if itemstat.id else 'créée'}: {itemstat.name} (ID: {itemstat.id})")
-        
-        return itemstat
-    
     # Méthodes pour les spécialisations
     
     def map_specialization(self, api_data: Dict[str, Any]) -> Specialization:
@@ -159,16 +189,7 @@ class GW2APIMapper:
         if not spec_id:
             raise ValueError("Données de spécialisation invalides: ID manquant")
         
-        # Vérifier si la spécialisation existe déjà en cache
-        if spec_id in self._specialization_cache:
-            return self._specialization_cache[spec_id]
-        
-        # Vérifier si la spécialisation existe en base de données
-        specialization = self.db.query(Specialization).filter_by(id=spec_id).first()
-        
-        if not specialization:
-            specialization = Specialization(id=spec_id)
-            self.db.add(specialization)
+        specialization = self.get_or_create(Specialization, spec_id)
         
         # Mettre à jour les propriétés de base
         specialization.name = api_data.get('name', '')
@@ -182,57 +203,64 @@ class GW2APIMapper:
         specialization.major_traits = api_data.get('major_traits', [])
         specialization.weapon_trait = api_data.get('weapon_trait')
         
-        # Mettre en cache la spécialisation
-        self._specialization_cache[spec_id] = specialization
-        
         return specialization
     
     # Méthodes pour les compétences
     
     def map_skill(self, api_data: Dict[str, Any]) -> Skill:
         """Mappe les données d'une compétence de l'API vers notre modèle."""
-        skill_id = api_data.get('id')
-        if not skill_id:
-            raise ValueError("Données de compétence invalides: ID manquant")
-        
-        # Vérifier si la compétence existe déjà en cache
-        if skill_id in self._skill_cache:
-            return self._skill_cache[skill_id]
+        row = self.skill_row(api_data)
+        skill = self.get_or_create(Skill, row['id'])
         
-        # Vérifier si la compétence existe en base de données
-        skill = self.db.query(Skill).filter_by(id=skill_id).first()
+        # Mettre à jour les propriétés
+        for key, value in row.items():
+            setattr(skill, key, value)
         
-        if not skill:
-            skill = Skill(id=skill_id)
-            self.db.add(skill)
+        return skill
+    
+    def skill_row(self, api_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convertit les données d'une compétence de l'API en ligne de la table ``skills``.
         
-        # Mettre à jour les propriétés de base
-        skill.name = api_data.get('name', '')
-        skill.description = api_data.get('description')
-        skill.icon = api_data.get('icon')
-        skill.chat_link = api_data.get('chat_link')
-        skill.type = api_data.get('type')
-        skill.weapon_type = api_data.get('weapon_type')
-        skill.professions = api_data.get('professions', [])
-        skill.slot = api_data.get('slot')
-        skill.facts = api_data.get('facts', [])
-        skill.traited_facts = api_data.get('traited_facts', [])
-        skill.categories = api_data.get('categories', [])
-        skill.attunement = api_data.get('attunement')
-        skill.cost = api_data.get('cost')
-        skill.dual_wield = api_data.get('dual_wield')
-        skill.flip_skill = api_data.get('flip_skill')
-        skill.initiative = api_data.get('initiative')
-        skill.next_chain = api_data.get('next_chain')
-        skill.prev_chain = api_data.get('prev_chain')
-        skill.transform_skills = api_data.get('transform_skills', [])
-        skill.bundle_skills = api_data.get('bundle_skills', [])
-        skill.toolbelt_skill = api_data.get('toolbelt_skill')
-        
-        # Mettre en cache la compétence
-        self._skill_cache[skill_id] = skill
+        Args:
+            api_data: Données brutes de la compétence depuis l'API
+            
+        Returns:
+            Les valeurs des colonnes de la compétence
+            
+        Raises:
+            ValueError: Si l'ID, le nom ou le type de la compétence manque
+        """
+        skill_id = api_data.get('id')
+        if not skill_id:
+            raise ValueError("Données de compétence invalides: ID manquant")
         
-        return skill
+        row = {
+            'id': skill_id,
+            'name': api_data.get('name', ''),
+            'description': api_data.get('description'),
+            'icon': api_data.get('icon'),
+            'chat_link': api_data.get('chat_link'),
+            'type': _to_enum(SkillType, api_data.get('type')),
+            'weapon_type': _to_enum(WeaponType, api_data.get('weapon_type')),
+            'professions': api_data.get('professions', []),
+            'slot': api_data.get('slot'),
+            'facts': api_data.get('facts', []),
+            'traited_facts': api_data.get('traited_facts', []),
+            'categories': api_data.get('categories', []),
+            'attunement': api_data.get('attunement'),
+            'cost': api_data.get('cost'),
+            'dual_wield': api_data.get('dual_wield'),
+            'flip_skill': api_data.get('flip_skill'),
+            'initiative': api_data.get('initiative'),
+            'next_chain': api_data.get('next_chain'),
+            'prev_chain': api_data.get('prev_chain'),
+            'transform_skills': api_data.get('transform_skills', []),
+            'bundle_skills': api_data.get('bundle_skills', []),
+            'toolbelt_skill': api_data.get('toolbelt_skill'),
+        }
+        if not row['name'] or row['type'] is None:
+            raise ValueError(f"Données de compétence invalides: champs obligatoires manquants pour la compétence {skill_id}")
+        return row
     
     # Méthodes pour les traits
     
@@ -242,33 +270,73 @@ class GW2APIMapper:
         if not trait_id:
             raise ValueError("Données de trait invalides: ID manquant")
         
-        # Vérifier si le trait existe déjà en cache
-        if trait_id in self._trait_cache:
-            return self._trait_cache[trait_id]
+        specialization = None
+        if api_data.get('specialization'):
+            specialization = self.get_existing(Specialization, api_data['specialization'])
+        row = self.trait_row(api_data, elite=bool(specialization and specialization.elite))
+        skill_ids = row.pop('skills')
         
-        # Vérifier si le trait existe en base de données
-        trait = self.db.query(Trait).filter_by(id=trait_id).first()
+        trait = self.get_or_create(Trait, trait_id)
         
-        if not trait:
-            trait = Trait(id=trait_id)
-            self.db.add(trait)
+        # Mettre à jour les propriétés
+        for key, value in row.items():
+            setattr(trait, key, value)
         
-        # Mettre à jour les propriétés de base
-        trait.name = api_data.get('name', '')
-        trait.icon = api_data.get('icon')
-        trait.description = api_data.get('description')
-        trait.specialization = api_data.get('specialization')
-        trait.tier = api_data.get('tier')
-        trait.slot = api_data.get('slot')
-        trait.facts = api_data.get('facts', [])
-        trait.traited_facts = api_data.get('traited_facts', [])
-        trait.skills = api_data.get('skills', [])
-        
-        # Mettre en cache le trait
-        self._trait_cache[trait_id] = trait
+        # Compétences liées au trait (relation ``skills``), si elles sont connues
+        skills = (self.get_existing(Skill, skill_id) for skill_id in skill_ids)
+        trait.skills = [skill for skill in skills if skill is not None]
         
         return trait
     
+    def trait_row(self, api_data: Dict[str, Any], elite: bool = False) -> Dict[str, Any]:
+        """Convertit les données d'un trait de l'API en ligne de la table ``traits``.
+        
+        L'API nomme ``slot`` le rang du trait (Major/Minor) et ``tier`` sa ligne
+        (1 à 3), l'inverse de nos colonnes ``tier`` et ``slot``. La clé ``skills``
+        (IDs des compétences liées au trait) n'est pas une colonne : elle alimente
+        la table d'association ``trait_skills``.
+        
+        Args:
+            api_data: Données brutes du trait depuis l'API
+            elite: Si True, le trait appartient à une spécialisation d'élite
+            
+        Returns:
+            Les valeurs des colonnes du trait
+            
+        Raises:
+            ValueError: Si l'ID, le nom ou le rang du trait manque
+        """
+        trait_id = api_data.get('id')
+        if not trait_id:
+            raise ValueError("Données de trait invalides: ID manquant")
+        
+        tier = _to_enum(TraitTier, api_data.get('slot'))
+        if tier is TraitTier.MINOR:
+            slot = TraitSlot.MINOR
+        else:
+            slot = _TRAIT_SLOTS_BY_TIER.get(api_data.get('tier'))
+        
+        row = {
+            'id': trait_id,
+            'name': api_data.get('name', ''),
+            'icon': api_data.get('icon'),
+            'description': api_data.get('description'),
+            'chat_link': api_data.get('chat_link'),
+            'specialization_id': api_data.get('specialization'),
+            'type': TraitType.ELITE if elite else TraitType.CORE,
+            'tier': tier,
+            'slot': slot,
+            'facts': api_data.get('facts', []),
+            'traited_facts': api_data.get('traited_facts', []),
+            'skills': [
+                skill['id'] if isinstance(skill, dict) else skill
+                for skill in api_data.get('skills') or []
+            ],
+        }
+        if not row['name'] or tier is None or (tier is TraitTier.MAJOR and slot is None):
+            raise ValueError(f"Données de trait invalides: champs obligatoires manquants pour le trait {trait_id}")
+        return row
+    
     # Méthodes pour les statistiques d'objets (item stats)
     
     def map_itemstat(self, api_data: Dict[str, Any]) -> ItemStats:
@@ -283,62 +351,55 @@ class GW2APIMapper:
         Raises:
             ValueError: Si les données sont invalides ou incomplètes
         """
-        if not api_data or 'id' not in api_data:
-            raise ValueError("Données de statistique d'objet invalides: ID manquant")
-            
-        stat_id = api_data['id']
+        row = self.itemstat_row(api_data)
         
-        # Vérifier si la statistique existe déjà en base de données
-        item_stats = self.db.query(ItemStats).filter_by(id=stat_id).first()
+        item_stats = self.get_or_create(ItemStats, row['id'])
         
-        if not item_stats:
-            item_stats = ItemStats(id=stat_id)
-            self.db.add(item_stats)
+        for key, value in row.items():
+            setattr(item_stats, key, value)
         
-        # Mettre à jour les propriétés de base
-        item_stats.name = api_data.get('name', '')
-        item_stats.description = api_data.get('description', '')
-        
-        # Mettre à jour les attributs de statistiques
-        attributes = api_data.get('attributes', [])
-        for attr_data in attributes:
-            # Les attributs sont sous forme de liste de dictionnaires avec 'attribute' et 'value'
-            attr_name = attr_data.get('attribute', '').lower()
-            value = attr_data.get('value', 0)
-            
-            # Mapper les noms d'attributs de l'API vers les noms de colonnes du modèle
-            attr_mapping = {
-                'power': 'power',
-                'precision': 'precision',
-                'toughness': 'toughness',
-                'vitality': 'vitality',
-                'concentration': 'concentration',
-                'conditiondamage': 'condition_damage',
-                'expertise': 'expertise',
-                'ferocity': 'ferocity',
-                'healing': 'healing_power',
-                'armor': 'armor',
-                'boonduration': 'boon_duration',
-                'criticalchance': 'critical_chance',
-                'criticaldamage': 'critical_damage',
-                'conditionduration': 'condition_duration'
-            }
+        return item_stats
+    
+    def itemstat_row(self, api_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convertit les données d'une statistique d'objet en ligne de la table ``item_stats``.
+        
+        Les attributs absents des données valent 0 ; une statistique sans nom
+        reçoit un nom par défaut basé sur son ID.
+        
+        Args:
+            api_data: Données brutes de la statistique d'objet depuis l'API
             
-            # Appliquer le mappage si nécessaire
-            attr_name = attr_mapping.get(attr_name.lower(), attr_name)
+        Returns:
+            Les valeurs des colonnes de la statistique
             
-            # Mettre à jour l'attribut s'il existe dans le modèle
-            if hasattr(item_stats, attr_name):
-                setattr(item_stats, attr_name, value)
+        Raises:
+            ValueError: Si l'ID de la statistique manque
+        """
+        if not api_data or not api_data.get('id'):
+            raise ValueError("Données de statistique d'objet invalides: ID manquant")
+        
+        stat_id = api_data['id']
+        row = {
+            'id': stat_id,
+            'name': api_data.get('name') or f"Statistiques-{stat_id}",
+            'description': api_data.get('description', ''),
+        }
+        row.update((column, 0) for column in _ITEMSTAT_ATTRIBUTES.values())
+        
+        # Les attributs sont sous forme de liste de dictionnaires avec 'attribute' et 'value'
+        for attr_data in api_data.get('attributes', []):
+            if not isinstance(attr_data, dict):
+                logger.warning(f"Format d'attribut inattendu: {attr_data}")
+                continue
+            column = _ITEMSTAT_ATTRIBUTES.get(str(attr_data.get('attribute', '')).lower())
+            if column:
+                row[column] = attr_data.get('value', 0)
         
         # Traiter les statistiques de défense si présentes
         if 'defense' in api_data:
-            item_stats.armor = api_data['defense']
-        
-        # Pour les statistiques de dégâts, on peut les ignorer car elles sont déjà incluses dans les attributs
-        # via l'API (power, condition_damage, etc.)
+            row['armor'] = api_data['defense']
         
-        return item_stats
+        return row
     
     def _map_with_mapper(self, mapper: 'GW2APIMapper', data: Dict[str, Any]) -> Any:
         """Utilise le mapper pour convertir les données en modèle ItemStats."""
@@ -392,16 +453,7 @@ class GW2APIMapper:
         if not item_id:
             raise ValueError("Données d'objet invalides: ID manquant")
         
-        # Vérifier si l'objet existe déjà en cache
-        if item_id in self._item_cache:
-            return self._item_cache[item_id]
-        
-        # Vérifier si l'objet existe en base de données
-        item = self.db.query(Item).filter_by(id=item_id).first()
-        
-        if not item:
-            item = Item(id=item_id)
-            self.db.add(item)
+        item = self.get_or_create(Item, item_id)
         
         # Mettre à jour les propriétés de base
         item.name = api_data.get('name', '')
@@ -446,11 +498,121 @@ class GW2APIMapper:
             elif item.type == "UpgradeComponent":
                 item.upgrade_component = self._map_upgrade_component_details({})
         
-        # Mettre en cache l'objet
-        self._item_cache[item_id] = item
-        
         return item
     
+    def item_row(self, api_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convertit les données d'un objet de l'API en ligne de la table ``items``.
+        
+        Args:
+            api_data: Données brutes de l'objet depuis l'API
+            
+        Returns:
+            Les valeurs des colonnes de l'objet
+            
+        Raises:
+            ValueError: Si l'ID, le nom, le type ou la rareté de l'objet manque
+        """
+        item_id = api_data.get('id')
+        if not item_id:
+            raise ValueError("Données d'objet invalides: ID manquant")
+        
+        details = api_data.get('details')
+        row = {
+            'id': item_id,
+            'name': api_data.get('name', ''),
+            'description': api_data.get('description'),
+            'icon': api_data.get('icon'),
+            'type': _to_enum(ItemType, api_data.get('type')),
+            'level': api_data.get('level', 0),
+            'rarity': _to_enum(Rarity, api_data.get('rarity')),
+            'vendor_value': api_data.get('vendor_value', 0),
+            'flags': api_data.get('flags', []),
+            'restrictions': api_data.get('restrictions', []),
+            'details': details if isinstance(details, dict) else None,
+        }
+        if not row['name'] or row['type'] is None or row['rarity'] is None:
+            raise ValueError(f"Données d'objet invalides: champs obligatoires manquants pour l'objet {item_id}")
+        return row
+    
+    def item_detail_row(self, api_data: Dict[str, Any]) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """Convertit les détails d'un objet en ligne de sa table spécifique.
+        
+        Les lignes de détails sont identifiées par ``item_id`` (contrainte unique).
+        
+        Args:
+            api_data: Données brutes de l'objet depuis l'API
+            
+        Returns:
+            Le couple (modèle, ligne) pour les armes, armures, bijoux et composants
+            d'amélioration ; None pour les autres objets ou si le sous-type est inconnu
+        """
+        model = _DETAIL_MODELS.get(api_data.get('type'))
+        if model is None:
+            return None
+        
+        details = api_data.get('details')
+        if not isinstance(details, dict):
+            logger.warning(f"Détails d'objet invalides (type: {type(details).__name__}) pour l'objet {api_data.get('id')}")
+            details = {}
+        
+        row = {
+            'item_id': api_data.get('id'),
+            'name': api_data.get('name', ''),
+            'description': api_data.get('description'),
+            'icon': api_data.get('icon'),
+            'chat_link': api_data.get('chat_link'),
+            'level': api_data.get('level', 0),
+            'flags': api_data.get('flags', []),
+            'restrictions': api_data.get('restrictions', []),
+            'details': details,
+        }
+        upgrades = {
+            'infusion_slots': details.get('infusion_slots', []),
+            'suffix_item_id': details.get('suffix_item_id'),
+            'secondary_suffix_item_id': details.get('secondary_suffix_item_id') or None,
+            'stat_choices': details.get('stat_choices', []),
+            'game_types': api_data.get('game_types', []),
+            'default_skin': api_data.get('default_skin'),
+        }
+        
+        if model is Weapon:
+            row.update(upgrades)
+            row.update({
+                'type': _to_enum(WeaponType, details.get('type')),
+                'damage_type': _to_enum(WeaponDamageType, details.get('damage_type')),
+                'min_power': details.get('min_power', 0),
+                'max_power': details.get('max_power', 0),
+                'defense': details.get('defense', 0),
+                'attributes': (details.get('infix_upgrade') or {}).get('attributes'),
+                'rarity': _to_enum(Rarity, api_data.get('rarity')),
+            })
+        elif model is Armor:
+            row.update(upgrades)
+            row.update({
+                'type': _to_enum(ArmorType, details.get('type')),
+                'weight_class': _to_enum(WeightClass, details.get('weight_class')),
+                'defense': details.get('defense', 0),
+                'rarity': api_data.get('rarity'),
+            })
+        elif model is Trinket:
+            row.update(upgrades)
+            row.update({
+                'type': _to_enum(TrinketType, details.get('type') or api_data.get('type')),
+                'rarity': api_data.get('rarity'),
+                'vendor_value': api_data.get('vendor_value', 0),
+            })
+        else:
+            row.update({
+                'type': _to_enum(UpgradeComponentType, details.get('type')),
+                'rarity': api_data.get('rarity'),
+                'vendor_value': api_data.get('vendor_value', 0),
+            })
+        
+        if row['type'] is None or row['rarity'] is None or (model is Armor and row['weight_class'] is None):
+            logger.debug(f"Détails de l'objet {row['item_id']} ignorés: sous-type inconnu ({details.get('type')})")
+            return None
+        return model, row
+    
     # Méthodes auxiliaires pour le mappage des détails spécifiques
     
     def _map_armor_details(self, details: Dict[str, Any]) -> Armor:
@@ -519,25 +681,19 @@ class GW2APIMapper:
         if not stats_id:
             raise ValueError("Données de statistiques d'objet invalides: ID manquant")
         
-        # Vérifier si les statistiques existent en base de données
-        item_stats = self.db.query(ItemStats).filter_by(id=stats_id).first()
-        
-        if not item_stats:
-            item_stats = ItemStats(id=stats_id)
-            self.db.add(item_stats)
+        item_stats = self.get_or_create(ItemStats, stats_id)
         
         # Mettre à jour les propriétés de base
         item_stats.name = api_data.get('name', '')
         
-        # Mapper les attributs
+        # Mapper les attributs (les attributs existants sont chargés en une requête)
         attributes = api_data.get('attributes', {})
+        existing = {
+            attr.attribute: attr
+            for attr in self.db.query(ItemStat).filter_by(stats_id=stats_id)
+        } if attributes else {}
         for attr_name, attr_value in attributes.items():
-            # Vérifier si l'attribut existe déjà
-            attr = (
-                self.db.query(ItemStat)
-                .filter_by(stats_id=stats_id, attribute=attr_name)
-                .first()
-            )
+            attr = existing.get(attr_name)
             
             if not attr:
                 attr = ItemStat(stats_id=stats_id, attribute=attr_name, value=attr_value)
@@ -550,9 +706,5 @@ class GW2APIMapper:
     # Méthodes utilitaires
     
     def clear_cache(self) -> None:
-        """Vide le cache interne du mappeur."""
-        self._profession_cache.clear()
-        self._specialization_cache.clear()
-        self._skill_cache.clear()
-        self._trait_cache.clear()
-        self._item_cache.clear()
+        """Vide la carte d'identité du mappeur."""
+        self._identity.clear()
@@ -0,0 +1,101 @@
+"""Requêtes asynchrones fréquentes sur les données de jeu.
+
+Ces fonctions utilisent une ``AsyncSession`` (voir ``app.database.get_async_db``)
+et ne bloquent pas la boucle d'événements. Elles chargent explicitement les
+données nécessaires : en asynchrone, un chargement paresseux d'une relation
+lèverait une erreur au lieu d'exécuter une requête implicite.
+
+Exemple d'utilisation:
+    ```python
+    @router.get("/skills/{skill_id}")
+    async def read_skill(skill_id: int, db: AsyncSession = Depends(get_async_db)):
+        skill = await repository.get_skill(db, skill_id)
+    ```
+"""
+
+from typing import Iterable, List, Optional, Sequence
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Profession, Skill, Specialization, Trait
+from app.models.profession_weapon import ProfessionWeaponType
+
+# Nombre maximum d'IDs par clause IN
+IN_CHUNK_SIZE = 500
+
+
+async def get_profession(session: AsyncSession, profession_id: str) -> Optional[Profession]:
+    """Retourne une profession par ID."""
+    return await session.get(Profession, profession_id)
+
+
+async def list_professions(session: AsyncSession) -> List[Profession]:
+    """Retourne toutes les professions, triées par nom."""
+    result = await session.scalars(select(Profession).order_by(Profession.name))
+    return list(result)
+
+
+async def get_skill(session: AsyncSession, skill_id: int) -> Optional[Skill]:
+    """Retourne une compétence par ID."""
+    return await session.get(Skill, skill_id)
+
+
+async def get_skills(session: AsyncSession, skill_ids: Iterable[int]) -> List[Skill]:
+    """Retourne les compétences d'une liste d'IDs (une requête par tranche d'IDs).
+
+    Args:
+        session: Session asynchrone
+        skill_ids: IDs des compétences
+
+    Returns:
+        Les compétences trouvées, dans l'ordre des IDs demandés
+    """
+    ids: Sequence[int] = list(dict.fromkeys(skill_ids))
+    by_id = {}
+    for start in range(0, len(ids), IN_CHUNK_SIZE):
+        chunk = ids[start:start + IN_CHUNK_SIZE]
+        result = await session.scalars(select(Skill).where(Skill.id.in_(chunk)))
+        by_id.update((skill.id, skill) for skill in result)
+    return [by_id[skill_id] for skill_id in ids if skill_id in by_id]
+
+
+async def skills_for_profession(session: AsyncSession, profession_id: str) -> List[Skill]:
+    """Retourne les compétences d'une profession (``profession_id`` ou liste ``professions``).
+
+    La liste JSON ``professions`` est filtrée en Python : son opérateur de
+    recherche diffère selon le SGBD.
+    """
+    result = await session.scalars(
+        select(Skill).where(or_(Skill.profession_id == profession_id, Skill.professions.isnot(None)))
+    )
+    return [
+        skill for skill in result
+        if skill.profession_id == profession_id or profession_id in (skill.professions or ())
+    ]
+
+
+async def specializations_for_profession(session: AsyncSession, profession_id: str) -> List[Specialization]:
+    """Retourne les spécialisations d'une profession."""
+    result = await session.scalars(
+        select(Specialization)
+        .where(Specialization.profession_id == profession_id)
+        .order_by(Specialization.id)
+    )
+    return list(result)
+
+
+async def traits_for_specialization(session: AsyncSession, specialization_id: int) -> List[Trait]:
+    """Retourne les traits d'une spécialisation."""
+    result = await session.scalars(
+        select(Trait).where(Trait.specialization_id == specialization_id).order_by(Trait.id)
+    )
+    return list(result)
+
+
+async def weapon_types_for_profession(session: AsyncSession, profession_id: str) -> List[ProfessionWeaponType]:
+    """Retourne les types d'armes utilisables par une profession."""
+    result = await session.scalars(
+        select(ProfessionWeaponType).where(ProfessionWeaponType.profession_id == profession_id)
+    )
+    return list(result)
@@ -0,0 +1,194 @@
+"""Graphe de dépendances des étapes de synchronisation depuis l'API GW2.
+
+``sync_all`` enchaînait les étapes (professions, compétences, traits, objets...)
+strictement l'une après l'autre, alors que seules certaines dépendent des
+autres : les statistiques d'objets, par exemple, ne dépendent pas des
+compétences. ``SyncGraph`` décrit chaque étape avec les étapes dont elle
+dépend, et lance une étape dès que ses dépendances sont terminées : les étapes
+indépendantes s'exécutent simultanément, dans la limite de débit partagée par
+les clients de l'API.
+
+Une étape en échec ne bloque pas les étapes qui en dépendent : comme avec
+l'exécution séquentielle, chaque étape synchronise ce qu'elle peut et signale
+ses erreurs dans son résultat.
+
+La durée de chaque étape et le chemin critique (la chaîne de dépendances qui
+détermine la durée totale) sont mesurés, pour savoir où passe le temps d'une
+synchronisation.
+
+Exemple d'utilisation:
+    ```python
+    graph = SyncGraph([
+        SyncStep("professions", service.sync_professions),
+        SyncStep("skills", service.sync_skills, depends_on=("professions",)),
+        SyncStep("itemstats", service.sync_itemstats),
+    ])
+    result = await graph.run()
+    print(result.results["skills"], result.critical_path)
+    ```
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SyncStep:
+    """Étape de synchronisation.
+
+    Attributes:
+        name: Nom de l'étape (clé de son résultat)
+        run: Coroutine de synchronisation ; retourne le résultat de l'étape
+        depends_on: Noms des étapes à terminer avant celle-ci
+    """
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+
+
+@dataclass
+class StepTiming:
+    """Instants de début et de fin d'une étape, relatifs au début du graphe (secondes)."""
+    start: float
+    end: float
+
+    @property
+    def seconds(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class GraphResult:
+    """Résultat d'une exécution du graphe.
+
+    Attributes:
+        results: Résultat de chaque étape
+        timings: Début et fin de chaque étape
+        critical_path: Étapes du chemin critique, dans l'ordre d'exécution
+        seconds: Durée totale
+    """
+    results: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, StepTiming] = field(default_factory=dict)
+    critical_path: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def report(self) -> Dict[str, Any]:
+        """Retourne les durées des étapes et le chemin critique (sérialisables en JSON)."""
+        return {
+            "total_seconds": round(self.seconds, 3),
+            "steps": {
+                name: {
+                    "start": round(timing.start, 3),
+                    "end": round(timing.end, 3),
+                    "seconds": round(timing.seconds, 3),
+                }
+                for name, timing in self.timings.items()
+            },
+            "critical_path": list(self.critical_path),
+            "critical_path_seconds": round(
+                sum(self.timings[name].seconds for name in self.critical_path), 3
+            ),
+        }
+
+
+class SyncGraph:
+    """Exécute des étapes de synchronisation selon leurs dépendances."""
+
+    def __init__(self, steps: Sequence[SyncStep]):
+        """Initialise le graphe.
+
+        Args:
+            steps: Étapes du graphe
+
+        Raises:
+            ValueError: Si un nom d'étape est en double, si une dépendance est
+                inconnue ou si les dépendances forment un cycle
+        """
+        self.steps: Dict[str, SyncStep] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Étape de synchronisation en double: {step.name}")
+            self.steps[step.name] = step
+        for step in steps:
+            unknown = [name for name in step.depends_on if name not in self.steps]
+            if unknown:
+                raise ValueError(f"Dépendances inconnues pour l'étape {step.name}: {unknown}")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """Ordonne les étapes après leurs dépendances (en conservant l'ordre déclaré)."""
+        order: List[str] = []
+        visiting = set()
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle de dépendances impliquant l'étape {name}")
+            visiting.add(name)
+            for dependency in self.steps[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in self.steps:
+            visit(name)
+        return order
+
+    async def run(self) -> GraphResult:
+        """Exécute toutes les étapes, chacune dès que ses dépendances sont terminées.
+
+        Une exception levée par une étape est convertie en résultat
+        ``{"status": "error", "error": ...}`` ; les autres étapes continuent.
+
+        Returns:
+            Les résultats et les durées des étapes
+        """
+        result = GraphResult()
+        origin = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_step(step: SyncStep) -> None:
+            if step.depends_on:
+                await asyncio.gather(*(tasks[name] for name in step.depends_on))
+            start = time.perf_counter() - origin
+            try:
+                result.results[step.name] = await step.run()
+            except Exception as e:
+                logger.error(f"Erreur lors de l'étape de synchronisation {step.name}: {e}", exc_info=True)
+                result.results[step.name] = {"status": "error", "error": str(e)}
+            result.timings[step.name] = StepTiming(start, time.perf_counter() - origin)
+            logger.info(f"Étape {step.name} terminée en {result.timings[step.name].seconds:.1f}s")
+
+        # Les tâches sont créées dans l'ordre topologique : les dépendances
+        # d'une étape existent toujours lorsqu'elle les attend
+        for name in self.order:
+            tasks[name] = asyncio.ensure_future(run_step(self.steps[name]))
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        result.seconds = time.perf_counter() - origin
+        result.results = {name: result.results[name] for name in self.order}
+        result.critical_path = self._critical_path(result.timings)
+        logger.info(
+            f"Synchronisation terminée en {result.seconds:.1f}s, "
+            f"chemin critique: {' → '.join(result.critical_path)}"
+        )
+        return result
+
+    def _critical_path(self, timings: Dict[str, StepTiming]) -> List[str]:
+        """Remonte depuis la dernière étape terminée, par la dépendance terminée en dernier."""
+        if not timings:
+            return []
+        path = [max(timings, key=lambda name: timings[name].end)]
+        while self.steps[path[-1]].depends_on:
+            path.append(max(self.steps[path[-1]].depends_on, key=lambda name: timings[name].end))
+        return path[::-1]
@@ -0,0 +1,222 @@
+"""Pipeline de synchronisation par lots depuis l'API GW2.
+
+Les boucles de synchronisation récupéraient un lot de 200 IDs, le traitaient,
+puis récupéraient le suivant : le réseau et la base de données ne travaillaient
+jamais en même temps. ``SyncPipeline`` enchaîne trois étages reliés par des
+files ``asyncio`` bornées :
+
+- N tâches de récupération appellent l'API (dans la limite de débit du client) ;
+- un étage de mappage convertit les données brutes en lignes ;
+- un unique étage d'écriture enregistre les lignes en base.
+
+Les files bornées assurent la contre-pression : si l'écriture prend du retard,
+les récupérations s'arrêtent dès que les files sont pleines.
+
+Avec un point de reprise (``ChunkCheckpoint``), les lots déjà validés lors
+d'une synchronisation interrompue sont sautés, et chaque lot écrit sans
+erreur est enregistré comme validé.
+
+Les étages sont de simples fonctions, ce qui permet de tester le pipeline hors
+ligne avec des réponses enregistrées.
+
+Exemple d'utilisation:
+    ```python
+    pipeline = SyncPipeline(
+        fetch=api.get_skills,
+        transform=lambda data: (rows_from(data), 0),
+        write=lambda rows: (len(rows), 0),
+        label="compétences",
+    )
+    result = await pipeline.run(skill_ids)
+    print(result.processed, result.errors)
+    ```
+"""
+
+import asyncio
+import contextlib
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, AsyncContextManager, Awaitable, Callable, List, Optional, Sequence, Tuple, Union
+
+from app.api.config import settings as api_settings
+
+if TYPE_CHECKING:
+    from app.services.incremental_sync import ChunkCheckpoint
+
+logger = logging.getLogger(__name__)
+
+# Taille maximale d'un lot d'IDs pour l'API GW2
+CHUNK_SIZE = 200
+
+# Marqueur de fin de flux entre deux étages
+_DONE = object()
+
+# Un étage peut être synchrone ou asynchrone
+Stage = Callable[[Any], Union[Any, Awaitable[Any]]]
+
+
+async def _call(stage: Stage, value: Any) -> Any:
+    """Appelle un étage et attend son résultat s'il est asynchrone."""
+    result = stage(value)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+def default_fetchers() -> int:
+    """Nombre de tâches de récupération, borné par la limite de débit du client."""
+    fetchers = api_settings.sync_fetch_concurrency
+    if api_settings.rate_limit_enabled:
+        fetchers = min(fetchers, api_settings.requests_per_second)
+    return max(1, fetchers)
+
+
+@dataclass
+class PipelineResult:
+    """Résultat d'une exécution du pipeline.
+
+    Attributes:
+        chunks: Nombre de lots écrits
+        processed: Nombre d'éléments écrits
+        errors: Nombre d'erreurs (éléments rejetés, et tous les IDs des lots en échec)
+        skipped: Nombre de lots sautés, déjà validés par une synchronisation précédente
+        seconds: Durée totale
+    """
+    chunks: int = 0
+    processed: int = 0
+    errors: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+
+class SyncPipeline:
+    """Récupère, convertit et écrit des lots d'IDs en parallèle."""
+
+    def __init__(
+        self,
+        fetch: Callable[[List[Any]], Awaitable[List[Any]]],
+        transform: Stage,
+        write: Stage,
+        fetchers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        section: Optional[Callable[[], AsyncContextManager[Any]]] = None,
+        label: str = "éléments"
+    ):
+        """Initialise le pipeline.
+
+        Args:
+            fetch: Récupère les données brutes d'un lot d'IDs
+            transform: Convertit les données brutes ; retourne (lot, nombre d'erreurs)
+            write: Écrit un lot converti ; retourne (nombre d'éléments écrits, nombre d'erreurs)
+            fetchers: Nombre de récupérations simultanées (par défaut : ``default_fetchers()``)
+            queue_size: Nombre de lots en attente entre deux étages
+            section: Section exclusive ouverte autour de l'écriture de chaque lot
+                et de sa validation (session partagée avec d'autres pipelines)
+            label: Désignation des éléments pour la journalisation
+        """
+        self.fetch = fetch
+        self.transform = transform
+        self.write = write
+        self.fetchers = fetchers or default_fetchers()
+        self.queue_size = queue_size or api_settings.sync_queue_size
+        self.section = section
+        self.label = label
+
+    async def run(
+        self,
+        ids: Sequence[Any],
+        chunk_size: Optional[int] = None,
+        checkpoint: Optional['ChunkCheckpoint'] = None
+    ) -> PipelineResult:
+        """Synchronise tous les IDs, lot par lot.
+
+        Un lot en échec compte une erreur par ID et est journalisé sans
+        interrompre les autres lots.
+
+        Args:
+            ids: IDs à synchroniser
+            chunk_size: Nombre d'IDs par appel à l'API (par défaut : celui du
+                point de reprise, sinon ``CHUNK_SIZE``)
+            checkpoint: Point de reprise : les lots validés sont sautés, et les
+                lots écrits sans erreur y sont enregistrés
+
+        Returns:
+            Le résultat de la synchronisation
+        """
+        result = PipelineResult()
+        start = time.perf_counter()
+        chunk_size = chunk_size or (checkpoint.chunk_size if checkpoint is not None else CHUNK_SIZE)
+
+        chunks: asyncio.Queue = asyncio.Queue()
+        for i in range(0, len(ids), chunk_size):
+            if checkpoint is not None and checkpoint.is_done(i):
+                result.skipped += 1
+                continue
+            chunks.put_nowait((i, list(ids[i:i + chunk_size])))
+        if result.skipped:
+            logger.info(f"{result.skipped} lots de {self.label} déjà validés, sautés")
+        fetched: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        mapped: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        async def fetcher() -> None:
+            while True:
+                try:
+                    offset, chunk = chunks.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    data = await self.fetch(chunk)
+                except Exception as e:
+                    result.errors += len(chunk)
+                    logger.error(f"Erreur lors de la récupération du lot de {self.label}: {e}")
+                    continue
+                await fetched.put((offset, len(chunk), data))
+
+        async def produce() -> None:
+            await asyncio.gather(*(fetcher() for _ in range(min(self.fetchers, chunks.qsize()))))
+            await fetched.put(_DONE)
+
+        async def convert() -> None:
+            while (item := await fetched.get()) is not _DONE:
+                offset, size, data = item
+                try:
+                    batch, errors = await _call(self.transform, data)
+                except Exception as e:
+                    result.errors += size
+                    logger.error(f"Erreur lors de la conversion du lot de {self.label}: {e}")
+                    continue
+                result.errors += errors
+                await mapped.put((offset, size, batch, errors))
+            await mapped.put(_DONE)
+
+        async def store() -> None:
+            while (item := await mapped.get()) is not _DONE:
+                offset, size, batch, mapping_errors = item
+                try:
+                    async with self.section() if self.section is not None else contextlib.nullcontext():
+                        written, errors = await _call(self.write, batch)
+                        # Un lot avec des erreurs n'est pas validé : il sera repris
+                        if checkpoint is not None and errors == 0 and mapping_errors == 0:
+                            checkpoint.commit(offset)
+                except Exception as e:
+                    # Les éléments rejetés à la conversion sont déjà comptés
+                    result.errors += size - mapping_errors
+                    logger.error(f"Erreur lors de l'écriture du lot de {self.label}: {e}")
+                    continue
+                result.chunks += 1
+                result.processed += written
+                result.errors += errors
+                logger.info(f"Traitement en cours: {result.processed}/{len(ids)} {self.label}")
+
+        tasks = [asyncio.create_task(stage()) for stage in (produce, convert, store)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        result.seconds = time.perf_counter() - start
+        return result
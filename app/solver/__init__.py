@@ -10,10 +10,12 @@ from .constraints import (
     WeaponProficiencyConstraint, AttributeThresholdConstraint, BuildValidator
 )
 from .solver import BuildGenerator, BuildSolution
+from .parallel import GenerationTask, generate_builds_for_professions
 
 __all__ = [
     # Classes principales
     'BuildGenerator', 'BuildSolution',
+    'GenerationTask', 'generate_builds_for_professions',
     
     # Contraintes
     'BuildConstraint', 'ConstraintViolation', 'ConstraintViolationSeverity',
@@ -0,0 +1,242 @@
+"""Génération parallèle de builds pour plusieurs professions.
+
+La génération de builds est purement CPU : construire un ``BuildGenerator`` par
+profession et attendre ``generate_builds`` l'un après l'autre n'exploite qu'un seul
+cœur. Ce module répartit le travail par couple (profession, rôle) sur un pool de
+processus, renvoie les solutions au fil de l'eau, les déduplique par empreinte
+canonique et respecte un budget de temps global.
+
+Exemple d'utilisation:
+    ```python
+    from app.solver.parallel import generate_builds_for_professions
+
+    async for solution in generate_builds_for_professions(
+        ["Guardian", "Necromancer"],
+        roles=[RoleType.HEALER, RoleType.DPS],
+        time_budget=5.0,
+    ):
+        print(solution["profession_id"], solution["score"])
+    ```
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set
+
+from app.game_mechanics import GameMode, RoleType
+from app.models import Profession
+from .solver import BuildGenerator, BuildSolution
+
+logger = logging.getLogger(__name__)
+
+# Type d'une fonction de travail exécutée dans le pool
+TaskWorker = Callable[..., List[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class GenerationTask:
+    """Unité de travail envoyée au pool : une profession pour un rôle donné."""
+    profession_id: str
+    role: Optional[RoleType] = None
+
+
+def _summarize_solution(solution: BuildSolution, role: Optional[RoleType]) -> Dict[str, Any]:
+    """Réduit une solution à des identifiants sérialisables entre processus."""
+    def ids(entities) -> List[Any]:
+        return [getattr(entity, 'id', None) for entity in entities or []]
+
+    return {
+        'fingerprint': solution.fingerprint,
+        'profession_id': getattr(solution.profession, 'id', None),
+        'role': role.value if role else None,
+        'score': solution.score,
+        'metric_score': solution.metric_score,
+        'specialization_ids': ids(solution.specializations),
+        'skill_ids': ids(solution.skills),
+        'weapon_ids': ids(solution.weapons),
+        'armor_ids': ids(solution.armor),
+        'trinket_ids': ids(solution.trinkets),
+        'upgrade_ids': ids(solution.upgrades),
+        'violations': [
+            {'severity': v.severity.name, 'message': v.message}
+            for v in solution.violations
+        ],
+    }
+
+
+def _init_worker() -> None:
+    """Initialise un processus de travail.
+
+    Les connexions héritées du processus parent ne doivent pas être réutilisées
+    après un fork : on les abandonne sans les fermer côté parent. Le catalogue
+    de jeu est installé s'il n'a pas été hérité (méthode de démarrage ``spawn``,
+    ou parent qui ne l'avait pas chargé) ; à défaut, le générateur lit la base.
+    """
+    from app.config import settings
+    from app.database import engine
+    from app.services.catalog import get_catalog
+    from app.services.catalog_file import install_catalog
+
+    engine.dispose(close=False)
+    if get_catalog() is None:
+        try:
+            install_catalog(settings.CATALOG_FILE)
+        except Exception as e:
+            logger.warning(f"Catalogue de jeu indisponible dans le processus de travail: {e}")
+
+
+def solve_generation_task(
+    task: GenerationTask,
+    game_mode: GameMode,
+    time_budget: Optional[float],
+    generator_options: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """Exécute un ``BuildGenerator`` pour une tâche, dans le processus courant.
+
+    Args:
+        task: Profession et rôle à traiter
+        game_mode: Mode de jeu ciblé
+        time_budget: Temps restant en secondes (None pour aucune limite)
+        generator_options: Arguments supplémentaires pour ``BuildGenerator``
+
+    Returns:
+        La liste des solutions résumées (voir ``_summarize_solution``)
+    """
+    from app.database import SessionLocal
+
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+    session = SessionLocal()
+    try:
+        profession = session.get(Profession, task.profession_id)
+        if profession is None:
+            logger.warning(f"Profession inconnue ignorée: {task.profession_id}")
+            return []
+
+        generator = BuildGenerator(
+            db=session,
+            profession=profession,
+            game_mode=game_mode,
+            role=task.role,
+            deadline=deadline,
+            **generator_options
+        )
+        solutions = asyncio.run(generator.generate_builds())
+        return [_summarize_solution(solution, generator.role) for solution in solutions]
+    finally:
+        session.close()
+
+
+async def generate_builds_for_professions(
+    profession_ids: Iterable[str],
+    roles: Optional[Iterable[Optional[RoleType]]] = None,
+    game_mode: GameMode = GameMode.PVE,
+    time_budget: Optional[float] = None,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    worker: TaskWorker = solve_generation_task,
+    **generator_options
+) -> AsyncIterator[Dict[str, Any]]:
+    """Génère des builds pour plusieurs professions en parallèle.
+
+    Chaque couple (profession, rôle) est soumis au pool dès le départ ; les
+    solutions sont renvoyées dès qu'une tâche se termine. Une solution dont
+    l'empreinte a déjà été vue est ignorée.
+
+    Args:
+        profession_ids: Identifiants des professions (ex: 'Guardian')
+        roles: Rôles à explorer pour chaque profession (None: rôle par défaut)
+        game_mode: Mode de jeu ciblé
+        time_budget: Budget de temps global en secondes (None pour aucune limite)
+        max_workers: Nombre de processus du pool créé par défaut
+        executor: Exécuteur à utiliser à la place du pool de processus
+        worker: Fonction exécutée pour chaque tâche (doit être sérialisable)
+        **generator_options: Arguments transmis à ``BuildGenerator``
+            (max_solutions, max_iterations, required_boons, etc.)
+
+    Yields:
+        Les solutions résumées, sans doublon, dans leur ordre d'arrivée
+    """
+    # Les rôles sont parcourus pour chaque profession : un générateur ne
+    # pourrait l'être qu'une fois
+    roles = list(roles) if roles is not None else [None]
+    tasks = [
+        GenerationTask(profession_id=profession_id, role=role)
+        for profession_id in profession_ids
+        for role in roles
+    ]
+    if not tasks:
+        return
+
+    started = time.monotonic()
+    deadline = started + time_budget if time_budget is not None else None
+
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker)
+
+    loop = asyncio.get_running_loop()
+    pending: Set[asyncio.Future] = set()
+    task_by_future: Dict[asyncio.Future, GenerationTask] = {}
+    seen: Set[str] = set()
+    duplicates = 0
+
+    try:
+        for task in tasks:
+            # Chaque tâche reçoit le temps restant sur le budget global
+            remaining = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+            future = loop.run_in_executor(
+                executor, worker, task, game_mode, remaining, generator_options
+            )
+            pending.add(future)
+            task_by_future[future] = task
+
+        while pending:
+            timeout = None
+            if deadline is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+
+            for future in done:
+                task = task_by_future[future]
+                try:
+                    solutions = future.result()
+                except Exception as e:
+                    logger.error(
+                        f"Erreur lors de la génération pour {task.profession_id} "
+                        f"(rôle: {task.role.value if task.role else 'défaut'}): {e}"
+                    )
+                    continue
+
+                for solution in solutions:
+                    fingerprint = solution.get('fingerprint')
+                    if fingerprint in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(fingerprint)
+                    yield solution
+
+        if pending:
+            logger.info(
+                f"Budget de temps de {time_budget}s atteint: "
+                f"{len(pending)}/{len(tasks)} tâches abandonnées"
+            )
+    finally:
+        for future in pending:
+            future.cancel()
+        if owns_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        logger.debug(
+            f"Génération parallèle terminée en {time.monotonic() - started:.2f}s: "
+            f"{len(seen)} solutions uniques, {duplicates} doublons ignorés"
+        )
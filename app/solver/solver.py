@@ -4,8 +4,10 @@ from typing import Dict, List, Set, Tuple, Optional, Any, Union
 from dataclasses import dataclass
 import logging
 import random
+import time
 from collections import defaultdict
 
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from constraint import Problem, AllDifferentConstraint, InSetConstraint
 
@@ -17,7 +19,15 @@ from app.models import (
     Profession, Specialization, Skill, Trait, 
     Weapon, Armor, Trinket, UpgradeComponent
 )
-from .constraints import BuildConstraint, ConstraintViolation, ConstraintViolationSeverity, BuildValidator
+from app.scoring.cache import get_default_metric_cache
+from app.scoring.fingerprint import build_fingerprint
+from app.scoring.scorer import BuildScorer
+from app.services.catalog import get_catalog
+from .constraints import (
+    BuildConstraint, ConstraintViolation, ConstraintViolationSeverity, BuildValidator,
+    RoleConstraint, BoonCoverageConstraint, ConditionCoverageConstraint,
+    WeaponProficiencyConstraint, AttributeThresholdConstraint
+)
 
 logger = logging.getLogger(__name__)
 
@@ -33,11 +43,38 @@ class BuildSolution:
     upgrades: List[UpgradeComponent]
     score: float = 0.0
     violations: List[ConstraintViolation] = None
+    # Score des métriques de scoring (BuildScorer), départage les solutions de même score
+    metric_score: float = 0.0
     
     def __post_init__(self):
         if self.violations is None:
             self.violations = []
     
+    @property
+    def fingerprint(self) -> str:
+        """Empreinte canonique du build (indépendante de l'ordre de sélection)."""
+        return build_fingerprint(
+            self.profession,
+            self.specializations,
+            self.skills,
+            self.weapons,
+            self.armor,
+            self.trinkets,
+            self.upgrades
+        )
+    
+    def scoring_input(self) -> Dict[str, Any]:
+        """Arguments d'évaluation du build pour ``BuildScorer``."""
+        return {
+            'profession': self.profession,
+            'specializations': self.specializations,
+            'skills': self.skills,
+            'weapons': self.weapons,
+            'armor': self.armor,
+            'trinkets': self.trinkets,
+            'upgrades': self.upgrades,
+        }
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convertit la solution en dictionnaire pour la sérialisation."""
         return {
@@ -49,6 +86,7 @@ class BuildSolution:
             'trinkets': [t.to_dict() for t in self.trinkets],
             'upgrades': [u.to_dict() for u in self.upgrades],
             'score': self.score,
+            'metric_score': self.metric_score,
             'violations': [{
                 'severity': v.severity.name,
                 'message': v.message,
@@ -56,6 +94,17 @@ class BuildSolution:
             } for v in self.violations]
         }
 
+def _skill_category(skill) -> Optional[SkillCategory]:
+    """Catégorie d'une compétence, déduite de son emplacement ('Heal', 'Utility', 'Elite'...)."""
+    category = getattr(skill, 'category', None)
+    if category is not None:
+        return category
+    slot = getattr(skill, 'slot', None)
+    try:
+        return SkillCategory(slot) if slot else None
+    except ValueError:
+        return None
+
 class BuildGenerator:
     """Générateur de builds GW2 basé sur un solveur de contraintes."""
     
@@ -71,7 +120,9 @@ class BuildGenerator:
         preferred_skills: List[Skill] = None,
         preferred_specializations: List[Specialization] = None,
         max_solutions: int = 10,
-        max_iterations: int = 1000
+        max_iterations: int = 1000,
+        deadline: Optional[float] = None,
+        scorer: Optional[BuildScorer] = None
     ):
         self.db = db
         self.profession = profession
@@ -84,6 +135,13 @@ class BuildGenerator:
         self.preferred_specializations = preferred_specializations or []
         self.max_solutions = max_solutions
         self.max_iterations = max_iterations
+        # Échéance absolue (time.monotonic()) au-delà de laquelle la génération s'arrête
+        self.deadline = deadline
+        # Les résultats des métriques sont partagés par les générateurs du processus :
+        # un build déjà rencontré n'est pas réévalué
+        self.scorer = scorer or BuildScorer(
+            game_mode=game_mode, role=self.role, result_cache=get_default_metric_cache()
+        )
         
         # Initialiser le validateur avec les contraintes de base
         self.validator = self._create_validator()
@@ -165,6 +223,12 @@ class BuildGenerator:
             if len(solutions) >= self.max_solutions:
                 break
             
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                logger.debug(
+                    f"Budget de temps épuisé pour {self.profession.id} après {iteration} itérations"
+                )
+                break
+            
             # Générer un build aléatoire (pour l'instant, à améliorer avec un vrai solveur de contraintes)
             build = self._generate_random_build()
             
@@ -189,16 +253,56 @@ class BuildGenerator:
             if self._is_acceptable_build(build, violations):
                 solutions.append(build)
         
-        # Trier les solutions par score décroissant
-        solutions.sort(key=lambda x: x.score, reverse=True)
+        # Trier les solutions par score décroissant, puis par score des métriques
+        self._score_solutions(solutions)
+        solutions.sort(key=lambda x: (x.score, x.metric_score), reverse=True)
         
         return solutions[:self.max_solutions]
     
+    def _score_solutions(self, solutions: List[BuildSolution]) -> None:
+        """Évalue les solutions retenues avec les métriques de scoring, en un seul lot."""
+        if not solutions:
+            return
+        evaluations = self.scorer.evaluate_builds([solution.scoring_input() for solution in solutions])
+        for solution, evaluation in zip(solutions, evaluations):
+            solution.metric_score = evaluation.total_score
+    
     async def _load_required_data(self):
-        """Charge les données nécessaires depuis la base de données."""
-        # TODO: Implémenter le chargement des données depuis la base de données
-        # avec mise en cache pour éviter les requêtes redondantes
-        pass
+        """Charge les données nécessaires depuis l'instantané du catalogue.
+        
+        Les spécialisations et compétences de la profession sont lues en mémoire,
+        sans requête. Sans catalogue chargé, elles sont lues dans la base.
+        L'équipement (armes, armures, bijoux, améliorations) n'est pas chargé :
+        les builds générés ne portent que des spécialisations et des compétences.
+        """
+        profession_id = self.profession.id
+        catalog = get_catalog()
+        if catalog is None:
+            self._load_from_database(profession_id)
+            return
+        
+        if self._available_specializations is None:
+            self._available_specializations = list(catalog.specializations_for_profession(profession_id))
+        if self._available_skills is None:
+            self._available_skills = list(catalog.skills_for_profession(profession_id))
+    
+    def _load_from_database(self, profession_id: str) -> None:
+        """Charge les spécialisations et compétences de la profession depuis ``self.db``."""
+        if self._available_specializations is None:
+            self._available_specializations = (
+                self.db.query(Specialization)
+                .filter(Specialization.profession_id == profession_id)
+                .all()
+            )
+        if self._available_skills is None:
+            # Compétences rattachées par ``profession_id`` ou par la liste ``professions``
+            skills = self.db.query(Skill).filter(
+                or_(Skill.profession_id == profession_id, Skill.professions.isnot(None))
+            )
+            self._available_skills = [
+                skill for skill in skills
+                if skill.profession_id == profession_id or profession_id in (skill.professions or ())
+            ]
     
     def _generate_random_build(self) -> BuildSolution:
         """Génère un build aléatoire (version simplifiée)."""
@@ -217,9 +321,9 @@ class BuildGenerator:
         )
         
         # Sélectionner des compétences (1 soin, 3 utilitaires, 1 élite)
-        heal_skills = [s for s in (self._available_skills or []) if s.category == SkillCategory.HEAL]
-        utility_skills = [s for s in (self._available_skills or []) if s.category == SkillCategory.UTILITY]
-        elite_skills = [s for s in (self._available_skills or []) if s.category == SkillCategory.ELITE]
+        heal_skills = [s for s in (self._available_skills or []) if _skill_category(s) == SkillCategory.HEAL]
+        utility_skills = [s for s in (self._available_skills or []) if _skill_category(s) == SkillCategory.UTILITY]
+        elite_skills = [s for s in (self._available_skills or []) if _skill_category(s) == SkillCategory.ELITE]
         
         skills = []
         if heal_skills:
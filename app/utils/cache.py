@@ -1,13 +1,14 @@
 """Module de cache pour l'API GW2.
 
 Ce module fournit une interface pour mettre en cache les réponses de l'API GW2
-et gérer leur expiration.
+et gérer leur expiration. Les entrées sont stockées dans le cache multi-niveaux
+de l'application (voir ``app.api.tiered_cache``).
 """
 
 import os
 import json
 import time
-import hashlib
+import logging
 from pathlib import Path
 from typing import Any, Dict, Optional, TypeVar, Type, Generic, Union
 from datetime import datetime, timedelta
@@ -16,16 +17,23 @@ import aiohttp
 from sqlalchemy.orm import Session
 
 from ..config import settings
+from app.api.tiered_cache import CACHE_FILE_NAME, TieredCache, get_cache, make_key
 from app.models import Base
 
+logger = logging.getLogger(__name__)
+
+# Espace de noms de ce cache dans le cache multi-niveaux
+CACHE_NAMESPACE = "api_cache"
+
 # Type générique pour les modèles SQLAlchemy
 ModelType = TypeVar("ModelType", bound=Base)
 
 class GW2APICache:
     """Classe pour gérer le cache des appels à l'API GW2.
     
-    Cette classe permet de mettre en cache les réponses de l'API GW2 dans un dossier
-    local et/ou dans la base de données, avec une durée d'expiration configurable.
+    Cette classe permet de mettre en cache les réponses de l'API GW2 en mémoire
+    et dans un fichier local (et dans Redis s'il est configuré), avec une durée
+    d'expiration configurable.
     """
     
     def __init__(
@@ -40,8 +48,10 @@ class GW2APICache:
         Args:
             cache_dir: Dossier pour stocker le cache sur disque
             default_ttl: Durée de vie par défaut en secondes
-            use_disk_cache: Si True, utilise le cache disque
-            use_db_cache: Si True, utilise le cache en base de données
+            use_disk_cache: Si True, utilise les niveaux persistants (disque, Redis) ;
+                sinon le cache est uniquement en mémoire
+            use_db_cache: Obsolète, les niveaux persistants du cache multi-niveaux
+                remplacent le cache en base de données
         """
         self.cache_dir = Path(cache_dir)
         self.default_ttl = default_ttl
@@ -51,22 +61,18 @@ class GW2APICache:
         # Créer le dossier de cache s'il n'existe pas
         if use_disk_cache and not self.cache_dir.exists():
             self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        self.cache: TieredCache = get_cache(
+            CACHE_NAMESPACE,
+            ttl=default_ttl,
+            path=self.cache_dir / CACHE_FILE_NAME,
+            persistent=use_disk_cache
+        )
     
     def _get_cache_key(self, endpoint: str, params: Optional[Dict] = None) -> str:
         """Génère une clé de cache unique à partir d'un endpoint et de paramètres."""
-        key_parts = [endpoint]
-        if params:
-            # Trier les paramètres pour assurer une clé cohérente
-            for k, v in sorted(params.items()):
-                key_parts.append(f"{k}={v}")
-        
-        # Créer un hachage de la clé pour un nom de fichier sûr
-        key_str = "&".join(key_parts)
-        return hashlib.md5(key_str.encode('utf-8')).hexdigest()
-    
-    def _get_cache_path(self, key: str) -> Path:
-        """Retourne le chemin du fichier de cache pour une clé donnée."""
-        return self.cache_dir / f"{key}.json"
+        # L'ordre des paramètres n'influe pas sur la clé
+        return make_key(endpoint, params or {})
     
     async def get_from_api(
         self, 
@@ -125,62 +131,18 @@ class GW2APICache:
         Returns:
             Les données en cache ou None si expirées ou non trouvées
         """
-        # Essayer le cache disque
-        if self.use_disk_cache:
-            cache_path = self._get_cache_path(key)
-            
-            if cache_path.exists():
-                try:
-                    with open(cache_path, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                    
-                    # Vérifier l'expiration
-                    if 'expires_at' in cache_data and cache_data['expires_at'] < time.time():
-                        return None
-                    
-                    return cache_data.get('data')
-                except (json.JSONDecodeError, IOError):
-                    # En cas d'erreur, supprimer le fichier corrompu
-                    if cache_path.exists():
-                        cache_path.unlink()
-        
-        # TODO: Implémenter le cache en base de données
-        # if self.use_db_cache:
-        #     pass
-        
-        return None
+        return await self.cache.get(key)
     
     async def set_in_cache(self, key: str, data: Any, ttl: Optional[int] = None) -> None:
         """Stocke des données dans le cache.
         
         Args:
             key: Clé de cache
-            data: Données à mettre en cache (doivent être sérialisables en JSON)
+            data: Données à mettre en cache (doivent être sérialisables en JSON
+                pour les niveaux persistants)
             ttl: Durée de vie en secondes (optionnel, utilise la valeur par défaut si non spécifié)
         """
-        ttl = ttl or self.default_ttl
-        expires_at = time.time() + ttl
-        cache_data = {
-            'data': data,
-            'expires_at': expires_at,
-            'cached_at': time.time(),
-            'ttl': ttl
-        }
-        
-        # Mettre en cache sur disque
-        if self.use_disk_cache:
-            cache_path = self._get_cache_path(key)
-            
-            try:
-                with open(cache_path, 'w', encoding='utf-8') as f:
-                    json.dump(cache_data, f, ensure_ascii=False, indent=2)
-            except IOError as e:
-                # Log l'erreur mais ne pas échouer
-                print(f"Erreur lors de l'écriture dans le cache disque: {e}")
-        
-        # TODO: Implémenter le cache en base de données
-        # if self.use_db_cache:
-        #     pass
+        await self.cache.set(key, data, ttl or self.default_ttl)
     
     async def clear_expired(self) -> int:
         """Supprime les entrées de cache expirées.
@@ -188,26 +150,7 @@ class GW2APICache:
         Returns:
             Nombre d'entrées supprimées
         """
-        count = 0
-        
-        # Nettoyer le cache disque
-        if self.use_disk_cache and self.cache_dir.exists():
-            for cache_file in self.cache_dir.glob('*.json'):
-                try:
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                    
-                    if 'expires_at' in cache_data and cache_data['expires_at'] < time.time():
-                        cache_file.unlink()
-                        count += 1
-                except (json.JSONDecodeError, IOError):
-                    # Supprimer les fichiers corrompus
-                    cache_file.unlink()
-                    count += 1
-        
-        # TODO: Nettoyer le cache en base de données
-        
-        return count
+        return self.cache.purge_expired()
     
     async def clear_all(self) -> int:
         """Vide complètement le cache.
@@ -215,9 +158,9 @@ class GW2APICache:
         Returns:
             Nombre d'entrées supprimées
         """
-        count = 0
+        count = await self.cache.clear()
         
-        # Vider le cache disque
+        # Supprimer les fichiers JSON de l'ancien cache (un fichier par requête)
         if self.use_disk_cache and self.cache_dir.exists():
             for cache_file in self.cache_dir.glob('*.json'):
                 try:
@@ -226,6 +169,4 @@ class GW2APICache:
                 except OSError:
                     pass
         
-        # TODO: Vider le cache en base de données
-        
         return count
@@ -1,11 +1,12 @@
 """Utilitaires pour la gestion des sessions et transactions SQLAlchemy."""
 from functools import wraps
-from typing import Any, Callable, Optional, TypeVar, cast
+from typing import Annotated, Any, Callable, Optional, TypeVar, cast
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import Depends
 
-from ..database import SessionLocal
+from ..database import SessionLocal, get_async_db
 
 F = TypeVar('F', bound=Callable[..., Any])
 
@@ -98,3 +99,11 @@ def get_db() -> Session:
 
 # Alias pour la compatibilité avec le code existant
 db_session = get_db
+
+# Dépendances FastAPI : chaque endpoint choisit l'accès synchrone ou asynchrone
+#
+#     @router.get("/skills/{skill_id}")
+#     async def read_skill(skill_id: int, db: AsyncDB):
+#         return await repository.get_skill(db, skill_id)
+SyncDB = Annotated[Session, Depends(get_db)]
+AsyncDB = Annotated[AsyncSession, Depends(get_async_db)]
@@ -7,8 +7,16 @@ uses as the AWS Lambda entrypoint.
 It wraps the existing FastAPI app (defined in app.main) with Mangum so the ASGI
 application can run in the Lambda environment.
 """
+import os
+from pathlib import Path
+
 from mangum import Mangum
 
+# Catalog file written by the build command in netlify.toml
+# (`scripts/gw2_data_sync.py export-catalog`, see app.services.catalog_file):
+# cold starts mmap it instead of loading the catalog from the database.
+os.environ.setdefault("CATALOG_FILE", str(Path(__file__).parent / "catalog.bin"))
+
 # Import FastAPI app
 from app.main import app as fastapi_app
 
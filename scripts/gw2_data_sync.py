@@ -53,6 +53,8 @@ async def sync_all_data(force: bool = False) -> None:
         logger.info("=" * 50)
         
         for entity, result in results.items():
+            if entity == 'timings':
+                continue
             if isinstance(result, dict):
                 status = result.get('status', 'inconnu')
                 total = result.get('total', 0)
@@ -66,6 +68,15 @@ async def sync_all_data(force: bool = False) -> None:
                     error = result.get('error', 'Erreur inconnue')
                     logger.error(f"{entity.capitalize()}: Échec - {error}")
         
+        timings = results.get('timings')
+        if timings:
+            for entity, timing in timings['steps'].items():
+                logger.info(f"{entity.capitalize()}: {timing['seconds']:.1f}s")
+            logger.info(
+                f"Chemin critique: {' → '.join(timings['critical_path'])} "
+                f"({timings['critical_path_seconds']:.1f}s sur {timings['total_seconds']:.1f}s)"
+            )
+        
         logger.info("=" * 50)
         logger.info("Synchronisation terminée")
         
@@ -132,6 +143,25 @@ async def show_cache_info() -> None:
         if service:
             await service.close()
 
+def export_catalog_file(path: str) -> None:
+    """Exporte le catalogue de jeu dans un fichier binaire projetable en mémoire.
+    
+    Args:
+        path: Chemin du fichier à écrire
+    """
+    from app.database import SessionLocal
+    from app.services.catalog import CatalogSnapshot
+    from app.services.catalog_file import export_catalog
+    
+    try:
+        with SessionLocal() as session:
+            snapshot = CatalogSnapshot.load(session)
+        export_catalog(snapshot, path)
+        logger.info(f"Catalogue exporté vers {path}: {snapshot.stats()}")
+    except Exception as e:
+        logger.error(f"Erreur lors de l'export du catalogue: {e}", exc_info=True)
+        sys.exit(1)
+
 def parse_arguments() -> argparse.Namespace:
     """Parse les arguments de ligne de commande."""
     parser = argparse.ArgumentParser(
@@ -155,6 +185,17 @@ def parse_arguments() -> argparse.Namespace:
     # Commande: cache-info
     info_parser = subparsers.add_parser('cache-info', help='Afficher des informations sur le cache')
     
+    # Commande: export-catalog
+    export_parser = subparsers.add_parser(
+        'export-catalog', help='Exporter le catalogue de jeu dans un fichier binaire'
+    )
+    export_parser.add_argument(
+        'path',
+        nargs='?',
+        default='netlify/functions/catalog.bin',
+        help='Chemin du fichier à écrire'
+    )
+    
     # Arguments généraux
     parser.add_argument(
         '-v', '--verbose',
@@ -179,6 +220,8 @@ def main() -> None:
         asyncio.run(clear_cache())
     elif args.command == 'cache-info':
         asyncio.run(show_cache_info())
+    elif args.command == 'export-catalog':
+        export_catalog_file(args.path)
     else:
         print("Commande non reconnue. Utilisez --help pour voir les commandes disponibles.")
         sys.exit(1)
@@ -0,0 +1,184 @@
+"""Tests pour les requêtes conditionnelles, le regroupement des requêtes et la pagination du GW2APIClient."""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.api.client import GW2APIClient, NotFoundError
+from app.api.config import settings
+from app.api.tiered_cache import make_key
+from app.services.gw2_data_service import GW2DataService
+
+ETAG = '"build-170000"'
+MINIS = list(range(1, 8))
+LAST_MODIFIED = "Sat, 17 Oct 2026 12:00:00 GMT"
+
+
+@pytest.fixture
+async def server():
+    """Serveur local imitant /v2/build avec validateurs HTTP."""
+    requests = []
+
+    async def build(request):
+        requests.append(dict(request.headers))
+        if request.headers.get('If-None-Match') == ETAG:
+            return web.Response(status=304)
+        return web.json_response({'id': 170000}, headers={'ETag': ETAG, 'Last-Modified': LAST_MODIFIED})
+
+    async def slow(request):
+        requests.append(dict(request.headers))
+        await asyncio.sleep(0.05)
+        if request.query.get('ids') == "0":
+            return web.json_response({'text': "no such id"}, status=404)
+        return web.json_response([{'id': int(request.query['ids'])}])
+
+    async def minis(request):
+        """Endpoint paginé : les premières pages répondent le plus lentement."""
+        requests.append(dict(request.query))
+        page, page_size = int(request.query['page']), int(request.query['page_size'])
+        page_total = -(-len(MINIS) // page_size)
+        if page >= page_total:
+            return web.json_response({'text': "page out of range"}, status=400)
+        await asyncio.sleep(0.02 * (page_total - page))
+        return web.json_response(
+            [{'id': mini_id} for mini_id in MINIS[page * page_size:(page + 1) * page_size]],
+            headers={'X-Page-Total': str(page_total), 'X-Result-Total': str(len(MINIS))}
+        )
+
+    app = web.Application()
+    app.router.add_get('/v2/build', build)
+    app.router.add_get('/v2/skills', slow)
+    app.router.add_get('/v2/minis', minis)
+    test_server = TestServer(app)
+    await test_server.start_server()
+    test_server.requests = requests
+    yield test_server
+    await test_server.close()
+
+
+@pytest.fixture
+async def client(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'api_base_url', str(server.make_url('')).rstrip('/'))
+    monkeypatch.setattr(settings, 'cache_dir', str(tmp_path))
+    monkeypatch.setattr(settings, 'cache_enabled', True)
+    monkeypatch.setattr(settings, 'rate_limit_enabled', False)
+    api = GW2APIClient()
+    yield api
+    await api.close()
+
+
+async def _expire(client, endpoint):
+    """Fait expirer une entrée du cache en conservant ses données et ses validateurs."""
+    await client._response_cache().touch(make_key(f"GET:{endpoint}", "", ""), ttl=-10)
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_is_served_from_cache(client, server):
+    assert await client.get_build() == {'id': 170000}
+    assert await client.get_build() == {'id': 170000}
+
+    assert len(server.requests) == 1
+    assert client.get_request_stats() == {"cache_hits": 1, "responses_200": 1, "responses_304": 0, "coalesced": 0}
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_revalidated(client, server):
+    """Une entrée expirée est revalidée ; un 304 prolonge sa durée de vie."""
+    await client.get_build()
+    await _expire(client, "/v2/build")
+
+    assert await client.get_build() == {'id': 170000}
+    assert server.requests[-1]['If-None-Match'] == ETAG
+    assert server.requests[-1]['If-Modified-Since'] == LAST_MODIFIED
+
+    # Le 304 a rafraîchi l'entrée : plus de requête jusqu'à sa prochaine expiration
+    assert await client.get_build() == {'id': 170000}
+    assert len(server.requests) == 2
+    assert client.get_request_stats() == {"cache_hits": 1, "responses_200": 1, "responses_304": 1, "coalesced": 0}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_call(client, server):
+    """Les GET identiques simultanés n'envoient qu'une requête."""
+    results = await asyncio.gather(*(client.get('/v2/skills', params={'ids': "5"}) for _ in range(5)))
+
+    assert results == [[{'id': 5}]] * 5
+    assert len(server.requests) == 1
+    assert client.get_request_stats()["coalesced"] == 4
+    assert not client._in_flight
+
+
+@pytest.mark.asyncio
+async def test_coalesced_callers_share_errors(client, server):
+    results = await asyncio.gather(
+        *(client.get('/v2/skills', params={'ids': "0"}) for _ in range(3)),
+        return_exceptions=True
+    )
+
+    assert all(isinstance(result, NotFoundError) for result in results)
+    assert len(server.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_caller_keeps_shared_request(client, server):
+    """Annuler un appelant n'interrompt pas la requête des autres appelants."""
+    first = asyncio.create_task(client.get('/v2/skills', params={'ids': "7"}))
+    second = asyncio.create_task(client.get('/v2/skills', params={'ids': "7"}))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == [{'id': 7}]
+    assert first.cancelled()
+    assert len(server.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_caller_after_cancelled_request_starts_a_new_one(client, server):
+    """Un appelant arrivé pendant l'annulation de la requête partagée ne la rejoint pas."""
+    first = asyncio.create_task(client.get('/v2/skills', params={'ids': "8"}))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    await asyncio.sleep(0)
+    # La requête annulée n'est plus proposée, même avant la fin de son annulation
+    assert not client._in_flight
+    second = asyncio.create_task(client.get('/v2/skills', params={'ids': "8"}))
+
+    assert await second == [{'id': 8}]
+    assert first.cancelled()
+    assert client.get_request_stats()["coalesced"] == 0
+    assert not client._in_flight
+
+
+@pytest.mark.asyncio
+async def test_responses_are_stored_in_a_single_file(client, server, tmp_path):
+    await client.get_build()
+    await client.get('/v2/skills', params={'ids': "5"})
+
+    assert [path.name for path in tmp_path.glob("*.json")] == []
+    info = await client.get_cache_info()
+    assert info["count"] == 2
+    assert info["cache_file"].endswith("cache.sqlite")
+    assert await client.clear_cache("GET:/v2/skills") == 1
+    assert (await client.get_cache_info())["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_page_returns_page_total(client, server):
+    assert await client.get_page('/v2/minis', 1, page_size=3) == ([{'id': 4}, {'id': 5}, {'id': 6}], 3)
+    # Le nombre de pages est conservé avec l'entrée du cache
+    assert await client.get_page('/v2/minis', 1, page_size=3) == ([{'id': 4}, {'id': 5}, {'id': 6}], 3)
+    assert len(server.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_paginated_call_fetches_pages_concurrently(client, server, db):
+    service = GW2DataService(db_session=db, api_client=client)
+
+    items = [item async for item in service._paginated_api_call('minis', page_size=2)]
+
+    assert sorted(item['id'] for item in items) == MINIS
+    assert sorted(request['page'] for request in server.requests) == ["0", "1", "2", "3"]
+    # Les pages 1 à 3 sont récupérées en parallèle : la plus lente arrive en dernier
+    assert items[-2:] == [{'id': 3}, {'id': 4}]
@@ -0,0 +1,72 @@
+"""Tests pour le moteur asynchrone, le rapport des pools et les requêtes asynchrones."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from app.database import get_async_database_url, get_pool_status, get_pools_status
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("sqlite:///./gw2.db", "sqlite+aiosqlite:///./gw2.db"),
+    ("postgresql://user:pw@host/db", "postgresql+asyncpg://user:pw@host/db"),
+    ("postgres://user:pw@host/db", "postgresql+asyncpg://user:pw@host/db"),
+    ("postgresql+asyncpg://user:pw@host/db", "postgresql+asyncpg://user:pw@host/db"),
+])
+def test_async_database_url(url, expected):
+    """L'URL synchrone est convertie vers le pilote asynchrone correspondant."""
+    assert get_async_database_url(url) == expected
+
+
+def test_pool_status_reports_utilization():
+    """L'utilisation d'un pool borné reflète les connexions empruntées."""
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=2, max_overflow=2)
+    try:
+        with engine.connect():
+            status = get_pool_status(engine.pool)
+            assert status["pool"] == "QueuePool"
+            assert status["checked_out"] == 1
+            assert status["utilization"] == pytest.approx(0.25)
+
+        assert get_pool_status(engine.pool)["checked_out"] == 0
+    finally:
+        engine.dispose()
+
+
+def test_pools_status_without_async_engine():
+    """Le rapport couvre le moteur synchrone même sans moteur asynchrone."""
+    status = get_pools_status()
+
+    assert "pool" in status["sync"]
+    assert "async" in status
+
+
+async def test_async_repository(tmp_path):
+    """Les requêtes asynchrones lisent les données sans bloquer la boucle."""
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.models import Base, Profession, Skill, Specialization
+    from app.models.skill import SkillType
+    from app.services import repository
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            session.add_all([
+                Profession(id="Guardian", name="Guardian"),
+                Specialization(id=27, name="Dragonhunter", profession_id="Guardian"),
+                Skill(id=9153, name="Shelter", type=SkillType.HEAL, profession_id="Guardian"),
+                Skill(id=14402, name="Might", type=SkillType.UTILITY, professions=["Guardian"]),
+            ])
+            await session.commit()
+
+            assert (await repository.get_profession(session, "Guardian")).name == "Guardian"
+            assert [s.id for s in await repository.get_skills(session, [14402, 9153, 1])] == [14402, 9153]
+            assert {s.id for s in await repository.skills_for_profession(session, "Guardian")} == {9153, 14402}
+            assert [s.id for s in await repository.specializations_for_profession(session, "Guardian")] == [27]
+    finally:
+        await engine.dispose()
@@ -0,0 +1,128 @@
+"""Tests pour l'écriture par lots des données synchronisées."""
+
+from app.models import ItemStats, Skill, Trait
+from app.models.trait import trait_skills
+from app.services.bulk_writer import BulkUpsertWriter
+from app.services.mapping.gw2_api_mapper import GW2APIMapper
+
+
+def _itemstat(stat_id, name, power=0):
+    return {'id': stat_id, 'name': name, 'attributes': [{'attribute': 'Power', 'value': power}]}
+
+
+def test_upsert_inserts_then_updates_in_one_statement(db):
+    """Un lot est écrit avec une seule instruction, insertion comme mise à jour."""
+    mapper = GW2APIMapper(db)
+    writer = BulkUpsertWriter(db, commit=False)
+
+    rows = [mapper.itemstat_row(_itemstat(9001 + i, f"Stat {i}", power=i)) for i in range(3)]
+    result = writer.upsert(ItemStats, rows)
+    assert result.written == 3
+    assert result.statements == 1
+    assert not result.failed
+
+    result = writer.upsert(ItemStats, [mapper.itemstat_row(_itemstat(9001, "Renamed", power=42))])
+    assert result.written == 1
+    stat = db.get(ItemStats, 9001, populate_existing=True)
+    assert stat.name == "Renamed"
+    assert stat.power == 42
+    assert db.query(ItemStats).filter(ItemStats.id.between(9001, 9003)).count() == 3
+
+
+def test_failed_rows_are_isolated(db):
+    """Une ligne invalide est rejetée sans empêcher l'écriture des autres."""
+    writer = BulkUpsertWriter(db, commit=False)
+    rows = [
+        {'id': 9101, 'name': "Valid"},
+        {'id': 9102, 'name': None},
+        {'id': 9103, 'name': "Also valid"},
+    ]
+
+    result = writer.upsert(ItemStats, rows)
+
+    assert result.written == 2
+    assert list(result.failed) == [9102]
+    assert db.get(ItemStats, 9101) is not None
+    assert db.get(ItemStats, 9102) is None
+    assert writer.stats()['item_stats']['fallbacks'] == 1
+
+
+def test_skill_rows_and_stats(db):
+    """Les lignes du mappeur sont écrites et le débit est rapporté par table."""
+    mapper = GW2APIMapper(db)
+    writer = BulkUpsertWriter(db, commit=False)
+    rows = [
+        mapper.skill_row({'id': 9201, 'name': "Heal", 'type': "Heal", 'professions': ["Guardian"]}),
+        mapper.skill_row({'id': 9202, 'name': "Strike", 'type': "Weapon", 'weapon_type': "Sword"}),
+    ]
+
+    writer.upsert(Skill, rows)
+
+    skill = db.get(Skill, 9202)
+    assert skill.name == "Strike"
+    stats = writer.stats()['skills']
+    assert stats['rows'] == 2
+    assert stats['chunks'] == 1
+    assert writer.rows_per_second() > 0
+
+
+def test_failed_chunk_keeps_previous_uncommitted_chunks(db):
+    """Sans validation par lot, l'échec d'un lot n'annule pas les lots précédents."""
+    writer = BulkUpsertWriter(db, commit=False)
+    writer.upsert(ItemStats, [{'id': 9301, 'name': "First chunk"}])
+
+    result = writer.upsert(ItemStats, [{'id': 9302, 'name': "Valid"}, {'id': 9303, 'name': None}])
+
+    assert list(result.failed) == [9303]
+    assert db.get(ItemStats, 9301, populate_existing=True).name == "First chunk"
+    assert db.get(ItemStats, 9302) is not None
+
+
+def test_missing_columns_are_not_overwritten(db):
+    """Une ligne ne met à jour que ses colonnes, même mélangée à des lignes complètes."""
+    writer = BulkUpsertWriter(db, commit=False)
+    writer.upsert(ItemStats, [
+        {'id': 9401, 'name': "Berserker", 'power': 10, 'ferocity': 5},
+        {'id': 9402, 'name': "Assassin", 'power': 7},
+    ])
+
+    result = writer.upsert(ItemStats, [
+        {'id': 9401, 'name': "Renamed"},
+        {'id': 9402, 'name': "Assassin", 'power': 8, 'ferocity': 3},
+        {'id': 9403, 'name': "New"},
+    ])
+
+    assert result.written == 3
+    assert result.statements == 2
+    berserker = db.get(ItemStats, 9401, populate_existing=True)
+    assert (berserker.name, berserker.power, berserker.ferocity) == ("Renamed", 10, 5)
+    assert db.get(ItemStats, 9402, populate_existing=True).ferocity == 3
+    # Les colonnes absentes d'une nouvelle ligne prennent leur valeur par défaut
+    new = db.get(ItemStats, 9403)
+    assert new.critical_damage == 150.0
+    assert new.created is not None
+
+
+def test_trait_rows_link_skills(db):
+    """Les compétences d'un trait sont écrites dans la table d'association, puis remplacées."""
+    from app.services.gw2_data_service import GW2DataService
+
+    mapper = GW2APIMapper(db)
+    writer = BulkUpsertWriter(db, commit=False)
+    writer.upsert(Skill, [
+        mapper.skill_row({'id': skill_id, 'name': f"Skill {skill_id}", 'type': "Utility"})
+        for skill_id in (9501, 9502)
+    ])
+    trait = {'id': 9601, 'name': "Linked", 'slot': "Major", 'tier': 1}
+
+    def links():
+        return sorted(db.execute(trait_skills.select().where(trait_skills.c.trait_id == 9601)).all())
+
+    row = mapper.trait_row({**trait, 'skills': [{'id': 9501, 'name': "Skill 9501"}, {'id': 9502}]})
+    assert row['skills'] == [9501, 9502]
+    assert GW2DataService._upsert_traits(writer, [row]) == (1, 0)
+    assert links() == [(9601, 9501), (9601, 9502)]
+
+    GW2DataService._upsert_traits(writer, [mapper.trait_row({**trait, 'skills': [{'id': 9502}]})])
+    assert links() == [(9601, 9502)]
+    assert [skill.id for skill in db.get(Trait, 9601, populate_existing=True).skills] == [9502]
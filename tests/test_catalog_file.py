@@ -0,0 +1,148 @@
+"""Tests pour le fichier binaire du catalogue projeté en mémoire."""
+
+import numpy as np
+import pytest
+
+from app.game_mechanics import BoonType
+from app.models import Profession, Skill, Specialization, Trait
+from app.models.profession_weapon import ProfessionWeaponType
+from app.models.skill import SkillType
+from app.models.trait import TraitSlot, TraitTier, TraitType
+from app.services.catalog import CatalogSnapshot, get_catalog, set_catalog
+from app.services.catalog_file import (
+    CatalogFile, CatalogFileError, CatalogTable, export_catalog, install_catalog, load_catalog_file
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_catalog():
+    set_catalog(None)
+    yield
+    set_catalog(None)
+
+
+@pytest.fixture
+def snapshot(db):
+    db.add_all([
+        Profession(id="Guardian", name="Guardian"),
+        Profession(id="Warrior", name="Warrior"),
+        Specialization(id=27, name="Dragonhunter", profession_id="Guardian", elite=True),
+        Trait(
+            id=1848, name="Zealot's Aggression", specialization_id=27,
+            type=TraitType.ELITE, tier=TraitTier.MAJOR, slot=TraitSlot.MASTER,
+        ),
+        ProfessionWeaponType(profession_id="Guardian", weapon_type="Sword", hand="MainHand"),
+        Skill(
+            id=9153, name="Shelter", type=SkillType.HEAL, profession_id="Guardian",
+            facts=[{"type": "Buff", "status": "Aegis", "duration": 3}, {"type": "Recharge", "value": 30}],
+        ),
+        Skill(id=14402, name="Might", type=SkillType.UTILITY, professions=["Warrior"], recharge=None),
+    ])
+    db.flush()
+    return CatalogSnapshot.load(db)
+
+
+@pytest.fixture
+def catalog_path(snapshot, tmp_path):
+    return export_catalog(snapshot, tmp_path / "catalog.bin")
+
+
+def test_round_trip(snapshot, catalog_path):
+    """Les enregistrements relus depuis le fichier sont identiques à l'instantané exporté."""
+    loaded = load_catalog_file(catalog_path)
+
+    assert loaded.source == str(catalog_path)
+    for name in ("professions", "specializations", "skills", "traits"):
+        original = getattr(snapshot, name)
+        assert sorted(getattr(loaded, name)) == sorted(original)
+        for record_id, record in original.items():
+            assert getattr(loaded, name)[record_id] == record
+    assert loaded.skills[9153].type is SkillType.HEAL
+    assert loaded.skills[14402].recharge is None
+    assert 12345 not in loaded.skills
+
+
+def test_groups_and_fact_store(snapshot, catalog_path):
+    """Les regroupements et le store des faits sont relus depuis le fichier."""
+    loaded = load_catalog_file(catalog_path)
+
+    assert [s.id for s in loaded.skills_for_profession("Warrior")] == [14402]
+    assert [s.name for s in loaded.specializations_for_profession("Guardian")] == ["Dragonhunter"]
+    assert [t.id for t in loaded.traits_for_specialization(27)] == [1848]
+    assert [w.weapon_type for w in loaded.weapon_types_for_profession("Guardian")] == ["Sword"]
+    assert loaded.fact_store.get_value(9153, "Recharge") == 30
+    assert loaded.fact_store.get_coefficients(9153) == snapshot.fact_store.get_coefficients(9153)
+    assert 9153 in loaded.effect_index.sources_with_boon(BoonType.AEGIS)
+
+
+def test_arrays_are_zero_copy_views(catalog_path):
+    """Les colonnes sont des vues en lecture seule sur le fichier projeté."""
+    catalog_file = CatalogFile(catalog_path)
+    ids = catalog_file.table("skills").column("id")
+
+    assert not ids.flags.writeable
+    assert not catalog_file.fact_store().value.flags.writeable
+    assert np.array_equal(ids, [9153, 14402])
+
+
+def test_invalid_files_are_rejected(tmp_path, catalog_path):
+    """Un fichier tronqué ou d'une autre version de format est refusé."""
+    data = catalog_path.read_bytes()
+
+    bad_magic = tmp_path / "magic.bin"
+    bad_magic.write_bytes(b"NOTACATL" + data[8:])
+    with pytest.raises(CatalogFileError):
+        CatalogFile(bad_magic)
+
+    truncated = tmp_path / "truncated.bin"
+    truncated.write_bytes(data[:len(data) // 2])
+    with pytest.raises(CatalogFileError):
+        CatalogFile(truncated)
+
+
+def test_install_catalog_prefers_file(catalog_path, monkeypatch):
+    """Au démarrage, le fichier est projeté sans accès à la base."""
+    def fail():
+        raise AssertionError("la base ne doit pas être lue")
+
+    monkeypatch.setattr("app.services.catalog_file.refresh_catalog", fail)
+
+    installed = install_catalog(catalog_path)
+
+    assert get_catalog() is installed
+    assert installed.source == str(catalog_path)
+
+
+def test_records_are_decoded_once(catalog_path, monkeypatch):
+    """Une ligne lue plusieurs fois (par ID ou par regroupement) n'est décodée qu'une fois."""
+    loaded = load_catalog_file(catalog_path)
+    decoded = []
+    decode = CatalogTable._decode
+    monkeypatch.setattr(CatalogTable, "_decode", lambda self, row: decoded.append(row) or decode(self, row))
+
+    skill = loaded.skills[14402]
+    assert loaded.skills[14402] is skill
+    assert loaded.skills_for_profession("Warrior")[0] is skill
+    assert decoded == [1]
+
+
+def test_rewritten_file_is_reopened(snapshot, catalog_path, db, monkeypatch):
+    """Un worker rouvre le fichier lorsqu'une synchronisation l'a réécrit."""
+    monkeypatch.setattr(CatalogFile, "check_interval", 0)
+    installed = install_catalog(catalog_path)
+    assert get_catalog() is installed
+
+    db.add(Profession(id="Necromancer", name="Necromancer"))
+    db.flush()
+    export_catalog(CatalogSnapshot.load(db), catalog_path)
+
+    reopened = get_catalog()
+    assert reopened is not installed
+    assert "Necromancer" in reopened.professions
+    assert "Necromancer" not in installed.professions
+    assert get_catalog() is reopened
+
+    # Instantané chargé depuis la base : jamais rechargé
+    set_catalog(snapshot)
+    assert not snapshot.is_stale()
+    assert get_catalog() is snapshot
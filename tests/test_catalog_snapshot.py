@@ -0,0 +1,133 @@
+"""Tests pour l'instantané immuable du catalogue de jeu."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.catalog import router
+from app.game_mechanics import BoonType
+from app.models import Profession, Skill, Specialization
+from app.models.skill import SkillType
+from app.models.skill_facts import get_skill_fact_store
+from app.optimizer.simple import optimize
+from app.scoring.schema import ScoringConfig
+from app.services.catalog import CatalogSnapshot, get_catalog, set_catalog
+from app.solver.solver import BuildGenerator
+
+
+@pytest.fixture(autouse=True)
+def reset_catalog():
+    set_catalog(None)
+    yield
+    set_catalog(None)
+
+
+@pytest.fixture
+def snapshot(db):
+    db.add_all([
+        Profession(id="Guardian", name="Guardian"),
+        Profession(id="Warrior", name="Warrior"),
+        Specialization(id=27, name="Dragonhunter", profession_id="Guardian", elite=True),
+        Skill(
+            id=9153, name="Shelter", type=SkillType.HEAL, profession_id="Guardian",
+            facts=[{"type": "Buff", "status": "Aegis", "duration": 3}, {"type": "Recharge", "value": 30}],
+        ),
+        Skill(id=14402, name="Might", type=SkillType.UTILITY, professions=["Warrior"]),
+    ])
+    db.flush()
+    return CatalogSnapshot.load(db)
+
+
+def test_snapshot_indexes(snapshot):
+    """Les index par profession et spécialisation sont construits au chargement."""
+    assert snapshot.professions["Guardian"].name == "Guardian"
+    assert [s.id for s in snapshot.specializations_for_profession("Guardian")] == [27]
+    assert [s.id for s in snapshot.skills_for_profession("Guardian")] == [9153]
+    assert [s.id for s in snapshot.skills_for_profession("Warrior")] == [14402]
+    assert snapshot.fact_store.get_value(9153, "Recharge") == 30
+    assert 9153 in snapshot.effect_index.sources_with_boon(BoonType.AEGIS)
+    assert snapshot.stats()["skills"] == 2
+
+
+def test_snapshot_is_immutable(snapshot):
+    """Ni l'instantané ni ses enregistrements ne peuvent être modifiés."""
+    skill = snapshot.skills[9153]
+
+    with pytest.raises(AttributeError):
+        snapshot.skills = {}
+    with pytest.raises(AttributeError):
+        skill.name = "Autre"
+    with pytest.raises(TypeError):
+        snapshot.skills[1] = skill
+    with pytest.raises(TypeError):
+        skill.facts[0]["duration"] = 10
+
+    assert isinstance(skill.facts, tuple)
+    assert skill.to_dict()["facts"][0] == {"type": "Buff", "status": "Aegis", "duration": 3}
+
+
+def test_set_catalog_swaps_fact_store(snapshot):
+    """L'installation d'un instantané remplace le store des faits global."""
+    set_catalog(snapshot)
+
+    assert get_catalog() is snapshot
+    assert get_skill_fact_store() is snapshot.fact_store
+
+    newer = CatalogSnapshot()
+    set_catalog(newer)
+
+    assert newer.version > snapshot.version
+    assert get_skill_fact_store() is newer.fact_store
+
+
+def test_catalog_api(snapshot):
+    """Les endpoints servent l'instantané courant et répondent 503 sans catalogue."""
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    assert client.get("/catalog/professions").status_code == 503
+
+    set_catalog(snapshot)
+    profession = client.get("/catalog/professions/Guardian").json()
+    assert [s["name"] for s in profession["specializations"]] == ["Dragonhunter"]
+    assert client.get("/catalog/skills/9153").json()["facts"][1]["value"] == 30
+    assert client.get("/catalog/traits/1").status_code == 404
+    assert client.get("/catalog/").json()["counts"]["professions"] == 2
+
+
+def test_optimize_reads_catalog(snapshot):
+    """L'optimiseur construit ses candidats depuis le catalogue chargé."""
+    set_catalog(snapshot)
+
+    teams = optimize(team_size=2, samples=10, top_n=1, config=ScoringConfig(), random_seed=1)
+
+    assert sorted(p.profession_id for p in teams[0][1]) == ["Guardian", "Warrior"]
+
+
+@pytest.mark.asyncio
+async def test_build_generator_reads_snapshot(db, snapshot):
+    """Le générateur de builds lit les spécialisations et compétences dans l'instantané."""
+    set_catalog(snapshot)
+    generator = BuildGenerator(db=db, profession=snapshot.professions["Guardian"], max_iterations=5)
+
+    solutions = await generator.generate_builds()
+
+    assert [s.id for s in generator._available_specializations] == [27]
+    assert [s.id for s in generator._available_skills] == [9153]
+    assert all(solution.profession.id == "Guardian" for solution in solutions)
+
+
+@pytest.mark.asyncio
+async def test_build_generator_reads_database_without_snapshot(db, snapshot):
+    """Sans catalogue installé (processus de travail), le générateur lit la base."""
+    guardian = db.get(Profession, "Guardian")
+    generator = BuildGenerator(db=db, profession=guardian, max_iterations=5)
+
+    await generator.generate_builds()
+
+    assert [s.id for s in generator._available_specializations] == [27]
+    assert [s.id for s in generator._available_skills] == [9153]
+    warrior = BuildGenerator(db=db, profession=db.get(Profession, "Warrior"), max_iterations=5)
+    await warrior._load_required_data()
+    assert [s.id for s in warrior._available_skills] == [14402]
@@ -0,0 +1,119 @@
+"""Tests pour l'index précalculé des effets de compétences et de traits."""
+
+from types import SimpleNamespace
+
+from app.game_mechanics import (
+    BoonType, ComboFieldType, ComboFinisherType, ConditionType, EffectIndex, GameMode,
+    InteractionAnalyzer, effects_from_facts
+)
+
+
+def make_skill(skill_id, facts=(), traited_facts=None, combo_field=None, combo_finisher=None):
+    return SimpleNamespace(
+        id=skill_id, facts=list(facts), traited_facts=traited_facts,
+        combo_field=combo_field, combo_finisher=combo_finisher,
+    )
+
+
+STABILITY_SKILL = make_skill(1, facts=[
+    {"type": "Recharge", "value": 30},
+    {"type": "Buff", "status": "Stability", "apply_count": 3, "duration": 5},
+    {"type": "ComboField", "field_type": "Light"},
+])
+BLAST_SKILL = make_skill(2, facts=[
+    {"type": "Damage", "dmg_multiplier": 1.2, "hit_count": 2},
+    {"type": "Buff", "status": "Burning", "apply_count": 1, "duration": 3},
+], traited_facts=[
+    {"type": "Buff", "status": "Might", "apply_count": 5, "duration": 10, "requires_trait": 77},
+], combo_finisher="Blast")
+TRAIT = SimpleNamespace(id=77, facts=[
+    {"type": "Buff", "status": "Fury", "duration": 4},
+    {"type": "AttributeAdjust", "target": "Power", "value": 120},
+], traited_facts=None)
+
+
+def test_facts_are_parsed_into_typed_effects():
+    """Les faits de l'API deviennent des effets typés ; les faits descriptifs sont ignorés."""
+    effects = effects_from_facts("skill", 1, STABILITY_SKILL.facts)
+
+    assert [e.effect_type for e in effects] == ["apply_boon", "combo_field"]
+    assert effects[0].effect_value == BoonType.STABILITY
+    assert (effects[0].stacks, effects[0].duration) == (3, 5)
+    assert effects[1].combo_field == ComboFieldType.LIGHT
+
+
+def test_inverted_indexes():
+    """Les index inversés répondent aux requêtes par buff, condition et combo."""
+    index = EffectIndex.build([STABILITY_SKILL, BLAST_SKILL], [TRAIT])
+
+    assert index.sources_with_boon(BoonType.STABILITY) == {1}
+    assert index.sources_with_boon(BoonType.MIGHT) == {2}
+    assert index.sources_with_boon(BoonType.FURY) == set()
+    assert index.sources_with_boon(BoonType.FURY, source_type="trait") == {77}
+    assert index.sources_with_condition(ConditionType.BURNING) == {2}
+    assert index.sources_with_combo_field(ComboFieldType.LIGHT) == {1}
+    assert index.sources_with_combo_finisher(ComboFinisherType.BLAST) == {2}
+    assert index.sources_with_effect_type("attribute_adjust", source_type=None) == {77}
+
+
+def test_reindexing_a_source_replaces_its_effects():
+    """Réindexer une compétence remplace ses anciens effets dans tous les index."""
+    index = EffectIndex.build([STABILITY_SKILL])
+    index.add_skill(make_skill(1, facts=[{"type": "Buff", "status": "Aegis", "duration": 3}]))
+
+    assert index.sources_with_boon(BoonType.STABILITY) == set()
+    assert index.sources_with_combo_field(ComboFieldType.LIGHT) == set()
+    assert index.sources_with_boon(BoonType.AEGIS) == {1}
+    assert len(index) == 1
+
+
+def test_analyzer_uses_index_for_trait_effects():
+    """L'analyseur sépare les effets de base des faits conditionnés par un trait."""
+    index = EffectIndex.build([BLAST_SKILL], [TRAIT])
+    analyzer = InteractionAnalyzer(effect_index=index)
+
+    base = analyzer._extract_skill_effects(BLAST_SKILL)
+    traited = analyzer._get_trait_effects_on_skill(TRAIT, BLAST_SKILL)
+
+    assert {e.effect_type for e in base} == {"damage", "apply_condition", "combo_finisher"}
+    assert [e.effect_value for e in traited] == [BoonType.MIGHT]
+    assert len(analyzer.get_effects_for_trait(77)) == 2
+
+
+def test_pvp_modifiers_do_not_mutate_indexed_effects():
+    """Les ajustements PvP travaillent sur des copies des effets indexés."""
+    skill = make_skill(3, facts=[{"type": "Buff", "status": "Fear", "duration": 2}])
+    index = EffectIndex.build([skill])
+    analyzer = InteractionAnalyzer(GameMode.PVP, effect_index=index)
+
+    modified = analyzer._apply_game_mode_modifiers(index.effects_for("skill", 3))
+
+    assert modified[0].duration == 1.0
+    assert index.effects_for("skill", 3)[0].duration == 2
+
+
+def test_pvp_modifiers_shorten_daze_and_dizzy():
+    """Hébétement et vertige sont deux contrôles distincts, tous deux réduits en PvP."""
+    skill = make_skill(4, facts=[
+        {"type": "Buff", "status": "Daze", "duration": 2},
+        {"type": "Buff", "status": "Dizzy", "duration": 4},
+    ])
+    index = EffectIndex.build([skill])
+    analyzer = InteractionAnalyzer(GameMode.PVP, effect_index=index)
+
+    modified = analyzer._apply_game_mode_modifiers(index.effects_for("skill", 4))
+
+    assert [e.effect_value for e in modified] == [ConditionType.DAZE, ConditionType.DIZZY]
+    assert [e.duration for e in modified] == [1.0, 2.0]
+
+
+def test_analyzer_defaults_to_catalog_effect_index(monkeypatch):
+    """Sans index fourni, l'analyseur utilise celui de l'instantané du catalogue."""
+    from app.services import catalog
+
+    snapshot = catalog.CatalogSnapshot()
+    monkeypatch.setattr(catalog, "_catalog", snapshot)
+    assert InteractionAnalyzer().effect_index is snapshot.effect_index
+
+    monkeypatch.setattr(catalog, "_catalog", None)
+    assert len(InteractionAnalyzer().effect_index) == 0
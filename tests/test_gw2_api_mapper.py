@@ -0,0 +1,97 @@
+"""Tests pour la carte d'identité et le préchargement du GW2APIMapper."""
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.models import ItemStats, Skill
+from app.models.skill import SkillType
+from app.services.mapping.gw2_api_mapper import GW2APIMapper
+
+
+@contextmanager
+def count_selects(db):
+    """Compte les SELECT exécutés sur la connexion de la session."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    connection = db.connection()
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+
+def _skill(skill_id, name):
+    return {'id': skill_id, 'name': name, 'type': "Utility"}
+
+
+def test_prefetch_removes_per_item_selects(db):
+    """Après le préchargement d'un lot, le mappage ne fait plus de SELECT."""
+    db.add_all([Skill(id=701, name="Old A", type=SkillType.UTILITY), Skill(id=702, name="Old B", type=SkillType.UTILITY)])
+    db.flush()
+    db.expunge_all()
+    mapper = GW2APIMapper(db)
+
+    with count_selects(db) as selects:
+        assert mapper.prefetch(Skill, [701, 702, 703]) == 2
+        skills = [mapper.map_skill(_skill(skill_id, f"Skill {skill_id}")) for skill_id in (701, 702, 703)]
+
+    assert len(selects) == 1
+    assert [skill.name for skill in skills] == ["Skill 701", "Skill 702", "Skill 703"]
+    assert mapper.get_existing(Skill, 703) is skills[2]
+
+    # Un nouveau préchargement des mêmes IDs ne refait pas de requête
+    with count_selects(db) as selects:
+        assert mapper.prefetch(Skill, [701, 703]) == 0
+    assert not selects
+
+
+def test_identity_map_is_shared_and_updated(db):
+    """Mapper deux fois le même ID met à jour la même instance."""
+    mapper = GW2APIMapper(db)
+
+    first = mapper.map_skill(_skill(711, "First"))
+    second = mapper.map_skill(_skill(711, "Second"))
+
+    assert first is second
+    assert second.name == "Second"
+
+    mapper.clear_cache()
+    db.flush()
+    assert mapper.get_existing(Skill, 711) is first
+
+
+class FailingAPI:
+    """Client API dont chaque appel échoue."""
+
+    def __getattr__(self, name):
+        async def fail(*args, **kwargs):
+            raise RuntimeError("API indisponible")
+        return fail
+
+
+@pytest.mark.asyncio
+async def test_service_resets_identity_map(db):
+    """La carte d'identité est vidée après l'annulation d'un lot et au début de chaque étape."""
+    from app.services.gw2_data_service import GW2DataService
+
+    service = GW2DataService(db_session=db, api_client=FailingAPI())
+    mapper = service.mapper
+
+    mapper.get_existing(ItemStats, 9701)
+    service._writer().upsert(ItemStats, [{'id': 9702, 'name': "Valid"}])
+    assert mapper._identity
+    result = service._writer().upsert(ItemStats, [{'id': 9703, 'name': None}])
+    assert list(result.failed) == [9703]
+    assert not mapper._identity
+
+    mapper.get_existing(ItemStats, 9702)
+    await service.sync_professions()
+    assert service.mapper is mapper
+    assert not mapper._identity
@@ -0,0 +1,145 @@
+"""Tests pour la synchronisation incrémentale (ID de build et empreintes du contenu)."""
+
+import pytest
+
+from app.models import Skill, SyncHash, SyncState
+from app.services.gw2_data_service import GW2DataService
+from app.services.incremental_sync import IncrementalSync, content_hash
+
+
+def _skill(skill_id, name=None):
+    return {'id': skill_id, 'name': name or f"Skill {skill_id}", 'type': "Utility", 'professions': ["Guardian"]}
+
+
+class BuildAPI:
+    """Client API enregistré, avec un ID de build modifiable."""
+
+    def __init__(self, skills, build_id=170000):
+        self.skills = skills
+        self.build_id = build_id
+        self.requested = []
+
+    async def get_build(self):
+        return {'id': self.build_id}
+
+    async def get(self, endpoint, params=None):
+        assert endpoint == '/v2/skills'
+        return list(self.skills)
+
+    async def get_skills(self, ids):
+        self.requested.extend(ids)
+        return [self.skills[i] for i in ids if i in self.skills]
+
+
+def test_content_hash_ignores_key_order():
+    """L'ordre des clés renvoyé par l'API n'influe pas sur l'empreinte."""
+    assert content_hash({'id': 1, 'name': "A"}) == content_hash({'name': "A", 'id': 1})
+    assert content_hash({'id': 1, 'name': "A"}) != content_hash({'id': 1, 'name': "B"})
+
+
+@pytest.mark.asyncio
+async def test_same_build_fetches_only_new_ids(db):
+    """Avec le même build, seuls les IDs apparus depuis sont récupérés."""
+    api = BuildAPI({skill_id: _skill(skill_id) for skill_id in range(9001, 9011)})
+    service = GW2DataService(db_session=db, api_client=api)
+
+    first = await service.sync_skills()
+    service._after_sync()
+    assert first['fetched'] == 10 and first['full']
+    assert db.get(SyncState, 'skills').build_id == 170000
+
+    api.requested.clear()
+    api.skills[9011] = _skill(9011)
+    del api.skills[9001]
+    second = await service.sync_skills()
+    service._after_sync()
+
+    assert api.requested == [9011]
+    assert second['full'] is False
+    assert (second['new'], second['removed'], second['processed']) == (1, 1, 1)
+    assert second['removed_ids'] == ['9001']
+    assert db.get(Skill, 9011).name == "Skill 9011"
+    assert db.get(SyncHash, ('skills', '9001')) is None
+    # Les lignes des IDs disparus sont conservées
+    assert db.get(Skill, 9001) is not None
+
+
+@pytest.mark.asyncio
+async def test_new_build_rewrites_only_changed_entities(db):
+    """Après un changement de build, seules les entités modifiées sont écrites."""
+    api = BuildAPI({skill_id: _skill(skill_id) for skill_id in range(9101, 9106)})
+    service = GW2DataService(db_session=db, api_client=api)
+    await service.sync_skills()
+    service._after_sync()
+
+    api.build_id = 170001
+    api.skills[9103] = _skill(9103, "Renamed")
+    result = await service.sync_skills()
+    service._after_sync()
+
+    assert result['full'] is True
+    assert result['fetched'] == 5
+    assert (result['unchanged'], result['processed']) == (4, 1)
+    assert db.get(Skill, 9103).name == "Renamed"
+    assert db.get(SyncState, 'skills').build_id == 170001
+
+
+def test_failed_sync_keeps_previous_build(db):
+    """Un échec n'enregistre pas le build : la prochaine synchronisation est complète."""
+    tracker = IncrementalSync(db, build_id=42).track('traits', [1, 2])
+    changed = tracker.changed([{'id': 1}, {'id': 2}])
+    tracker.record([1])
+    tracker.complete(success=False)
+
+    assert len(changed) == 2
+    assert db.get(SyncState, 'traits').build_id is None
+    retry = IncrementalSync(db, build_id=42).track('traits', [1, 2])
+    assert retry.full and retry.ids == [1, 2]
+    assert retry.changed([{'id': 1}, {'id': 2}]) == [{'id': 2}]
+
+
+@pytest.mark.asyncio
+async def test_mapping_version_bump_rewrites_everything(db, monkeypatch):
+    """Changer la version de la conversion réécrit toutes les entités, même avec le même build."""
+    from app.services import incremental_sync
+
+    api = BuildAPI({skill_id: _skill(skill_id) for skill_id in range(9201, 9204)})
+    service = GW2DataService(db_session=db, api_client=api)
+    await service.sync_skills()
+    service._after_sync()
+
+    api.requested.clear()
+    monkeypatch.setattr(incremental_sync, "MAPPING_VERSION", incremental_sync.MAPPING_VERSION + 1)
+    result = await service.sync_skills()
+    service._after_sync()
+
+    assert api.requested == [9201, 9202, 9203]
+    assert result['full'] is True
+    assert (result['unchanged'], result['processed']) == (0, 3)
+    assert db.get(SyncState, 'skills').mapping_version == incremental_sync.MAPPING_VERSION
+
+    api.requested.clear()
+    again = await service.sync_skills()
+    assert api.requested == []
+    assert again['full'] is False
+
+
+@pytest.mark.asyncio
+async def test_specialization_ids_use_a_single_request(db):
+    """Les IDs des spécialisations sont récupérés en une requête, sans détailler les professions."""
+    class SpecializationAPI:
+        def __init__(self):
+            self.calls = []
+
+        async def get(self, endpoint, params=None):
+            self.calls.append(endpoint)
+            return [27, 62]
+
+        async def get_profession(self, profession_id):
+            raise AssertionError("les professions ne doivent pas être récupérées")
+
+    api = SpecializationAPI()
+    service = GW2DataService(db_session=db, api_client=api)
+
+    assert await service._get_all_specialization_ids() == [27, 62]
+    assert api.calls == ['/v2/specializations']
@@ -0,0 +1,88 @@
+"""Tests pour le stockage clé-valeur SQLite du cache des réponses de l'API."""
+
+import pytest
+
+from app.api.cache_store import KVStore
+
+
+class Clock:
+    """Horloge manuelle."""
+
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    kv_store = KVStore(tmp_path / "cache.sqlite", clock=clock)
+    yield kv_store
+    kv_store.close()
+
+
+def test_get_set_and_expiry(store, clock):
+    store.set("GET:/v2/build", {'id': 170000}, ttl=60)
+    assert store.get("GET:/v2/build") == {'id': 170000}
+
+    clock.now += 61
+    assert store.get("GET:/v2/build") is None
+    # Une entrée expirée reste lisible pour être revalidée
+    assert store.get_entry("GET:/v2/build") == ({'id': 170000}, 1_060.0)
+
+    assert store.touch("GET:/v2/build", ttl=60)
+    assert store.get("GET:/v2/build") == {'id': 170000}
+    assert store.stats()["hits"] == 3
+
+
+def test_purge_expired_and_clear_by_prefix(store, clock):
+    store.set("GET:/v2/skills:ids=1", [1], ttl=10)
+    store.set("GET:/v2/skills:ids=2", [2], ttl=100)
+    store.set("GET:/v2/traits:ids=1", [3], ttl=100)
+
+    clock.now += 50
+    assert store.purge_expired() == 1
+    assert store.clear("GET:/v2/skills") == 1
+    assert len(store) == 1
+    assert store.get("GET:/v2/traits:ids=1") == [3]
+
+
+def test_size_bound_evicts_least_recently_read(tmp_path, clock):
+    payload = [f"entry-{i}" * 50 for i in range(200)]
+    store = KVStore(tmp_path / "bounded.sqlite", clock=clock)
+    store.set("probe", payload, ttl=60)
+    store.max_bytes = store.stats()["size_bytes"] * 3
+    store.clear()
+
+    for key in ("a", "b", "c"):
+        clock.now += 1
+        store.set(key, payload, ttl=60)
+    clock.now += 1
+    store.get("a")
+    clock.now += 1
+    store.set("d", payload, ttl=60)
+
+    assert store.get("b") is None
+    assert all(store.get(key) == payload for key in ("a", "c", "d"))
+    assert store.stats()["evictions"] == 1
+    assert store.stats()["size_bytes"] <= store.max_bytes
+    store.close()
+
+
+def test_size_is_restored_on_reopen(tmp_path):
+    path = tmp_path / "persistent.sqlite"
+    store = KVStore(path)
+    store.set("key", {'data': "x" * 1000}, ttl=60)
+    size = store.stats()["size_bytes"]
+    store.close()
+
+    reopened = KVStore(path)
+    assert reopened.stats()["size_bytes"] == size
+    assert reopened.get("key") == {'data': "x" * 1000}
+    reopened.close()
@@ -0,0 +1,116 @@
+"""Tests pour le cache des modèles utilisé par les compétences liées."""
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models import Skill
+from app.models.model_cache import ModelCache, get_model_cache
+from app.models.skill import SkillType
+
+
+@pytest.fixture
+def skills(db):
+    get_model_cache().bump_data_version()
+    owner = Skill(id=501, name="Owner", type=SkillType.UTILITY, transform_skills=[502, 503], bundle_skills=[504])
+    db.add_all([
+        owner,
+        Skill(id=502, name="Transform A", type=SkillType.UTILITY),
+        Skill(id=503, name="Transform B", type=SkillType.UTILITY),
+        Skill(id=504, name="Bundle", type=SkillType.UTILITY),
+    ])
+    db.flush()
+    yield owner
+    get_model_cache().bump_data_version()
+
+
+def test_related_skills_are_cached(db, skills):
+    """Le second appel est servi par le cache, sans requête."""
+    cache = get_model_cache()
+    before = cache.stats()
+
+    first = skills.get_transform_skills(session=db)
+    second = skills.get_transform_skills(session=db)
+    related = skills.get_related_skills(session=db)
+
+    assert sorted(s.id for s in first) == [502, 503]
+    assert [s.id for s in second] == [s.id for s in first]
+    assert [s.id for s in related["bundle_skills"]] == [504]
+    stats = cache.stats()
+    assert stats["hits"] - before["hits"] == 1
+    assert stats["misses"] - before["misses"] == 2
+
+
+def test_update_invalidates_dependent_entries(db, skills):
+    """Modifier une compétence liée invalide l'entrée de la compétence propriétaire."""
+    cache = get_model_cache()
+    skills.get_transform_skills(session=db)
+    assert len(cache) == 1
+
+    transformed = db.get(Skill, 503)
+    transformed.name = "Renamed"
+    db.flush()
+
+    assert len(cache) == 0
+    assert "Renamed" in [s.name for s in skills.get_transform_skills(session=db)]
+
+
+def test_sync_bumps_data_version(db, skills):
+    """Une synchronisation invalide toutes les entrées."""
+    cache = get_model_cache()
+    skills.get_bundle_skills(session=db)
+    version = cache.data_version
+
+    cache.bump_data_version()
+
+    assert cache.data_version == version + 1
+    assert len(cache) == 0
+
+
+def test_sessions_do_not_share_cached_instances(db, skills):
+    """Une autre session relit ses propres instances, sans les modifications non validées."""
+    first = skills.get_transform_skills(session=db)
+    first[0].name = "Modifié sans flush"
+
+    other = Session(bind=db.connection())
+    try:
+        owner = other.get(Skill, 501)
+        transform = owner.get_transform_skills(session=other)
+        bundle = owner.get_bundle_skills(session=other)
+
+        assert sorted(s.name for s in transform) == ["Transform A", "Transform B"]
+        assert [s.id for s in bundle] == [504]
+        assert all(s in other and s not in db for s in transform)
+    finally:
+        other.close()
+
+    # La session d'origine retrouve ses instances depuis sa carte d'identité
+    assert skills.get_transform_skills(session=db) == first
+
+
+class Row:
+    def __init__(self, id):
+        self.id = id
+
+
+def test_bounded_size_and_metrics():
+    """Le cache évince les entrées les moins récemment utilisées."""
+    cache = ModelCache(max_entries=2)
+    for owner in (1, 2, 3):
+        cache.put(cache.make_key(Row, owner, "children"), [Row(owner * 10)])
+
+    assert len(cache) == 2
+    assert cache.get(cache.make_key(Row, 1, "children")) is None
+    assert cache.invalidate(Row, 30) == 1
+    stats = cache.stats()
+    assert (stats["evictions"], stats["invalidations"], stats["misses"]) == (1, 1, 1)
+
+
+def test_results_computed_before_sync_are_not_stored():
+    """Un résultat calculé avec une version de données périmée n'est pas conservé."""
+    cache = ModelCache()
+    key = cache.make_key(Row, 1, "children")
+    cache.bump_data_version()
+
+    cache.put(key, [Row(2)])
+
+    assert len(cache) == 0
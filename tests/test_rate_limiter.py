@@ -0,0 +1,79 @@
+"""Tests pour le seau à jetons limitant le débit des requêtes vers l'API GW2."""
+
+import pytest
+
+from app.api.client import GW2APIClient
+from app.api.rate_limiter import TokenBucket, get_rate_limiter
+
+
+class Clock:
+    """Horloge manuelle."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_steady_rate():
+    """Le seau permet une rafale, puis espace les requêtes selon le débit."""
+    clock = Clock()
+    bucket = TokenBucket(rate=5, burst=3, clock=clock)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.2)
+    assert bucket.reserve() == pytest.approx(0.4)
+
+    clock.now += 1.0
+    assert bucket.reserve() == 0.0
+    stats = bucket.stats()
+    assert (stats["acquired"], stats["waited"]) == (6, 2)
+    assert stats["max_wait_seconds"] == pytest.approx(0.4)
+
+
+def test_429_reduces_rate_and_recovers_gradually():
+    clock = Clock()
+    bucket = TokenBucket(rate=4, burst=4, min_rate=1, recovery_step=0.25, clock=clock)
+
+    bucket.penalize(retry_after=2)
+    assert bucket.rate == 2
+    assert bucket.reserve() == pytest.approx(2.0)  # Retry-After respecté
+    # Les appelants en attente repartent espacés au débit courant
+    assert bucket.reserve() == pytest.approx(2.5)
+
+    bucket.penalize()
+    assert bucket.rate == 2  # une seule réduction par fenêtre Retry-After
+    clock.now += 2.0
+    bucket.penalize()
+    assert bucket.rate == 1  # borné par min_rate
+
+    bucket.on_success()
+    assert bucket.rate == 1  # moins d'une seconde depuis la dernière réduction
+    for _ in range(4):
+        clock.now += 1.0
+        bucket.on_success()
+    assert bucket.rate == 4
+    clock.now += 1.0
+    bucket.on_success()
+    assert bucket.rate == 4
+    assert bucket.stats()["throttled"] == 3
+
+
+def test_burst_of_429_reduces_rate_once():
+    """Les 429 des requêtes déjà envoyées ne réduisent le débit qu'une fois par fenêtre."""
+    clock = Clock()
+    bucket = TokenBucket(rate=8, burst=8, min_rate=0.5, clock=clock)
+
+    for _ in range(5):
+        bucket.penalize()
+    assert bucket.rate == 4
+
+    clock.now += 1.0
+    bucket.penalize()
+    assert bucket.rate == 2
+    assert bucket.stats()["throttled"] == 6
+
+
+def test_limiter_is_shared_by_clients():
+    assert GW2APIClient()._rate_limiter is GW2APIClient()._rate_limiter is get_rate_limiter()
@@ -0,0 +1,157 @@
+"""Tests pour la protection contre l'effet de meute du cache (``get_or_set``, ``redis_cache``)."""
+
+import asyncio
+import json
+import pickle
+import random
+import time
+
+import pytest
+
+from app.api.cache_store import decode_value, encode_value
+from app.api.tiered_cache import TieredCache, make_key
+from app.services.gw2_data_service import redis_cache
+
+
+class Clock:
+    """Horloge manuelle."""
+
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """Sous-ensemble de ``redis.asyncio.Redis`` (avec ``SET NX``) utilisé par le cache."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def scan_iter(self, match=None):
+        for key in list(self.data):
+            if match is None or key.startswith(match.rstrip('*')):
+                yield key
+
+
+def counting(value, delay=0.05):
+    """Retourne une coroutine de calcul lente et la liste de ses appels."""
+    calls = []
+
+    async def compute():
+        calls.append(time.monotonic())
+        await asyncio.sleep(delay)
+        return value
+
+    return compute, calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_compute_once():
+    cache = TieredCache("stampede", ttl=60)
+    compute, calls = counting({'id': 1})
+
+    results = await asyncio.gather(*(cache.get_or_set("key", compute) for _ in range(20)))
+
+    assert results == [{'id': 1}] * 20
+    assert len(calls) == 1
+    assert await cache.get_or_set("key", compute) == {'id': 1}
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_lock_serializes_processes():
+    """Deux processus (deux caches sur le même Redis) ne recalculent qu'une fois."""
+    redis = FakeRedis()
+    first = TieredCache("shared", ttl=60, redis_client=redis)
+    second = TieredCache("shared", ttl=60, redis_client=redis)
+    compute, calls = counting([1, 2, 3], delay=0.1)
+
+    results = await asyncio.gather(first.get_or_set("key", compute), second.get_or_set("key", compute))
+
+    assert results == [[1, 2, 3], [1, 2, 3]]
+    assert len(calls) == 1
+    assert second.stats()["lock_waits"] == 1
+    # Le verrou est libéré après le calcul
+    assert not any(key.endswith(":lock") for key in redis.data)
+
+
+@pytest.mark.asyncio
+async def test_early_refresh_before_expiry(monkeypatch):
+    clock = Clock()
+    cache = TieredCache("xfetch", ttl=100, clock=clock)
+    compute, calls = counting("v", delay=0)
+    await cache.get_or_set("key", compute)
+
+    # Loin de l'expiration, un tirage défavorable ne déclenche rien
+    monkeypatch.setattr(random, "random", lambda: 0.999999)
+    clock.now += 50
+    await cache.get_or_set("key", compute)
+    assert len(calls) == 1
+
+    # Avec un calcul coûteux enregistré, l'entrée est recalculée avant d'expirer
+    await cache.set("key", ["v", 10.0])
+    clock.now += 95
+    await cache.get_or_set("key", compute)
+    assert len(calls) == 2
+    assert cache.stats()["early_refreshes"] == 1
+
+    # beta=0 désactive le rafraîchissement anticipé
+    await cache.set("key", ["v", 10.0])
+    clock.now += 95
+    await cache.get_or_set("key", compute, beta=0)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_none_is_not_cached():
+    cache = TieredCache("none", ttl=60)
+    compute, calls = counting(None, delay=0)
+    assert await cache.get_or_set("key", compute) is None
+    assert await cache.get_or_set("key", compute) is None
+    assert len(calls) == 2
+
+
+def test_compact_encoding():
+    value = {'items': [{'id': i, 'name': f"Item {i}"} for i in range(100)]}
+    blob = encode_value(value)
+    assert decode_value(blob) == value
+    assert len(blob) < min(len(json.dumps(value)), len(pickle.dumps(value)))
+    # Les petites valeurs ne sont pas compressées
+    assert encode_value({'id': 1}) == b'{"id":1}'
+
+
+@pytest.mark.asyncio
+async def test_decorator_uses_stable_keys(tmp_path, monkeypatch):
+    from app.api import tiered_cache
+    monkeypatch.setattr(tiered_cache, "_caches", {})
+    monkeypatch.setattr(tiered_cache.settings, "cache_dir", tmp_path)
+
+    class Service:
+        def __init__(self):
+            self.calls = 0
+
+        @redis_cache(ttl=60, prefix="test_decorator:")
+        async def lookup(self, ids, lang="fr"):
+            self.calls += 1
+            return {'ids': ids, 'lang': lang}
+
+    service = Service()
+    assert await service.lookup([1, 2], lang="en") == {'ids': [1, 2], 'lang': "en"}
+    assert await service.lookup([1, 2], lang="en") == {'ids': [1, 2], 'lang': "en"}
+    assert await service.lookup([1, 2]) == {'ids': [1, 2], 'lang': "fr"}
+    assert service.calls == 2
+    assert make_key("a", {'x': 1, 'y': 2}) == make_key("a", {'y': 2, 'x': 1})
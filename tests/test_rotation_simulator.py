@@ -0,0 +1,114 @@
+"""Tests pour le simulateur de rotation et les métriques de dégâts associées."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.game_mechanics import AttributeType, ConditionType
+from app.game_mechanics.rotation import (
+    CONDITION_TICK_DAMAGE, MIGHT_MAX_STACKS, RotationSimulator, compile_skill
+)
+from app.scoring.metrics import ConditionDamageMetric, DirectDamageMetric
+
+
+def make_skill(skill_id, recharge=0, cast=1.0, facts=()):
+    return SimpleNamespace(
+        id=skill_id,
+        recharge=None,
+        facts=[{"type": "Recharge", "value": recharge},
+               {"type": "Time", "text": "Activation", "duration": cast},
+               *facts],
+    )
+
+
+AUTO_ATTACK = make_skill(1, facts=[{"type": "Damage", "dmg_multiplier": 1.0, "hit_count": 1}])
+BLEED_SKILL = make_skill(2, recharge=0, cast=1.0, facts=[
+    {"type": "Buff", "status": "Bleeding", "apply_count": 2, "duration": 5},
+])
+MIGHT_SKILL = make_skill(3, recharge=10, cast=0.0, facts=[
+    {"type": "Buff", "status": "Might", "apply_count": 25, "duration": 10},
+    {"type": "Buff", "status": "Fury", "duration": 5},
+])
+
+
+def test_compile_skill_reads_facts():
+    """Les faits de l'API sont convertis en profil de simulation."""
+    profile = compile_skill(make_skill(9, recharge=8, cast=0.5, facts=[
+        {"type": "Damage", "dmg_multiplier": 0.5, "hit_count": 3},
+        {"type": "Buff", "status": "Burning", "apply_count": 2, "duration": 4},
+        {"type": "Buff", "status": "Might", "apply_count": 5, "duration": 8},
+    ]))
+
+    assert profile.recharge == 8
+    assert profile.cast_time == 0.5
+    assert profile.damage_coefficient == pytest.approx(1.5)
+    assert profile.conditions == ((ConditionType.BURNING, 2, 4.0),)
+    assert (profile.might_stacks, profile.might_duration) == (5, 8.0)
+
+
+def test_condition_stacks_and_ticks():
+    """Une compétence appliquée chaque seconde maintient un nombre de piles stable."""
+    result = RotationSimulator(fight_duration=20).simulate([BLEED_SKILL])
+
+    assert result.casts[2] == 20
+    # 2 piles par seconde pendant 5 secondes : 10 piles en régime établi
+    assert result.average_condition_stacks[ConditionType.BLEEDING] == pytest.approx(9.0, abs=1.0)
+    base, _ = CONDITION_TICK_DAMAGE[ConditionType.BLEEDING]
+    expected = sum(min(2 * t, 10) for t in range(1, 21)) * base
+    assert result.condition_damage[ConditionType.BLEEDING] == pytest.approx(expected)
+    assert result.direct_damage == 0
+    assert result.condition_share == 1.0
+
+
+def test_might_and_fury_increase_direct_damage():
+    """La puissance et la fureur augmentent les dégâts directs."""
+    simulator = RotationSimulator(fight_duration=30)
+    attributes = {AttributeType.POWER: 2000, AttributeType.PRECISION: 1500, AttributeType.FEROCITY: 900}
+
+    baseline = simulator.simulate([AUTO_ATTACK], attributes)
+    buffed = simulator.simulate([MIGHT_SKILL, AUTO_ATTACK], attributes)
+
+    assert buffed.direct_damage > baseline.direct_damage
+    # Might au plafond en permanence (recharge = durée)
+    assert buffed.might_average == pytest.approx(MIGHT_MAX_STACKS, rel=0.05)
+    assert 0.4 < buffed.fury_uptime < 0.6
+    assert buffed.casts[3] == 4  # t = 0, 10, 20, 30
+
+
+def test_empty_rotation():
+    """Un build sans compétence utile ne produit aucun dégât."""
+    result = RotationSimulator().simulate([make_skill(5)])
+
+    assert result.dps == 0
+    assert result.casts == {}
+
+
+def test_metrics_use_simulation():
+    """Les métriques de dégâts reflètent la rotation simulée."""
+    profession = SimpleNamespace(name="Necromancer")
+    args = dict(profession=profession, specializations=[], weapons=[], armor=[], trinkets=[], upgrades=[])
+
+    condition = ConditionDamageMetric().evaluate(skills=[BLEED_SKILL, AUTO_ATTACK], **args)
+    power = ConditionDamageMetric().evaluate(skills=[AUTO_ATTACK], **args)
+    direct = DirectDamageMetric().evaluate(skills=[AUTO_ATTACK], **args)
+
+    assert condition.details["is_condition_build"] is True
+    assert condition.value > 0
+    assert power.details["is_condition_build"] is False
+    assert power.weight == 0.0
+    assert direct.value > 0
+
+
+def test_simulation_throughput():
+    """Le simulateur doit pouvoir évaluer plusieurs centaines de builds par seconde."""
+    simulator = RotationSimulator(fight_duration=60)
+    skills = [MIGHT_SKILL, BLEED_SKILL, AUTO_ATTACK]
+    builds = 200
+
+    start = time.perf_counter()
+    for _ in range(builds):
+        simulator.simulate(skills)
+    elapsed = time.perf_counter() - start
+
+    assert builds / elapsed > 100
@@ -0,0 +1,143 @@
+"""Tests pour l'évaluation par lot des builds et la matrice de comparaison."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.game_mechanics import GameMode, RoleType
+from app.scoring.metrics import AttributeScoreMetric, BaseMetric, MetricResult, MetricType
+from app.scoring.scorer import BuildScorer
+
+
+def make_build(name, value=0.0):
+    """Crée un build minimal ; ``value`` est lu par les métriques de test."""
+    return {
+        "profession": SimpleNamespace(name=name, value=value),
+        "specializations": [SimpleNamespace(name=f"{name} spec")],
+        "skills": [],
+        "weapons": [],
+        "armor": [],
+        "trinkets": [],
+        "upgrades": [],
+    }
+
+
+class ValueMetric(BaseMetric):
+    """Métrique de test qui compte ses appels et renvoie ``profession.value``."""
+
+    def __init__(self, **kwargs):
+        super().__init__(metric_type=MetricType.DIRECT_DAMAGE, **kwargs)
+        self.evaluate_calls = 0
+        self.batch_calls = 0
+
+    def evaluate(self, profession, *args, **kwargs):
+        self.evaluate_calls += 1
+        if profession.name == "Broken":
+            raise ValueError("build invalide")
+        return MetricResult(metric_type=self.metric_type, value=profession.value, weight=self.weight)
+
+
+class BatchValueMetric(ValueMetric):
+    """Variante vectorisée de ValueMetric."""
+
+    def evaluate_batch(self, builds, game_mode=GameMode.PVE, role=None, **kwargs):
+        self.batch_calls += 1
+        values = np.array([build["profession"].value for build in builds])
+        return [MetricResult(metric_type=self.metric_type, value=float(v), weight=self.weight) for v in values]
+
+
+class BrokenBatchMetric(ValueMetric):
+    """Métrique dont l'évaluation par lot échoue systématiquement."""
+
+    def evaluate_batch(self, builds, game_mode=GameMode.PVE, role=None, **kwargs):
+        self.batch_calls += 1
+        raise RuntimeError("lot invalide")
+
+
+@pytest.mark.parametrize("role", [None, RoleType.DPS, RoleType.HEALER, RoleType.TANK])
+def test_attribute_batch_matches_scalar(role):
+    """La version vectorisée donne les mêmes scores que l'évaluation unitaire."""
+    metric = AttributeScoreMetric(weight=1.0)
+    builds = [make_build("Guardian"), make_build("Warrior")]
+
+    batch = metric.evaluate_batch(builds, role=role)
+    scalar = [metric.evaluate(**build, role=role) for build in builds]
+
+    assert [r.value for r in batch] == pytest.approx([r.value for r in scalar])
+    assert all(r.details["attributes"] for r in batch)
+
+
+def test_evaluate_builds_matches_evaluate_build():
+    """evaluate_builds et evaluate_build produisent les mêmes évaluations."""
+    scorer = BuildScorer(role=RoleType.DPS)
+    builds = [make_build("Guardian"), make_build("Necromancer")]
+
+    batched = scorer.evaluate_builds(builds)
+    single = [scorer.evaluate_build(**build) for build in builds]
+
+    assert [e.to_dict() for e in batched] == [e.to_dict() for e in single]
+    assert batched[1].details["profession"] == "Necromancer"
+
+
+def test_each_metric_called_once_per_batch():
+    """Une métrique vectorisée n'est appelée qu'une fois pour tout le lot."""
+    metric = BatchValueMetric(weight=1.0)
+    scorer = BuildScorer(custom_metrics=[metric])
+
+    evaluations = scorer.evaluate_builds([make_build(f"B{i}", i) for i in range(20)])
+
+    assert metric.batch_calls == 1
+    assert metric.evaluate_calls == 0
+    assert [e.total_score for e in evaluations] == [min(1000.0, i * 10.0) for i in range(20)]
+
+
+def test_batch_failure_falls_back_per_build():
+    """Un lot en échec est réévalué build par build, sans propager l'erreur d'un build."""
+    metric = BrokenBatchMetric(weight=1.0)
+    scorer = BuildScorer(custom_metrics=[metric])
+
+    evaluations = scorer.evaluate_builds([make_build("Guardian", 5), make_build("Broken", 7)])
+
+    assert metric.batch_calls == 1
+    assert metric.evaluate_calls == 2
+    assert evaluations[0].total_score == 50.0
+    assert MetricType.DIRECT_DAMAGE not in evaluations[1].metric_results
+    assert evaluations[1].total_score == 0.0
+
+
+def test_default_batch_evaluates_each_build_once():
+    """Sans évaluation vectorisée, un build en échec n'entraîne pas de réévaluation des autres."""
+    metric = ValueMetric(weight=1.0)
+    scorer = BuildScorer(custom_metrics=[metric])
+
+    evaluations = scorer.evaluate_builds(
+        [make_build("Guardian", 5), make_build("Broken", 7), make_build("Warrior", 3)]
+    )
+
+    assert metric.evaluate_calls == 3
+    assert [e.total_score for e in evaluations] == [50.0, 0.0, 30.0]
+
+
+def test_compare_builds_matrix_reuses_evaluations():
+    """La matrice N×N est cohérente avec compare_builds et n'évalue chaque build qu'une fois."""
+    metric = ValueMetric(weight=1.0)
+    scorer = BuildScorer(custom_metrics=[metric])
+    builds = [make_build("A", 10), make_build("B", 30), make_build("C", 10.5)]
+
+    result = scorer.compare_builds_matrix(builds)
+
+    assert metric.evaluate_calls == len(builds)
+    matrix = result["score_matrix"]
+    assert matrix.shape == (3, 3)
+    np.testing.assert_allclose(matrix, -matrix.T)
+    np.testing.assert_allclose(np.diag(matrix), 0.0)
+    assert result["ranking"] == [1, 2, 0]
+    assert result["winners"][1, 0] == 1 and result["winners"][0, 1] == -1
+    # Écart inférieur au seuil de 10 points : égalité
+    assert result["winners"][0, 2] == 0
+
+    pairwise = scorer.compare_builds(builds[1], builds[0])
+    assert pairwise["winner"] == "build1"
+    assert pairwise["winner_margin"] == pytest.approx(matrix[1, 0])
+    assert result["metric_matrices"][MetricType.DIRECT_DAMAGE.value][1, 0] == pytest.approx(20.0)
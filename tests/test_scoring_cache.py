@@ -0,0 +1,203 @@
+"""Tests pour le cache des résultats de métriques."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.game_mechanics import GameMode, RoleType
+from app.scoring.cache import MetricResultCache, get_default_metric_cache
+from app.scoring.metrics import BaseMetric, MetricResult, MetricType
+from app.scoring.scorer import BuildScorer
+from app.solver.solver import BuildGenerator, BuildSolution
+
+
+def make_build(profession_id, skills=()):
+    return {
+        "profession": SimpleNamespace(id=profession_id, name=profession_id),
+        "specializations": [],
+        "skills": [SimpleNamespace(id=skill_id) for skill_id in skills],
+        "weapons": [],
+        "armor": [],
+        "trinkets": [],
+        "upgrades": [],
+    }
+
+
+class CountingMetric(BaseMetric):
+    """Métrique de test qui compte les builds évalués."""
+
+    def __init__(self, **kwargs):
+        super().__init__(metric_type=MetricType.DIRECT_DAMAGE, **kwargs)
+        self.evaluated = 0
+
+    def evaluate(self, profession, specializations, skills, *args, **kwargs):
+        self.evaluated += 1
+        return MetricResult(metric_type=self.metric_type, value=len(skills), weight=self.weight)
+
+
+def test_repeated_evaluations_hit_the_cache():
+    """Un build déjà évalué n'est plus recalculé, même avec un ordre différent."""
+    metric = CountingMetric()
+    cache = MetricResultCache()
+    scorer = BuildScorer(custom_metrics=[metric], result_cache=cache)
+
+    first = scorer.evaluate_builds([make_build("Guardian", [1, 2]), make_build("Warrior", [3])])
+    second = scorer.evaluate_builds([make_build("Guardian", [2, 1]), make_build("Necromancer")])
+
+    assert metric.evaluated == 3
+    assert second[0].total_score == first[0].total_score
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+    assert stats["hit_rate"] == pytest.approx(0.25)
+
+
+def test_key_depends_on_mode_role_and_version():
+    """Le mode de jeu, le rôle et la version de la métrique séparent les entrées."""
+    metric = CountingMetric()
+    cache = MetricResultCache()
+    build = make_build("Guardian", [1])
+
+    BuildScorer(custom_metrics=[metric], result_cache=cache).evaluate_builds([build])
+    BuildScorer(game_mode=GameMode.WVW, custom_metrics=[metric], result_cache=cache).evaluate_builds([build])
+    BuildScorer(role=RoleType.HEALER, custom_metrics=[metric], result_cache=cache).evaluate_builds([build])
+    assert metric.evaluated == 3
+
+    metric.version += 1
+    BuildScorer(custom_metrics=[metric], result_cache=cache).evaluate_builds([build])
+    assert metric.evaluated == 4
+
+
+def test_context_bypasses_cache():
+    """Un contexte libre peut modifier le résultat : il n'est pas mis en cache."""
+    metric = CountingMetric()
+    cache = MetricResultCache()
+    scorer = BuildScorer(custom_metrics=[metric], result_cache=cache)
+
+    scorer.evaluate_builds([make_build("Guardian")], context={"target": "golem"})
+    scorer.evaluate_builds([make_build("Guardian")], context={"target": "golem"})
+
+    assert metric.evaluated == 2
+    assert len(cache) == 0
+
+
+def test_lru_eviction_bounds_memory():
+    """Le cache ne dépasse jamais max_entries et évince les entrées les plus anciennes."""
+    cache = MetricResultCache(max_entries=2)
+    result = MetricResult(metric_type=MetricType.DIRECT_DAMAGE, value=1.0)
+
+    cache.put("a", result)
+    cache.put("b", result)
+    assert cache.get("a") == result
+    cache.put("c", result)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == result
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_by_metric_type():
+    """invalidate supprime uniquement les entrées de la métrique demandée."""
+    metric = CountingMetric()
+    cache = MetricResultCache()
+    BuildScorer(custom_metrics=[metric], result_cache=cache).evaluate_builds([make_build("Guardian")])
+    cache.put(("x", MetricType.BOON_UPTIME.value, "PvE", None, 1, 1.0), MetricResult(MetricType.BOON_UPTIME, 1.0))
+
+    assert cache.invalidate(MetricType.DIRECT_DAMAGE) == 1
+    assert len(cache) == 1
+
+
+def test_persistence_round_trip(tmp_path):
+    """Les résultats sauvegardés sont rechargés par une nouvelle instance."""
+    path = tmp_path / "metrics.pkl"
+    metric = CountingMetric()
+    cache = MetricResultCache(path=path)
+    BuildScorer(custom_metrics=[metric], result_cache=cache).evaluate_builds([make_build("Guardian", [1])])
+    cache.save()
+
+    reloaded = MetricResultCache(path=path)
+    evaluation = BuildScorer(custom_metrics=[metric], result_cache=reloaded).evaluate_builds(
+        [make_build("Guardian", [1])]
+    )[0]
+
+    assert metric.evaluated == 1
+    assert evaluation.metric_results[MetricType.DIRECT_DAMAGE].value == 1
+    assert reloaded.stats()["hits"] == 1
+
+
+def test_corrupted_persistence_file_is_ignored(tmp_path):
+    """Un fichier de persistance illisible n'empêche pas la création du cache."""
+    path = tmp_path / "metrics.pkl"
+    path.write_bytes(b"not a pickle")
+
+    assert len(MetricResultCache(path=path)) == 0
+
+
+class OtherCountingMetric(CountingMetric):
+    """Métrique personnalisée distincte, du même type que CountingMetric."""
+
+    def evaluate(self, profession, specializations, skills, *args, **kwargs):
+        self.evaluated += 1
+        return MetricResult(metric_type=self.metric_type, value=100.0, weight=self.weight)
+
+
+def test_key_depends_on_metric_class():
+    """Deux métriques du même type ne partagent pas leurs résultats."""
+    cache = MetricResultCache()
+    build = make_build("Guardian", [1])
+
+    first = BuildScorer(custom_metrics=[CountingMetric()], result_cache=cache).evaluate_builds([build])
+    second = BuildScorer(custom_metrics=[OtherCountingMetric()], result_cache=cache).evaluate_builds([build])
+
+    assert first[0].metric_results[MetricType.DIRECT_DAMAGE].value == 1
+    assert second[0].metric_results[MetricType.DIRECT_DAMAGE].value == 100.0
+
+
+def test_cached_results_are_copies():
+    """Modifier un résultat renvoyé n'altère pas l'entrée du cache."""
+    cache = MetricResultCache()
+    key = ("fingerprint", "direct_damage", "Metric", "pve", None, 1, 1.0)
+    cache.put(key, MetricResult(metric_type=MetricType.DIRECT_DAMAGE, value=1.0, details={'hits': [1]}))
+
+    result = cache.get(key)
+    result.value = 2.0
+    result.details['hits'].append(2)
+
+    assert cache.get(key).value == 1.0
+    assert cache.get(key).details == {'hits': [1]}
+
+
+def test_build_generator_scores_with_shared_cache():
+    """Le solveur note ses solutions avec le cache partagé par le processus."""
+    profession = SimpleNamespace(id="Guardian", name="Guardian")
+    metric = CountingMetric()
+    generator = BuildGenerator(db=None, profession=profession)
+    assert generator.scorer.result_cache is get_default_metric_cache()
+
+    generator.scorer = BuildScorer(custom_metrics=[metric], result_cache=MetricResultCache())
+    solutions = [
+        BuildSolution(profession, [], [SimpleNamespace(id=1), SimpleNamespace(id=2)], [], [], [], []),
+        BuildSolution(profession, [], [SimpleNamespace(id=2), SimpleNamespace(id=1)], [], [], [], []),
+    ]
+    generator._score_solutions(solutions)
+
+    assert metric.evaluated == 1
+    assert [solution.metric_score for solution in solutions] == [20.0, 20.0]
+
+
+def test_shared_cache_is_cleared_when_game_data_changes(db):
+    """Une synchronisation ou un nouvel instantané du catalogue vide le cache partagé."""
+    from app.services.catalog import set_catalog
+    from app.services.gw2_data_service import GW2DataService
+
+    cache = get_default_metric_cache()
+    key = ("fingerprint", "direct_damage", "Metric", "pve", None, 1, 1.0)
+
+    cache.put(key, MetricResult(metric_type=MetricType.DIRECT_DAMAGE, value=1.0))
+    GW2DataService(db_session=db, api_client=object())._after_sync()
+    assert cache.get(key) is None
+
+    cache.put(key, MetricResult(metric_type=MetricType.DIRECT_DAMAGE, value=1.0))
+    set_catalog(None)
+    assert cache.get(key) is None
@@ -0,0 +1,102 @@
+"""Tests pour la table des combos et le potentiel de combos des équipes."""
+
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.game_mechanics import ComboAnalyzer, ComboFieldType, ComboFinisherType, EffectIndex
+from app.game_mechanics.interactions import COMBO_TABLE, COMBO_VALUES
+from app.scoring.combos import count_combo_sources, score_team_combos, score_teams_combos
+from app.scoring.engine import PlayerBuild
+
+
+def make_player(profession, fields=(), finishers=(), skill_ids=()):
+    metadata = {"combo_fields": list(fields), "combo_finishers": list(finishers), "skill_ids": list(skill_ids)}
+    return PlayerBuild(profession_id=profession, buffs=set(), roles={"dps"}, metadata=metadata)
+
+
+def test_combo_table_is_complete():
+    """Chaque champ a un effet pour chaque finisseur, dans la table comme dans la matrice."""
+    assert len(COMBO_TABLE) == len(ComboFieldType) * len(ComboFinisherType)
+    assert COMBO_VALUES.shape == (len(ComboFieldType), len(ComboFinisherType))
+    assert np.all(COMBO_VALUES > 0)
+
+    analyzer = ComboAnalyzer()
+    assert analyzer.get_combo_effect(ComboFieldType.WATER, ComboFinisherType.BLAST)["effect"] == "Area Heal"
+    assert analyzer.get_combo_effect(ComboFieldType.FIRE, ComboFinisherType.BLAST)["effect"] == "Might (3x)"
+    assert len(analyzer.combo_fields[ComboFieldType.LIGHT]) == 4
+
+
+def test_sources_are_counted_per_subgroup():
+    """Les champs et finisseurs sont comptés par sous-groupe de 5 joueurs."""
+    team = [make_player("Tempest", fields=["Water"])] + [make_player("Warrior") for _ in range(4)]
+    team.append(make_player("Scrapper", finishers=["Blast", "Blast"]))
+
+    fields, finishers = count_combo_sources(team)
+
+    assert fields.shape == (2, len(ComboFieldType))
+    assert fields[:, list(ComboFieldType).index(ComboFieldType.WATER)].tolist() == [1, 0]
+    assert finishers[:, list(ComboFinisherType).index(ComboFinisherType.BLAST)].tolist() == [0, 2]
+
+
+def test_combos_require_field_and_finisher_in_same_subgroup():
+    """Un combo n'est réalisable que si le champ et le finisseur sont dans le même sous-groupe."""
+    together = [make_player("Tempest", fields=["Water"]), make_player("Scrapper", finishers=["Blast"])]
+    apart = [together[0]] + [make_player("Warrior") for _ in range(4)] + [together[1]]
+
+    potential = score_team_combos(together)
+
+    assert potential.score > 0
+    assert potential.achievable(0) == [(ComboFieldType.WATER, ComboFinisherType.BLAST, "Area Heal")]
+    assert score_team_combos(apart).score == 0
+
+
+def test_skill_sources_come_from_effect_index():
+    """Les compétences d'un build sont résolues via l'index des effets."""
+    index = EffectIndex.build([
+        SimpleNamespace(id=10, facts=[{"type": "ComboField", "field_type": "Light"}], traited_facts=None,
+                        combo_field=None, combo_finisher=None),
+        SimpleNamespace(id=11, facts=[], traited_facts=None, combo_field=None, combo_finisher="Blast"),
+    ])
+    team = [make_player("Firebrand", skill_ids=[10]), make_player("Scrapper", skill_ids=[11])]
+
+    potential = score_team_combos(team, effect_index=index)
+
+    assert potential.achievable(0)[0][:2] == (ComboFieldType.LIGHT, ComboFinisherType.BLAST)
+    assert score_team_combos(team).score == 0
+
+
+def test_batch_scoring_matches_single_team():
+    """Le calcul par lot donne le même score que l'évaluation équipe par équipe."""
+    players = [
+        make_player("Tempest", fields=["Water", "Fire"]),
+        make_player("Scrapper", finishers=["Blast", "Blast", "Leap"]),
+        make_player("Firebrand", fields=["Light"], finishers=["Projectile"]),
+        make_player("Warrior", finishers=["Whirl"]),
+    ]
+    teams = [players[:2], players[1:], players * 3, []]
+
+    batch = score_teams_combos(teams)
+
+    expected = [score_team_combos(team).score for team in teams]
+    assert batch == pytest.approx(expected)
+    assert 0 < batch[0] < 1
+
+
+def test_batch_scoring_is_fast():
+    """Des milliers d'équipes candidates sont notées rapidement."""
+    players = [
+        make_player(f"P{i}", fields=[["Water", "Fire", "Light"][i % 3]], finishers=[["Blast", "Leap"][i % 2]])
+        for i in range(20)
+    ]
+    rng = np.random.default_rng(0)
+    teams = [[players[j] for j in rng.choice(20, size=10, replace=False)] for _ in range(2000)]
+
+    start = time.perf_counter()
+    scores = score_teams_combos(teams)
+    elapsed = time.perf_counter() - start
+
+    assert scores.shape == (2000,)
+    assert elapsed < 1.0
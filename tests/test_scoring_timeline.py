@@ -0,0 +1,119 @@
+"""Tests pour la simulation de couverture des buffs par sous-groupe."""
+
+import time
+
+import numpy as np
+import pytest
+
+from app.scoring.engine import PlayerBuild, score_team
+from app.scoring.schema import BuffType, BuffWeight, RoleType, RoleWeight, ScoringConfig
+from app.scoring.timeline import BoonSource, score_team_timeline, simulate_boon_timeline
+
+
+def make_player(profession, buffs=(), sources=None, roles=("dps",)):
+    metadata = {"boon_sources": sources} if sources is not None else None
+    return PlayerBuild(profession_id=profession, buffs=set(buffs), roles=set(roles), metadata=metadata)
+
+
+CONFIG = ScoringConfig(
+    buff_weights={
+        BuffType.QUICKNESS: BuffWeight(weight=2.0),
+        BuffType.MIGHT: BuffWeight(weight=1.0),
+    },
+    role_weights={RoleType.DPS: RoleWeight(weight=1.0, required_count=1)},
+)
+
+
+def test_uptime_matches_source_cycle():
+    """Une source 4s toutes les 8s donne 50% de couverture, 4s toutes les 4s 100%."""
+    team = [
+        make_player("Firebrand", sources=[BoonSource("quickness", duration=4, interval=8)]),
+        *[make_player("Weaver") for _ in range(4)],
+        make_player("Herald", sources=[BoonSource("quickness", duration=4, interval=4)]),
+    ]
+
+    timeline = simulate_boon_timeline(team, fight_duration=40, bin_size=0.25)
+
+    uptime = timeline.uptime_for("quickness")
+    assert uptime.shape == (2,)
+    assert uptime[0] == pytest.approx(0.5, abs=0.01)
+    assert uptime[1] == pytest.approx(1.0)
+    assert timeline.stacks.shape == (2, 160, 1)
+
+
+def test_intensity_stacks_accumulate_and_cap():
+    """Les piles de might s'additionnent entre sources et plafonnent à 25."""
+    source = BoonSource("might", duration=10, interval=5, stacks=8)
+    team = [make_player("Herald", sources=[source]), make_player("Scrapper", sources=[source])]
+
+    timeline = simulate_boon_timeline(team, fight_duration=30, bin_size=1.0)
+
+    might = timeline.stacks_for("might")[0]
+    # Deux applications se chevauchent pour chaque source : 2 × 2 × 8 = 32, plafonné à 25
+    assert might.max() == 25
+    assert might[0] == 16
+
+
+def test_partial_targets_reduce_group_coverage():
+    """Une source ne touchant que 2 membres sur 5 ne couvre que 40% du groupe."""
+    team = [
+        make_player("Druid", sources=[BoonSource("alacrity", duration=10, interval=0, targets=2)]),
+        *[make_player("Weaver") for _ in range(4)],
+    ]
+
+    timeline = simulate_boon_timeline(team, fight_duration=20, bin_size=1.0)
+
+    assert timeline.uptime_for("alacrity")[0] == pytest.approx(0.4)
+
+
+def test_default_sources_for_listed_buffs():
+    """Un buff listé sans source explicite reçoit une source par défaut."""
+    timeline = simulate_boon_timeline([make_player("Firebrand", buffs={"quickness"})], fight_duration=50)
+
+    assert 0.0 < timeline.uptime_for("quickness")[0] < 1.0
+    assert timeline.providers[0]["quickness"] == ["Firebrand"]
+
+
+def test_score_team_timeline_uses_real_uptime():
+    """Le mode chronologique pénalise une couverture partielle que score_team ignore."""
+    team = [
+        make_player("Firebrand", sources=[
+            BoonSource("quickness", duration=2, interval=8),
+            BoonSource("might", duration=10, interval=1, stacks=5),
+        ]),
+        make_player("Weaver", buffs={"quickness", "might"}),
+    ]
+
+    boolean = score_team(team, CONFIG)
+    result, timeline = score_team_timeline(team, CONFIG, fight_duration=40)
+
+    assert boolean.buff_score == pytest.approx(1.0)
+    assert result.buff_score < boolean.buff_score
+    assert result.role_score == boolean.role_score
+    quickness = next(c for c in result.buff_coverage if c.buff == BuffType.QUICKNESS)
+    assert quickness.covered is False
+    assert sorted(quickness.provided_by) == ["Firebrand", "Weaver"]
+    assert set(timeline.boons) == {"quickness", "might"}
+
+
+def test_empty_team():
+    """Une équipe vide conserve le résultat par défaut de score_team."""
+    result, timeline = score_team_timeline([], CONFIG)
+
+    assert timeline is None
+    assert result.total_score == 1.0
+
+
+def test_fifty_player_squad_is_fast():
+    """Une escouade de 50 joueurs est simulée en quelques millisecondes."""
+    buffs = ["quickness", "alacrity", "might", "fury", "protection", "stability"]
+    team = [make_player(f"P{i}", buffs=buffs[i % 3: i % 3 + 3]) for i in range(50)]
+
+    simulate_boon_timeline(team, fight_duration=120)
+    start = time.perf_counter()
+    timeline = simulate_boon_timeline(team, fight_duration=120)
+    elapsed = time.perf_counter() - start
+
+    assert timeline.uptime.shape == (10, len(timeline.boons))
+    assert np.all((timeline.uptime >= 0) & (timeline.uptime <= 1))
+    assert elapsed < 0.05
@@ -0,0 +1,118 @@
+"""Tests pour le store des faits de compétences en colonnes."""
+
+import gc
+import weakref
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.game_mechanics.rotation import RotationSimulator, compile_skill
+from app.models import Skill
+from app.models.skill import SkillType
+from app.models.skill_facts import SkillFactStore, get_skill_fact_store, set_skill_fact_store
+
+
+FACTS = [
+    {"type": "Recharge", "value": 12},
+    {"type": "Time", "text": "Activation", "duration": 0.5},
+    {"type": "Damage", "dmg_multiplier": 0.8, "hit_count": 3},
+    {"type": "Buff", "status": "Bleeding", "apply_count": 2, "duration": 6},
+    {"type": "Buff", "status": "Might", "apply_count": 5, "duration": 8},
+    {"type": "Radius", "distance": 240},
+    {"type": "Range", "value": 900},
+]
+TRAITED_FACTS = [{"type": "Damage", "dmg_multiplier": 1.1, "hit_count": 3, "requires_trait": 42}]
+
+
+@pytest.fixture
+def store():
+    return SkillFactStore.build([
+        (20, [{"type": "Heal", "hit_count": 2, "dmg_multiplier": 0.5}], None),
+        (7, FACTS, TRAITED_FACTS),
+        (9, None, None),
+    ])
+
+
+@pytest.fixture(autouse=True)
+def reset_store():
+    yield
+    set_skill_fact_store(None)
+
+
+def test_columns_and_offsets(store):
+    """Les faits sont stockés en colonnes typées, contigus par compétence."""
+    assert store.skill_ids.tolist() == [7, 9, 20]
+    assert store.offsets.tolist() == [0, 8, 8, 9]
+    assert store.base_ends.tolist() == [7, 8, 9]
+    assert store.type_code.dtype == np.int16
+    assert len(store) == 9
+
+    rows = store.fact_rows(7, include_traited=False)
+    assert [store.fact_types[c] for c in store.type_code[rows]] == [f["type"] for f in FACTS]
+    assert store.requires_trait[store.fact_rows(7)].tolist()[-1] == 42
+    assert 9 in store and 8 not in store
+    assert store.fact_rows(8) == slice(0, 0)
+
+
+def test_values(store):
+    """Les valeurs sont lues sans allocation de dictionnaire."""
+    assert store.get_value(7, "Recharge") == 12
+    assert store.get_value(7, "Time", "duration") == 0.5
+    assert store.get_value(7, "Buff", "stacks") == 2
+    assert store.attribute_name(store.find(7, "Buff")) == "Bleeding"
+    assert store.get_value(9, "Damage", default=0) == 0
+    assert store.find(7, "Unknown") == -1
+
+
+def test_coefficients_match_json_implementation(store):
+    """Skill.get_coefficients donne le même résultat avec ou sans le store."""
+    skill = Skill(id=7, name="Test", facts=FACTS, traited_facts=TRAITED_FACTS)
+    healer = Skill(id=20, name="Heal", facts=[{"type": "Heal", "hit_count": 2, "dmg_multiplier": 0.5}])
+
+    expected = skill.get_coefficients(), healer.get_coefficients()
+    set_skill_fact_store(store)
+
+    assert (skill.get_coefficients(), healer.get_coefficients()) == expected
+    assert expected[0] == {"damage": 0.8, "healing": 0, "hits": 3, "duration": 0, "radius": 240, "range": 900}
+    assert expected[1]["healing"] == 1.0
+
+
+def test_rotation_profiles_from_store(store):
+    """Le simulateur compile les mêmes profils depuis le store que depuis le JSON."""
+    skill = SimpleNamespace(id=7, recharge=None, facts=FACTS)
+
+    assert compile_skill(skill, store) == compile_skill(skill)
+    assert RotationSimulator(fact_store=store).profile(SimpleNamespace(id=7, recharge=None, facts=[])) \
+        == compile_skill(skill)
+
+
+def test_fact_accessors_do_not_pin_instances():
+    """Les accès aux faits ne retiennent plus les instances dans un cache global."""
+    skill = Skill(id=99, name="Temp", facts=FACTS)
+    skill.get_skill_facts()
+    skill.get_skill_facts_by_type("Damage")
+    assert skill.get_skill_fact_value("Damage", "dmg_multiplier") == 0.8
+    assert skill.to_dict(include_related=False)['name'] == "Temp"
+    # Le dictionnaire suit les modifications de l'instance
+    skill.name = "Renamed"
+    assert skill.to_dict(include_related=False)['name'] == "Renamed"
+    skill.clear_cache()
+
+    ref = weakref.ref(skill)
+    del skill
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_from_session(db):
+    """Le store est chargé en une requête depuis la table des compétences."""
+    db.add(Skill(id=1234, name="Stored", type=SkillType.UTILITY, facts=FACTS))
+    db.commit()
+
+    store = SkillFactStore.from_session(db)
+
+    assert 1234 in store
+    assert store.get_value(1234, "Range") == 900
+    assert get_skill_fact_store() is None
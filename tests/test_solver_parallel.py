@@ -0,0 +1,159 @@
+"""Tests pour la génération parallèle de builds multi-professions."""
+
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from app.config import settings
+from app.game_mechanics import GameMode, RoleType
+from app.scoring.fingerprint import build_fingerprint
+from app.services import catalog, catalog_file
+from app.solver.parallel import GenerationTask, _init_worker, generate_builds_for_professions
+
+
+def fake_worker(task, game_mode, time_budget, generator_options):
+    """Renvoie deux solutions par tâche, dont une commune à toutes les tâches."""
+    return [
+        {'fingerprint': build_fingerprint(task.profession_id, [task.role.value if task.role else None]),
+         'profession_id': task.profession_id,
+         'role': task.role.value if task.role else None,
+         'score': 1.0},
+        {'fingerprint': 'shared', 'profession_id': task.profession_id, 'score': 0.5},
+    ]
+
+
+def slow_worker(task, game_mode, time_budget, generator_options):
+    """Simule une profession dont la génération dépasse le budget."""
+    if task.profession_id == "Slow":
+        time.sleep(2.0)
+    return [{'fingerprint': task.profession_id, 'profession_id': task.profession_id, 'score': 1.0}]
+
+
+def failing_worker(task, game_mode, time_budget, generator_options):
+    """Échoue pour une profession précise."""
+    if task.profession_id == "Broken":
+        raise RuntimeError("boom")
+    return [{'fingerprint': task.profession_id, 'profession_id': task.profession_id, 'score': 1.0}]
+
+
+async def collect(**kwargs):
+    return [solution async for solution in generate_builds_for_professions(**kwargs)]
+
+
+def test_build_fingerprint_ignores_selection_order():
+    """L'empreinte ne dépend pas de l'ordre des éléments d'un emplacement."""
+    assert build_fingerprint("Guardian", [42, 16], [1, 2, 3]) == build_fingerprint("Guardian", [16, 42], [3, 2, 1])
+    assert build_fingerprint("Guardian", [42, 16]) != build_fingerprint("Warrior", [42, 16])
+    # Un même ID dans deux emplacements différents ne doit pas collisionner
+    assert build_fingerprint("Guardian", [42]) != build_fingerprint("Guardian", [], [42])
+
+
+@pytest.mark.asyncio
+async def test_fan_out_and_deduplicate():
+    """Chaque couple (profession, rôle) est traité et les doublons sont filtrés."""
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        solutions = await collect(
+            profession_ids=["Guardian", "Warrior", "Necromancer"],
+            roles=[RoleType.DPS, RoleType.HEALER],
+            executor=executor,
+            worker=fake_worker,
+        )
+
+    fingerprints = [s['fingerprint'] for s in solutions]
+    assert len(fingerprints) == len(set(fingerprints))
+    # 6 solutions propres + 1 solution partagée dédupliquée
+    assert len(solutions) == 7
+    assert {(s['profession_id'], s.get('role')) for s in solutions if s['fingerprint'] != 'shared'} == {
+        (p, r.value) for p in ["Guardian", "Warrior", "Necromancer"] for r in (RoleType.DPS, RoleType.HEALER)
+    }
+
+
+@pytest.mark.asyncio
+async def test_time_budget_stops_streaming():
+    """Les tâches qui dépassent le budget global sont abandonnées."""
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        start = time.monotonic()
+        solutions = await collect(
+            profession_ids=["Guardian", "Slow"],
+            time_budget=0.3,
+            executor=executor,
+            worker=slow_worker,
+        )
+        elapsed = time.monotonic() - start
+    finally:
+        executor.shutdown(wait=False)
+
+    assert [s['profession_id'] for s in solutions] == ["Guardian"]
+    assert elapsed < 1.5
+
+
+@pytest.mark.asyncio
+async def test_worker_errors_do_not_abort_generation():
+    """Une erreur sur une profession n'empêche pas les autres de produire des builds."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        solutions = await collect(
+            profession_ids=["Broken", "Guardian"],
+            executor=executor,
+            worker=failing_worker,
+        )
+
+    assert [s['profession_id'] for s in solutions] == ["Guardian"]
+
+
+@pytest.mark.asyncio
+async def test_process_pool_round_trip():
+    """Les tâches et les résultats transitent correctement entre processus."""
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        solutions = await collect(
+            profession_ids=["Guardian", "Warrior"],
+            roles=[RoleType.SUPPORT],
+            game_mode=GameMode.WVW,
+            executor=executor,
+            worker=fake_worker,
+        )
+
+    assert sorted(s['profession_id'] for s in solutions if s['fingerprint'] != 'shared') == ["Guardian", "Warrior"]
+
+
+@pytest.mark.asyncio
+async def test_roles_generator_and_remaining_budget():
+    """Un générateur de rôles sert toutes les professions ; chaque tâche reçoit le temps restant."""
+    budgets = []
+
+    def recording_worker(task, game_mode, time_budget, generator_options):
+        budgets.append(time_budget)
+        return fake_worker(task, game_mode, time_budget, generator_options)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        solutions = await collect(
+            profession_ids=["Guardian", "Warrior"],
+            roles=(role for role in (RoleType.DPS, RoleType.HEALER)),
+            time_budget=5.0,
+            executor=executor,
+            worker=recording_worker,
+        )
+
+    assert {(s['profession_id'], s['role']) for s in solutions if s['fingerprint'] != 'shared'} == {
+        (p, r.value) for p in ["Guardian", "Warrior"] for r in (RoleType.DPS, RoleType.HEALER)
+    }
+    assert len(budgets) == 4
+    assert all(0 <= budget < 5.0 for budget in budgets)
+
+
+def test_generation_task_is_hashable():
+    """Les tâches sont immuables et peuvent servir de clés."""
+    task = GenerationTask(profession_id="Guardian", role=RoleType.DPS)
+    assert {task: 1}[GenerationTask("Guardian", RoleType.DPS)] == 1
+
+
+def test_worker_installs_missing_catalog(monkeypatch):
+    """Un processus de travail sans catalogue hérité (``spawn``) installe le sien."""
+    installed = []
+    monkeypatch.setattr(catalog, "_catalog", None)
+    monkeypatch.setattr(catalog_file, "install_catalog", installed.append)
+
+    _init_worker()
+
+    assert installed == [settings.CATALOG_FILE]
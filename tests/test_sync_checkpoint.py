@@ -0,0 +1,132 @@
+"""Tests pour la reprise d'une synchronisation interrompue (points de reprise par lot)."""
+
+import asyncio
+
+import pytest
+
+from app.models import ItemStats, Skill, SyncCheckpoint, SyncState
+from app.services.gw2_data_service import GW2DataService
+
+SKILLS = {
+    skill_id: {'id': skill_id, 'name': f"Skill {skill_id}", 'type': "Utility", 'professions': ["Guardian"]}
+    for skill_id in range(7001, 7501)
+}
+
+
+class FlakyAPI:
+    """Client API enregistré dont certains lots échouent ou restent bloqués."""
+
+    def __init__(self, build_id=170000, failing=(), hanging=()):
+        self.build_id = build_id
+        self.failing = set(failing)
+        self.hanging = set(hanging)
+        self.requested = []
+        self.written = asyncio.Event()
+
+    async def get_build(self):
+        return {'id': self.build_id}
+
+    async def get(self, endpoint, params=None):
+        assert endpoint == '/v2/skills'
+        return list(SKILLS)
+
+    async def get_skills(self, ids):
+        if ids[0] in self.hanging:
+            await asyncio.Event().wait()
+        if ids[0] in self.failing:
+            raise RuntimeError("API indisponible")
+        self.requested.extend(ids)
+        return [SKILLS[i] for i in ids]
+
+
+@pytest.mark.asyncio
+async def test_crashed_sync_resumes_after_last_committed_chunk(db):
+    """Une synchronisation interrompue ne récupère à nouveau que les lots non validés."""
+    api = FlakyAPI(hanging={7201, 7401})
+    service = GW2DataService(db_session=db, api_client=api)
+    task = asyncio.ensure_future(service.sync_skills())
+    while db.get(SyncCheckpoint, 'skills') is None:
+        await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    service._after_sync()
+
+    checkpoint = db.get(SyncCheckpoint, 'skills')
+    assert checkpoint.done_chunks == [0]
+    assert checkpoint.chunk_count == 3
+    first_run = checkpoint.run_id
+
+    resumed = GW2DataService(db_session=db, api_client=FlakyAPI())
+    result = await resumed.sync_skills()
+
+    assert resumed._api.requested == list(range(7201, 7501))
+    assert result['status'] == "success"
+    assert (result['resumed_from'], result['resumed']) == (first_run, 200)
+    assert db.query(Skill).filter(Skill.id.between(7001, 7500)).count() == 500
+    # Synchronisation terminée : le point de reprise est supprimé et le build enregistré
+    assert db.get(SyncCheckpoint, 'skills') is None
+    assert db.get(SyncState, 'skills').build_id == 170000
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_is_retried_on_next_sync(db):
+    api = FlakyAPI(failing={7201})
+    service = GW2DataService(db_session=db, api_client=api)
+    first = await service.sync_skills()
+    service._after_sync()
+
+    assert first['status'] == "partial"
+    assert db.get(SyncCheckpoint, 'skills').done_chunks == [0, 400]
+
+    retry = FlakyAPI()
+    service = GW2DataService(db_session=db, api_client=retry)
+    second = await service.sync_skills()
+    service._after_sync()
+
+    assert retry.requested == list(range(7201, 7401))
+    assert second['resumed'] == 300
+    assert db.get(SyncCheckpoint, 'skills') is None
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_is_discarded_after_build_change(db):
+    service = GW2DataService(db_session=db, api_client=FlakyAPI(failing={7201}))
+    await service.sync_skills()
+    service._after_sync()
+
+    new_build = FlakyAPI(build_id=170001)
+    service = GW2DataService(db_session=db, api_client=new_build)
+    result = await service.sync_skills()
+
+    assert new_build.requested == list(SKILLS)
+    assert 'resumed' not in result
+    assert db.get(SyncCheckpoint, 'skills') is None
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_is_created_inside_db_section(db):
+    """Remplacer un point de reprise périmé ne valide pas les écritures d'une étape simultanée."""
+    service = GW2DataService(db_session=db, api_client=FlakyAPI(failing={7201}))
+    await service.sync_skills()
+    service._after_sync()
+    assert db.get(SyncCheckpoint, 'skills') is not None
+
+    service = GW2DataService(db_session=db, api_client=FlakyAPI(build_id=170001))
+    tracker = await service._track('skills', list(SKILLS))
+
+    async def failing_step():
+        async with service._db_section() as session:
+            session.add(ItemStats(id=9901, name="Stat 9901"))
+            await asyncio.sleep(0.01)
+            raise RuntimeError("échec")
+
+    step = asyncio.ensure_future(failing_step())
+    await asyncio.sleep(0)
+    checkpoint = await service._checkpoint(tracker)
+    with pytest.raises(RuntimeError):
+        await step
+
+    assert checkpoint.resumed_from is None
+    assert db.get(SyncCheckpoint, 'skills') is None
+    assert db.get(ItemStats, 9901) is None
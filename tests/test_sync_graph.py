@@ -0,0 +1,132 @@
+"""Tests pour le graphe de dépendances des étapes de synchronisation."""
+
+import asyncio
+
+import pytest
+
+from app.models import ItemStats
+from app.services.gw2_data_service import GW2DataService
+from app.services.sync_graph import SyncGraph, SyncStep
+
+
+class Steps:
+    """Étapes simulées qui enregistrent leur ordre de démarrage et de fin."""
+
+    def __init__(self):
+        self.events = []
+        self.running = 0
+        self.max_running = 0
+
+    def step(self, name, delay, result=None, error=None):
+        async def run():
+            self.events.append(("start", name))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            try:
+                await asyncio.sleep(delay)
+                if error is not None:
+                    raise error
+                return result or {"status": "success"}
+            finally:
+                self.running -= 1
+                self.events.append(("end", name))
+        return run
+
+    def index(self, event, name):
+        return self.events.index((event, name))
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently():
+    steps = Steps()
+    graph = SyncGraph([
+        SyncStep("professions", steps.step("professions", 0.02)),
+        SyncStep("skills", steps.step("skills", 0.05), depends_on=("professions",)),
+        SyncStep("traits", steps.step("traits", 0.02), depends_on=("skills",)),
+        SyncStep("itemstats", steps.step("itemstats", 0.03)),
+        SyncStep("items", steps.step("items", 0.02), depends_on=("professions", "itemstats")),
+    ])
+
+    result = await graph.run()
+
+    assert list(result.results) == ["professions", "skills", "traits", "itemstats", "items"]
+    assert steps.max_running >= 2
+    assert steps.index("start", "itemstats") < steps.index("end", "professions")
+    for step, dependency in [("skills", "professions"), ("traits", "skills"), ("items", "itemstats")]:
+        assert steps.index("end", dependency) < steps.index("start", step)
+
+    report = result.report()
+    assert report["critical_path"] == ["professions", "skills", "traits"]
+    assert report["critical_path_seconds"] <= report["total_seconds"]
+    assert report["steps"]["skills"]["seconds"] >= 0.04
+    # Durée totale : celle du chemin critique, pas la somme des étapes
+    assert report["total_seconds"] < sum(timing["seconds"] for timing in report["steps"].values())
+
+
+@pytest.mark.asyncio
+async def test_failed_step_does_not_stop_the_graph():
+    steps = Steps()
+    graph = SyncGraph([
+        SyncStep("professions", steps.step("professions", 0, error=RuntimeError("API indisponible"))),
+        SyncStep("skills", steps.step("skills", 0), depends_on=("professions",)),
+    ])
+
+    result = await graph.run()
+
+    assert result.results["professions"] == {"status": "error", "error": "API indisponible"}
+    assert result.results["skills"] == {"status": "success"}
+
+
+def test_invalid_graphs_are_rejected():
+    async def noop():
+        return {}
+
+    with pytest.raises(ValueError, match="inconnues"):
+        SyncGraph([SyncStep("skills", noop, depends_on=("professions",))])
+    with pytest.raises(ValueError, match="Cycle"):
+        SyncGraph([SyncStep("a", noop, depends_on=("b",)), SyncStep("b", noop, depends_on=("a",))])
+    with pytest.raises(ValueError, match="double"):
+        SyncGraph([SyncStep("a", noop), SyncStep("a", noop)])
+
+
+@pytest.mark.asyncio
+async def test_sync_all_reports_step_timings(db, monkeypatch):
+    service = GW2DataService(db_session=db, api_client=object())
+    steps = Steps()
+    for name in ("professions", "specializations", "skills", "traits", "itemstats", "items"):
+        monkeypatch.setattr(service, f"sync_{name}", steps.step(name, 0.01))
+    monkeypatch.setattr(service, "_after_sync", lambda: None)
+
+    report = await service.sync_all()
+
+    assert report["status"] == "success"
+    assert set(report["results"]) == {"professions", "specializations", "skills", "traits", "itemstats", "items"}
+    assert report["timings"]["critical_path"] == ["professions", "specializations", "skills", "traits"]
+    # Les statistiques d'objets ne dépendent d'aucune autre étape
+    assert steps.events[:2] == [("start", "professions"), ("start", "itemstats")]
+
+
+@pytest.mark.asyncio
+async def test_db_sections_isolate_concurrent_steps(db):
+    """Une étape en échec n'annule que ses propres écritures, pas celles d'une étape simultanée."""
+    service = GW2DataService(db_session=db, api_client=object())
+    events = []
+
+    async def step(stat_id, error=None):
+        async with service._db_section() as session:
+            events.append(("start", stat_id))
+            session.add(ItemStats(id=stat_id, name=f"Stat {stat_id}"))
+            # Les autres étapes attendent : elles ne peuvent ni valider ni annuler cet ajout
+            await asyncio.sleep(0.01)
+            events.append(("end", stat_id))
+            if error is not None:
+                raise error
+
+    results = await asyncio.gather(
+        step(9901), step(9902, error=RuntimeError("échec")), step(9903), return_exceptions=True
+    )
+
+    assert isinstance(results[1], RuntimeError)
+    assert events == [(event, stat_id) for stat_id in (9901, 9902, 9903) for event in ("start", "end")]
+    assert db.get(ItemStats, 9902) is None
+    assert {stat.id for stat in db.query(ItemStats).filter(ItemStats.id.between(9901, 9903))} == {9901, 9903}
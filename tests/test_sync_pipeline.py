@@ -0,0 +1,152 @@
+"""Tests pour le pipeline de synchronisation, hors ligne avec des réponses enregistrées."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.models import Skill
+from app.services.gw2_data_service import GW2DataService
+from app.services.sync_pipeline import SyncPipeline
+
+# Réponses enregistrées de /v2/skills (une compétence invalide, sans type)
+RECORDED_SKILLS = {
+    skill_id: {'id': skill_id, 'name': f"Skill {skill_id}", 'type': "Utility", 'professions': ["Guardian"]}
+    for skill_id in range(8001, 8451)
+}
+RECORDED_SKILLS[8013] = {'id': 8013, 'name': "Broken"}
+
+
+class RecordedAPI:
+    """Client API rejouant des réponses enregistrées, avec une latence simulée."""
+
+    def __init__(self, responses, latency=0.01, failing_chunks=()):
+        self.responses = responses
+        self.latency = latency
+        self.failing_chunks = set(failing_chunks)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    async def get(self, endpoint, params=None):
+        assert endpoint == '/v2/skills'
+        return list(self.responses)
+
+    async def get_skills(self, ids):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if ids[0] in self.failing_chunks:
+                raise RuntimeError("API indisponible")
+            return [self.responses[i] for i in ids if i in self.responses]
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_fetches_concurrently_with_backpressure():
+    """Les récupérations se chevauchent sans dépasser la taille des files."""
+    api = RecordedAPI(RECORDED_SKILLS)
+    written = []
+    pending = []
+
+    def transform(data):
+        pending.append(len(data))
+        return data, 0
+
+    async def write(batch):
+        await asyncio.sleep(0.03)
+        written.append(batch)
+        return len(batch), 0
+
+    pipeline = SyncPipeline(api.get_skills, transform, write, fetchers=3, queue_size=1)
+    result = await pipeline.run(list(RECORDED_SKILLS), chunk_size=50)
+
+    assert result.chunks == 9
+    assert result.processed == len(RECORDED_SKILLS)
+    assert result.errors == 0
+    assert api.max_in_flight > 1
+    assert sorted(skill['id'] for batch in written for skill in batch) == sorted(RECORDED_SKILLS)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_isolates_failed_chunks():
+    """Chaque ID d'un lot en échec est compté comme une erreur, sans arrêter les autres lots."""
+    api = RecordedAPI(RECORDED_SKILLS, latency=0, failing_chunks={8001})
+    pipeline = SyncPipeline(api.get_skills, lambda data: (data, 0), lambda batch: (len(batch), 0), fetchers=2)
+
+    result = await pipeline.run(list(RECORDED_SKILLS), chunk_size=200)
+
+    assert result.errors == 200
+    assert result.processed == len(RECORDED_SKILLS) - 200
+
+
+@pytest.mark.asyncio
+async def test_pipeline_counts_failed_writes_per_id():
+    """Un lot dont l'écriture échoue compte ses IDs, sans recompter les éléments rejetés."""
+    ids = list(RECORDED_SKILLS)[:300]
+
+    def transform(data):
+        batch = [skill for skill in data if skill['id'] != ids[0]]
+        return batch, len(data) - len(batch)
+
+    def write(batch):
+        if batch[0]['id'] == ids[1]:
+            raise RuntimeError("base indisponible")
+        return len(batch), 0
+
+    pipeline = SyncPipeline(RecordedAPI(RECORDED_SKILLS, latency=0).get_skills, transform, write, fetchers=2)
+    result = await pipeline.run(ids, chunk_size=200)
+
+    assert result.errors == 200
+    assert result.processed == 100
+
+
+@pytest.mark.asyncio
+async def test_concurrent_pipelines_serialize_writes_in_section():
+    """Deux pipelines simultanés n'écrivent jamais en même temps dans une section partagée."""
+    lock = asyncio.Lock()
+    writing = []
+    overlaps = []
+
+    @asynccontextmanager
+    async def section():
+        async with lock:
+            yield
+
+    def pipeline(label):
+        async def write(batch):
+            overlaps.append(bool(writing))
+            writing.append(label)
+            await asyncio.sleep(0.01)
+            writing.remove(label)
+            return len(batch), 0
+        api = RecordedAPI(RECORDED_SKILLS, latency=0)
+        return SyncPipeline(api.get_skills, lambda data: (data, 0), write, section=section, label=label)
+
+    results = await asyncio.gather(*(
+        pipeline(label).run(list(RECORDED_SKILLS), chunk_size=100) for label in ("a", "b")
+    ))
+
+    assert [result.processed for result in results] == [len(RECORDED_SKILLS)] * 2
+    assert len(overlaps) == 10
+    assert not any(overlaps)
+
+
+@pytest.mark.asyncio
+async def test_sync_skills_offline(db):
+    """La synchronisation des compétences écrit les réponses enregistrées."""
+    api = RecordedAPI(RECORDED_SKILLS)
+    service = GW2DataService(db_session=db, api_client=api)
+
+    result = await service.sync_skills()
+
+    assert result['total'] == len(RECORDED_SKILLS)
+    assert result['processed'] == len(RECORDED_SKILLS) - 1
+    assert result['errors'] == 1
+    assert result['status'] == "partial"
+    assert api.calls == 3
+    assert db.get(Skill, 8450).name == "Skill 8450"
+    assert db.get(Skill, 8013) is None
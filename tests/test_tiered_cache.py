@@ -0,0 +1,104 @@
+"""Tests pour le cache multi-niveaux (mémoire → disque → Redis)."""
+
+import pytest
+
+from app.api.cache_store import KVStore
+from app.api.tiered_cache import TieredCache, make_key
+
+
+class Clock:
+    """Horloge manuelle."""
+
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """Sous-ensemble de ``redis.asyncio.Redis`` utilisé par le cache."""
+
+    def __init__(self):
+        self.data = {}
+        self.gets = 0
+
+    async def get(self, key):
+        self.gets += 1
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def scan_iter(self, match=None):
+        for key in list(self.data):
+            if match is None or key.startswith(match.rstrip('*')):
+                yield key
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    kv_store = KVStore(tmp_path / "cache.sqlite", clock=clock)
+    yield kv_store
+    kv_store.close()
+
+
+def test_make_key_is_stable():
+    assert make_key("GET:/v2/skills", {'ids': "1", 'lang': "fr"}) == make_key("GET:/v2/skills", {'lang': "fr", 'ids': "1"})
+    assert make_key("GET:/v2/skills", {'ids': "1"}).startswith("GET:/v2/skills:")
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_is_bounded(clock):
+    cache = TieredCache("test", ttl=60, memory_entries=2, clock=clock)
+    for key in ("a", "b", "c"):
+        await cache.set(key, key.upper())
+
+    assert await cache.get("a") is None
+    assert await cache.get("c") == "C"
+    assert cache.stats()["memory_evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_write_through_and_read_through(store, clock):
+    """Une écriture atteint tous les niveaux ; une lecture remonte l'entrée trouvée."""
+    redis = FakeRedis()
+    writer = TieredCache("data", ttl=60, store=store, redis_client=redis, clock=clock)
+    await writer.set("GET:/v2/build:x", {'id': 170000})
+    assert store.get("data:GET:/v2/build:x") == {'id': 170000}
+    assert "data:GET:/v2/build:x" in redis.data
+
+    # Un autre processus : mémoire vide, lecture sur le disque
+    reader = TieredCache("data", ttl=60, store=store, redis_client=redis, clock=clock)
+    assert await reader.get("GET:/v2/build:x") == {'id': 170000}
+    assert await reader.get("GET:/v2/build:x") == {'id': 170000}
+    assert (reader.stats()["disk_hits"], reader.stats()["memory_hits"]) == (1, 1)
+
+    # Un autre hôte : ni mémoire ni disque, lecture dans Redis
+    remote = TieredCache("data", ttl=60, redis_client=redis, clock=clock)
+    assert await remote.get("GET:/v2/build:x") == {'id': 170000}
+    assert remote.stats()["redis_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_and_namespaces(store, clock):
+    api = TieredCache("api", ttl=10, store=store, clock=clock)
+    other = TieredCache("other", ttl=100, store=store, clock=clock)
+    await api.set("GET:/v2/skills:1", [1])
+    await api.set("GET:/v2/traits:1", [2], ttl=100)
+    await other.set("GET:/v2/skills:1", [3])
+
+    clock.now += 50
+    assert await api.get("GET:/v2/skills:1") is None
+    assert await api.get_entry("GET:/v2/skills:1") == ([1], 1_010.0)
+    assert api.purge_expired() == 1
+    assert await api.clear("GET:/v2/traits") == 1
+    assert await other.get("GET:/v2/skills:1") == [3]